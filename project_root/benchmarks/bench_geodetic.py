@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of the geodetic transforms.
+
+Converts synthetic GPS fixes around a reference point (1M by default) from WGS84 to ENU/NED
+with the former DataFrame implementation of coordinate_transformation.py (wgs842ecef +
+ecef2enu, reproduced below) and with the batched array transforms of geodetic.py, allocating
+the output, into a preallocated output and in place. Then times the inverse (ENU to WGS84,
+closed-form geodetic latitude) and reports the round-trip error.
+
+Usage:
+    python benchmarks/bench_geodetic.py [--fixes 1000000] [--frame ENU]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.localization_and_navigation.geodetic import (WGS84_A, WGS84_E2, LocalTangentFrame, ecef_to_geodetic,
+                                                        geodetic_to_ecef)
+
+# Reference point of the sample trip
+REFERENCE = (35.4517588, 139.63635209, 42.6)
+
+
+def timed(label, func, repeat=1):
+    """Run func `repeat` times and print the mean duration."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<45} {elapsed * 1e3:10.3f} ms")
+    return result, elapsed
+
+
+def synthetic_fixes(num_fixes, seed=0):
+    """Fixes within a few km of the reference point, as a C-contiguous (N, 3) array."""
+    rng = np.random.default_rng(seed)
+    lla = np.empty((num_fixes, 3))
+    lla[:, 0] = REFERENCE[0] + rng.normal(0.0, 0.02, num_fixes)
+    lla[:, 1] = REFERENCE[1] + rng.normal(0.0, 0.02, num_fixes)
+    lla[:, 2] = REFERENCE[2] + rng.normal(0.0, 5.0, num_fixes)
+    return lla
+
+
+def dataframe_to_tangent(df_wgs84, frame_name):
+    """The former DataFrame implementation: column vectors for ECEF, then a 3 x N rotation."""
+    lat = np.radians(df_wgs84[["latitude"]].to_numpy())
+    lng = np.radians(df_wgs84[["longitude"]].to_numpy())
+    h = df_wgs84[["height"]].to_numpy()
+    sin_lat, cos_lat, sin_lng, cos_lng = np.sin(lat), np.cos(lat), np.sin(lng), np.cos(lng)
+    rn = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    df_ecef = pd.DataFrame({"X": np.squeeze((rn + h) * cos_lat * cos_lng), "Y": np.squeeze((rn + h) * cos_lat * sin_lng),
+                            "Z": np.squeeze((rn * (1 - WGS84_E2) + h) * sin_lat)})
+
+    xyz = np.stack([df_ecef[[c]].to_numpy().squeeze() for c in "XYZ"], axis=0)
+    s_lat, c_lat = np.sin(np.radians(REFERENCE[0])), np.cos(np.radians(REFERENCE[0]))
+    s_lng, c_lng = np.sin(np.radians(REFERENCE[1])), np.cos(np.radians(REFERENCE[1]))
+    east, north = [-s_lng, c_lng, 0.0], [-s_lat * c_lng, -s_lat * s_lng, c_lat]
+    up = [c_lat * c_lng, c_lat * s_lng, s_lat]
+    w = np.array([east, north, up] if frame_name == "ENU" else [north, east, [-v for v in up]])
+    ref = geodetic_to_ecef(np.array([REFERENCE]))[0]
+    return pd.DataFrame((w @ (xyz - ref[:, None])).T, columns=["x", "y", "z"])
+
+
+def run(num_fixes, frame_name):
+    lla = synthetic_fixes(num_fixes)
+    frame = LocalTangentFrame(*REFERENCE, frame=frame_name)
+    print(f"Geodetic benchmark: {num_fixes} fixes, frame {frame_name}")
+
+    df_wgs84 = pd.DataFrame(lla, columns=["latitude", "longitude", "height"])
+    reference, legacy_time = timed("DataFrame (former implementation)",
+                                   lambda: dataframe_to_tangent(df_wgs84, frame_name).to_numpy())
+    local, batched_time = timed("batched, new output", lambda: frame.from_geodetic(lla), repeat=5)
+    out = np.empty_like(lla)
+    timed("batched, preallocated output", lambda: frame.from_geodetic(lla, out=out), repeat=5)
+    scratch = lla.copy()
+
+    def in_place():
+        scratch[:] = lla
+        return frame.from_geodetic(scratch, out=scratch)
+
+    timed("batched, in place (incl. copy)", in_place, repeat=5)
+    print(f"speedup vs DataFrame: {legacy_time / batched_time:.1f}x, "
+          f"max difference {np.abs(local - reference).max():.3e} m")
+
+    ecef, _ = timed("WGS84 -> ECEF", lambda: geodetic_to_ecef(lla), repeat=5)
+    timed("ECEF -> WGS84", lambda: ecef_to_geodetic(ecef), repeat=5)
+    back, _ = timed(f"{frame_name} -> WGS84", lambda: frame.to_geodetic(local), repeat=5)
+    print(f"round trip error: {np.abs(back[:, :2] - lla[:, :2]).max():.3e} deg, "
+          f"{np.abs(back[:, 2] - lla[:, 2]).max():.3e} m")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the geodetic transforms")
+    parser.add_argument("--fixes", type=int, default=1_000_000, help="Number of GPS fixes")
+    parser.add_argument("--frame", choices=["ENU", "NED"], default="ENU", help="Local tangent frame")
+    args = parser.parse_args()
+    run(args.fixes, args.frame)
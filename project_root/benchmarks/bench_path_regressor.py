@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of the virtual path extraction of the PathRegressor.
+
+Compares the vectorized extraction over CSR paths (PathRegressor.extract_virtual_path) with
+the per-timestamp reference (PathRegressor.extract_virtual_path_per_timestamp) on a full
+trip, and checks that both return the same points. Then times the kinematic KPIs of all
+paths (PathRegressor.evaluate_kpi), and a parameter sweep (PathRegressor.sweep) against
+calling update_params + extract_virtual_path per parameter set.
+
+Usage:
+    python benchmarks/bench_path_regressor.py [--trip 2024-09-11T15_55_30/] [--loader polars]
+        [--delta-t 1.0] [--pts-before 3] [--pts-after 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from data_classes.PathRegressor import PathRegressor
+
+
+def timed(label, func, repeat=1):
+    """Run func `repeat` times and print the mean duration."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<45} {elapsed * 1e3:10.3f} ms")
+    return result, elapsed
+
+
+def run(trip, loader, delta_t_sec, pts_before, pts_after):
+    if loader == "pandas":
+        from data_classes.PathTrajectory_pandas import PathTrajectoryPandas as PathTrajectory
+    else:
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars as PathTrajectory
+    path_trajectory = PathTrajectory(os.path.join(trip, "path_trajectory.csv"))
+    regressor = PathRegressor(path_trajectory, CACHE_DIR=None, delta_t_sec=delta_t_sec, pts_before=pts_before,
+                              pts_after=pts_after)
+
+    def extract_cold():
+        # Include the per-path precomputation, which the regressor otherwise keeps between calls
+        regressor._precomputation = None
+        return regressor.extract_virtual_path()
+
+    num_paths = len(regressor.time_data)
+    print(f"PathRegressor benchmark: {num_paths} paths, loader {loader}, "
+          f"delta_t_sec {delta_t_sec}, window [-{pts_before}, +{pts_after}]")
+    (_, v_p_reference), reference_time = timed("per-timestamp reference",
+                                               regressor.extract_virtual_path_per_timestamp)
+    (_, v_p), vectorized_time = timed("vectorized (CSR)", extract_cold, repeat=10)
+
+    # The reference leaves the kinematic columns empty
+    assert v_p.shape == v_p_reference.shape and np.allclose(v_p[:, :6], v_p_reference[:, :6], equal_nan=True), \
+        "Vectorized extraction differs from the reference"
+    print(f"{len(v_p)} points, identical results, speedup {reference_time / vectorized_time:.1f}x")
+
+    def evaluate_kpi_cold():
+        regressor._precomputation = None
+        return regressor.evaluate_kpi()
+
+    timed("kinematic KPIs of all paths", evaluate_kpi_cold, repeat=10)
+
+    grid = {'delta_t_sec': np.linspace(0.5, 3.0, 6), 'pts_before': [0, 2, 4], 'pts_after': [0, 3, 5, 8]}
+
+    def sweep_one_by_one():
+        for delta_t in grid['delta_t_sec']:
+            for before in grid['pts_before']:
+                for after in grid['pts_after']:
+                    regressor.update_params({'delta_t_sec': delta_t, 'pts_before': before, 'pts_after': after})
+                    extract_cold()
+
+    def sweep_grid():
+        regressor._precomputation = None
+        return regressor.sweep(grid)
+
+    print(f"Parameter sweep over {6 * 3 * 4} parameter sets")
+    _, one_by_one_time = timed("update_params + extract_virtual_path", sweep_one_by_one)
+    _, sweep_time = timed("sweep", sweep_grid)
+    print(f"speedup {one_by_one_time / sweep_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PathRegressor virtual path extraction benchmark")
+    parser.add_argument("--trip", default=os.path.join(base_path, "2024-09-11T15_55_30"), help="Trip folder")
+    parser.add_argument("--loader", choices=["polars", "pandas"], default="polars", help="Path trajectory loader")
+    parser.add_argument("--delta-t", type=float, default=1.0, help="Look-ahead time delta_t_sec [s]")
+    parser.add_argument("--pts-before", type=int, default=3, help="Points before the look-ahead point")
+    parser.add_argument("--pts-after", type=int, default=5, help="Points after the look-ahead point")
+    args = parser.parse_args()
+    run(args.trip, args.loader, args.delta_t, args.pts_before, args.pts_after)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Scaling benchmark for the SignalRegistry.
+
+Registers N signals spread over many plugins, types and categories (like the generic CSV
+and FSM plugins exposing every column) and times registration, indexed queries and
+subscriber operations. Index queries are compared against a linear scan of all signals.
+
+Usage:
+    python benchmarks/bench_signal_registry.py [--signals 50000] [--plugins 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.signal_registry import SignalRegistry
+
+SIGNAL_TYPES = ["temporal", "spatial", "boolean"]
+
+
+class Subscriber:
+    """Stand-in for a plot widget."""
+    pass
+
+
+def timed(label, func, repeat=1):
+    """Run func `repeat` times and print the mean duration."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<45} {elapsed * 1e3:10.3f} ms")
+    return result
+
+
+def run(num_signals, num_plugins):
+    registry = SignalRegistry()
+    func = lambda timestamp: 0.0
+
+    def register_all():
+        for i in range(num_signals):
+            plugin = f"plugin_{i % num_plugins}"
+            registry.register_signal(
+                f"{plugin}.column_{i}",
+                {"func": func, "type": SIGNAL_TYPES[i % len(SIGNAL_TYPES)], "category": f"category_{i % 100}"},
+                plugin,
+            )
+
+    print(f"SignalRegistry benchmark: {num_signals} signals, {num_plugins} plugins")
+    timed(f"register {num_signals} signals", register_all)
+
+    timed("get_signals_by_type('spatial')", lambda: registry.get_signals_by_type("spatial"), repeat=20)
+    timed("  linear scan equivalent", lambda: [n for n, s in registry.signals.items() if s["type"] == "spatial"], repeat=20)
+
+    timed("get_signals_by_plugin('plugin_7')", lambda: registry.get_signals_by_plugin("plugin_7"), repeat=100)
+    timed("  linear scan equivalent", lambda: [n for n, p in registry.signal_providers.items() if p == "plugin_7"], repeat=100)
+
+    timed("get_signals_by_category('category_42')", lambda: registry.get_signals_by_category("category_42"), repeat=100)
+    timed("get_signals_by_prefix('plugin_7.column_1')", lambda: registry.get_signals_by_prefix("plugin_7.column_1"), repeat=100)
+    timed("  linear scan equivalent", lambda: [n for n in registry.signals if n.startswith("plugin_7.column_1")], repeat=100)
+
+    subscribers = [Subscriber() for _ in range(100)]
+    names = list(registry.signals)[:1000]
+
+    def subscribe_all():
+        for name in names:
+            for subscriber in subscribers:
+                registry.subscribe_to_signal(name, subscriber)
+
+    timed("subscribe 100 subscribers x 1000 signals", subscribe_all)
+    timed("re-register plugin_0 signals (unchanged keys)", lambda: [
+        registry.register_signal(name, {"func": func, "type": registry.signals[name]["type"],
+                                        "category": registry.signals[name]["category"]}, "plugin_0")
+        for name in registry.get_signals_by_plugin("plugin_0")
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SignalRegistry scaling benchmark")
+    parser.add_argument("--signals", type=int, default=50000, help="Number of signals to register")
+    parser.add_argument("--plugins", type=int, default=50, help="Number of plugins the signals are spread over")
+    args = parser.parse_args()
+    run(args.signals, args.plugins)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""
+Process-wide data cache for the Debug Player.
+
+Decoded trip data (parsed CSV files, prepared data frames) is kept in memory keyed by the
+loader, its arguments and the fingerprint of the source file. A loader call for a file that
+has not changed returns the already-decoded object instead of parsing the file again, so
+re-instantiating a plugin (e.g. on hot reload) does not re-parse the trip.
+
+Cached objects are shared between callers and must be treated as read-only; callers that
+modify the result in place should work on a copy.
+
+Usage:
+    from core.cache_handler import cached_loader
+
+    @cached_loader
+    def read_log(file_path):
+        return pl.read_csv(file_path)
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List
+
+from core import tracing
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of cached loader results; least recently used entries are dropped first
+DEFAULT_MAX_ENTRIES = 256
+
+
+def file_fingerprint(file_path: str) -> List[int]:
+    """
+    Get a cheap fingerprint of a file that changes whenever the file is modified.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        [size in bytes, modification time in ns]
+
+    Raises:
+        OSError: If the file does not exist
+    """
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class DataCache:
+    """
+    Thread-safe LRU cache of loader results, invalidated by source file fingerprint.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results
+        hits (int): Number of loads served from the cache
+        misses (int): Number of loads that ran the loader
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key -> (fingerprint, value)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, file_path: str, loader: Callable, *args, **kwargs) -> Any:
+        """
+        Get the cached result of loader(*args, **kwargs) for a source file, loading it if needed.
+
+        Args:
+            file_path: The source file the result is derived from
+            loader: The loading function
+            *args, **kwargs: Arguments passed to the loader; part of the cache key
+
+        Returns:
+            The (possibly shared) loader result
+        """
+        try:
+            fingerprint = file_fingerprint(file_path)
+        except OSError:
+            # Missing files are not cached, so the loader reports the error as usual
+            return loader(*args, **kwargs)
+
+        loader_name = f"{getattr(loader, '__module__', '')}.{getattr(loader, '__qualname__', repr(loader))}"
+        key = (loader_name, os.path.abspath(file_path),
+               repr(args), repr(sorted(kwargs.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with tracing.span(f"load:{getattr(loader, '__name__', 'loader')}", "loader", file=os.path.basename(file_path)):
+            value = loader(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug(f"Cached {key[0]} for {file_path}")
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached results and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache statistics.
+
+        Returns:
+            Dictionary with entries, hits, misses and hit_rate (None before the first load)
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+            }
+
+
+# The process-wide cache shared by all loaders
+data_cache = DataCache()
+
+
+def cached_loader(func: Callable) -> Callable:
+    """
+    Decorator caching a loader whose first argument is the path of the file it reads.
+
+    The undecorated loader remains available as func.uncached.
+    """
+    @wraps(func)
+    def wrapper(file_path, *args, **kwargs):
+        return data_cache.get_or_load(file_path, func, file_path, *args, **kwargs)
+    wrapper.uncached = func
+    return wrapper
@@ -18,7 +18,17 @@ temporal_signal_axes = {
     "target_steering_angle": ["plot1", "plot3"],
     "current_speed": ["plot2","plot3"],
     "target_speed": ["plot2", "plot3"],
-    "driving_mode": ["plot3"]   
+    "driving_mode": ["plot3"],
+    "steering_error": ["plot1"],
+    "speed_error": ["plot2"]
     # Add additional mappings as needed
 }
 
+
+
+# Expression signals: name -> expression over other signals (see core/signal_expressions.py)
+# Comparisons and logical expressions register boolean signals, everything else temporal signals
+expression_signals = {
+    "steering_deviation_over_5": "abs(current_steering - target_steering_angle) > 5",
+    "target_speed_mean_1s": "rolling_mean(target_speed, 1s)",
+}
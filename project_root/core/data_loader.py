@@ -43,12 +43,13 @@ def validate_trip_path(path: str) -> str:
     return expanded_path
 
 
-def parse_arguments() -> Union[str, Tuple[str, str]]:
+def parse_arguments() -> Union[str, Tuple[str, str, float]]:
     """
     Parse command-line arguments and validate trip paths.
     
     Returns:
-        Union[str, Tuple[str, str]]: The validated trip path(s).
+        Union[str, Tuple[str, str, float]]: The validated trip path, or for a comparison
+        the two trip paths and the time offset of the second trip in seconds.
         
     Raises:
         DataLoadError: If no valid trip paths are provided.
@@ -71,15 +72,34 @@ def parse_arguments() -> Union[str, Tuple[str, str]]:
         default=None, 
         help='Path to the second trip data directory or file (optional for comparison)'
     )
+    parser.add_argument(
+        '--trip2-offset',
+        type=float,
+        default=0.0,
+        help='Time offset of the second trip in seconds; both trips are aligned at their start plus this offset'
+    )
+    parser.add_argument(
+        '--trips-root',
+        type=str,
+        default=None,
+        help='Folder of trips to pick the first trip from (indexed in a trip catalog) when --trip1 is not given'
+    )
     
     # Parse the command-line arguments
     args = parser.parse_args()
     
     try:
+        # Without a trip path, let the user pick one from the catalog of the trips root
+        if not args.trip1 and args.trips_root:
+            from gui.trip_picker import select_trip
+            args.trip1 = select_trip(validate_trip_path(args.trips_root))
+            if not args.trip1:
+                sys.exit(0)
+
         # Check if at least one trip path is provided
         if not args.trip1:
             raise DataLoadError(
-                "No trip path provided. Please specify at least one trip path using --trip1."
+                "No trip path provided. Please specify at least one trip path using --trip1 or --trips-root."
             )
         
         # Validate the primary trip path
@@ -88,7 +108,7 @@ def parse_arguments() -> Union[str, Tuple[str, str]]:
         # If second trip is provided, validate it too
         if args.trip2:
             trip2_path = validate_trip_path(args.trip2)
-            return trip1_path, trip2_path
+            return trip1_path, trip2_path, args.trip2_offset
         
         # If only one trip is provided, return just that path
         return trip1_path
@@ -104,15 +124,27 @@ def get_available_signals(trip_path: str) -> dict:
     """
     Scan trip data and return available signals.
     
+    Only the header and a small sample of each CSV file are read; the schemas are cached
+    per file fingerprint in the trip folder, so repeated scans of an unchanged trip are cheap.
+    
     Args:
         trip_path (str): Path to trip data.
         
     Returns:
-        dict: Dictionary of available signals and their types.
+        dict: Dictionary mapping signal names ("<file stem>.<column>") to their metadata:
+              type, file, column, dtype and sample_rate_hz. Empty if the path is not a
+              directory.
     """
-    # This is a placeholder for future implementation
-    # In the future, this could scan the trip directory structure
-    # and find available signals based on file patterns or metadata
+    from utils.data_loaders.csv_schema_scanner import scan_trip_folder, iter_signal_columns
     
-    # For now, return an empty dict to indicate no automatic detection
-    return {}
+    schemas = scan_trip_folder(os.path.expanduser(trip_path))
+    return {
+        signal: {
+            "type": "temporal",
+            "file": file_name,
+            "column": column["name"],
+            "dtype": column["dtype"],
+            "sample_rate_hz": schemas[file_name]["sample_rate_hz"],
+        }
+        for signal, file_name, column in iter_signal_columns(schemas)
+    }
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""
+Derived Signals for the Debug Player.
+
+A derived signal is computed from other registered signals by a vectorized function.
+The inputs are aligned onto a common time base and the function is evaluated once over
+the whole trip; the result is cached and reused for every timestamp request until one of
+the inputs changes (its version in the SignalRegistry is bumped).
+
+Input signals must expose their full series through an optional "series" field in their
+signal definition: a callable taking no arguments and returning a tuple of
+(timestamps in milliseconds, values) as array-likes of equal length.
+
+The function of a derived signal is called as func(time_base_ms, *aligned_inputs) and must
+return an array with one value per time base sample.
+
+Usage:
+    registry.register_derived_signal(
+        "speed_error", ["target_speed", "current_speed"], lambda t, target, current: target - current
+    )
+"""
+
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.signal_validation import SignalValidationError
+
+logger = logging.getLogger(__name__)
+
+# Plugin name under which derived signals are registered
+DERIVED_PLUGIN_NAME = "DerivedSignals"
+
+# Supported input alignment modes
+# - interp: linear interpolation (numeric inputs), NaN outside the input's time range
+# - previous: sample-and-hold of the last known value (any dtype)
+# - nearest: value of the closest sample in time, the earlier one on ties (any dtype)
+ALIGN_MODES = ("interp", "previous", "nearest")
+
+
+class DerivedSignal:
+    """
+    Definition of a derived signal and its cached evaluation.
+
+    Attributes:
+        name (str): Name of the derived signal
+        inputs (List[str]): Names of the input signals, in the order passed to func
+        func (Callable): Vectorized function func(time_base_ms, *aligned_inputs) -> values
+        align (str): Input alignment mode, one of ALIGN_MODES
+        time_base (Optional[str]): Input whose timestamps are used as the time base;
+                                   None uses the union of all input timestamps
+        timestamps (Optional[np.ndarray]): Cached time base in milliseconds
+        values (Optional[np.ndarray]): Cached values, one per time base sample
+        cache_key (Optional[Tuple]): Input versions the cached values were computed from
+    """
+
+    def __init__(self, name: str, inputs: Sequence[str], func: Callable,
+                 align: str = "interp", time_base: Optional[str] = None):
+        self.name = name
+        self.inputs = list(inputs)
+        self.func = func
+        self.align = align
+        self.time_base = time_base
+
+        self.timestamps: Optional[np.ndarray] = None
+        self.values: Optional[np.ndarray] = None
+        self.cache_key: Optional[Tuple] = None
+
+
+def align_series(time_base: np.ndarray, timestamps: np.ndarray, values: np.ndarray,
+                 align: str = "interp") -> np.ndarray:
+    """
+    Resample a series onto a time base.
+
+    Args:
+        time_base (np.ndarray): Sorted target timestamps
+        timestamps (np.ndarray): Sorted timestamps of the series
+        values (np.ndarray): Values of the series
+        align (str): "interp" for linear interpolation, "previous" for sample-and-hold or
+                     "nearest" for the closest sample. Non-numeric values use "previous"
+                     instead of "interp".
+
+    Returns:
+        np.ndarray: The values at each time base sample. Samples before the first
+                    timestamp (and after the last one with "interp") are NaN for
+                    numeric values; "nearest" never produces NaN.
+    """
+    numeric = values.dtype.kind in "fiub"
+    if len(timestamps) == 0:
+        return np.full(len(time_base), np.nan)
+
+    if align == "nearest":
+        idx = np.clip(np.searchsorted(timestamps, time_base, side="left"), 1, len(timestamps) - 1)
+        if len(timestamps) == 1:
+            return values[np.zeros(len(time_base), dtype=np.intp)]
+        previous_closer = (time_base - timestamps[idx - 1]) <= (timestamps[idx] - time_base)
+        return values[np.where(previous_closer, idx - 1, idx)]
+
+    if align == "interp" and numeric:
+        return np.interp(time_base, timestamps, values.astype(np.float64), left=np.nan, right=np.nan)
+
+    idx = np.searchsorted(timestamps, time_base, side="right") - 1
+    before_start = idx < 0
+    aligned = values[np.maximum(idx, 0)]
+    if numeric and before_start.any():
+        aligned = aligned.astype(np.float64)
+        aligned[before_start] = np.nan
+    return aligned
+
+
+class DerivedSignalEngine:
+    """
+    Evaluates and caches derived signals registered in a SignalRegistry.
+
+    The engine also implements the plugin interface (signals, has_signal and
+    get_data_for_timestamp), so the PlotManager routes requests for derived signals to it
+    exactly like it does for any other plugin.
+    """
+
+    def __init__(self, registry: Any):
+        """
+        Initialize the engine.
+
+        Args:
+            registry: The SignalRegistry holding the input signal definitions and versions
+        """
+        self.registry = registry
+
+        # Derived signal definitions and caches, keyed by signal name
+        self.derived: Dict[str, DerivedSignal] = {}
+
+        # Plugin-style signal definitions: {"func", "series", "type", "inputs", ...}
+        self.signals: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, signal_name: str, inputs: Sequence[str], func: Callable,
+            signal_type: str = "temporal", align: str = "interp",
+            time_base: Optional[str] = None, **metadata) -> Dict[str, Any]:
+        """
+        Add a derived signal and build its signal definition.
+
+        Args:
+            signal_name: Name of the derived signal
+            inputs: Names of the input signals
+            func: Vectorized function func(time_base_ms, *aligned_inputs) -> values
+            signal_type: Signal type of the result
+            align: Input alignment mode, one of ALIGN_MODES
+            time_base: Optional input name whose timestamps form the time base
+            **metadata: Additional signal definition fields (description, units, ...)
+
+        Returns:
+            The signal definition, ready to be registered with the SignalRegistry
+
+        Raises:
+            SignalValidationError: If the definition is invalid
+        """
+        if not callable(func):
+            raise SignalValidationError(f"Derived signal '{signal_name}' does not have a valid callable function.")
+        if not inputs:
+            raise SignalValidationError(f"Derived signal '{signal_name}' must declare at least one input.")
+        if align not in ALIGN_MODES:
+            raise SignalValidationError(
+                f"Derived signal '{signal_name}' has unknown align mode '{align}'. Expected one of {ALIGN_MODES}."
+            )
+        if time_base is not None and time_base not in inputs:
+            raise SignalValidationError(
+                f"Derived signal '{signal_name}' uses time base '{time_base}' which is not one of its inputs."
+            )
+
+        self.derived[signal_name] = DerivedSignal(signal_name, inputs, func, align, time_base)
+        definition = dict(metadata)
+        definition.update({
+            "func": partial(self.value_at, signal_name),
+            "series": partial(self.get_series, signal_name),
+            "type": signal_type,
+            "inputs": list(inputs),
+            "derived": True,
+        })
+        self.signals[signal_name] = definition
+        return definition
+
+    def remove(self, signal_name: str) -> None:
+        """
+        Remove a derived signal and its cache.
+
+        Args:
+            signal_name: Name of the derived signal
+        """
+        self.derived.pop(signal_name, None)
+        self.signals.pop(signal_name, None)
+
+    def dependency_key(self, signal_name: str) -> Any:
+        """
+        Get the version key of a signal, including the versions of all its inputs.
+
+        Args:
+            signal_name: Name of the signal
+
+        Returns:
+            The signal's version for plain signals, or a nested tuple of versions for derived signals
+        """
+        version = self.registry.get_signal_version(signal_name)
+        derived = self.derived.get(signal_name)
+        if derived is None:
+            return version
+        return (version,) + tuple(self.dependency_key(name) for name in derived.inputs)
+
+    def get_series(self, signal_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the full series of a derived signal, evaluating it if any input changed.
+
+        Args:
+            signal_name: Name of the derived signal
+
+        Returns:
+            Tuple of (timestamps in milliseconds, values)
+        """
+        derived = self.derived[signal_name]
+        key = self.dependency_key(signal_name)
+        if derived.cache_key != key:
+            self._evaluate(derived)
+            derived.cache_key = key
+        return derived.timestamps, derived.values
+
+    def value_at(self, signal_name: str, timestamp: float) -> Optional[Any]:
+        """
+        Get the value of a derived signal at a timestamp (last sample at or before it).
+
+        Args:
+            signal_name: Name of the derived signal
+            timestamp: Timestamp in milliseconds
+
+        Returns:
+            The value as a Python scalar, or None if there is no value at the timestamp
+        """
+        timestamps, values = self.get_series(signal_name)
+        idx = np.searchsorted(timestamps, timestamp, side="right") - 1
+        if idx < 0:
+            return None
+
+        value = values[idx]
+        if values.dtype.kind == "f" and np.isnan(value):
+            return None
+        return value.item() if hasattr(value, "item") else value
+
+    def _input_series(self, signal_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch the full series of an input signal, sorted by timestamp.
+
+        Args:
+            signal_name: Name of the input signal
+
+        Returns:
+            Tuple of (timestamps in milliseconds as float64, values)
+
+        Raises:
+            SignalValidationError: If the input does not provide a series
+        """
+        if signal_name in self.derived:
+            return self.get_series(signal_name)
+
+        definition = self.registry.signals.get(signal_name, {})
+        series_func = definition.get("series")
+        if not callable(series_func):
+            raise SignalValidationError(f"Signal '{signal_name}' does not provide a 'series' function.")
+
+        timestamps, values = series_func()
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values)
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[order]
+        return timestamps, values
+
+    def _evaluate(self, derived: DerivedSignal) -> None:
+        """
+        Align the inputs of a derived signal and evaluate its function over the full time base.
+
+        Args:
+            derived: The derived signal to evaluate
+
+        Raises:
+            SignalValidationError: If the function does not return one value per time base sample
+        """
+        series = [self._input_series(name) for name in derived.inputs]
+
+        if derived.time_base is not None:
+            time_base = series[derived.inputs.index(derived.time_base)][0]
+        else:
+            time_base = np.unique(np.concatenate([timestamps for timestamps, _ in series]))
+
+        aligned = [align_series(time_base, timestamps, values, derived.align) for timestamps, values in series]
+
+        values = np.asarray(derived.func(time_base, *aligned))
+        if values.shape[:1] != time_base.shape:
+            raise SignalValidationError(
+                f"Derived signal '{derived.name}' returned {values.shape[:1]} values "
+                f"for a time base of {len(time_base)} samples."
+            )
+
+        derived.timestamps = time_base
+        derived.values = values
+        logger.debug(f"Evaluated derived signal '{derived.name}' over {len(time_base)} samples")
+
+    def has_signal(self, signal: str) -> bool:
+        """Check if the engine provides the requested derived signal."""
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal: str, timestamp: float) -> Optional[Any]:
+        """Fetch the value of a derived signal at a timestamp in milliseconds."""
+        if signal not in self.derived:
+            return None
+        return self.value_at(signal, timestamp)
+
+
+def difference(time_base_ms: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized a - b."""
+    return a - b
+
+
+def second_derivative(time_base_ms: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Vectorized second time derivative (per second squared), e.g. jerk from speed."""
+    if len(time_base_ms) < 3:
+        return np.full(len(time_base_ms), np.nan)
+    time_s = time_base_ms / 1000.0
+    return np.gradient(np.gradient(values, time_s), time_s)
+
+
+# Derived signals registered by default when all of their inputs are available
+DEFAULT_DERIVED_SIGNALS: Dict[str, Dict[str, Any]] = {
+    "speed_error": {
+        "inputs": ["target_speed", "current_speed"],
+        "func": difference,
+        "description": "target_speed - current_speed",
+    },
+    "steering_error": {
+        "inputs": ["target_steering_angle", "current_steering"],
+        "func": difference,
+        "description": "target_steering_angle - current_steering",
+    },
+    "jerk": {
+        "inputs": ["current_speed"],
+        "func": second_derivative,
+        "description": "Second time derivative of current_speed",
+        "units": "speed units / s^2",
+    },
+}
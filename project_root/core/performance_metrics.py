@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+"""
+Performance metrics for the Debug Player.
+
+Aggregates the spans recorded by core.tracing into live frame metrics: frames per second,
+request_data latency percentiles, and time breakdowns per plugin, per signal and per widget.
+Also estimates the memory held by each plugin and reads the resident memory of the process.
+
+The aggregator consumes only the events recorded since its last update, so it can be
+sampled periodically (e.g. by the performance HUD) at a cost proportional to the number of
+new events.
+"""
+
+import os
+import sys
+from collections import deque
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from core import tracing
+from core.cache_handler import data_cache
+
+# Number of most recent frames used for the latency percentiles
+LATENCY_WINDOW = 500
+
+# Time window used to compute frames per second [s]
+FPS_WINDOW_S = 2.0
+
+
+class PerformanceMetrics:
+    """
+    Live aggregation of tracing spans.
+
+    Attributes:
+        latencies_ms (deque): request_data durations of the most recent frames [ms]
+        frame_times_ns (deque): Start times of the frames within the FPS window [ns]
+        plugin_times (Dict[str, List[float]]): {plugin span name: [calls, total ms]}
+        signal_times (Dict[str, List[float]]): {signal: [calls, total ms]} of plugin calls
+        widget_times (Dict[str, List[float]]): {widget span name: [calls, total ms]}
+    """
+
+    def __init__(self):
+        self._cursor = 0
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self.frame_times_ns = deque()
+        self.plugin_times: Dict[str, List[float]] = {}
+        self.signal_times: Dict[str, List[float]] = {}
+        self.widget_times: Dict[str, List[float]] = {}
+
+    def reset(self) -> None:
+        """Drop all aggregated metrics (new events are still read from the current position)."""
+        self.latencies_ms.clear()
+        self.frame_times_ns.clear()
+        self.plugin_times.clear()
+        self.signal_times.clear()
+        self.widget_times.clear()
+
+    def update(self) -> int:
+        """
+        Aggregate the events recorded since the last update.
+
+        Returns:
+            The number of new events
+        """
+        events, self._cursor = tracing.read_raw_events(self._cursor)
+        for phase, name, category, start_ns, duration_ns, _, args in events:
+            if phase != "X":
+                continue
+            duration_ms = duration_ns / 1e6
+            if category == "frame":
+                self.latencies_ms.append(duration_ms)
+                self.frame_times_ns.append(start_ns)
+            elif category == "plugin":
+                _accumulate(self.plugin_times, name, duration_ms)
+                _accumulate(self.signal_times, args.get("signal", "?"), duration_ms)
+            elif category == "widget":
+                _accumulate(self.widget_times, name, duration_ms)
+
+        if self.frame_times_ns:
+            horizon = self.frame_times_ns[-1] - FPS_WINDOW_S * 1e9
+            while self.frame_times_ns and self.frame_times_ns[0] < horizon:
+                self.frame_times_ns.popleft()
+        return len(events)
+
+    @property
+    def fps(self) -> Optional[float]:
+        """Frames per second over the FPS window, None before two frames were seen."""
+        if len(self.frame_times_ns) < 2:
+            return None
+        elapsed_s = (self.frame_times_ns[-1] - self.frame_times_ns[0]) / 1e9
+        return (len(self.frame_times_ns) - 1) / elapsed_s if elapsed_s > 0 else None
+
+    def latency_percentiles(self) -> Optional[Dict[str, float]]:
+        """
+        Get the request_data latency percentiles over the most recent frames.
+
+        Returns:
+            {"p50": ms, "p99": ms}, or None before the first frame
+        """
+        if not self.latencies_ms:
+            return None
+        p50, p99 = np.percentile(np.fromiter(self.latencies_ms, dtype=np.float64), [50, 99])
+        return {"p50": float(p50), "p99": float(p99)}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all metrics as a dictionary.
+
+        Returns:
+            Dictionary with fps, latency, plugins, signals and widgets
+            ({name: {"calls", "total_ms", "mean_ms"}}), cache_hit_rate and rss_bytes
+        """
+        return {
+            "fps": self.fps,
+            "latency": self.latency_percentiles(),
+            "plugins": _table(self.plugin_times),
+            "signals": _table(self.signal_times),
+            "widgets": _table(self.widget_times),
+            "cache_hit_rate": data_cache.stats()["hit_rate"],
+            "rss_bytes": resident_memory(),
+        }
+
+
+def _accumulate(table: Dict[str, List[float]], key: str, duration_ms: float) -> None:
+    entry = table.get(key)
+    if entry is None:
+        table[key] = [1, duration_ms]
+    else:
+        entry[0] += 1
+        entry[1] += duration_ms
+
+
+def _table(table: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """Convert accumulated [calls, total] entries, sorted by total time (descending)."""
+    rows = sorted(table.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        name: {"calls": int(calls), "total_ms": total, "mean_ms": total / calls}
+        for name, (calls, total) in rows
+    }
+
+
+def resident_memory() -> Optional[int]:
+    """
+    Get the resident memory of the process in bytes.
+
+    Returns:
+        The current RSS on Linux, the peak RSS elsewhere, or None if unavailable
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def estimate_memory(obj: Any, max_depth: int = 3, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the memory held by an object's data: numpy arrays, polars and pandas frames,
+    followed through attributes, dicts, lists and tuples up to max_depth levels.
+
+    Objects are counted once, even if they are reachable from several places. Plain Python
+    objects other than containers are not counted, so the result is a lower bound dominated
+    by the loaded trip data.
+
+    Args:
+        obj: The object, e.g. a plugin instance
+        max_depth: Maximum depth of attribute/container traversal
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or obj is None or isinstance(obj, (str, bytes, int, float, bool)):
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.base is None or id(obj.base) not in seen else 0
+    estimated_size = getattr(obj, "estimated_size", None)  # polars DataFrame / Series
+    if callable(estimated_size) and type(obj).__module__.startswith("polars"):
+        return int(estimated_size())
+    memory_usage = getattr(obj, "memory_usage", None)  # pandas DataFrame / Series
+    if callable(memory_usage) and type(obj).__module__.startswith("pandas"):
+        usage = memory_usage(deep=False)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+
+    if max_depth <= 0:
+        return 0
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        children = obj
+    elif hasattr(obj, "__dict__") and not callable(obj):
+        children = vars(obj).values()
+    else:
+        return 0
+    return sum(estimate_memory(child, max_depth - 1, seen) for child in children)
+
+
+def plugin_memory(plugins: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Estimate the memory held by each plugin.
+
+    Data shared between plugins (e.g. the same cached frame) is attributed to the first
+    plugin that references it.
+
+    Args:
+        plugins: {plugin name: plugin instance}
+
+    Returns:
+        {plugin name: estimated bytes}
+    """
+    seen: Set[int] = set()
+    return {name: estimate_memory(plugin, _seen=seen) for name, plugin in plugins.items()}
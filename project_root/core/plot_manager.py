@@ -1,9 +1,36 @@
 import os
 import sys
-from PySide6.QtCore import Slot
+import time
+from PySide6.QtCore import QObject, Signal, Slot
 import importlib.util
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from gui.custom_plot_widget import TemporalPlotWidget_plt, SpatialPlotWidget, TemporalPlotWidget_pg   
 from core.config import temporal_signal_axes
+from core.signal_validation import SignalDataValidator, SignalValidationError
+from core.signal_registry import SignalRegistry
+from core.derived_signals import DERIVED_PLUGIN_NAME, DEFAULT_DERIVED_SIGNALS, difference
+from core.trip_comparison import (ComparisonPlugin, PathDivergencePlugin, PATH_DIVERGENCE_PLUGIN_NAME,
+                                  comparison_name, diff_name, base_signal_name, trip_start_ms)
+from core import tracing
+
+
+class GuiThreadDispatcher(QObject):
+    """Runs callables in the thread that created it (the GUI thread), whichever thread dispatches them."""
+    dispatched = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.dispatched.connect(self._call)
+
+    @Slot(object)
+    def _call(self, func):
+        func()
+
+    def dispatch(self, func):
+        """Queue func to run in the thread of the dispatcher (at once if called from it)."""
+        self.dispatched.emit(func)
+
 
 class PlotManager:
     """
@@ -38,19 +65,44 @@ class PlotManager:
         # Format: {plugin_name: plugin_instance}
         self.plugins = {}  
         
-        # Dictionary mapping signals to their source plugin and metadata
-        # Format: {signal_name: {"plugin": plugin_name, "func": callable, "type": signal_type, ...}}
-        self.signal_plugins = {}  
+        # Source file and constructor arguments of plugins loaded from files, for hot reload
+        # Format: {plugin_name: (file_path, plugin_args)}
+        self.plugin_sources = {}
+        
+        # Single registry of all signals: definitions, indexes, subscribers and derived signals.
+        # self.signal_plugins is a view of self.signal_registry.signals
+        self.signal_registry = SignalRegistry()
         
         # Tracks signal types for type checking and validation
         self.signal_types = {}  
         
+        # Timestamp of the last request_data call
+        self.current_timestamp = None
+        
+        # Optional runtime check of plugin return values against the signal data contract
+        # (see core.signal_validation). None means no checking.
+        self.data_validator = None
+        
         # Central widget instances for each visualization type
         # Note: In future versions, these could be dynamically created based on need
         self.temporal_plot_widget = TemporalPlotWidget_pg()  # For time-based signals
         self.spatial_plot_widget = SpatialPlotWidget()      # For spatial data (2D/3D)
+        
+        # Hands results of background work (e.g. the path divergence) back to the GUI thread
+        self.gui_dispatcher = GuiThreadDispatcher()
 
 
+    @property
+    def signal_plugins(self):
+        """
+        Dictionary mapping signals to their source plugin and metadata.
+        
+        Format: {signal_name: {"plugin": plugin_name, "func": callable, "type": signal_type, ...}}
+        This is the signal table of self.signal_registry, not a copy.
+        """
+        return self.signal_registry.signals
+
+    
     def register_plugin(self, plugin_name, plugin_instance):
         """
         Register a plugin that provides data for signals.
@@ -74,7 +126,7 @@ class PlotManager:
         
         # Import signal validation after ensuring the plugin is valid
         # This avoids circular imports
-        from core.signal_validation import validate_signal_definition, check_required_signal_fields, SignalValidationError
+        from core.signal_validation import check_required_signal_fields
         
         # Count registered signals for summary
         registered_signals = []
@@ -83,8 +135,8 @@ class PlotManager:
         # Register each signal provided by the plugin
         for signal, signal_info in plugin_instance.signals.items():
             try:
-                # Validate and normalize the signal definition
-                normalized_signal = validate_signal_definition(signal, signal_info, plugin_name)
+                # Validate, normalize and register the signal definition
+                self.signal_registry.register_signal(signal, signal_info, plugin_name)
                 
                 # Check for missing required fields
                 missing_fields = check_required_signal_fields(signal, signal_info, plugin_name)
@@ -93,8 +145,6 @@ class PlotManager:
                         f"Signal '{signal}' is missing required fields: {', '.join(missing_fields)}"
                     )
                 
-                # Store the normalized signal in signal_plugins
-                self.signal_plugins[signal] = normalized_signal
                 registered_signals.append(signal)
                 
             except SignalValidationError as e:
@@ -109,6 +159,116 @@ class PlotManager:
             print(f"\033[93mWarning: {warning}\033[0m")
 
     
+    def register_derived_signal(self, signal_name, inputs, func, signal_type="temporal", **options):
+        """
+        Register a signal computed from other signals by a vectorized function.
+        
+        The derived signal is served by the DerivedSignalEngine of the signal registry, which
+        is registered as a plugin, so the signal can be plotted like any other signal.
+        
+        Args:
+            signal_name (str): Name of the derived signal.
+            inputs (list): Names of the input signals.
+            func (callable): Vectorized function func(time_base_ms, *aligned_inputs) -> values.
+            signal_type (str): Signal type of the result. Defaults to "temporal".
+            **options: align / time_base options and additional metadata fields.
+            
+        Returns:
+            bool: True if the derived signal was registered, False otherwise.
+        """
+        try:
+            normalized_signal = self.signal_registry.register_derived_signal(
+                signal_name, inputs, func, signal_type, **options
+            )
+        except SignalValidationError as e:
+            print(f"\033[95mError: {str(e)}\033[0m")
+            return False
+        
+        self._add_derived_signal(signal_name, normalized_signal)
+        return True
+
+    
+    def register_expression_signal(self, signal_name, expression):
+        """
+        Register a signal defined by an expression over other signals.
+        
+        Example expressions: "abs(current_steering - target_steering_angle) > 5",
+        "rolling_mean(current_speed, 1s)". See core.signal_expressions for the syntax.
+        
+        Args:
+            signal_name (str): Name of the new signal.
+            expression (str): The expression to compile.
+            
+        Returns:
+            bool: True if the signal was registered, False otherwise.
+        """
+        try:
+            normalized_signal = self.signal_registry.register_expression_signal(signal_name, expression)
+        except SignalValidationError as e:
+            print(f"\033[95mError: {str(e)}\033[0m")
+            return False
+        
+        self._add_derived_signal(signal_name, normalized_signal)
+        return True
+
+    
+    def register_expression_signals(self, expressions):
+        """
+        Register several expression signals, e.g. from core.config.expression_signals.
+        
+        Args:
+            expressions (dict): Mapping of signal name to expression string.
+            
+        Returns:
+            list: Names of the registered signals.
+        """
+        return [name for name, expression in expressions.items()
+                if self.register_expression_signal(name, expression)]
+
+    
+    def _add_derived_signal(self, signal_name, normalized_signal):
+        """Route requests for a signal registered by the derived signal engine to the engine."""
+        self.plugins[DERIVED_PLUGIN_NAME] = self.signal_registry.derived_engine
+        print(f"\033[92m Registered derived signal \033[0m'{signal_name}' from {normalized_signal['inputs']}")
+
+    
+    def register_default_derived_signals(self):
+        """
+        Register the derived signals of DEFAULT_DERIVED_SIGNALS whose inputs are all available.
+        
+        Returns:
+            list: Names of the registered derived signals.
+        """
+        registered = []
+        for signal_name, definition in DEFAULT_DERIVED_SIGNALS.items():
+            options = dict(definition)
+            inputs = options.pop("inputs")
+            func = options.pop("func")
+            if not all(name in self.signal_plugins for name in inputs):
+                continue
+            if self.register_derived_signal(signal_name, inputs, func, **options):
+                registered.append(signal_name)
+        return registered
+
+    
+    def enable_data_validation(self, mode="warn"):
+        """
+        Check every value returned by plugins against the signal data contract.
+        
+        In "warn" mode each plugin signal that returns a slow (non-contract) type is logged
+        once and recorded in `self.data_validator.violations`; in "strict" mode a
+        SignalValidationError is raised instead. "off" disables the checks.
+        
+        Args:
+            mode (str): The validation mode: "off", "warn" or "strict".
+            
+        Returns:
+            SignalDataValidator: The validator used by request_data.
+        """
+        self.data_validator = SignalDataValidator(mode)
+        return self.data_validator
+
+    
     def load_plugins_from_directory(self, directory_path, plugin_args=None):
         """
         Dynamically discover and load plugins from the given directory.
@@ -127,6 +287,127 @@ class PlotManager:
                 self.load_plugin_from_file(module_name, module_path, plugin_args)
     
     
+    def load_comparison_plugins_from_directory(self, directory_path, trip_a, trip_b, time_offset_s=0.0, max_workers=None):
+        """
+        Load the plugins of a directory for two trips concurrently, for A/B comparison.
+        
+        Every plugin is instantiated once per trip in a thread pool, so the trips (and the
+        plugins of each trip) load in parallel. Trip A plugins are registered as usual. Trip B
+        plugins are registered as "<plugin> [B]" with their signals suffixed by " [B]" and
+        aligned to the start of trip A (see core.trip_comparison).
+        
+        Args:
+            directory_path (str): The path to the directory containing plugin files.
+            trip_a (str): Path of the reference trip.
+            trip_b (str): Path of the compared trip.
+            time_offset_s (float): Additional shift of trip B in seconds: at a given relative
+                time t, trip B is shown at t + time_offset_s.
+            max_workers (int, optional): Size of the thread pool. Defaults to the executor default.
+            
+        Returns:
+            float: The offset applied to trip B requests [ms] (trip B time minus trip A time).
+        """
+        modules = [(filename[:-3], os.path.join(directory_path, filename))
+                   for filename in sorted(os.listdir(directory_path))
+                   if filename.endswith(".py") and filename != "__init__.py"]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                (trip, module_name): pool.submit(self._instantiate_plugin, module_name, file_path, {"file_path": trip_path})
+                for trip, trip_path in (("A", trip_a), ("B", trip_b))
+                for module_name, file_path in modules
+            }
+            instances = {key: future.result() for key, future in futures.items()}
+        
+        plugins_a = {name: instances[("A", name)] for name, _ in modules if instances[("A", name)] is not None}
+        plugins_b = {name: instances[("B", name)] for name, _ in modules if instances[("B", name)] is not None}
+        
+        start_a, start_b = trip_start_ms(plugins_a), trip_start_ms(plugins_b)
+        offset_ms = time_offset_s * 1000.0
+        if start_a is not None and start_b is not None:
+            offset_ms += start_b - start_a
+        else:
+            print(f"\033[93mWarning: Could not determine the trip start times, comparing on absolute timestamps.\033[0m")
+        
+        for module_name, file_path in modules:
+            if module_name in plugins_a:
+                self.plugin_sources[module_name] = (file_path, {"file_path": trip_a})
+                self.register_plugin(module_name, plugins_a[module_name])
+            if module_name in plugins_b:
+                self.register_plugin(comparison_name(module_name), ComparisonPlugin(plugins_b[module_name], offset_ms))
+        return offset_ms
+    
+    
+    def register_comparison_diff_signals(self):
+        """
+        Register an A - B derived signal for every temporal signal available in both trips.
+        
+        The difference is evaluated vectorized over the timestamps of the trip A signal, with
+        the trip B signal interpolated onto them.
+        
+        Returns:
+            list: Names of the registered difference signals.
+        """
+        registered = []
+        for signal in list(self.signal_plugins):
+            signal_b = comparison_name(signal)
+            signal_info = self.signal_plugins[signal]
+            if (base_signal_name(signal) != signal or signal_b not in self.signal_plugins
+                    or signal_info["type"] != "temporal" or not callable(signal_info.get("series"))):
+                continue
+            if self.register_derived_signal(diff_name(signal), [signal, signal_b], difference, time_base=signal):
+                registered.append(diff_name(signal))
+        return registered
+    
+    
+    def register_path_divergence_signals(self, max_workers=1):
+        """
+        Register the divergence between the planned paths of both trips as temporal signals.
+        
+        Looks for a trip A plugin holding a path_trajectory whose trip B counterpart is loaded,
+        and registers a PathDivergencePlugin for them (see core.trip_comparison). The comparison
+        starts at once in a background thread; when it is done, refresh_signals updates the
+        statistics and plots of the divergence signals in the GUI thread.
+        
+        Args:
+            max_workers (int): Worker processes of the path comparison.
+            
+        Returns:
+            list: Names of the registered divergence signals.
+        """
+        for plugin_name, plugin in list(self.plugins.items()):
+            comparison = self.plugins.get(comparison_name(plugin_name))
+            if getattr(plugin, "path_trajectory", None) is None or not isinstance(comparison, ComparisonPlugin):
+                continue
+            path_trajectory_b = getattr(comparison.plugin, "path_trajectory", None)
+            if path_trajectory_b is None:
+                continue
+            divergence = PathDivergencePlugin(plugin.path_trajectory, path_trajectory_b, comparison.offset_ms, max_workers)
+            divergence.on_ready = partial(self.gui_dispatcher.dispatch, partial(self.refresh_signals, list(divergence.signals)))
+            self.register_plugin(PATH_DIVERGENCE_PLUGIN_NAME, divergence)
+            divergence.start_comparison()
+            return list(divergence.signals)
+        return []
+    
+    
+    def refresh_signals(self, signals):
+        """
+        Take in new data of signals whose plugin computed them in the background.
+        
+        The signals are invalidated (derived signals depending on them are recomputed), the
+        statistics of the plotted ones are recomputed and the current timestamp is requested again.
+        
+        Args:
+            signals (list): Names of the signals with new data.
+        """
+        for signal in signals:
+            self.signal_registry.invalidate_signal(signal)
+            if signal in self.signals and self.signal_plugins[signal]["type"] in ("temporal", "boolean"):
+                self.temporal_plot_widget.set_signal_statistics(signal, self.signal_registry.get_signal_statistics(signal))
+        if self.current_timestamp is not None:
+            self.request_data(self.current_timestamp)
+    
+    
     def load_plugin_from_file(self, module_name, file_path, plugin_args=None):
         """
         Load a plugin from a specified Python file.
@@ -147,7 +428,20 @@ class PlotManager:
         if plugin_args is None:
             plugin_args = {}  # Ensure there's a default empty argument dict
             # TODO: Allow loading different arguments for different plugins
-            
+        
+        plugin_instance = self._instantiate_plugin(module_name, file_path, plugin_args)
+        if plugin_instance is not None:
+            self.plugin_sources[module_name] = (file_path, plugin_args)
+            self.register_plugin(module_name, plugin_instance)
+    
+    
+    def _instantiate_plugin(self, module_name, file_path, plugin_args):
+        """
+        Execute a plugin module and instantiate its `plugin_class`.
+        
+        Returns:
+            The plugin instance, or None if the module does not define `plugin_class`.
+        """
         ### Creating a Module Specification-  returns a ModuleSpec object,
         # which contains all the information needed to load the module, such as its name, location, and loader.
         spec = importlib.util.spec_from_file_location(module_name, file_path)
@@ -161,11 +455,63 @@ class PlotManager:
             plugin_class = module.plugin_class
             
             # Pass arguments when instantiating the plugin
-            plugin_instance = plugin_class(**plugin_args)
+            return plugin_class(**plugin_args)
+        
+        print(f"No 'Plugin' class found in {module_name}")
+        return None
+    
+    
+    def reload_plugin(self, plugin_name):
+        """
+        Re-execute a plugin's module and replace the running instance, keeping the loaded trip data.
+        
+        Data loaders cache decoded files in the process-wide data cache (core.cache_handler),
+        so the new instance reuses the already-parsed trip instead of reading it again.
+        The plugin's signals are re-registered in place: plots keep their signals, derived
+        signals and statistics are recomputed, signals the plugin no longer provides are
+        removed, and the current frame is requested again.
+        
+        Args:
+            plugin_name (str): Name of a plugin loaded with load_plugin_from_file.
             
-            self.register_plugin(module_name, plugin_instance)
-        else:
-            print(f"No 'Plugin' class found in {module_name}")
+        Returns:
+            bool: True if the plugin was reloaded, False otherwise.
+        """
+        if plugin_name not in self.plugin_sources:
+            print(f"\033[95mError: Plugin '{plugin_name}' was not loaded from a file and cannot be reloaded.\033[0m")
+            return False
+        
+        file_path, plugin_args = self.plugin_sources[plugin_name]
+        start = time.perf_counter()
+        try:
+            plugin_instance = self._instantiate_plugin(plugin_name, file_path, plugin_args)
+        except Exception as e:
+            # Keep the running instance if the edited plugin is broken
+            print(f"\033[95mError: Reloading plugin '{plugin_name}' failed: {e}\033[0m")
+            return False
+        if plugin_instance is None:
+            return False
+        
+        previous_signals = set(self.signal_registry.get_signals_by_plugin(plugin_name))
+        del self.plugins[plugin_name]
+        self.register_plugin(plugin_name, plugin_instance)
+        
+        for signal in previous_signals - set(plugin_instance.signals):
+            self.signal_registry.unregister_signal(signal)
+            # Take the signal off its plots, so it is neither requested nor drawn anymore
+            for plot_widget in self.signals.pop(signal, []):
+                plot_widget.unregister_signal(signal)
+        
+        # Refresh the statistics of plotted signals from the new instance
+        for signal in self.signal_registry.get_signals_by_plugin(plugin_name):
+            if signal in self.signals and self.signal_plugins[signal]["type"] in ("temporal", "boolean"):
+                self.temporal_plot_widget.set_signal_statistics(signal, self.signal_registry.get_signal_statistics(signal))
+        
+        if self.current_timestamp is not None:
+            self.request_data(self.current_timestamp)
+        
+        print(f"\033[92mReloaded plugin '{plugin_name}' in {time.perf_counter() - start:.3f}s\033[0m")
+        return True
            
                     
     def register_plot(self, signal):
@@ -183,11 +529,21 @@ class PlotManager:
         signal_type = signal_info["type"]
         
         # Create the appropriate plot widget based on signal type
-        if signal_type == "temporal":
+        # Boolean signals are plotted as 0/1 steps on the temporal widget
+        if signal_type in ("temporal", "boolean"):
             # Get the specified axes for the signal, or default to ["ax1"] if not specified
-            plots = temporal_signal_axes.get(signal, ["plot1"])  
+            # Signals of a compared trip (and their differences) share the plots of the trip A signal
+            plots = temporal_signal_axes.get(base_signal_name(signal), ["plot1"])  
             for plot_name in plots:
                 self.temporal_plot_widget.register_signal(signal, plot_name)            
+            
+            # Precomputed statistics drive the y-autoscale and flag sparse signals
+            statistics = self.signal_registry.get_signal_statistics(signal)
+            self.temporal_plot_widget.set_signal_statistics(signal, statistics)
+            if statistics is not None and statistics.is_sparse:
+                rate = statistics.sample_rate_hz
+                rate_text = f"{rate:.2f} Hz" if rate else "n/a"
+                print(f"\033[93mWarning: Signal '{signal}' is sparse ({statistics.count} samples, rate {rate_text}).\033[0m")
         elif signal_type == "spatial":
             self.spatial_plot_widget.register_signal(signal)
         else:
@@ -198,7 +554,7 @@ class PlotManager:
             self.signals[signal] = []
             
         # Assuming here that self.temporal_plot_widget or self.spatial_plot_widget should be the "plot" references
-        if signal_type == "temporal":
+        if signal_type in ("temporal", "boolean"):
             self.signals[signal].append(self.temporal_plot_widget)
         elif signal_type == "spatial":
             self.signals[signal].append(self.spatial_plot_widget)
@@ -216,30 +572,37 @@ class PlotManager:
         Args:
             timestamp (int): The timestamp for which to request data.
         """
-        print(f"Requesting data for timestamp {timestamp}")
-        for signal, plot_list in self.signals.items(): # Iterate over all registered signals
-            # Fetch data for each signal from all plugins that provide it
-            signal_info = self.signal_plugins.get(signal) # Get the plugin info for the signal
-            if not signal_info:
-                        print(f"\033[93mWarning: No plugin found for signal '{signal}'\033[0m")
-                        continue
+        self.current_timestamp = timestamp
+        with tracing.span("request_data", "frame", timestamp=timestamp, signals=len(self.signals)):
+            for signal, plot_list in self.signals.items(): # Iterate over all registered signals
+                # Fetch data for each signal from all plugins that provide it
+                signal_info = self.signal_plugins.get(signal) # Get the plugin info for the signal
+                if not signal_info:
+                    print(f"\033[93mWarning: No plugin found for signal '{signal}'\033[0m")
+                    continue
+                        
+                # Fetch the plugin instance for the signal
+                plugin_name = signal_info["plugin"]
+                plugin = self.plugins.get(plugin_name) # Get the plugin instance
+                if plugin and plugin.has_signal(signal):
+                    # Fetch data for this signal at the given timestamp
+                    with tracing.span(f"plugin:{plugin_name}", "plugin", signal=signal):
+                        data = plugin.get_data_for_timestamp(signal, timestamp)
                     
-            # Fetch the plugin instance for the signal
-            plugin_name = signal_info["plugin"]
-            plugin = self.plugins.get(plugin_name) # Get the plugin instance
-            if plugin and plugin.has_signal(signal):
-                # Fetch data for this signal at the given timestamp
-                data = plugin.get_data_for_timestamp(signal, timestamp)
-
-                # Update the correct plot widget
-                if signal_info["type"] == "temporal":
-                    # Send data to TemporalPlotWidget
-                    self.temporal_plot_widget.update_data(signal, data, timestamp)
-                elif signal_info["type"] == "spatial":
-                    # Send data to SpatialPlotWidget
-                    self.spatial_plot_widget.update_data(signal, data)
-            else:
-                print(f"\033[95mError: Plugin '{plugin_name}' for signal '{signal}' not found.\033[0m")
+                    if self.data_validator is not None:
+                        self.data_validator.check(signal, data, signal_info.get("type", "temporal"), plugin_name)
+    
+                    # Update the correct plot widget
+                    if signal_info["type"] in ("temporal", "boolean"):
+                        # Send data to TemporalPlotWidget
+                        with tracing.span("widget:temporal", "widget", signal=signal):
+                            self.temporal_plot_widget.update_data(signal, data, timestamp)
+                    elif signal_info["type"] == "spatial":
+                        # Send data to SpatialPlotWidget
+                        with tracing.span("widget:spatial", "widget", signal=signal):
+                            self.spatial_plot_widget.update_data(signal, data)
+                else:
+                    print(f"\033[95mError: Plugin '{plugin_name}' for signal '{signal}' not found.\033[0m")
 
                         
     def assign_signal_to_plot(self, plot_widget, signal):
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Signal Expressions for the Debug Player.
+
+This module compiles small expressions over signal names, such as
+
+    abs(current_steering - target_steering_angle) > 5
+    rolling_mean(current_speed, 1s)
+
+into polars expressions. An expression is evaluated once over the aligned timeline of its
+input signals (see core.derived_signals) in a polars lazy query, so the work runs in native,
+multithreaded code instead of in Python per sample. The result is registered as a derived
+signal: comparisons and logical operators give a boolean signal, everything else a
+temporal signal.
+
+Supported syntax:
+- signal names, numbers and durations (e.g. 500ms, 1s, 2.5s, 1min)
+- dotted signal names (e.g. cruise_control.target_speed from the GenericCsvPlugin)
+- any other signal name in backticks, e.g. `current_speed [B]` or `current_speed [A-B]`
+- arithmetic: + - * / % ** and unary -
+- comparisons: > >= < <= == != (chained comparisons are supported)
+- logic: and, or, not
+- functions: see EXPRESSION_FUNCTIONS
+
+Usage:
+    compiled = compile_expression("abs(current_steering - target_steering_angle) > 5")
+    compiled.inputs       # ('current_steering', 'target_steering_angle')
+    compiled.signal_type  # 'boolean'
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+import polars as pl
+
+from core.signal_validation import SignalValidationError
+
+# Name of the timeline column in the evaluation frame [ms]
+TIME_COLUMN = "__t_ms"
+
+# Duration literals: number followed by a unit, converted to milliseconds
+_DURATION_UNITS_MS = {"ms": 1.0, "s": 1000.0, "min": 60000.0}
+_DURATION_PATTERN = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)(ms|s|min)\b")
+_DURATION_FUNC = "__duration_ms__"
+
+# Quoted signal names: any text but a backtick, in backticks
+_QUOTED_SIGNAL_PATTERN = re.compile(r"`([^`]+)`")
+_QUOTED_SIGNAL_FUNC = "__signal__"
+
+
+class SignalExpressionError(SignalValidationError):
+    """Exception raised when a signal expression cannot be parsed or compiled."""
+    pass
+
+
+class Duration(NamedTuple):
+    """A time window in milliseconds, as written in an expression (e.g. 1s)."""
+    milliseconds: float
+
+
+class CompiledExpression(NamedTuple):
+    """
+    A signal expression compiled to a polars expression.
+
+    Attributes:
+        text (str): The original expression string
+        expr (pl.Expr): The polars expression over the input columns and TIME_COLUMN
+        inputs (Tuple[str, ...]): Input signal names in order of first appearance
+        signal_type (str): "boolean" or "temporal"
+    """
+    text: str
+    expr: pl.Expr
+    inputs: Tuple[str, ...]
+    signal_type: str
+
+
+def _rolling(method: str) -> Callable:
+    """Build a time-based rolling window function, e.g. rolling_mean(x, 1s)."""
+    def rolling(expr: pl.Expr, window: Any) -> pl.Expr:
+        if not isinstance(window, Duration):
+            raise SignalExpressionError(f"rolling_{method}() expects a duration window such as 1s, got {window!r}")
+        window_size = f"{max(int(round(window.milliseconds)), 1)}i"
+        return getattr(expr, f"rolling_{method}_by")(pl.col(TIME_COLUMN), window_size=window_size)
+    return rolling
+
+
+def _derivative(expr: pl.Expr) -> pl.Expr:
+    """Time derivative per second using backward differences."""
+    return expr.diff() / (pl.col(TIME_COLUMN).diff().cast(pl.Float64) / 1000.0)
+
+
+# Functions available in expressions: name -> (number of arguments, builder)
+EXPRESSION_FUNCTIONS: Dict[str, Tuple[int, Callable]] = {
+    "abs": (1, lambda x: x.abs()),
+    "sqrt": (1, lambda x: x.sqrt()),
+    "min": (2, lambda a, b: pl.min_horizontal(a, b)),
+    "max": (2, lambda a, b: pl.max_horizontal(a, b)),
+    "diff": (1, lambda x: x.diff()),
+    "derivative": (1, _derivative),
+    "rolling_mean": (2, _rolling("mean")),
+    "rolling_min": (2, _rolling("min")),
+    "rolling_max": (2, _rolling("max")),
+    "rolling_sum": (2, _rolling("sum")),
+    "rolling_std": (2, _rolling("std")),
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+}
+
+
+def _replace_durations(text: str) -> str:
+    """Rewrite duration literals (1s, 500ms, 1min) into calls understood by the compiler."""
+    def to_call(match):
+        milliseconds = float(match.group(1)) * _DURATION_UNITS_MS[match.group(2)]
+        return f"{_DURATION_FUNC}({milliseconds!r})"
+    return _DURATION_PATTERN.sub(to_call, text)
+
+
+def _replace_quoted_signals(text: str) -> Tuple[str, List[str]]:
+    """Rewrite backtick-quoted signal names into calls understood by the compiler.
+
+    Returns the rewritten text and the quoted names; the calls refer to the names by index, so
+    the names are not seen by the duration rewriting or the parser.
+    """
+    names: List[str] = []
+
+    def to_call(match):
+        names.append(match.group(1))
+        return f"{_QUOTED_SIGNAL_FUNC}({len(names) - 1})"
+    return _QUOTED_SIGNAL_PATTERN.sub(to_call, text), names
+
+
+class _ExpressionCompiler:
+    """Walks a Python AST and builds the equivalent polars expression."""
+
+    def __init__(self, text: str, quoted_signals: List[str] = ()):
+        self.text = text
+        self.quoted_signals = list(quoted_signals)
+        self.inputs: List[str] = []
+
+    def compile(self, node: ast.AST) -> Any:
+        method = getattr(self, f"_compile_{type(node).__name__}", None)
+        if method is None:
+            raise SignalExpressionError(f"Unsupported syntax '{type(node).__name__}' in expression: {self.text}")
+        return method(node)
+
+    def _compile_Expression(self, node: ast.Expression) -> Any:
+        return self.compile(node.body)
+
+    def _signal(self, name: str) -> pl.Expr:
+        if name not in self.inputs:
+            self.inputs.append(name)
+        return pl.col(name)
+
+    def _compile_Name(self, node: ast.Name) -> pl.Expr:
+        return self._signal(node.id)
+
+    def _compile_Attribute(self, node: ast.Attribute) -> pl.Expr:
+        # a.b.c is the dotted signal name "a.b.c"
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            raise SignalExpressionError(f"Unsupported attribute access in expression: {self.text}")
+        parts.append(node.id)
+        return self._signal(".".join(reversed(parts)))
+
+    def _compile_Constant(self, node: ast.Constant) -> Any:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise SignalExpressionError(f"Unsupported constant {node.value!r} in expression: {self.text}")
+        return pl.lit(node.value)
+
+    def _compile_BinOp(self, node: ast.BinOp) -> pl.Expr:
+        operator = _BINARY_OPERATORS.get(type(node.op))
+        if operator is None:
+            raise SignalExpressionError(f"Unsupported operator '{type(node.op).__name__}' in expression: {self.text}")
+        return operator(self._operand(node.left), self._operand(node.right))
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> pl.Expr:
+        operand = self._operand(node.operand)
+        if isinstance(node.op, ast.USub):
+            return -operand
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.Not):
+            return ~operand.cast(pl.Boolean)
+        raise SignalExpressionError(f"Unsupported operator '{type(node.op).__name__}' in expression: {self.text}")
+
+    def _compile_Compare(self, node: ast.Compare) -> pl.Expr:
+        result = None
+        left = self._operand(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            operator = _COMPARE_OPERATORS.get(type(op))
+            if operator is None:
+                raise SignalExpressionError(f"Unsupported comparison '{type(op).__name__}' in expression: {self.text}")
+            right = self._operand(comparator)
+            comparison = operator(left, right)
+            result = comparison if result is None else result & comparison
+            left = right
+        return result
+
+    def _compile_BoolOp(self, node: ast.BoolOp) -> pl.Expr:
+        values = [self._operand(value).cast(pl.Boolean) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = result & value if isinstance(node.op, ast.And) else result | value
+        return result
+
+    def _compile_Call(self, node: ast.Call) -> Any:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise SignalExpressionError(f"Only plain function calls are supported in expression: {self.text}")
+
+        name = node.func.id
+        if name == _DURATION_FUNC:
+            return Duration(node.args[0].value)
+        if name == _QUOTED_SIGNAL_FUNC:
+            return self._signal(self.quoted_signals[node.args[0].value])
+        if name not in EXPRESSION_FUNCTIONS:
+            raise SignalExpressionError(
+                f"Unknown function '{name}' in expression: {self.text}. "
+                f"Available functions: {', '.join(sorted(EXPRESSION_FUNCTIONS))}"
+            )
+
+        arity, builder = EXPRESSION_FUNCTIONS[name]
+        if len(node.args) != arity:
+            raise SignalExpressionError(f"{name}() expects {arity} argument(s) in expression: {self.text}")
+        args = [self.compile(arg) for arg in node.args]
+        return builder(*args)
+
+    def _operand(self, node: ast.AST) -> pl.Expr:
+        """Compile a node that must produce a value (not a duration)."""
+        result = self.compile(node)
+        if isinstance(result, Duration):
+            raise SignalExpressionError(f"Durations can only be used as rolling windows in expression: {self.text}")
+        return result
+
+
+def _is_boolean(node: ast.AST) -> bool:
+    """Check whether the top-level operation of an expression produces a boolean."""
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return True
+    return isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Compile a signal expression into a polars expression.
+
+    Compiled expressions are cached per expression string.
+
+    Args:
+        text (str): The expression, e.g. "abs(current_steering - target_steering_angle) > 5"
+
+    Returns:
+        CompiledExpression: The polars expression, its inputs and the result signal type
+
+    Raises:
+        SignalExpressionError: If the expression cannot be parsed or uses unsupported syntax
+    """
+    rewritten, quoted_signals = _replace_quoted_signals(text.strip())
+    try:
+        tree = ast.parse(_replace_durations(rewritten), mode="eval")
+    except SyntaxError as e:
+        raise SignalExpressionError(f"Invalid expression '{text}': {e.msg}") from e
+
+    compiler = _ExpressionCompiler(text, quoted_signals)
+    expr = compiler._operand(tree.body)
+    if not compiler.inputs:
+        raise SignalExpressionError(f"Expression '{text}' does not reference any signal.")
+
+    signal_type = "boolean" if _is_boolean(tree.body) else "temporal"
+    return CompiledExpression(text, expr, tuple(compiler.inputs), signal_type)
+
+
+def evaluate_expression(compiled: CompiledExpression, time_base_ms: np.ndarray, *inputs: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a compiled expression over aligned input arrays in a polars lazy query.
+
+    NaN input samples (no data) are treated as nulls and give NaN results. Boolean
+    results are returned as 1.0/0.0 floats so they can be plotted and validated as scalars.
+
+    Args:
+        compiled (CompiledExpression): The compiled expression
+        time_base_ms (np.ndarray): The aligned timeline in milliseconds
+        *inputs (np.ndarray): One aligned array per input signal, in compiled.inputs order
+
+    Returns:
+        np.ndarray: float64 result, one value per timeline sample
+    """
+    columns = {TIME_COLUMN: np.asarray(time_base_ms).astype(np.int64)}
+    columns.update(zip(compiled.inputs, inputs))
+
+    float_inputs = [name for name, values in zip(compiled.inputs, inputs) if values.dtype.kind == "f"]
+    query = pl.LazyFrame(columns)
+    if float_inputs:
+        query = query.with_columns(pl.col(float_inputs).fill_nan(None))
+
+    result = query.select(compiled.expr.cast(pl.Float64).alias("value")).collect()
+    return result.to_series().to_numpy()
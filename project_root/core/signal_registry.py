@@ -5,10 +5,20 @@ Signal Registry for the Debug Player.
 
 This module provides a centralized system for managing signals from plugins,
 including registration, validation, and subscription management.
+
+Lookups by type, plugin, category and name prefix use secondary indexes that are
+maintained on registration, so queries stay proportional to the size of the result
+even with tens of thousands of registered signals.
 """
 
-from typing import Dict, Any, List, Callable, Set, Optional
+import weakref
+from typing import Dict, Any, List, Callable, Set, Optional, Tuple
+from sortedcontainers import SortedList
 from core.signal_validation import validate_signal_definition, SignalValidationError
+from core.derived_signals import DerivedSignalEngine, DERIVED_PLUGIN_NAME
+from core.signal_expressions import compile_expression, evaluate_expression
+from core.signal_statistics import SignalStatistics, compute_signal_statistics
+from functools import partial
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +32,7 @@ class SignalRegistry:
     2. Signal validation and type checking
     3. Signal subscription management
     4. Signal metadata and discovery
+    5. Derived signals and their dependency tracking
     
     This class serves as the mediator between plugins (signal providers)
     and widgets (signal consumers).
@@ -35,8 +46,9 @@ class SignalRegistry:
         # Track which plugin provides each signal
         self.signal_providers: Dict[str, str] = {}
         
-        # Track subscribers for each signal
-        self.signal_subscribers: Dict[str, List[Any]] = {}
+        # Track subscribers for each signal. Subscribers are held by weak reference so that
+        # deleted widgets drop out automatically.
+        self.signal_subscribers: Dict[str, weakref.WeakSet] = {}
         
         # Store hierarchical signal information
         self.signal_hierarchy: Dict[str, Dict[str, List[str]]] = {}
@@ -44,6 +56,29 @@ class SignalRegistry:
         # Cache of available signal types from each plugin
         self._plugin_signal_types: Dict[str, Dict[str, Set[str]]] = {}
         
+        # Secondary indexes: key -> ordered set (dict with None values) of signal names
+        self._type_index: Dict[str, Dict[str, None]] = {}
+        self._plugin_index: Dict[str, Dict[str, None]] = {}
+        self._category_index: Dict[str, Dict[str, None]] = {}
+        
+        # All signal names in sorted order, for prefix queries
+        self._sorted_names = SortedList()
+        
+        # Index keys (plugin, type, category) each signal is currently filed under
+        self._index_keys: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        
+        # Version counter per signal, bumped whenever a signal is (re-)registered or invalidated
+        self.signal_versions: Dict[str, int] = {}
+        
+        # Dependency graph of derived signals: input -> derived signals that use it
+        self.signal_dependents: Dict[str, Set[str]] = {}
+        
+        # Evaluates and caches derived signals
+        self.derived_engine = DerivedSignalEngine(self)
+        
+        # Precomputed series statistics: signal -> (dependency key they were computed at, statistics)
+        self._statistics: Dict[str, Tuple[Any, Optional[SignalStatistics]]] = {}
+        
     def register_signal(self, signal_name: str, signal_definition: Dict[str, Any], 
                        plugin_name: str) -> Dict[str, Any]:
         """
@@ -62,35 +97,182 @@ class SignalRegistry:
         """
         # Validate and normalize the signal definition
         normalized_signal = validate_signal_definition(signal_name, signal_definition, plugin_name)
+        signal_type = normalized_signal.get("type", "temporal")
+        index_keys = (plugin_name, signal_type, normalized_signal.get("category"))
+        
+        # Re-registration: only refile the signal if its plugin, type or category changed
+        previous_keys = self._index_keys.get(signal_name)
+        if previous_keys is not None and previous_keys != index_keys:
+            self._remove_from_indexes(signal_name)
+            previous_keys = None
         
         # Store in registry
         self.signals[signal_name] = normalized_signal
         self.signal_providers[signal_name] = plugin_name
+        self.signal_versions[signal_name] = self.signal_versions.get(signal_name, 0) + 1
         
-        # Initialize subscriber list
+        # Initialize subscriber set
         if signal_name not in self.signal_subscribers:
-            self.signal_subscribers[signal_name] = []
+            self.signal_subscribers[signal_name] = weakref.WeakSet()
+        
+        if previous_keys is None:
+            self._add_to_indexes(signal_name, index_keys, normalized_signal)
+        
+        logger.debug(f"Registered signal '{signal_name}' from plugin '{plugin_name}'")
+        return normalized_signal
+        
+    def register_derived_signal(self, signal_name: str, inputs: List[str], func: Callable,
+                                signal_type: str = "temporal", **options) -> Dict[str, Any]:
+        """
+        Register a signal computed from other signals by a vectorized function.
+        
+        The function is called as func(time_base_ms, *aligned_inputs) over the full aligned
+        time base of the inputs; the result is cached until one of the inputs changes.
+        
+        Args:
+            signal_name: Name of the derived signal
+            inputs: Names of registered input signals (plain signals must provide a "series" function)
+            func: Vectorized function returning one value per time base sample
+            signal_type: Signal type of the result
+            **options: align / time_base options and additional metadata (see DerivedSignalEngine.add)
             
-        # Update plugin signal types cache
-        signal_type = normalized_signal.get("type", "temporal")
-        if plugin_name not in self._plugin_signal_types:
-            self._plugin_signal_types[plugin_name] = {}
+        Returns:
+            The normalized signal definition dictionary
+            
+        Raises:
+            SignalValidationError: If an input is unknown, has no series, or the inputs form a cycle
+        """
+        for input_name in inputs:
+            if input_name not in self.signals:
+                raise SignalValidationError(f"Derived signal '{signal_name}' uses unknown input signal '{input_name}'.")
+            if input_name == signal_name or input_name in self.get_dependents(signal_name):
+                raise SignalValidationError(f"Derived signal '{signal_name}' has a circular dependency on '{input_name}'.")
+            if input_name not in self.derived_engine.derived and not callable(self.signals[input_name].get("series")):
+                raise SignalValidationError(
+                    f"Input signal '{input_name}' of derived signal '{signal_name}' does not provide a 'series' function."
+                )
+        
+        # Replace the dependency edges of a previous definition
+        previous = self.derived_engine.derived.get(signal_name)
+        if previous is not None:
+            for input_name in previous.inputs:
+                self.signal_dependents.get(input_name, set()).discard(signal_name)
+        
+        definition = self.derived_engine.add(signal_name, inputs, func, signal_type, **options)
+        for input_name in inputs:
+            self.signal_dependents.setdefault(input_name, set()).add(signal_name)
+        
+        return self.register_signal(signal_name, definition, DERIVED_PLUGIN_NAME)
+    
+    def register_expression_signal(self, signal_name: str, expression: str) -> Dict[str, Any]:
+        """
+        Register a derived signal defined by an expression string.
         
-        if signal_type not in self._plugin_signal_types[plugin_name]:
-            self._plugin_signal_types[plugin_name][signal_type] = set()
+        The expression is compiled (and cached) into a polars expression that is evaluated
+        over the aligned timeline of its inputs, with sample-and-hold alignment.
+        
+        Args:
+            signal_name: Name of the new signal
+            expression: Expression such as "abs(current_steering - target_steering_angle) > 5"
             
-        self._plugin_signal_types[plugin_name][signal_type].add(signal_name)
+        Returns:
+            The normalized signal definition dictionary; its type is "boolean" for
+            comparisons and logical expressions and "temporal" otherwise
+            
+        Raises:
+            SignalValidationError: If the expression is invalid or uses unknown signals
+        """
+        compiled = compile_expression(expression)
+        return self.register_derived_signal(
+            signal_name, list(compiled.inputs), partial(evaluate_expression, compiled),
+            compiled.signal_type, align="previous", expression=expression, description=expression
+        )
+    
+    def get_signal_version(self, signal_name: str) -> int:
+        """
+        Get the version counter of a signal.
         
-        # Add to signal hierarchy
-        self._update_signal_hierarchy(signal_name, plugin_name, normalized_signal)
+        Args:
+            signal_name: Name of the signal
+            
+        Returns:
+            The version (0 if the signal is unknown)
+        """
+        return self.signal_versions.get(signal_name, 0)
+    
+    def invalidate_signal(self, signal_name: str) -> Set[str]:
+        """
+        Mark the data of a signal as changed.
         
-        logger.debug(f"Registered signal '{signal_name}' from plugin '{plugin_name}'")
-        return normalized_signal
+        Derived signals that depend on it (directly or indirectly) are recomputed
+        the next time they are requested.
+        
+        Args:
+            signal_name: Name of the signal whose data changed
+            
+        Returns:
+            The set of derived signals affected by the change
+        """
+        self.signal_versions[signal_name] = self.signal_versions.get(signal_name, 0) + 1
+        return self.get_dependents(signal_name)
+    
+    def get_dependents(self, signal_name: str) -> Set[str]:
+        """
+        Get all derived signals that depend on a signal, directly or indirectly.
+        
+        Args:
+            signal_name: Name of the signal
+            
+        Returns:
+            Set of dependent derived signal names
+        """
+        dependents: Set[str] = set()
+        pending = [signal_name]
+        while pending:
+            for dependent in self.signal_dependents.get(pending.pop(), ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+        return dependents
+        
+    def unregister_signal(self, signal_name: str) -> bool:
+        """
+        Remove a signal from the registry.
+        
+        Subscribers of the signal are dropped. The version counter is kept and bumped,
+        so derived signals depending on it are recomputed if it is registered again.
         
+        Args:
+            signal_name: Name of the signal
+            
+        Returns:
+            True if the signal was registered, False otherwise
+        """
+        if signal_name not in self.signals:
+            return False
+        
+        self._remove_from_indexes(signal_name)
+        del self.signals[signal_name]
+        del self.signal_providers[signal_name]
+        self.signal_subscribers.pop(signal_name, None)
+        self._statistics.pop(signal_name, None)
+        self.signal_versions[signal_name] = self.signal_versions.get(signal_name, 0) + 1
+        
+        if signal_name in self.derived_engine.derived:
+            for input_name in self.derived_engine.derived[signal_name].inputs:
+                self.signal_dependents.get(input_name, set()).discard(signal_name)
+            self.derived_engine.remove(signal_name)
+        
+        logger.debug(f"Unregistered signal '{signal_name}'")
+        return True
+    
     def subscribe_to_signal(self, signal_name: str, subscriber: Any) -> bool:
         """
         Subscribe a widget or component to a signal.
         
+        The subscriber is held by weak reference and must therefore support weak
+        references (widgets and other class instances do).
+        
         Args:
             signal_name: Name of the signal to subscribe to
             subscriber: Object that will receive signal updates
@@ -101,11 +283,14 @@ class SignalRegistry:
         if signal_name not in self.signals:
             logger.warning(f"Cannot subscribe to unknown signal: {signal_name}")
             return False
-            
-        if subscriber not in self.signal_subscribers[signal_name]:
-            self.signal_subscribers[signal_name].append(subscriber)
-            logger.debug(f"Added subscriber to signal: {signal_name}")
         
+        try:
+            self.signal_subscribers[signal_name].add(subscriber)
+        except TypeError:
+            logger.warning(f"Cannot subscribe {type(subscriber).__name__} to {signal_name}: weak references not supported")
+            return False
+        
+        logger.debug(f"Added subscriber to signal: {signal_name}")
         return True
     
     def unsubscribe_from_signal(self, signal_name: str, subscriber: Any) -> bool:
@@ -122,9 +307,12 @@ class SignalRegistry:
         if signal_name not in self.signal_subscribers:
             return False
             
-        if subscriber in self.signal_subscribers[signal_name]:
-            self.signal_subscribers[signal_name].remove(subscriber)
-            return True
+        try:
+            if subscriber in self.signal_subscribers[signal_name]:
+                self.signal_subscribers[signal_name].discard(subscriber)
+                return True
+        except TypeError:
+            pass
             
         return False
     
@@ -153,7 +341,7 @@ class SignalRegistry:
         Returns:
             List of subscribers for the signal
         """
-        return self.signal_subscribers.get(signal_name, [])
+        return list(self.signal_subscribers.get(signal_name, ()))
     
     def get_signals_by_type(self, signal_type: str) -> List[str]:
         """
@@ -165,10 +353,7 @@ class SignalRegistry:
         Returns:
             List of signal names matching the requested type
         """
-        return [
-            signal_name for signal_name, signal_info in self.signals.items()
-            if signal_info.get("type") == signal_type
-        ]
+        return list(self._type_index.get(signal_type, ()))
     
     def get_signals_by_plugin(self, plugin_name: str) -> List[str]:
         """
@@ -180,10 +365,37 @@ class SignalRegistry:
         Returns:
             List of signal names provided by the plugin
         """
-        return [
-            signal_name for signal_name, provider in self.signal_providers.items()
-            if provider == plugin_name
-        ]
+        return list(self._plugin_index.get(plugin_name, ()))
+    
+    def get_signals_by_category(self, category: str) -> List[str]:
+        """
+        Get all signals in a category.
+        
+        Args:
+            category: Category given in the signal definitions
+            
+        Returns:
+            List of signal names in the category
+        """
+        return list(self._category_index.get(category, ()))
+    
+    def get_signals_by_prefix(self, prefix: str) -> List[str]:
+        """
+        Get all signals whose name starts with a prefix, in sorted order.
+        
+        Args:
+            prefix: Name prefix (e.g. "imu." for all columns of imu.csv)
+            
+        Returns:
+            Sorted list of matching signal names
+        """
+        start = self._sorted_names.bisect_left(prefix)
+        matches = []
+        for signal_name in self._sorted_names.islice(start):
+            if not signal_name.startswith(prefix):
+                break
+            matches.append(signal_name)
+        return matches
     
     def get_signal_metadata(self, signal_name: str) -> Dict[str, Any]:
         """
@@ -198,13 +410,49 @@ class SignalRegistry:
         if signal_name not in self.signals:
             return {}
             
-        # Return a copy without the function to avoid exposing implementation details
-        metadata = dict(self.signals[signal_name])
-        if "func" in metadata:
-            del metadata["func"]
+        # Return a copy without the callables to avoid exposing implementation details
+        metadata = {key: value for key, value in self.signals[signal_name].items()
+                    if key not in ("func", "series")}
+        
+        statistics = self.get_signal_statistics(signal_name)
+        if statistics is not None:
+            metadata["statistics"] = statistics.to_metadata()
             
         return metadata
     
+    def get_signal_statistics(self, signal_name: str) -> Optional[SignalStatistics]:
+        """
+        Get the precomputed statistics of a signal's full series.
+        
+        The statistics (count, time extent, median sample interval and per-block
+        min/max/mean) are computed from the signal's "series" function the first time
+        they are requested and cached until the signal or one of its inputs changes.
+        
+        Args:
+            signal_name: Name of the signal
+            
+        Returns:
+            The SignalStatistics, or None if the signal does not provide a numeric series
+        """
+        signal = self.signals.get(signal_name)
+        if signal is None or not callable(signal.get("series")):
+            return None
+        
+        key = self.derived_engine.dependency_key(signal_name)
+        cached = self._statistics.get(signal_name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        try:
+            timestamps, values = signal["series"]()
+            statistics = compute_signal_statistics(timestamps, values)
+        except Exception as e:
+            logger.warning(f"Could not compute statistics for signal '{signal_name}': {e}")
+            statistics = None
+        
+        self._statistics[signal_name] = (key, statistics)
+        return statistics
+    
     def has_signal(self, signal_name: str) -> bool:
         """
         Check if a signal exists in the registry.
@@ -217,6 +465,55 @@ class SignalRegistry:
         """
         return signal_name in self.signals
     
+    def _add_to_indexes(self, signal_name: str, index_keys: Tuple[str, str, Optional[str]],
+                        signal_info: Dict[str, Any]) -> None:
+        """
+        File a signal under its plugin, type and category in all secondary indexes.
+        
+        Args:
+            signal_name: Name of the signal
+            index_keys: (plugin name, signal type, category or None)
+            signal_info: Normalized signal definition
+        """
+        plugin_name, signal_type, category = index_keys
+        self._index_keys[signal_name] = index_keys
+        
+        self._type_index.setdefault(signal_type, {})[signal_name] = None
+        self._plugin_index.setdefault(plugin_name, {})[signal_name] = None
+        if category:
+            self._category_index.setdefault(category, {})[signal_name] = None
+        self._sorted_names.add(signal_name)
+        
+        # Update plugin signal types cache
+        self._plugin_signal_types.setdefault(plugin_name, {}).setdefault(signal_type, set()).add(signal_name)
+        
+        # Add to signal hierarchy
+        self._update_signal_hierarchy(signal_name, plugin_name, signal_info)
+    
+    def _remove_from_indexes(self, signal_name: str) -> None:
+        """
+        Remove a signal from all secondary indexes.
+        
+        Args:
+            signal_name: Name of the signal
+        """
+        index_keys = self._index_keys.pop(signal_name, None)
+        if index_keys is None:
+            return
+        plugin_name, signal_type, category = index_keys
+        
+        self._type_index.get(signal_type, {}).pop(signal_name, None)
+        self._plugin_index.get(plugin_name, {}).pop(signal_name, None)
+        if category:
+            self._category_index.get(category, {}).pop(signal_name, None)
+        self._sorted_names.discard(signal_name)
+        self._plugin_signal_types.get(plugin_name, {}).get(signal_type, set()).discard(signal_name)
+        
+        hierarchy = self.signal_hierarchy.get(plugin_name, {})
+        for key in (signal_type, category):
+            if key and signal_name in hierarchy.get(key, ()):
+                hierarchy[key].remove(signal_name)
+    
     def _update_signal_hierarchy(self, signal_name: str, plugin_name: str, 
                                 signal_info: Dict[str, Any]) -> None:
         """
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+"""
+Signal Statistics for the Debug Player.
+
+Summary statistics of a signal's full series, computed once when the series is first needed:
+sample count, time extent, median sample interval and a block table holding the min, max,
+sum and count of the values in each fixed time block (1 s by default).
+
+The block table lets range queries, such as the y-range of the visible part of a plot, run
+over the handful of blocks overlapping the range instead of over every sample. Blocks are
+stored as one compact structured array (28 bytes per block, i.e. about 100 kB for an hour of
+data at 1 s blocks), independent of the signal's sample rate.
+
+Usage:
+    stats = compute_signal_statistics(timestamps_ms, values)
+    stats.range_stats(t_start_ms, t_end_ms)  # (min, max, mean, count) over the blocks in range
+    stats.to_metadata()                      # summary for SignalRegistry.get_signal_metadata
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+# Default block length in milliseconds
+DEFAULT_BLOCK_MS = 1000.0
+
+# Signals sampled below this rate are reported as sparse
+SPARSE_RATE_HZ = 1.0
+
+# One row per non-empty block
+BLOCK_DTYPE = np.dtype([
+    ("start", np.float64),  # Block start time [ms]
+    ("min", np.float32),
+    ("max", np.float32),
+    ("sum", np.float64),
+    ("count", np.uint32),
+])
+
+
+class RangeStats(NamedTuple):
+    """Statistics of a signal over a time range."""
+    min: float
+    max: float
+    mean: float
+    count: int
+
+
+class SignalStatistics:
+    """
+    Precomputed statistics of a numeric signal series.
+
+    Attributes:
+        count (int): Number of finite samples
+        t_min (float): First timestamp [ms]
+        t_max (float): Last timestamp [ms]
+        median_dt (Optional[float]): Median interval between samples [ms], None for fewer than 2 samples
+        block_ms (float): Block length [ms]
+        blocks (np.ndarray): BLOCK_DTYPE array of the non-empty blocks, sorted by start time
+    """
+
+    def __init__(self, count: int, t_min: float, t_max: float, median_dt: Optional[float],
+                 block_ms: float, blocks: np.ndarray):
+        self.count = count
+        self.t_min = t_min
+        self.t_max = t_max
+        self.median_dt = median_dt
+        self.block_ms = block_ms
+        self.blocks = blocks
+
+    @property
+    def sample_rate_hz(self) -> Optional[float]:
+        """Nominal sample rate derived from the median sample interval."""
+        if not self.median_dt:
+            return None
+        return 1000.0 / self.median_dt
+
+    @property
+    def is_sparse(self) -> bool:
+        """True if the signal has too few samples or is sampled below SPARSE_RATE_HZ."""
+        rate = self.sample_rate_hz
+        return self.count < 2 or rate is None or rate < SPARSE_RATE_HZ
+
+    def range_stats(self, t_start: float, t_end: float) -> Optional[RangeStats]:
+        """
+        Get the statistics of the blocks overlapping a time range.
+
+        The result covers whole blocks, so it may include samples up to one block length
+        outside the range. This is the intended trade-off for y-autoscaling.
+
+        Args:
+            t_start: Range start [ms]
+            t_end: Range end [ms]
+
+        Returns:
+            RangeStats over the overlapping blocks, or None if no block overlaps the range
+        """
+        starts = self.blocks["start"]
+        first = max(np.searchsorted(starts, t_start, side="right") - 1, 0)
+        last = np.searchsorted(starts, t_end, side="right")
+        visible = self.blocks[first:last]
+        visible = visible[visible["start"] + self.block_ms > t_start]
+        if len(visible) == 0:
+            return None
+
+        count = int(visible["count"].sum())
+        return RangeStats(
+            float(visible["min"].min()), float(visible["max"].max()),
+            float(visible["sum"].sum() / count), count,
+        )
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """
+        Get the summary as a plain dictionary.
+
+        Returns:
+            Dictionary with count, t_min, t_max, median_dt, sample_rate_hz, is_sparse,
+            block_ms and the block table
+        """
+        return {
+            "count": self.count,
+            "t_min": self.t_min,
+            "t_max": self.t_max,
+            "median_dt": self.median_dt,
+            "sample_rate_hz": self.sample_rate_hz,
+            "is_sparse": self.is_sparse,
+            "block_ms": self.block_ms,
+            "blocks": self.blocks,
+        }
+
+
+def compute_signal_statistics(timestamps_ms: Any, values: Any,
+                              block_ms: float = DEFAULT_BLOCK_MS) -> Optional[SignalStatistics]:
+    """
+    Compute the statistics of a signal series in a single vectorized pass.
+
+    Non-finite values (NaN for missing data) are ignored.
+
+    Args:
+        timestamps_ms: Timestamps in milliseconds
+        values: Numeric values, one per timestamp
+        block_ms: Block length in milliseconds
+
+    Returns:
+        The SignalStatistics, or None if the values are not numeric
+    """
+    timestamps = np.asarray(timestamps_ms, dtype=np.float64)
+    values = np.asarray(values)
+    if values.ndim != 1 or values.dtype.kind not in "fiub" or len(values) != len(timestamps):
+        return None
+
+    values = values.astype(np.float64)
+    finite = np.isfinite(values) & np.isfinite(timestamps)
+    timestamps, values = timestamps[finite], values[finite]
+    if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, values = timestamps[order], values[order]
+
+    if len(timestamps) == 0:
+        return SignalStatistics(0, np.nan, np.nan, None, block_ms, np.empty(0, dtype=BLOCK_DTYPE))
+
+    dt = np.diff(timestamps)
+    dt = dt[dt > 0]
+    median_dt = float(np.median(dt)) if len(dt) else None
+
+    # Samples are sorted, so each block is a contiguous run: reduce the runs in place
+    block_ids = np.floor(timestamps / block_ms).astype(np.int64)
+    run_starts = np.flatnonzero(np.diff(block_ids, prepend=block_ids[0] - 1))
+
+    blocks = np.empty(len(run_starts), dtype=BLOCK_DTYPE)
+    blocks["start"] = block_ids[run_starts] * block_ms
+    blocks["min"] = np.minimum.reduceat(values, run_starts)
+    blocks["max"] = np.maximum.reduceat(values, run_starts)
+    blocks["sum"] = np.add.reduceat(values, run_starts)
+    blocks["count"] = np.diff(np.append(run_starts, len(values)))
+
+    return SignalStatistics(len(values), float(timestamps[0]), float(timestamps[-1]), median_dt, block_ms, blocks)
@@ -19,11 +19,25 @@ Signal Definition Requirements:
 - Some signal types have additional required fields (e.g., 'categories' for categorical signals)
 - Additional metadata fields may be included for enhanced functionality
 
+Signal Data Contract:
+Each signal type also defines the payloads its function may return, so widgets can
+consume plugin data directly without per-frame conversion:
+- scalar: a Python/NumPy float, int or bool
+- xy_array: a C-contiguous (N, 2) float64 array of x/y points
+- pose: a structured record (or 1-D record array) with POSE_DTYPE fields x, y, theta [deg]
+
 Usage:
     validated_signal = validate_signal_definition("signal_name", signal_info, "plugin_name")
+    validator = SignalDataValidator(mode="warn")
+    validator.check("signal_name", data, "temporal", "plugin_name")
 """
 
-from typing import Dict, Any, Callable, List, Union, Optional
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 
 class SignalValidationError(Exception):
@@ -31,30 +45,46 @@ class SignalValidationError(Exception):
     pass
 
 
+# Payload kinds that make up the signal data contract
+PAYLOAD_SCALAR = "scalar"
+PAYLOAD_XY_ARRAY = "xy_array"
+PAYLOAD_POSE = "pose"
+
+# Structured pose record: position in meters and heading in degrees
+POSE_DTYPE = np.dtype([("x", np.float64), ("y", np.float64), ("theta", np.float64)])
+
+
 # Define known signal types and their expected format
 SIGNAL_TYPES = {
     "temporal": {
         "description": "Time-series data that changes with timestamp",
         "required_fields": ["func", "type"],
         "optional_fields": ["description", "units", "valid_range"],
+        "payloads": [PAYLOAD_SCALAR],
     },
     "spatial": {
         "description": "Spatial data that may be 2D or 3D",
         "required_fields": ["func", "type"],
         "optional_fields": ["description", "coordinate_system", "units", "valid_range"],
+        "payloads": [PAYLOAD_XY_ARRAY, PAYLOAD_POSE],
     },
     "categorical": {
         "description": "Data with discrete categories or states",
         "required_fields": ["func", "type", "categories"],
         "optional_fields": ["description"],
+        "payloads": [PAYLOAD_SCALAR],
     },
     "boolean": {
         "description": "Binary true/false data",
         "required_fields": ["func", "type"],
         "optional_fields": ["description", "true_label", "false_label"],
+        "payloads": [PAYLOAD_SCALAR],
     },
 }
 
+# Modes supported by SignalDataValidator
+VALIDATION_MODES = ("off", "warn", "strict")
+
 
 def validate_signal_definition(signal_name: str, signal_info: Dict[str, Any], plugin_name: str) -> Dict[str, Any]:
     """
@@ -167,9 +197,214 @@ def get_signal_metadata(signal_type: str) -> Dict[str, Any]:
             - description: String describing the signal type
             - required_fields: List of field names that must be present
             - optional_fields: List of additional fields that may be present
+            - payloads: List of data contract payloads the signal function may return
             Returns an empty dict if the type is unknown.
     """
     if signal_type not in SIGNAL_TYPES:
         return {}  # Unknown type
     
     return SIGNAL_TYPES[signal_type]
+
+
+def make_pose_record(x: float, y: float, theta: float) -> np.void:
+    """
+    Build a structured pose record that satisfies the 'pose' payload contract.
+    
+    Args:
+        x (float): X position in meters
+        y (float): Y position in meters
+        theta (float): Heading in degrees
+        
+    Returns:
+        np.void: A scalar record with POSE_DTYPE fields x, y and theta
+    """
+    return np.array((float(x), float(y), float(theta)), dtype=POSE_DTYPE)[()]
+
+
+def make_xy_array(x: Any, y: Any) -> np.ndarray:
+    """
+    Build a C-contiguous (N, 2) float64 array that satisfies the 'xy_array' payload contract.
+    
+    Args:
+        x (array-like): X coordinates
+        y (array-like): Y coordinates
+        
+    Returns:
+        np.ndarray: Array of shape (N, 2) with x in column 0 and y in column 1
+    """
+    xy = np.empty((len(x), 2), dtype=np.float64)
+    xy[:, 0] = x
+    xy[:, 1] = y
+    return xy
+
+
+def classify_signal_data(data: Any) -> Optional[str]:
+    """
+    Determine which contract payload a piece of signal data conforms to.
+    
+    Args:
+        data (Any): The value returned by a signal function
+        
+    Returns:
+        Optional[str]: One of the PAYLOAD_* constants, or None if the data does not
+                       conform to any payload of the contract
+    """
+    if isinstance(data, (float, int, bool, np.floating, np.integer, np.bool_)):
+        return PAYLOAD_SCALAR
+    if isinstance(data, np.void) and data.dtype == POSE_DTYPE:
+        return PAYLOAD_POSE
+    if isinstance(data, np.ndarray):
+        if data.dtype == POSE_DTYPE and data.ndim <= 1:
+            return PAYLOAD_POSE
+        if (data.ndim == 2 and data.shape[1] == 2 and data.dtype == np.float64
+                and data.flags.c_contiguous):
+            return PAYLOAD_XY_ARRAY
+    return None
+
+
+def validate_signal_data(signal_name: str, data: Any, signal_type: str, plugin_name: str) -> str:
+    """
+    Validate that data returned by a signal function matches its type's contract.
+    
+    A None value is accepted for every type and means "no data at this timestamp".
+    
+    Args:
+        signal_name (str): The name of the signal
+        data (Any): The value returned by the signal function
+        signal_type (str): The registered type of the signal
+        plugin_name (str): The name of the plugin providing this signal
+        
+    Returns:
+        str: The payload kind the data conforms to ("none" for None)
+        
+    Raises:
+        SignalValidationError: If the data does not conform to the contract for the signal type
+    """
+    if data is None:
+        return "none"
+    
+    allowed = SIGNAL_TYPES.get(signal_type, SIGNAL_TYPES["temporal"])["payloads"]
+    payload = classify_signal_data(data)
+    if payload not in allowed:
+        raise SignalValidationError(
+            f"Signal '{signal_name}' in plugin '{plugin_name}' returned "
+            f"{describe_data_type(data)}; '{signal_type}' signals must return one of {allowed}"
+        )
+    return payload
+
+
+def describe_data_type(data: Any) -> str:
+    """
+    Return a short, human-readable description of the type of a signal value.
+    
+    Args:
+        data (Any): The value to describe
+        
+    Returns:
+        str: A description such as 'polars.dataframe.frame.DataFrame' or 'ndarray(float32, (3,))'
+    """
+    if isinstance(data, np.ndarray):
+        return f"ndarray({data.dtype}, {data.shape})"
+    data_type = type(data)
+    module = data_type.__module__
+    if module == "builtins":
+        return data_type.__name__
+    return f"{module}.{data_type.__name__}"
+
+
+def to_scalar(data: Any) -> Any:
+    """
+    Convert a legacy (non-contract) temporal value into a scalar.
+    
+    Handles single-row polars/pandas frames and series, 0-d or single element arrays
+    and one-element lists. This is the slow path; contract scalars should not need it.
+    
+    Args:
+        data (Any): The value to convert
+        
+    Returns:
+        Any: The scalar value, or the input unchanged if it cannot be reduced to a scalar
+    """
+    if hasattr(data, "to_numpy"):
+        data = data.to_numpy()
+    if isinstance(data, (list, tuple)):
+        data = np.asarray(data)
+    if isinstance(data, np.ndarray) and data.size == 1:
+        return data.item()
+    return data
+
+
+class SignalDataValidator:
+    """
+    Checks signal data against the data contract at runtime.
+    
+    Modes:
+    - off: no checks are performed
+    - warn: each non-conforming signal is logged once and recorded in `violations`
+    - strict: a SignalValidationError is raised on the first non-conforming value
+    """
+    
+    def __init__(self, mode: str = "warn"):
+        """
+        Initialize the validator.
+        
+        Args:
+            mode (str): One of VALIDATION_MODES
+            
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode '{mode}'. Expected one of {VALIDATION_MODES}")
+        self.mode = mode
+        
+        # Format: {signal_name: {"plugin": str, "type": str, "data_type": str, "count": int}}
+        self.violations: Dict[str, Dict[str, Any]] = {}
+    
+    def check(self, signal_name: str, data: Any, signal_type: str, plugin_name: str) -> bool:
+        """
+        Check a single value returned by a signal function.
+        
+        Args:
+            signal_name (str): The name of the signal
+            data (Any): The value returned by the signal function
+            signal_type (str): The registered type of the signal
+            plugin_name (str): The name of the plugin providing this signal
+            
+        Returns:
+            bool: True if the data conforms to the contract (or checks are off), False otherwise
+            
+        Raises:
+            SignalValidationError: In strict mode, if the data does not conform
+        """
+        if self.mode == "off":
+            return True
+        
+        try:
+            validate_signal_data(signal_name, data, signal_type, plugin_name)
+            return True
+        except SignalValidationError as e:
+            if self.mode == "strict":
+                raise
+            
+            violation = self.violations.get(signal_name)
+            if violation is None:
+                self.violations[signal_name] = {
+                    "plugin": plugin_name,
+                    "type": signal_type,
+                    "data_type": describe_data_type(data),
+                    "count": 1,
+                }
+                logger.warning(f"Slow signal data type: {e}")
+            else:
+                violation["count"] += 1
+            return False
+    
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a summary of all non-conforming signals seen so far.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: A copy of the recorded violations keyed by signal name
+        """
+        return {name: dict(info) for name, info in self.violations.items()}
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+"""
+Hot-path tracing for the Debug Player.
+
+Spans time sections of the frame pipeline (slider handler, PlotManager.request_data, plugin
+calls, widget updates, loaders) and record them into a fixed-size ring buffer. The buffer can
+be exported as Chrome trace JSON, which opens in chrome://tracing and https://ui.perfetto.dev.
+
+Tracing is disabled by default. A disabled span() call returns a shared no-op context
+manager, so instrumented code costs one function call and one flag check per span.
+Arguments passed to span() are evaluated by the caller either way; keep them cheap or
+guard expensive ones with is_enabled().
+
+Tracing is enabled at startup by setting DEBUG_PLAYER_TRACE to the output file path; the
+trace is written when the player exits.
+
+Usage:
+    from core import tracing
+
+    with tracing.span("request_data", "frame", timestamp=timestamp):
+        ...
+
+    tracing.instant("no data", "widget", signal=signal)
+    tracing.export_chrome_trace("trace.json")
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding the trace output path; tracing is enabled when it is set
+TRACE_ENV_VAR = "DEBUG_PLAYER_TRACE"
+
+# Default number of events kept in the ring buffer
+DEFAULT_CAPACITY = 200_000
+
+_enabled = False
+_events: deque = deque(maxlen=DEFAULT_CAPACITY)
+_recorded = 0  # Number of events recorded since tracing was enabled, including dropped ones
+_pid = os.getpid()
+
+# Raw event tuple: (phase, name, category, start_ns, duration_ns, thread id, args)
+RawEvent = Tuple[str, str, str, int, int, int, Dict[str, Any]]
+
+
+class _NullSpan:
+    """No-op span returned while tracing is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A recorded span: appends a complete ("X") event to the ring buffer on exit."""
+    __slots__ = ("name", "category", "args", "start_ns")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record(("X", self.name, self.category, self.start_ns, end_ns - self.start_ns,
+                 threading.get_ident(), self.args))
+        return False
+
+
+def _record(event: RawEvent) -> None:
+    global _recorded
+    _events.append(event)
+    _recorded += 1
+
+
+def enable_tracing(capacity: int = DEFAULT_CAPACITY) -> None:
+    """
+    Enable tracing with an empty ring buffer.
+
+    Args:
+        capacity: Maximum number of events kept; the oldest events are dropped first
+    """
+    global _enabled, _events, _recorded
+    _events = deque(maxlen=capacity)
+    _recorded = 0
+    _enabled = True
+
+
+def disable_tracing() -> None:
+    """Disable tracing. Recorded events are kept until the next enable_tracing() or clear()."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check whether tracing is enabled."""
+    return _enabled
+
+
+def clear() -> None:
+    """Drop all recorded events."""
+    _events.clear()
+
+
+def span(name: str, category: str = "", **args) -> Any:
+    """
+    Time a section of code.
+
+    Args:
+        name: Span name, e.g. "request_data" or "plugin:car_state_plugin"
+        category: Span category, e.g. "frame", "plugin", "widget", "loader", "ui"
+        **args: Values attached to the event (must be JSON serializable or convertible with str())
+
+    Returns:
+        A context manager; a shared no-op one while tracing is disabled
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def instant(name: str, category: str = "", **args) -> None:
+    """
+    Record a point-in-time event, e.g. a warning raised on every frame.
+
+    Args:
+        name: Event name
+        category: Event category
+        **args: Values attached to the event
+    """
+    if _enabled:
+        _record(("i", name, category, time.perf_counter_ns(), 0, threading.get_ident(), args))
+
+
+def traced(name: Optional[str] = None, category: str = "") -> Callable:
+    """
+    Decorator wrapping every call of a function in a span.
+
+    Args:
+        name: Span name; defaults to the function's qualified name
+        category: Span category
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_raw_events(since: int = 0) -> Tuple[List[RawEvent], int]:
+    """
+    Read the events recorded after a previous read, without converting them.
+
+    This lets periodic consumers (e.g. the performance HUD) sample the buffer cheaply:
+    each call only touches the new events. Events that were dropped from the ring buffer
+    before being read are skipped.
+
+    Args:
+        since: The cursor returned by the previous call (0 for the first call)
+
+    Returns:
+        Tuple of (new raw events in recording order, cursor for the next call)
+    """
+    events, total = _events, _recorded
+    new = min(total - since, len(events))
+    if new <= 0:
+        return [], total
+    return [events[-k] for k in range(new, 0, -1)], total
+
+
+def get_events() -> List[Dict[str, Any]]:
+    """
+    Get the recorded events in Chrome trace event format.
+
+    Returns:
+        List of event dictionaries with name, cat, ph, ts and dur in microseconds, pid, tid and args
+    """
+    events = []
+    for phase, name, category, start_ns, duration_ns, tid, args in list(_events):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": start_ns / 1000.0,
+            "pid": _pid,
+            "tid": tid,
+            "args": args,
+        }
+        if phase == "X":
+            event["dur"] = duration_ns / 1000.0
+        else:
+            event["s"] = "t"
+        events.append(event)
+    return events
+
+
+def export_chrome_trace(file_path: str) -> int:
+    """
+    Write the recorded events as a Chrome/Perfetto trace JSON file.
+
+    Args:
+        file_path: Output path
+
+    Returns:
+        The number of exported events
+    """
+    events = get_events()
+    with open(file_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+    logger.info(f"Exported {len(events)} trace events to {file_path}")
+    return len(events)
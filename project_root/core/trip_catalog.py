@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+
+"""
+SQLite trip catalog for the Debug Player.
+
+Indexes the trip folders below a root (folders that directly contain CSV files) into a
+SQLite database: files and row counts, start time and duration, available signals, time
+spent per driving mode, route bounding boxes (GPS and local car pose) and distance
+travelled. Browsing and filtering thousands of trips is then a query on the catalog
+instead of a scan of the file system.
+
+Refreshing is incremental: a trip is re-indexed only when the size or modification time
+of one of its CSV files changed, and trips that disappeared are removed. Trips are indexed
+on a thread pool (reading CSV files releases the GIL); the database is only written from
+the thread calling refresh().
+
+Usage:
+    catalog = TripCatalog(default_catalog_path("/data/trips"))
+    catalog.refresh("/data/trips")
+    trips = catalog.query(min_duration_s=600, driving_mode=1, bbox=(-200, 0, 100, 400))
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Catalog file written into the trips root (see default_catalog_path)
+CATALOG_FILE = ".debug_player_catalog.sqlite"
+
+# Bump when the tables or the indexed values change to rebuild existing catalogs
+CATALOG_VERSION = 1
+
+# (file, column) of the driving mode
+DRIVING_MODE_SOURCE = ("driving_mode.csv", "data_value")
+
+# (file, latitude column, longitude column) of the GPS route
+GPS_ROUTE_SOURCE = ("gps.csv", "latitude", "longitude")
+
+# (file, x column, y column) of the local route in meters, as drawn in the spatial plot
+POSE_ROUTE_SOURCE = ("car_pose.csv", "car_pose_front_axle_x_meters", "car_pose_front_axle_y_meters")
+
+# Mean earth radius for GPS distances [m]
+EARTH_RADIUS_M = 6371e3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    path TEXT PRIMARY KEY,
+    name TEXT,
+    signature TEXT,
+    indexed_at REAL,
+    start_ms REAL,
+    end_ms REAL,
+    duration_s REAL,
+    distance_m REAL,
+    min_lat REAL, max_lat REAL, min_lon REAL, max_lon REAL,
+    min_x REAL, max_x REAL, min_y REAL, max_y REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    trip TEXT, file TEXT, size INTEGER, mtime_ns INTEGER, rows INTEGER,
+    PRIMARY KEY (trip, file)
+);
+CREATE TABLE IF NOT EXISTS signals (
+    trip TEXT, signal TEXT,
+    PRIMARY KEY (trip, signal)
+);
+CREATE TABLE IF NOT EXISTS driving_modes (
+    trip TEXT, mode REAL, duration_s REAL,
+    PRIMARY KEY (trip, mode)
+);
+CREATE INDEX IF NOT EXISTS trips_duration ON trips (duration_s);
+CREATE INDEX IF NOT EXISTS trips_start ON trips (start_ms);
+CREATE INDEX IF NOT EXISTS signals_signal ON signals (signal, trip);
+CREATE INDEX IF NOT EXISTS driving_modes_mode ON driving_modes (mode, duration_s);
+"""
+
+_TRIP_COLUMNS = ("path", "name", "start_ms", "end_ms", "duration_s", "distance_m",
+                 "min_lat", "max_lat", "min_lon", "max_lon", "min_x", "max_x", "min_y", "max_y", "error")
+
+
+def default_catalog_path(root: str) -> str:
+    """
+    Get the catalog file of a trips root: inside the root, or in the user cache directory
+    if the root is not writable.
+    """
+    root = os.path.abspath(os.path.expanduser(root))
+    if os.access(root, os.W_OK):
+        return os.path.join(root, CATALOG_FILE)
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "debug_player")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, root.strip(os.sep).replace(os.sep, "__") + ".sqlite")
+
+
+def find_trip_folders(root: str) -> List[str]:
+    """
+    Find the trip folders below a root: directories that directly contain CSV files.
+    Subfolders of a trip belong to the trip and are not searched.
+
+    Returns:
+        Absolute trip paths with a trailing separator, sorted
+    """
+    trips = []
+    for directory, subdirectories, files in os.walk(os.path.abspath(os.path.expanduser(root))):
+        if any(name.endswith(".csv") for name in files):
+            trips.append(directory.rstrip(os.sep) + os.sep)
+            subdirectories.clear()
+    return sorted(trips)
+
+
+def trip_signature(trip_path: str) -> str:
+    """Get a signature of a trip that changes when one of its CSV files is added, removed or modified."""
+    entries = sorted(
+        (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+        for entry in os.scandir(trip_path) if entry.is_file() and entry.name.endswith(".csv")
+    )
+    return json.dumps(entries)
+
+
+def _count_rows(file_path: str) -> int:
+    """Count the data rows of a CSV file: its lines, minus a header line with non-numeric fields."""
+    lines = 0
+    last = b"\n"
+    with open(file_path, "rb") as f:
+        first_line = f.readline().lstrip(b"\x00")
+        f.seek(0)
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    try:
+        [float(field) for field in first_line.decode("utf-8", errors="replace").split(",") if field.strip()]
+        has_header = False
+    except ValueError:
+        has_header = True
+    return max(lines - has_header, 0)
+
+
+def _haversine_distance(lat: np.ndarray, lon: np.ndarray) -> float:
+    """Sum of the great-circle distances between consecutive GPS positions [m]."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    a = (np.sin(np.diff(lat) / 2.0) ** 2
+         + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2.0) ** 2)
+    return float(np.sum(2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))))
+
+
+def index_trip(trip_path: str) -> Dict[str, Any]:
+    """
+    Read the catalog record of a trip.
+
+    Only the time columns, the driving mode and the route columns are loaded; signals and
+    sample rates come from the schema scan (see utils.data_loaders.csv_schema_scanner).
+
+    Args:
+        trip_path: Trip folder
+
+    Returns:
+        Record with the trips table columns plus "files" [(file, size, mtime_ns, rows)],
+        "signals" [name] and "driving_modes" {mode: seconds}
+    """
+    from utils.data_loaders.csv_schema_scanner import scan_trip_folder, iter_signal_columns, load_csv_columns
+
+    record = {"path": trip_path, "name": os.path.basename(os.path.normpath(trip_path)),
+              "files": [], "signals": [], "driving_modes": {}}
+
+    for entry in sorted(os.scandir(trip_path), key=lambda e: e.name):
+        if entry.is_file() and entry.name.endswith(".csv"):
+            stat = entry.stat()
+            record["files"].append((entry.name, stat.st_size, stat.st_mtime_ns, _count_rows(entry.path)))
+
+    schemas = scan_trip_folder(trip_path)
+    record["signals"] = [signal for signal, _, _ in iter_signal_columns(schemas)]
+
+    def load(file_name, *columns):
+        """Load columns of a scanned file (time column first, in ms), or None."""
+        schema = schemas.get(file_name)
+        if schema is None or schema["time_column"] is None:
+            return None
+        names = [column["name"] for column in schema["columns"]]
+        if any(column not in names for column in columns):
+            return None
+        # Bypass the process-wide data cache: indexing touches every file only once
+        df = load_csv_columns.uncached(os.path.join(trip_path, file_name), schema, [schema["time_column"], *columns])
+        arrays = [df[column].to_numpy() for column in df.columns]
+        arrays[0] = arrays[0] * (1.0 if schema["time_unit"] == "ms" else 1000.0)
+        valid = np.all([np.isfinite(a) for a in arrays], axis=0)
+        return [a[valid] for a in arrays]
+
+    # Trip extent: files whose timestamps resolve the sample period (some logs write
+    # coarse timestamps such as 1.72604e+09, which would move the extent by minutes)
+    starts, ends = [], []
+    for file_name, schema in schemas.items():
+        if schema["sample_rate_hz"] is None:
+            continue
+        timestamps, = load(file_name)
+        if len(timestamps):
+            starts.append(float(timestamps.min()))
+            ends.append(float(timestamps.max()))
+    if starts:
+        record["start_ms"], record["end_ms"] = min(starts), max(ends)
+        record["duration_s"] = (record["end_ms"] - record["start_ms"]) / 1000.0
+
+    driving_mode = load(*DRIVING_MODE_SOURCE)
+    if driving_mode is not None and len(driving_mode[0]) > 1:
+        timestamps, modes = driving_mode
+        order = np.argsort(timestamps, kind="stable")
+        # Each sample holds until the next one
+        durations = np.diff(timestamps[order]) / 1000.0
+        unique_modes, inverse = np.unique(modes[order][:-1], return_inverse=True)
+        record["driving_modes"] = dict(zip(unique_modes.tolist(), np.bincount(inverse, weights=durations).tolist()))
+
+    gps = load(*GPS_ROUTE_SOURCE)
+    if gps is not None and len(gps[0]):
+        _, lat, lon = gps
+        record.update(min_lat=float(lat.min()), max_lat=float(lat.max()),
+                      min_lon=float(lon.min()), max_lon=float(lon.max()),
+                      distance_m=_haversine_distance(lat, lon))
+
+    pose = load(*POSE_ROUTE_SOURCE)
+    if pose is not None and len(pose[0]):
+        _, x, y = pose
+        record.update(min_x=float(x.min()), max_x=float(x.max()), min_y=float(y.min()), max_y=float(y.max()),
+                      distance_m=float(np.sum(np.hypot(np.diff(x), np.diff(y)))))
+    return record
+
+
+class TripCatalog:
+    """
+    SQLite catalog of trips.
+
+    A catalog connection belongs to the thread that created it; background indexing opens
+    its own TripCatalog on the same file (the database runs in WAL mode, so readers are not
+    blocked by a refresh).
+
+    Attributes:
+        db_path (str): Catalog database file
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, timeout=30.0)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            with self.connection:
+                for table in ("trips", "files", "signals", "driving_modes"):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def _delete_trip(self, path: str) -> None:
+        for table, column in (("trips", "path"), ("files", "trip"), ("signals", "trip"), ("driving_modes", "trip")):
+            self.connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (path,))
+
+    def _write_trip(self, record: Dict[str, Any], signature: str) -> None:
+        with self.connection:
+            self._delete_trip(record["path"])
+            values = {column: record.get(column) for column in _TRIP_COLUMNS}
+            values.update(signature=signature, indexed_at=time.time())
+            self.connection.execute(
+                f"INSERT INTO trips ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                list(values.values()))
+            self.connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                                        [(record["path"], *f) for f in record.get("files", [])])
+            self.connection.executemany("INSERT INTO signals VALUES (?, ?)",
+                                        [(record["path"], s) for s in record.get("signals", [])])
+            self.connection.executemany("INSERT INTO driving_modes VALUES (?, ?, ?)",
+                                        [(record["path"], m, d) for m, d in record.get("driving_modes", {}).items()])
+
+    def refresh(self, root: str, max_workers: Optional[int] = None,
+                progress: Optional[Callable[[int, int, str], None]] = None,
+                should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Bring the catalog up to date with the trips below a root.
+
+        Args:
+            root: Trips root
+            max_workers: Threads reading trips (default: min(8, CPU count))
+            progress: Called with (done, total, trip path) after each re-indexed trip
+            should_stop: Polled between trips; returning True ends the refresh early
+
+        Returns:
+            Counts of "indexed", "unchanged", "removed" and "failed" trips
+        """
+        root = os.path.abspath(os.path.expanduser(root)).rstrip(os.sep) + os.sep
+        trips = find_trip_folders(root)
+        known = {row["path"]: row["signature"] for row in self.connection.execute("SELECT path, signature FROM trips")
+                 if row["path"].startswith(root)}
+
+        removed = set(known) - set(trips)
+        if removed:
+            with self.connection:
+                for path in removed:
+                    self._delete_trip(path)
+
+        signatures = {}
+        for path in trips:
+            try:
+                signatures[path] = trip_signature(path)
+            except OSError as e:
+                logger.warning(f"Could not read trip {path}: {e}")
+        changed = [path for path, signature in signatures.items() if known.get(path) != signature]
+        counts = {"indexed": 0, "unchanged": len(signatures) - len(changed), "removed": len(removed), "failed": 0}
+
+        def read(path):
+            if should_stop is not None and should_stop():
+                return None
+            try:
+                return index_trip(path)
+            except Exception as e:
+                logger.warning(f"Could not index trip {path}: {e}")
+                return {"path": path, "name": os.path.basename(os.path.normpath(path)), "error": str(e)}
+
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for done, record in enumerate(executor.map(read, changed), 1):
+                if record is None:
+                    break
+                # A failed trip keeps its signature, so it is retried only once its files change
+                self._write_trip(record, signatures[record["path"]])
+                counts["failed" if record.get("error") else "indexed"] += 1
+                if progress is not None:
+                    progress(done, len(changed), record["path"])
+        logger.info(f"Catalog refresh of {root}: {counts}")
+        return counts
+
+    def query(self, min_duration_s: Optional[float] = None, max_duration_s: Optional[float] = None,
+              driving_mode: Optional[float] = None, min_mode_duration_s: float = 0.0,
+              bbox: Optional[Tuple[float, float, float, float]] = None,
+              geo_bbox: Optional[Tuple[float, float, float, float]] = None,
+              signals: Sequence[str] = (), name: Optional[str] = None,
+              start_after_ms: Optional[float] = None, start_before_ms: Optional[float] = None,
+              root: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find trips matching all given filters, ordered by start time.
+
+        Args:
+            min_duration_s, max_duration_s: Trip duration range
+            driving_mode: Only trips that spent more than min_mode_duration_s in this driving mode
+            min_mode_duration_s: Minimum time in the driving mode [s]
+            bbox: (min_x, min_y, max_x, max_y) the local car pose route must intersect [m]
+            geo_bbox: (min_lat, min_lon, max_lat, max_lon) the GPS route must intersect
+            signals: Signals the trip must provide ("<file stem>.<column>")
+            name: Substring of the trip folder name
+            start_after_ms, start_before_ms: Trip start range (epoch milliseconds)
+            root: Only trips below this root
+            limit: Maximum number of trips
+
+        Returns:
+            One dictionary per trip with the trips table columns
+        """
+        conditions, params = ["error IS NULL"], []
+        if min_duration_s is not None:
+            conditions.append("duration_s >= ?")
+            params.append(min_duration_s)
+        if max_duration_s is not None:
+            conditions.append("duration_s <= ?")
+            params.append(max_duration_s)
+        if start_after_ms is not None:
+            conditions.append("start_ms >= ?")
+            params.append(start_after_ms)
+        if start_before_ms is not None:
+            conditions.append("start_ms <= ?")
+            params.append(start_before_ms)
+        if driving_mode is not None:
+            conditions.append("EXISTS (SELECT 1 FROM driving_modes m WHERE m.trip = trips.path "
+                              "AND m.mode = ? AND m.duration_s > ?)")
+            params.extend([driving_mode, min_mode_duration_s])
+        if bbox is not None:
+            min_x, min_y, max_x, max_y = bbox
+            conditions.append("max_x >= ? AND min_x <= ? AND max_y >= ? AND min_y <= ?")
+            params.extend([min_x, max_x, min_y, max_y])
+        if geo_bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = geo_bbox
+            conditions.append("max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?")
+            params.extend([min_lat, max_lat, min_lon, max_lon])
+        for signal in signals:
+            conditions.append("EXISTS (SELECT 1 FROM signals s WHERE s.trip = trips.path AND s.signal = ?)")
+            params.append(signal)
+        if name:
+            conditions.append("instr(name, ?) > 0")
+            params.append(name)
+        if root is not None:
+            prefix = os.path.abspath(os.path.expanduser(root)).rstrip(os.sep) + os.sep
+            conditions.append("substr(path, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+
+        sql = (f"SELECT {', '.join(_TRIP_COLUMNS)} FROM trips WHERE {' AND '.join(conditions)} "
+               f"ORDER BY start_ms, path")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def get_trip(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the full record of a trip.
+
+        Returns:
+            The trips table columns plus "files", "signals" and "driving_modes", or None
+        """
+        row = self.connection.execute(f"SELECT {', '.join(_TRIP_COLUMNS)} FROM trips WHERE path = ?",
+                                      (path,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["files"] = [tuple(r) for r in self.connection.execute(
+            "SELECT file, size, mtime_ns, rows FROM files WHERE trip = ? ORDER BY file", (path,))]
+        record["signals"] = [r[0] for r in self.connection.execute(
+            "SELECT signal FROM signals WHERE trip = ? ORDER BY signal", (path,))]
+        record["driving_modes"] = {r[0]: r[1] for r in self.connection.execute(
+            "SELECT mode, duration_s FROM driving_modes WHERE trip = ? ORDER BY mode", (path,))}
+        return record
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""
+A/B trip comparison for the Debug Player.
+
+In comparison mode the plugins are instantiated once per trip. Trip A is registered as
+usual. Each plugin of trip B is wrapped in a ComparisonPlugin, which serves its signals
+under suffixed names ("current_speed [B]") on the time base of trip A: both trips are
+aligned at their start (the first slider timestamp), optionally shifted by an explicit
+offset, so one slider position shows the same relative time of both trips.
+
+For every temporal signal available in both trips with a full series, a diff signal
+("current_speed [A-B]") is registered as a derived signal. It is evaluated once over the
+aligned timeline of trip A (see core.derived_signals), not per frame.
+
+If both trips have planned paths, a PathDivergencePlugin serves the per-cycle distance
+between corresponding paths (Hausdorff, discrete Frechet, mean lateral deviation, see
+utils.path_analysis.path_comparison) as temporal signals.
+"""
+
+import logging
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.derived_signals import align_series
+from interfaces.PluginBase import PluginBase
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the signals of trip B
+COMPARISON_SUFFIX = " [B]"
+
+# Suffix of the A - B difference signals
+DIFF_SUFFIX = " [A-B]"
+
+# Signal holding the trip timeline (the slider timestamps)
+TIMELINE_SIGNAL = "timestamps"
+
+# Plugin name of the PathDivergencePlugin
+PATH_DIVERGENCE_PLUGIN_NAME = "path_divergence"
+
+# Path divergence signals: signal name -> column of utils.path_analysis.path_comparison.compare_trips
+PATH_DIVERGENCE_SIGNALS = {
+    "path_divergence_hausdorff": "hausdorff_m",
+    "path_divergence_frechet": "frechet_m",
+    "path_divergence_lateral": "mean_lateral_deviation_m",
+}
+
+
+def comparison_name(signal: str) -> str:
+    """Get the name of a signal of trip B."""
+    return f"{signal}{COMPARISON_SUFFIX}"
+
+
+def diff_name(signal: str) -> str:
+    """Get the name of the A - B difference of a signal."""
+    return f"{signal}{DIFF_SUFFIX}"
+
+
+def is_comparison_signal(signal: str) -> bool:
+    """Check whether a signal belongs to trip B."""
+    return signal.endswith(COMPARISON_SUFFIX)
+
+
+def base_signal_name(signal: str) -> str:
+    """Get the trip A signal a trip B or difference signal is derived from."""
+    for suffix in (COMPARISON_SUFFIX, DIFF_SUFFIX):
+        if signal.endswith(suffix):
+            return signal[:-len(suffix)]
+    return signal
+
+
+def comparison_companions(signal: str) -> List[str]:
+    """Get the names of the trip B and difference signals of a trip A signal."""
+    return [comparison_name(signal), diff_name(signal)]
+
+
+def trip_start_ms(plugins: Dict[str, Any]) -> Optional[float]:
+    """
+    Get the start of a trip in milliseconds.
+
+    The start is the first timestamp of the timeline signal if a plugin provides it,
+    otherwise the earliest first sample of all signals with a full series.
+
+    Args:
+        plugins: {plugin name: plugin instance} of the trip
+
+    Returns:
+        The start timestamp, or None if no plugin provides timestamps
+    """
+    for plugin in plugins.values():
+        signal_info = plugin.signals.get(TIMELINE_SIGNAL)
+        if signal_info is not None:
+            timestamps = np.asarray(signal_info["func"](), dtype=np.float64)
+            if len(timestamps):
+                return float(timestamps[0])
+
+    starts = []
+    for plugin in plugins.values():
+        for signal_info in plugin.signals.values():
+            series = signal_info.get("series")
+            if callable(series):
+                timestamps, _ = series()
+                if len(timestamps):
+                    starts.append(float(np.min(timestamps)))
+    return min(starts) if starts else None
+
+
+class ComparisonPlugin(PluginBase):
+    """
+    Serves the signals of a trip B plugin under suffixed names, on the time base of trip A.
+
+    A request for time t (trip A) is answered with the trip B data at t + offset_ms, and
+    full series are shifted by -offset_ms, so derived signals align both trips directly.
+
+    Attributes:
+        plugin: The wrapped trip B plugin instance
+        offset_ms (float): Trip B time minus trip A time [ms]
+    """
+
+    def __init__(self, plugin: Any, offset_ms: float = 0.0):
+        super().__init__(plugin.file_path)
+        self.plugin = plugin
+        self.offset_ms = float(offset_ms)
+
+        self.signals = {}
+        for signal, signal_info in plugin.signals.items():
+            definition = {key: value for key, value in signal_info.items() if key not in ("plugin", "series")}
+            if callable(signal_info.get("series")):
+                definition["series"] = partial(self.get_series, signal)
+            definition["source_signal"] = signal
+            definition["trip"] = "B"
+            self.signals[comparison_name(signal)] = definition
+
+    def get_series(self, signal: str):
+        """Get the full series of a trip B signal on the time base of trip A."""
+        timestamps, values = self.plugin.signals[signal]["series"]()
+        return np.asarray(timestamps, dtype=np.float64) - self.offset_ms, values
+
+    def has_signal(self, signal: str) -> bool:
+        """Check if this plugin provides the requested signal."""
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal: str, timestamp: float) -> Optional[Any]:
+        """Fetch the trip B data of a signal at a trip A timestamp (in milliseconds)."""
+        if signal not in self.signals:
+            return None
+        return self.plugin.get_data_for_timestamp(base_signal_name(signal), timestamp + self.offset_ms)
+
+    def get_data_for_timestamps(self, signal: str, timestamps) -> np.ndarray:
+        """Fetch the trip B values of a signal at many trip A timestamps (in milliseconds)."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        return self.plugin.get_data_for_timestamps(base_signal_name(signal), timestamps + self.offset_ms)
+
+
+class PathDivergencePlugin(PluginBase):
+    """
+    Serves the divergence between the planned paths of trip A and trip B as temporal signals.
+
+    The comparison (utils.path_analysis.path_comparison.compare_trips) runs once: in a background
+    thread after start_comparison(), otherwise on the first request. Afterwards every request is
+    a lookup of the closest compared cycle of trip A. While the background comparison runs,
+    requests return no data (empty series) instead of waiting; on_ready is called from the
+    background thread when the result is there, so the caller can refresh. A failed comparison
+    is logged once and leaves an empty table (error holds the message); it is not retried.
+
+    Attributes:
+        path_trajectory_a, path_trajectory_b: The PathTrajectory objects of both trips
+        offset_ms (float): Trip B time minus trip A time [ms]
+        max_workers (int): Worker processes of the comparison
+        on_ready (callable): Called without arguments after the background comparison, or None
+        error (str): Message of the failed comparison, or None
+    """
+
+    def __init__(self, path_trajectory_a: Any, path_trajectory_b: Any, offset_ms: float = 0.0, max_workers: int = 1,
+                 on_ready: Optional[Callable[[], None]] = None):
+        super().__init__(getattr(path_trajectory_a, "file_path", None))
+        self.path_trajectory_a = path_trajectory_a
+        self.path_trajectory_b = path_trajectory_b
+        self.offset_ms = float(offset_ms)
+        self.max_workers = max_workers
+        self.on_ready = on_ready
+        self.error = None
+        self._divergence = None
+        self._lock = threading.Lock()
+        self._comparison_thread = None
+
+        self.signals = {
+            signal: {"func": partial(self.get_data_for_timestamp, signal), "type": "temporal", "mode": "dynamic",
+                     "series": partial(self.get_series, signal), "units": "m"}
+            for signal in PATH_DIVERGENCE_SIGNALS
+        }
+
+    def start_comparison(self):
+        """Start computing the divergence table in a background thread, so the GUI thread does not wait for it."""
+        if self._divergence is None and self._comparison_thread is None:
+            self._comparison_thread = threading.Thread(target=self._compare_in_background, daemon=True,
+                                                       name="path-divergence")
+            self._comparison_thread.start()
+
+    def _compare_in_background(self):
+        self.get_divergence()
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def is_comparing(self) -> bool:
+        """Check whether the background comparison is still running."""
+        return self._divergence is None and self._comparison_thread is not None and self._comparison_thread.is_alive()
+
+    def get_divergence(self):
+        """
+        Get the per-cycle divergence table, computing it on first use.
+
+        Returns:
+            pd.DataFrame: Output of compare_trips (timestamp, timestamp_b, path indices and metrics);
+                empty if the comparison failed.
+        """
+        with self._lock:
+            if self._divergence is None:
+                import pandas as pd
+                from utils.path_analysis.path_comparison import METRIC_COLUMNS, compare_trips
+                try:
+                    self._divergence = compare_trips(self.path_trajectory_a, self.path_trajectory_b,
+                                                     offset_ms=self.offset_ms, max_workers=self.max_workers)
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    logger.warning(f"Path divergence comparison failed: {self.error}")
+                    columns = ["timestamp", "timestamp_b", "path_idx_a", "path_idx_b"] + METRIC_COLUMNS
+                    self._divergence = pd.DataFrame({column: np.empty(0) for column in columns})
+            return self._divergence
+
+    def get_series(self, signal: str):
+        """Get the full series of a divergence signal on the time base of trip A (empty while comparing)."""
+        if self.is_comparing():
+            return np.empty(0), np.empty(0)
+        divergence = self.get_divergence()
+        return (divergence["timestamp"].to_numpy(dtype=np.float64),
+                divergence[PATH_DIVERGENCE_SIGNALS[signal]].to_numpy(dtype=np.float64))
+
+    def has_signal(self, signal: str) -> bool:
+        """Check if this plugin provides the requested signal."""
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal: str, timestamp: float) -> Optional[float]:
+        """Fetch the divergence of the closest compared cycle at a trip A timestamp (in milliseconds)."""
+        if signal not in self.signals:
+            return None
+        values = self.get_data_for_timestamps(signal, [timestamp])
+        return None if np.isnan(values[0]) else float(values[0])
+
+    def get_data_for_timestamps(self, signal: str, timestamps) -> np.ndarray:
+        """Fetch the divergence of the closest compared cycles at many trip A timestamps (in milliseconds)."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        signal_timestamps, values = self.get_series(signal)
+        return align_series(timestamps, signal_timestamps, values, align="nearest")
+
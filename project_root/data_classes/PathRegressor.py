@@ -1,17 +1,161 @@
 # PathRegressor.py
 import os
 import sys
-import pickle
 import pandas as pd
 import numpy as np
+import polars as pl
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from data_classes.PathTrajectory_pandas import PathTrajectory
-from typing import TypeAlias
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from data_classes.PathTrajectoryBase import PathTrajectoryBase
+from utils.path_analysis.csr_paths import (CsrPaths, arc_length, gather_windows, nearest_arc_length_index,
+                                           transform_paths)
+from utils.path_analysis.kinematics import KINEMATIC_COLUMNS, path_kinematics, path_kpis, speed_profile, trip_kpis
+from utils.path_analysis.result_cache import ResultCache, cache_key, file_content_hash
+from typing import NamedTuple, TypeAlias
 
 # Custom type alias for DataFrame with specific columns
 PathDataFrame: TypeAlias = pd.DataFrame
 
+# Columns of the virtual path array v_p; the kinematic columns come from utils.path_analysis.kinematics
+V_P_COLUMNS = ["x", "y", "timestamp_idx", "timestamp", "speed", "yaw_angle_rad"] + KINEMATIC_COLUMNS
+
+
+class PathPrecomputation(NamedTuple):
+    """ Per-path products that do not depend on delta_t_sec, pts_before or pts_after. """
+    world: CsrPaths          # Paths in world coordinates
+    arc_lengths: np.ndarray  # Arc length of every path point [m]
+    speeds: np.ndarray       # current_speed_mps of every path
+    timestamps: np.ndarray   # Timestamp of every path [ms]
+    yaw_rad: np.ndarray      # Heading of the image pose of every path, wrapped to [-pi, pi]
+    pose_x: np.ndarray       # Image pose of every path [m]
+    pose_y: np.ndarray
+    kinematics: np.ndarray   # Kinematics of every path point, [num_points x len(KINEMATIC_COLUMNS)]
+
+
+# Grids with at least this many distinct delta_t_sec are swept on a process pool (if max_workers > 1).
+# Starting a worker costs seconds (imports), one look-ahead search milliseconds on a typical trip.
+SWEEP_POOL_MIN_DELTA_T = 256
+
+# Columns of the sweep KPI table besides the parameters
+SWEEP_KPI_COLUMNS = ["num_points", "num_paths", "lookahead_error_mean_m", "lookahead_error_p95_m",
+                     "lookahead_error_max_m"]
+
+
+def virtual_path_points(pre, delta_t_sec, pts_before, pts_after, mid_indices=None):
+    """
+    Extract the virtual path of one parameter set from the shared per-path products.
+
+    Args:
+        pre (PathPrecomputation): The per-path products (see PathRegressor.precompute).
+        delta_t_sec (float): Look-ahead time; the window is centered on the delta_t_sec * speed point.
+        pts_before (int): Points before the look-ahead point.
+        pts_after (int): Points after the look-ahead point.
+        mid_indices (np.ndarray): Look-ahead point of each path, if already computed for delta_t_sec.
+
+    Returns:
+        np.array: [num_points x len(V_P_COLUMNS)] array with the extracted points, in path order.
+    """
+    if mid_indices is None:
+        mid_indices = nearest_arc_length_index(pre.world, pre.arc_lengths, delta_t_sec * pre.speeds)
+    indices, path_idx = gather_windows(pre.world, mid_indices, int(pts_before), int(pts_after))
+
+    v_p = np.full((len(indices), len(V_P_COLUMNS)), np.nan)
+    v_p[:, 0] = pre.world.x[indices]
+    v_p[:, 1] = pre.world.y[indices]
+    v_p[:, 2] = path_idx
+    v_p[:, 3] = pre.timestamps[path_idx]
+    v_p[:, 4] = pre.speeds[path_idx]
+    v_p[:, 5] = pre.yaw_rad[path_idx]
+    v_p[:, 6:] = pre.kinematics[indices]
+    return v_p
+
+
+def lookahead_errors(pre, delta_t_sec, mid_indices):
+    """
+    Distance between the look-ahead point of every path and where the car actually was
+    delta_t_sec later (the image pose interpolated at timestamp + delta_t_sec).
+
+    Returns:
+        np.ndarray: The error of every path with a look-ahead point inside the trip [m].
+    """
+    order = np.argsort(pre.timestamps, kind='stable')
+    timestamps = pre.timestamps[order]
+    target_ms = pre.timestamps + delta_t_sec * 1000.0
+    valid = (mid_indices >= 0) & (target_ms <= timestamps[-1]) if len(timestamps) else mid_indices >= 0
+    if not valid.any():
+        return np.empty(0)
+    points = pre.world.offsets[:-1][valid] + mid_indices[valid]
+    actual_x = np.interp(target_ms[valid], timestamps, pre.pose_x[order])
+    actual_y = np.interp(target_ms[valid], timestamps, pre.pose_y[order])
+    return np.hypot(pre.world.x[points] - actual_x, pre.world.y[points] - actual_y)
+
+
+def sweep_delta_t(pre, delta_t_sec, windows):
+    """
+    Evaluate all window sizes of one delta_t_sec: the look-ahead points are searched once and
+    only the window gather is repeated per (pts_before, pts_after).
+
+    Args:
+        pre (PathPrecomputation): The per-path products.
+        delta_t_sec (float): Look-ahead time.
+        windows (list): (pts_before, pts_after) pairs.
+
+    Returns:
+        list: (params dict, v_p, KPI dict) per window.
+    """
+    mid_indices = nearest_arc_length_index(pre.world, pre.arc_lengths, delta_t_sec * pre.speeds)
+    errors = lookahead_errors(pre, delta_t_sec, mid_indices)
+    error_kpis = {
+        'lookahead_error_mean_m': float(errors.mean()) if len(errors) else np.nan,
+        'lookahead_error_p95_m': float(np.percentile(errors, 95)) if len(errors) else np.nan,
+        'lookahead_error_max_m': float(errors.max()) if len(errors) else np.nan,
+    }
+    results = []
+    for pts_before, pts_after in windows:
+        v_p = virtual_path_points(pre, delta_t_sec, pts_before, pts_after, mid_indices)
+        kpis = {'num_points': len(v_p), 'num_paths': int(np.count_nonzero(mid_indices >= 0)), **error_kpis}
+        params = {'delta_t_sec': float(delta_t_sec), 'pts_before': int(pts_before), 'pts_after': int(pts_after)}
+        results.append((params, v_p, kpis))
+    return results
+
+
+# Per-path products of the sweep worker processes, sent once per worker by the pool initializer
+_worker_precomputation = None
+
+
+def _init_sweep_worker(pre):
+    global _worker_precomputation
+    _worker_precomputation = pre
+
+
+def _sweep_worker(args):
+    delta_t_sec, windows = args
+    return sweep_delta_t(_worker_precomputation, delta_t_sec, windows)
+
+
+def expand_param_grid(param_grid):
+    """
+    Expand a parameter grid into parameter sets.
+
+    Args:
+        param_grid (dict | list): Either {name: [values]} (all combinations) or a list of
+            parameter dicts. Missing parameters keep the given defaults.
+
+    Returns:
+        list: Parameter dicts with delta_t_sec, pts_before and pts_after.
+    """
+    if isinstance(param_grid, dict):
+        names = list(param_grid)
+        param_sets = [dict(zip(names, values)) for values in product(*(param_grid[name] for name in names))]
+    else:
+        param_sets = [dict(params) for params in param_grid]
+    for params in param_sets:
+        unknown = set(params) - {'delta_t_sec', 'pts_before', 'pts_after'}
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters {sorted(unknown)}")
+    return param_sets
+
 
 class PathRegressor:
     """ The class is used to generate a regression model for the path data. 
@@ -24,13 +168,13 @@ class PathRegressor:
     - Generate a an equivalent trajectory from the the extracted points. 
     - Evaluate KPI of the generated trajectory.    
     """
-    def __init__(self, pathobj:PathTrajectory = None, trip_name = None, carpose= None, CACHE_DIR = "cache", delta_t_sec=0.1, pts_before=0, pts_after=0, max_workers= 1):
+    def __init__(self, pathobj:PathTrajectoryBase = None, trip_name = None, carpose= None, CACHE_DIR = "cache", delta_t_sec=0.1, pts_before=0, pts_after=0, max_workers= 1):
         self.pathobj = pathobj
         self.trip_name = trip_name
         if pathobj:
             self.df_path = pathobj.df_path
             self.df_path_xy = pathobj.df_path_xy
-            self.time_data = pathobj.get_timestamps()
+            self.time_data = pathobj.get_timestamps_ms()
         if carpose is not None:
             self.carpose = carpose
         self.CACHE_DIR = CACHE_DIR
@@ -43,6 +187,8 @@ class PathRegressor:
         self.df_key_points = None   # New attribute to store the key points
         self.df_trajectory = None   # New attribute to store the trajectory
         self.kpi = None            # New attribute to store the KPI
+        self.df_path_kpis = None   # Kinematic KPIs of every path
+        self._precomputation = None
         
     def update_params(self, params_dict):
         """ Update the parameters of the path regressor. """
@@ -72,11 +218,20 @@ class PathRegressor:
         
         return self.df_trajectory   
     
-    def evaluate_kpi(self, df_trajectory):
-        """ Evaluate KPI of the generated trajectory. """
-        # Evaluate KPI of the generated trajectory
-        self.kpi = self.pathobj.evaluate_kpi(df_trajectory)
-        
+    def evaluate_kpi(self, df_trajectory=None):
+        """
+        Evaluate the kinematic KPIs of all planned paths (see utils.path_analysis.kinematics).
+
+        Args:
+            df_trajectory: Unused; kept for existing callers.
+
+        Returns:
+            dict: Median, 95th percentile and maximum over the paths of the per-path maxima of
+                curvature, accelerations and jerks. The per-path values are in self.df_path_kpis.
+        """
+        pre = self.precompute()
+        self.df_path_kpis = path_kpis(pre.world, pre.arc_lengths, pre.kinematics, pre.timestamps)
+        self.kpi = trip_kpis(self.df_path_kpis)
         return self.kpi
     
     def extract_path_points_at_timestamp(self, path, timestamp: float, speed: float):      
@@ -125,91 +280,192 @@ class PathRegressor:
 
         return extracted_points
     
+    def params(self):
+        """ Get the parameters the virtual path depends on. """
+        return {'delta_t_sec': float(self.delta_t_sec), 'pts_before': int(self.pts_before),
+                'pts_after': int(self.pts_after)}
+
+    def data_key(self):
+        """ Get the key of the path data: its loader class and the content hash of its source file (None if unknown).
+        The loaders differ in details of the loaded data (pandas floors timestamps to ms, polars keeps fractions),
+        so results of one loader are not served to another. """
+        file_path = getattr(self.pathobj, 'file_path', None)
+        if file_path is None or not os.path.exists(file_path):
+            return None
+        return f'{type(self.pathobj).__name__}:{file_content_hash(file_path)}'
+
+    def result_cache(self):
+        """ Get the result cache, or None if caching is disabled (CACHE_DIR None) or the data has no key. """
+        if not self.CACHE_DIR or self.data_key() is None:
+            return None
+        return ResultCache(self.CACHE_DIR)
+
+    def precompute(self):
+        """
+        Compute the per-path products shared by all parameter sets: the paths in world coordinates,
+        their arc lengths, speeds, timestamps, headings and kinematics. They are kept in memory and in the
+        result cache, so changing delta_t_sec / pts_before / pts_after only redoes the extraction.
+
+        Returns:
+            PathPrecomputation: The shared products.
+        """
+        if self._precomputation is not None:
+            return self._precomputation
+
+        cache = self.result_cache()
+        key = cache_key('path_precomputation', self.data_key()) if cache else None
+        arrays = cache.load_arrays(key) if cache else None
+        if arrays is not None:
+            world = CsrPaths(arrays['x'], arrays['y'], arrays['offsets'])
+            self._precomputation = PathPrecomputation(world, arrays['arc_lengths'], arrays['speeds'],
+                                                      arrays['timestamps'], arrays['yaw_rad'],
+                                                      arrays['pose_x'], arrays['pose_y'], arrays['kinematics'])
+            return self._precomputation
+
+        pose_x, pose_y, pose_yaw = self.pathobj.get_image_poses()
+        ego = self.pathobj.get_paths_csr()
+        world = transform_paths(ego, pose_x, pose_y, pose_yaw)
+        arc_lengths = arc_length(world)
+        speeds = self.pathobj.get_current_speeds()
+        self._precomputation = PathPrecomputation(
+            world=world,
+            arc_lengths=arc_lengths,
+            speeds=speeds,
+            timestamps=np.asarray(self.time_data),
+            # Heading of the image pose, wrapped like the angle of its rotation matrix
+            yaw_rad=np.arctan2(np.sin(pose_yaw), np.cos(pose_yaw)),
+            pose_x=np.asarray(pose_x, dtype=np.float64),
+            pose_y=np.asarray(pose_y, dtype=np.float64),
+            # In the ego frame, so the longitudinal/lateral components are relative to the car
+            kinematics=path_kinematics(ego, arc_lengths,
+                                       speed_profile(ego, arc_lengths, speeds, self.pathobj.get_target_speeds())),
+        )
+        if cache:
+            arrays = {'x': world.x, 'y': world.y, 'offsets': world.offsets,
+                      **{name: value for name, value in self._precomputation._asdict().items() if name != 'world'}}
+            cache.save_arrays(key, arrays, {'kind': 'path_precomputation', 'trip_name': self.trip_name,
+                                            'source_file': self.pathobj.file_path})
+        return self._precomputation
+
+    def extract_virtual_path(self):
+        """
+        Extract the path points around the delta_t_sec * speed point of every path, for all paths at once.
+
+        Returns:
+            pd.DataFrame: The extracted path points (x, y, timestamp_idx, timestamp), in path order.
+            np.array: [num_points x len(V_P_COLUMNS)] array with the extracted points and other metrics.
+
+        Algorithm Description:
+            The paths are kept in CSR layout (utils.path_analysis.csr_paths) and transformed to world
+            coordinates with their image poses in bulk (see precompute). The arc length is a segmented
+            cumsum, the point closest to delta_t_sec * speed is found with a segmented searchsorted, and
+            the windows [mid - pts_before, mid + pts_after] are gathered with one index array. The result
+            equals extract_virtual_path_per_timestamp.
+        """
+        v_p = virtual_path_points(self.precompute(), self.delta_t_sec, self.pts_before, self.pts_after)
+        return self.virtual_path_frame(v_p), v_p
+
+    def sweep(self, param_grid, max_workers=None):
+        """
+        Extract the virtual path and its KPIs for every parameter set of a grid.
+
+        The per-path products (see precompute) are computed once for the whole grid. Parameter
+        sets are grouped by delta_t_sec, so the look-ahead point search runs once per distinct
+        delta_t_sec and each window size is a single gather. Grids with at least
+        SWEEP_POOL_MIN_DELTA_T distinct delta_t_sec are spread over a process pool when
+        max_workers > 1; each worker receives the per-path products once.
+
+        Args:
+            param_grid (dict | list): {name: [values]} or a list of parameter dicts (see
+                expand_param_grid); parameters not given keep the regressor's values.
+            max_workers (int): Worker processes (default: self.max_workers).
+
+        Returns:
+            pd.DataFrame: The virtual path points of all parameter sets: param_set, the parameters,
+                then x, y, timestamp_idx, timestamp, speed and yaw_angle_rad, in path order.
+            pd.DataFrame: One row per parameter set: param_set, the parameters and SWEEP_KPI_COLUMNS.
+        """
+        max_workers = max_workers or self.max_workers
+        param_sets = [{**self.params(), **params} for params in expand_param_grid(param_grid)]
+        pre = self.precompute()
+
+        groups = {}
+        for params in param_sets:
+            groups.setdefault(float(params['delta_t_sec']), []).append((params['pts_before'], params['pts_after']))
+        tasks = list(groups.items())
+
+        if max_workers > 1 and len(tasks) >= SWEEP_POOL_MIN_DELTA_T:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)),
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_sweep_worker, initargs=(pre,)) as executor:
+                group_results = list(executor.map(_sweep_worker, tasks))
+        else:
+            group_results = [sweep_delta_t(pre, delta_t_sec, windows) for delta_t_sec, windows in tasks]
+        results = {(p['delta_t_sec'], p['pts_before'], p['pts_after']): (v_p, kpis)
+                   for group in group_results for p, v_p, kpis in group}
+
+        point_frames = []
+        kpi_rows = []
+        for param_set, params in enumerate(param_sets):
+            v_p, kpis = results[(float(params['delta_t_sec']), int(params['pts_before']), int(params['pts_after']))]
+            point_frames.append(pd.DataFrame({
+                'param_set': param_set, 'delta_t_sec': float(params['delta_t_sec']),
+                'pts_before': int(params['pts_before']), 'pts_after': int(params['pts_after']),
+                'x': v_p[:, 0], 'y': v_p[:, 1], 'timestamp_idx': v_p[:, 2].astype(np.int64),
+                'timestamp': v_p[:, 3], 'speed': v_p[:, 4], 'yaw_angle_rad': v_p[:, 5]}))
+            kpi_rows.append({'param_set': param_set, 'delta_t_sec': float(params['delta_t_sec']),
+                             'pts_before': int(params['pts_before']), 'pts_after': int(params['pts_after']), **kpis})
+        df_points = pd.concat(point_frames, ignore_index=True) if point_frames else pd.DataFrame()
+        return df_points, pd.DataFrame(kpi_rows)
+
+    def virtual_path_frame(self, v_p):
+        """ Build the df_virt_path DataFrame (x, y, timestamp_idx, timestamp) of a v_p array. """
+        path_idx = v_p[:, 2].astype(np.int64)
+        return pd.DataFrame({'x': v_p[:, 0], 'y': v_p[:, 1], 'timestamp_idx': path_idx,
+                             'timestamp': np.asarray(self.time_data)[path_idx]})
+
     def extract_virtual_path_parallel(self):
         """
-        Extract path points at each timestamp in parallel.                          
-                
+        Extract path points at each timestamp.
+
+        Kept for existing callers: the extraction is vectorized over all paths (see
+        extract_virtual_path), which is faster than any per-timestamp thread pool.
+        """
+        return self.extract_virtual_path()
+
+    def extract_virtual_path_per_timestamp(self):
+        """
+        Reference implementation of extract_virtual_path: one path at a time, through
+        get_path_in_world_coordinates and extract_path_points_at_timestamp. Used by tests and
+        benchmarks to check the vectorized extraction.
+
         Returns:
-            pd.DataFrame: A DataFrame with the extracted path points.
+            pd.DataFrame: The extracted path points.
             np.array: An array with the extracted path points and other metrics.
-            
-        Algorithm Description:
-            For each timestamp, extract path points, compute speed and other metrics.
-            Use ThreadPoolExecutor to parallelize the processing of each timestamp.
         """
-        def process_timestamp(idx, timestamp):
-            """
-            Process a single timestamp: extract path points, compute speed and other metrics.
-            Returns v_p_entry which is a list of the extracted path points and other metrics.
-            """
+        v_p_list = []
+        df_virt_path_list = []
+        for idx, timestamp in enumerate(self.time_data):
             cur_path, carpose_path = self.pathobj.get_path_in_world_coordinates(timestamp)
             speed = self.pathobj.get_current_speed(timestamp)
-            
-            # Extract path points at the timestamp
             extracted_points = self.extract_path_points_at_timestamp(cur_path, timestamp, speed)
             if extracted_points.empty:
-                return None, None
-
-            v_p_entries = []
-            for i in range(len(extracted_points)):
-                x = extracted_points.iloc[i]['x']
-                y = extracted_points.iloc[i]['y']
-                # Collect other data (some of these might not be directly available)
-                yaw_angle_rad = carpose_path.theta() 
-                curvature = np.nan    
-                acceleration = np.nan 
-                jerk = np.nan 
-                # ... and so on for other quantities
-
-                v_p_entry = [
-                    x, y, idx, timestamp, speed, yaw_angle_rad, curvature, acceleration,
-                    jerk,  # jerk
-                    np.nan,  # longitudinal jerk
-                    np.nan,  # lateral jerk
-                    np.nan,  # longitudinal acceleration
-                    np.nan,  # lateral acceleration
-                    np.nan,  # longitudinal velocity
-                    np.nan,  # lateral velocity
-                    np.nan,  # longitudinal position
-                    np.nan,  # lateral position
-                    np.nan,  # longitudinal velocity (again?)
-                ]
-                v_p_entries.append(v_p_entry)
-
-            # Add timestamp index to extracted_points
-            extracted_points['timestamp_idx'] = idx
-            extracted_points['timestamp'] = timestamp
+                continue
 
-            return v_p_entries, extracted_points
-
-        # Initialize lists to collect data
-        v_p_list = []
-        df_virt_path_list = []
+            yaw_angle_rad = np.arctan2(carpose_path[1, 0], carpose_path[0, 0])
+            for x, y in zip(extracted_points['x'], extracted_points['y']):
+                v_p_entry = np.full(len(V_P_COLUMNS), np.nan)
+                v_p_entry[:6] = [x, y, idx, timestamp, speed, yaw_angle_rad]
+                v_p_list.append(v_p_entry)
 
-        # Get all timestamps from PathTrajectory
-        timestamps = self.time_data
+            extracted_points['timestamp_idx'] = idx
+            extracted_points['timestamp'] = timestamp
+            df_virt_path_list.append(extracted_points)
 
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit tasks for each timestamp
-            future_to_timestamp = {executor.submit(process_timestamp, idx, timestamp): timestamp for idx, timestamp in enumerate(timestamps)}
-            
-            # Process the results as they complete
-            for future in as_completed(future_to_timestamp):
-                result = future.result()
-                if result is not None:
-                    v_p_entries, extracted_points = result
-                    if v_p_entries:
-                        v_p_list.extend(v_p_entries)
-                    if not extracted_points.empty:
-                        df_virt_path_list.append(extracted_points)
-
-        # Convert lists to DataFrame and array
         df_virt_path = pd.concat(df_virt_path_list, ignore_index=True) if df_virt_path_list else pd.DataFrame()
-        v_p = np.array(v_p_list) if v_p_list else np.array([])
-
+        v_p = np.array(v_p_list) if v_p_list else np.empty((0, len(V_P_COLUMNS)))
         return df_virt_path, v_p
-     
+
     def run(self):
         """ Run the path regressor. """
         # Extract key points from the path data
@@ -224,34 +480,29 @@ class PathRegressor:
         return self.df_key_points, self.df_trajectory, self.kpi
     
     def save(self):
-            """ Save the path regressor. """
-            # Compose reo_str string made of trip_name, delta_t_sec, pts_before, pts_after
-            repr_str = f'{self.trip_name}_{self.delta_t_sec}_{self.pts_before}_{self.pts_after}'
-                    # Save the data to the cache file
-            
-            CACHE_FILE_PATH = f"{self.CACHE_DIR}/{repr_str}.pkl"
-
-            with open(CACHE_FILE_PATH, 'wb') as cache_file:
-                pickle.dump((self.df_virt_path, self.v_p), cache_file)
-                print(f'Saved virtual points data to cache at {repr_str}.')            
-            
+        """ Store the virtual path in the result cache, keyed by the path data and the parameters. """
+        cache = self.result_cache()
+        if cache is None or self.v_p is None:
             return
+        key = cache_key('virtual_path', self.data_key(), self.params())
+        cache.save_table(key, pl.DataFrame(self.v_p, schema=V_P_COLUMNS, orient='row'),
+                         {'kind': 'virtual_path', 'trip_name': self.trip_name, 'params': self.params(),
+                          'source_file': self.pathobj.file_path, 'data_key': self.data_key()})
+        print(f'Saved virtual points data to cache at {key}.')
+        return
 
     def load(self):
-        """ Load the path regressor. """
-        # Compose reo_str string made of trip_name, delta_t_sec, pts_before, pts_after
-        repr_str = f'{self.trip_name}_{self.delta_t_sec}_{self.pts_before}_{self.pts_after}'
-
-        CACHE_FILE_PATH = f"{self.CACHE_DIR}/{repr_str}.pkl"
-        # check if the cache file exists            
-        if os.path.exists(CACHE_FILE_PATH):
-            with open(CACHE_FILE_PATH, 'rb') as cache_file:
-                df_virt_path, v_p= pickle.load(cache_file)
-                print("Loaded data from cache.")
-                return df_virt_path, v_p
-        else:
+        """ Load the virtual path of the current parameters from the result cache, or None. """
+        cache = self.result_cache()
+        if cache is None:
             return None
-            
+        df = cache.load_table(cache_key('virtual_path', self.data_key(), self.params()))
+        if df is None:
+            return None
+        v_p = df.select(V_P_COLUMNS).to_numpy().astype(float).reshape(-1, len(V_P_COLUMNS))
+        print("Loaded data from cache.")
+        return self.virtual_path_frame(v_p), v_p
+
     def eval(self):
         """ calculate the virtual path and store it in the cache. """                
         # try to load virtual path from cache        
@@ -262,11 +513,11 @@ class PathRegressor:
             self.v_p = v_p
             return 
         else: 
-            # Extract path points at each timestamp in parallel                    
-            df_virt_path, v_p = self.extract_virtual_path_parallel()  
-            # sort df_virt_path and v_p by timestamp
-            self.df_virt_path = df_virt_path.sort_values(by=['timestamp'])
-            self.v_p = v_p[v_p[:, 3].argsort()]                   
+            # Extract path points of all timestamps
+            df_virt_path, v_p = self.extract_virtual_path()
+            # sort df_virt_path and v_p by timestamp, keeping the point order within each path
+            self.df_virt_path = df_virt_path.sort_values(by=['timestamp'], kind='stable')
+            self.v_p = v_p[np.argsort(v_p[:, 3], kind='stable')]
             # Update the cache
             self.save() 
             return                           
@@ -6,9 +6,10 @@ class PathTrajectoryBase(ABC):
     """
     Base class for PathTrajectory implementations.
     """
-    def __init__(self, df_path, path_xy):
+    def __init__(self, df_path, path_xy, file_path=None):
         self.df_path = df_path
         self.df_path_xy = path_xy
+        self.file_path = file_path  # Source file; identifies the data in result caches
 
     @abstractmethod
     def get_timestamps_ms(self):
@@ -22,6 +23,56 @@ class PathTrajectoryBase(ABC):
     def find_path_and_car_pose(self, timestamp):
         pass
 
+    @abstractmethod
+    def get_path_matrices(self):
+        """
+        Gets the path points of all paths as padded float matrices.
+
+        Returns:
+        tuple: (path_x, path_y) [num_paths x max_points] arrays in ego coordinates, NaN-padded.
+        """
+        pass
+
+    def get_paths_csr(self):
+        """
+        Gets all paths in ego coordinates in CSR layout (see utils.path_analysis.csr_paths).
+
+        Returns:
+        CsrPaths: One path per row of df_path.
+        """
+        from utils.path_analysis.csr_paths import paths_to_csr
+        return paths_to_csr(*self.get_path_matrices())
+
+    def get_image_poses(self):
+        """
+        Gets the car pose each path was planned from (the image pose) for all paths.
+
+        Returns:
+        tuple: (x, y, yaw_rad) float arrays with one entry per path.
+        """
+        return tuple(np.asarray(self.df_path[column], dtype=float)
+                     for column in ("w_car_pose_image_x", "w_car_pose_image_y", "w_car_pose_image_yaw_rad"))
+
+    def get_current_speeds(self):
+        """
+        Gets the speed at which each path was planned.
+
+        Returns:
+        np.ndarray: current_speed_mps of every path.
+        """
+        return np.asarray(self.df_path["current_speed_mps"], dtype=float)
+
+    def get_target_speeds(self):
+        """
+        Gets the target speed of each path.
+
+        Returns:
+        np.ndarray: target_speed_mps of every path, or None if the log has no target speed.
+        """
+        if "target_speed_mps" not in self.df_path.columns:
+            return None
+        return np.asarray(self.df_path["target_speed_mps"], dtype=float)
+
     def transform_to_world_coordinates(self, path_ego, car_pose):
         """
         Transforms the path from ego coordinates to world coordinates using SE2.
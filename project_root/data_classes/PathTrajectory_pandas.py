@@ -16,7 +16,7 @@ class PathTrajectoryPandas(PathTrajectoryBase):
 
     def __init__(self, file_path):
         df_path, path_xy = read_path_handler_data(file_path)
-        super().__init__(df_path, path_xy)
+        super().__init__(df_path, path_xy, file_path)
         timestamp_s = pd.to_datetime(df_path['data_timestamp_sec'], unit='s')
         self.time_data_ms = timestamp_s.astype('int64') // 10**6
         
@@ -26,6 +26,11 @@ class PathTrajectoryPandas(PathTrajectoryBase):
             
     def find_min_index(self, timestamps):
         return timestamps.idxmin()         
+
+    def get_path_matrices(self):
+        # The loader keeps the path points as strings (None past the end of shorter rows)
+        return tuple(self.df_path_xy[key].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+                     for key in ('path_x_data', 'path_y_data'))
     
     def find_path_and_car_pose(self, timestamp_ms):
         """
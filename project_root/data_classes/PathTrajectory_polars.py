@@ -16,7 +16,7 @@ class PathTrajectoryPolars(PathTrajectoryBase):
 
     def __init__(self, file_path):
         df_path, path_xy = read_path_handler_data(file_path)
-        super().__init__(df_path, path_xy)
+        super().__init__(df_path, path_xy, file_path)
         # timestamp_s = to_datetime(df_path['data_timestamp_sec'], unit='s')
         # self.time_data_ms = timestamp_s.astype('int64') // 10**6
         self.time_data_ms = df_path["data_timestamp_sec"]*(10**3)
@@ -26,6 +26,27 @@ class PathTrajectoryPolars(PathTrajectoryBase):
     def find_min_index(self, timestamps):
         return timestamps.arg_min()
 
+    def get_path_matrices(self):
+        # Columns with values written with a leading space (e.g. ' 0') are read as strings
+        return tuple(self.df_path_xy[key]
+                     .with_columns(pl.col(pl.String).str.strip_chars())
+                     .select(pl.all().cast(pl.Float64, strict=False)).to_numpy()
+                     for key in ("path_x_data", "path_y_data"))
+
+    def get_current_speed(self, timestamp):
+        """
+        Gets the current speed for a given timestamp.
+
+        Parameters:
+        timestamp (float): The timestamp to get the speed for.
+
+        Returns:
+        float: The current speed.
+        """
+        row_ind = self.find_min_index((self.time_data_ms - timestamp).abs())
+        # Columns written with a leading space are read as strings
+        return float(self.df_path["current_speed_mps"][row_ind])
+
     def find_path_and_car_pose(self, timestamp: float) -> tuple:
         """
         Finds the path and car pose at the given timestamp.
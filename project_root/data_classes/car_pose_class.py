@@ -1,4 +1,6 @@
 from scipy.interpolate import interp1d
+from scipy.spatial import cKDTree
+import numpy as np
 import pandas as pd
 from utils.data_loaders.car_pose_loader import prepare_car_pose_data
 
@@ -12,7 +14,13 @@ class CarPose:
         - get_trajectory(): Get the car pose trajectory.
         - get_timestamps(): Get the timestamps.
         - set_interpolation(): Prepare the interpolation objects for x,y, and the yaw.
+        - build_spatial_index(): Build the KD-tree over the car pose positions.
+        - get_nearest_timestamp(x, y): Get the timestamp at which the car was closest to a point.
+        - get_passes_near(x, y, radius): Get every pass of the car within a radius of a point.
     '''
+    # Samples within a radius that are less than this apart [ms] belong to the same pass
+    PASS_GAP_MS = 1000
+
     def __init__(self, trip_path): 
         self.trip_path = trip_path
         self.df_car_pose = prepare_car_pose_data(trip_path)        
@@ -20,6 +28,8 @@ class CarPose:
         self.route  = self.df_car_pose[['cp_x', 'cp_y']]    
         # Prepare the interpolation objects
         self.set_interpolation()        
+        # Spatial index for the position queries
+        self.build_spatial_index()
     
     def set_interpolation(self):
         ''' Prepare the interpolation objects for x, y, and the yaw. '''
@@ -40,6 +50,53 @@ class CarPose:
         else:
             print("No car pose data available.")
                         
+    def build_spatial_index(self):
+        ''' Build the KD-tree over the car pose positions, once per trip, for the nearest and radius queries. '''
+        self.positions = np.ascontiguousarray(self.route.to_numpy(dtype=np.float64))
+        self.timestamps_ms = np.asarray(self.get_timestamps_milliseconds(), dtype=np.int64)
+        self.spatial_index = cKDTree(self.positions)
+
+    def get_nearest_timestamp(self, x, y):
+        ''' Get the timestamp at which the car was closest to a point.
+        
+            Parameters:
+            x, y (float): The point in world coordinates [m].
+            
+            Returns:
+            tuple: (timestamp [ms], distance [m]) of the closest car pose, or None without car poses.
+        '''
+        if len(self.positions) == 0:
+            return None
+        distance, index = self.spatial_index.query((x, y))
+        return int(self.timestamps_ms[index]), float(distance)
+
+    def get_passes_near(self, x, y, radius, min_gap_ms=PASS_GAP_MS):
+        ''' Get every pass of the car within a radius of a point, e.g. each lap of a looped route.
+        
+            Consecutive car poses within the radius form one pass; passes less than min_gap_ms
+            apart are merged. Each pass is reported at its pose closest to the point.
+        
+            Parameters:
+            x, y (float): The point in world coordinates [m].
+            radius (float): The search radius [m].
+            min_gap_ms (float): The shortest time outside the radius between two passes [ms].
+            
+            Returns:
+            list: (timestamp [ms], distance [m]) of each pass, in time order.
+        '''
+        indices = np.sort(np.asarray(self.spatial_index.query_ball_point((x, y), radius), dtype=np.int64))
+        if len(indices) == 0:
+            return []
+        timestamps = self.timestamps_ms[indices]
+        # A pass ends where the poses within the radius are not consecutive and far apart in time
+        breaks = np.flatnonzero((np.diff(indices) > 1) & (np.diff(timestamps) >= min_gap_ms)) + 1
+        distances = np.hypot(self.positions[indices, 0] - x, self.positions[indices, 1] - y)
+        passes = []
+        for run in np.split(np.arange(len(indices)), breaks):
+            closest = run[np.argmin(distances[run])]
+            passes.append((int(timestamps[closest]), float(distances[closest])))
+        return passes
+
     def get_car_pose_at_timestamp(self, timestamp, interpolation = True):
         ''' Get the car pose at the given timestamp.
         
@@ -1,4 +1,5 @@
 from scipy.interpolate import interp1d
+import numpy as np
 import pandas as pd
 from utils.data_loaders.vehicle_states_multi_file_reader import read_vehicle_state_logs
 
@@ -18,6 +19,11 @@ class CarStateInfo:
         car_info = read_vehicle_state_logs(trip_path)
         df_cruise_control, df_driving_mode, df_speed, df_steering = car_info
         
+        self.df_cruise_control = None
+        self.df_driving_mode = None
+        self.df_speed = None
+        self.df_steering = None
+        
         if df_cruise_control is not None:
             self.df_cruise_control = df_cruise_control
             
@@ -49,7 +55,7 @@ class CarStateInfo:
         '''
         if self.df_speed is not None:
             closest_idx = (self.df_speed['time_stamp'] - timestamp).abs().arg_min()
-            return self.df_speed.select('data_value')[closest_idx]
+            return float(self.df_speed['data_value'][closest_idx])
         else:
             print("Error: speed data not availalbe")
             return None
@@ -73,7 +79,7 @@ class CarStateInfo:
         '''
         if self.df_steering is not None:
             closest_idx = (self.df_steering['time_stamp'] - timestamp).abs().arg_min()
-            return self.df_steering.select('data_value')[closest_idx]
+            return float(self.df_steering['data_value'][closest_idx])
         else:
             print("Error: steering data not availalbe")
             return None
@@ -93,11 +99,11 @@ class CarStateInfo:
             timestamp (int): The timestamp.
             
             Returns:
-            str: The driving mode at the given timestamp.
+            float: The driving mode code at the given timestamp.
         '''
         if self.df_driving_mode is not None:
             closest_idx = (self.df_driving_mode['time_stamp']-timestamp).abs().arg_min()
-            return self.df_driving_mode.select('data_value')[closest_idx]
+            return float(self.df_driving_mode['data_value'][closest_idx])
         else:
             print("Error: driving mode data not availalbe")
             return None
@@ -129,7 +135,7 @@ class CarStateInfo:
         '''
         if self.df_cruise_control is not None:
             closest_idx = (self.df_cruise_control['timestamp'] - timestamp).abs().arg_min()
-            return self.df_cruise_control.select('target_speed')[closest_idx]
+            return float(self.df_cruise_control['target_speed'][closest_idx])
 
         else:
             print("Error: cruise control data not availalbe")
@@ -154,14 +160,31 @@ class CarStateInfo:
         '''
         if self.df_cruise_control is not None:
             closest_idx = (self.df_cruise_control['timestamp'] - timestamp).abs().arg_min()
-            return self.df_cruise_control['steer_command'][closest_idx]
-            return self.df_cruise_control.select('target_speed')[closest_idx]
+            return float(self.df_cruise_control['steer_command'][closest_idx])
 
         else:
             print("Error: cruise control data not availalbe")
             return None
                 
         
+    def get_time_series(self, df_name, time_column, value_column):
+        ''' Get a full signal as numpy arrays.
+        
+            Args:
+            df_name (str): The name of the data frame attribute (e.g. 'df_speed').
+            time_column (str): The timestamp column [s].
+            value_column (str): The value column.
+            
+            Returns:
+            tuple: The timestamps in milliseconds and the values as float64 numpy arrays
+                   (empty arrays if the data is not available).
+        '''
+        df = getattr(self, df_name, None)
+        if df is None:
+            return np.empty(0), np.empty(0)
+        timestamps_ms = df[time_column].to_numpy().astype(np.float64) * 1000.0
+        return timestamps_ms, df[value_column].to_numpy().astype(np.float64)
+    
     def get_timestamps_seconds(self):
         ''' Get the timestamps in seconds.
         
@@ -12,10 +12,14 @@ from PySide6.QtWidgets import (
     QGraphicsScene, QGraphicsView, QStyleOptionGraphicsItem,
     QVBoxLayout, QWidget, QSlider, QLabel
 )
+import numpy as np
 import pandas as pd
 import networkx as nx
 from pathlib import Path
 
+from examples.fsm.fsm_event_index import FsmEventIndex
+from examples.fsm.fsm_log import FsmLog
+
 class FSM:
     """Finite State Machine Data Class"""
 
@@ -29,6 +33,10 @@ class FSM:
         self.signals_and_data_dict = {} # Dictionary of signals-values and their data data signals -values
         self.signals_data_dict={} # Dictionary of signals and their data at each index
         self.signals_dict = {} # Dictionary of signals and their values
+        self.signal_columns = {} # Signal name -> SignalColumn (typed values and '-' mask)
+        self.signal_data_columns = {} # 'signal-data_value_name' -> SignalColumn
+        self.log = None # FsmLog of the loaded file
+        self.event_index = None # FsmEventIndex of the loaded file (time lookups, transition jumps)
         if fsm_file_path:
             fsm_abs_path = Path(fsm_file_path + "li_conditions.csv")
             self.load_data_from_file(fsm_abs_path)
@@ -38,33 +46,33 @@ class FSM:
 
     def extract_signals_and_signals_data(self):
         """
-        Input: DataFrame with signals and their data. Columns are arranged such
-        that each signal has prefix 'sig-' followed by the signal_name and each signal 
-        data has the prefix 'data-' + signal_name + '-' + data_value_name. 
+        Input: the columns of self.log. Columns are arranged such that each signal has prefix
+        'sig-' followed by the signal_name and each signal data has the prefix 'data-' +
+        signal_name + '-' + data_value_name.
         For example: sig-RWB_1, data-RWB_1-reached_waiting_box, data-RWB_1-hit_point_x_ego_frame.
-        
-        Output: Dictionary of signals and their data such that each signal has a dictionary of 
-        its data and we can later easily retrieve for each signal its data.
+
+        Output: Dictionary of signals and their data such that each signal has a dictionary of
+        its data and we can later easily retrieve for each signal its data. The values are the
+        typed arrays of the log (NaN where the log has '-').
         """
         signals_data = {}
-        for column in self.dataframe.columns:
-            if column.startswith("sig-"):
-                signal_name = column[4:] # remove the prefix 'sig_'
-                if signal_name not in signals_data: # add the signal if it is not already in the dictionary
-                    signals_data[signal_name] = {"signal": self.dataframe[column].tolist(), "data": {}}
-                else:
-                    signals_data[signal_name]["signal"] = self.dataframe[column].tolist()
-            elif column.startswith("data-"):
-                signal_name = column[5:].split('-')[0] # remove the prefix 'data_' and get the signal name                
-                data_value_name = column[len("data-" + signal_name + "-"):] # remove the prefix 'data_' + signal_name + '_'
-                if signal_name not in signals_data: # add the signal if it is not already in the dictionary
-                    signals_data[signal_name] = {"signal": [], "data": {}} # add the signal if it is not already in the dictionary
-                signals_data[signal_name]["data"][data_value_name] = self.dataframe[column].tolist() # add the data to the signal's data dictionary
-        
+        self.signal_columns = {}
+        self.signal_data_columns = {}
+        for signal_name, data_columns in self.log.data_columns.items():
+            signal_column = self.log.signal_columns.get(signal_name)
+            if signal_column is not None:
+                self.signal_columns[signal_name] = signal_column
+            signals_data[signal_name] = {
+                "signal": signal_column.values if signal_column is not None else np.empty(0),
+                "data": {data_value_name: column.values for data_value_name, column in data_columns.items()},
+            }
+            for data_value_name, column in data_columns.items():
+                self.signal_data_columns[f"{signal_name}-{data_value_name}"] = column
+
         self.signals_and_data_dict = signals_data
-        self.signals_list = list(signals_data.keys())      
-        self.signals_data_dict, self.signals_dict= self.extract_combined_signal_data()  
-        return 
+        self.signals_list = list(signals_data.keys())
+        self.signals_data_dict, self.signals_dict= self.extract_combined_signal_data()
+        return
 
 
     
@@ -88,31 +96,26 @@ class FSM:
         """
         Extract combined signal data from self.signals_data at a specific index.
         
-        Output: Dictionary where each key is 'signal_name-data_value_name' and the value is the corresponding data value.
+        Output: Dictionary where each key is 'signal_name-data_value_name' and the value is the corresponding data value ('-' if not evaluated).
         """
-        combined_data = {}
-        for signal, signal_data in self.signals_and_data_dict.items():
-            for data_value_name, data_value in signal_data["data"].items():
-                combined_key = f"{signal}-{data_value_name}"
-                combined_data[combined_key] = data_value[index]
-        return combined_data
+        return {combined_key: column.value_at(index) for combined_key, column in self.signal_data_columns.items()}
     
     
     def get_signals_data_at_index(self, index):
         """
         Get signals and their data at a specific index.
         """
-        signals_data_at_index = {signal: self.signals_data_dict[signal][index] 
-            for signal in self.signals_data_dict 
-            if index < len(self.signals_data_dict[signal])}
+        signals_data_at_index = {signal: column.value_at(index)
+            for signal, column in self.signal_data_columns.items()
+            if index < len(column)}
                                 
         return signals_data_at_index
     
     def get_signals_data_at_timestamp(self, timestamp):
         """
-        Get signals and their data at a specific timestamp.
+        Get signals and their data at a specific timestamp (the row with the closest time stamp).
         """
-        index = self.time_stamps[self.time_stamps == timestamp].index[0]
+        index = self.event_index.nearest_row(timestamp)
         signals_data_at_index = self.get_signals_data_at_index(index)
         return signals_data_at_index
     
@@ -120,48 +123,36 @@ class FSM:
         """
         Get signals and their data at a specific index.
         """
-        signals_value_at_index =  {signal: self.signals_dict[signal][index] 
-            for signal in self.signals_dict 
-            if index < len(self.signals_dict[signal])}
+        signals_value_at_index =  {signal: column.value_at(index)
+            for signal, column in self.signal_columns.items()
+            if index < len(column)}
         return signals_value_at_index
     
     def get_signals_value_at_timestamp(self, timestamp):
         """
-        Get signals and their data at a specific timestamp.
+        Get signals and their data at a specific timestamp (the row with the closest time stamp).
         """
-        index = self.time_stamps[self.time_stamps == timestamp].index[0]
+        index = self.event_index.nearest_row(timestamp)
         signals_data_at_index = self.get_signals_value_at_index(index)
         return signals_data_at_index
         
     
     def load_data_from_file(self, file_path):
-        """Load FSM data from a CSV file."""
-        # Header: time_stamp,li_state,path_ts,map_obj_ts,
-        self.dataframe = pd.read_csv(file_path)
-        first_signal_col_ind = 4
-        signals_inds = range(first_signal_col_ind, len(self.dataframe.columns))
-        # change column name from "li_state" to "Current State"
-        # df_signals_and_data = self.dataframe.drop(columns=["fsm_execution_ts_sec", "current_state", "path_ts_sec", "map_obj_ts_sec"])
-        self.dataframe.rename(columns={"current_state": "Current State"}, inplace=True)
-        self.states.update(self.dataframe["Current State"].unique())
-        self.dataframe.rename(columns={"fsm_execution_ts_sec": "time_stamp"}, inplace=True)
+        """Load FSM data from a CSV file, column by column (see fsm_log.py)."""
+        # Header: fsm_execution_ts_sec,current_state,path_ts_sec,map_obj_ts_sec,sig-...,data-...
+        self.log = FsmLog.from_csv(file_path)
+        # The meta columns, with "current_state" renamed to "Current State" and "fsm_execution_ts_sec" to "time_stamp"
+        self.dataframe = self.log.dataframe
+        self.states.update(self.log.state_names)
         self.time_stamps=self.dataframe["time_stamp"]
         self.path_time_stamps=self.dataframe["path_ts_sec"]
         
         # Extract signals and their data
         self.extract_signals_and_signals_data()
-        
-        for ind, row in self.dataframe.iterrows():
-            if ind == len(self.dataframe) - 1:
-                break
-            next_state = self.dataframe.loc[ind + 1, "Current State"]
-            transition = (row["Current State"], next_state)
-            # signals = df_signals.loc[ind]
-            # find which signals have numeric values (not '-')
-            signals = {signal: self.signals_and_data_dict[signal]["signal"][ind] for signal in self.signals_list}            
-            # active_signals = {signal: value for signal, value in signals.items() if isinstance(value, (int, float)) and value != '-'}
-            active_signals_values = {signal: self.signals_and_data_dict[signal]["signal"][ind] for signal in self.signals_list if self.signals_and_data_dict[signal]["signal"][ind] != '-'}
-            self.transitions[transition] = active_signals_values
+
+        # Each pair of consecutive rows, with the signals that were not '-' the last time it was taken
+        self.transitions = self.log.last_transitions()
+        self.event_index = FsmEventIndex.from_log(self.log)
         return
                         
             
@@ -0,0 +1,136 @@
+"""Event index of an FSM log, for seeking by time and jumping between transitions.
+
+Built once when the log is loaded: the row time stamps sorted for binary search, a run-length
+table of the states (one run per stretch of rows in the same state; every run after the first
+starts with a transition) and, per (source, target) transition, the sorted rows it was taken
+at. Every lookup is a binary search (np.searchsorted), O(log n) in the length of the log,
+instead of a scan over the whole time stamp column.
+"""
+import numpy as np
+
+
+class FsmEventIndex:
+    """Index of the state runs and transitions of an FSM log.
+
+    Rows are the rows of the log (the slider positions of the FSM viewer); a transition is
+    located at the first row of the new state.
+
+    Attributes:
+        state_names (np.ndarray): The states.
+        run_starts (np.ndarray): First row of each state run.
+        run_states (np.ndarray): Index into state_names of the state of each run.
+        transition_rows (np.ndarray): First row of every run but the first (the transitions).
+        occurrences (dict): (source, target) -> sorted rows the transition was taken at.
+    """
+
+    def __init__(self, time_stamps, state_codes, state_names):
+        """Build the index.
+
+        Args:
+            time_stamps (array-like): Time stamp of each row [s].
+            state_codes (array-like): Index into state_names of the state of each row.
+            state_names (array-like): The states.
+        """
+        time_stamps = np.asarray(time_stamps, dtype=np.float64)
+        state_codes = np.asarray(state_codes, dtype=np.int64)
+        self.state_names = np.asarray(state_names, dtype=object)
+        self.num_rows = len(state_codes)
+
+        # Sorted time stamps and the row of each (the log is normally already in time order)
+        if np.all(np.diff(time_stamps) >= 0):
+            self.sorted_rows = None
+            self.sorted_times = time_stamps
+        else:
+            self.sorted_rows = np.argsort(time_stamps, kind="stable")
+            self.sorted_times = time_stamps[self.sorted_rows]
+
+        # State run-length table
+        changes = np.flatnonzero(state_codes[1:] != state_codes[:-1]) + 1
+        self.run_starts = np.concatenate(([0], changes)) if self.num_rows else np.empty(0, dtype=np.int64)
+        self.run_states = state_codes[self.run_starts]
+        self.transition_rows = self.run_starts[1:]
+
+        # Rows of each transition, grouped by (source, target)
+        sources, targets = self.run_states[:-1], self.run_states[1:]
+        pairs = sources * max(len(self.state_names), 1) + targets
+        order = np.argsort(pairs, kind="stable")
+        unique_pairs, group_starts = np.unique(pairs[order], return_index=True)
+        self.occurrences = {}
+        for pair, rows in zip(unique_pairs, np.split(self.transition_rows[order], group_starts[1:])):
+            source, target = divmod(int(pair), len(self.state_names))
+            self.occurrences[(self.state_names[source], self.state_names[target])] = rows
+
+    @classmethod
+    def from_log(cls, log):
+        """Build the index of an FsmLog (see fsm_log.py)."""
+        return cls(log.dataframe["time_stamp"].to_numpy(), log.state_codes, log.state_names)
+
+    def _sorted_position_to_row(self, position):
+        return int(position if self.sorted_rows is None else self.sorted_rows[position])
+
+    def nearest_row(self, time_stamp):
+        """The row whose time stamp is closest to time_stamp (None for an empty log)."""
+        if self.num_rows == 0:
+            return None
+        position = int(np.searchsorted(self.sorted_times, time_stamp))
+        if position == self.num_rows or (
+                position > 0 and time_stamp - self.sorted_times[position - 1] <= self.sorted_times[position] - time_stamp):
+            position -= 1
+        return self._sorted_position_to_row(position)
+
+    def row_at_time(self, time_stamp):
+        """The last row at or before time_stamp, i.e. the FSM execution in effect (None before the log)."""
+        position = int(np.searchsorted(self.sorted_times, time_stamp, side="right")) - 1
+        if position < 0:
+            return None
+        return self._sorted_position_to_row(position)
+
+    def run_at_row(self, row):
+        """Index of the state run that contains row."""
+        return int(np.searchsorted(self.run_starts, row, side="right")) - 1
+
+    def state_at_row(self, row):
+        """The state at row."""
+        return self.state_names[self.run_states[self.run_at_row(row)]]
+
+    def state_at_time(self, time_stamp):
+        """The state in effect at time_stamp (None before the first row of the log)."""
+        row = self.row_at_time(time_stamp)
+        return None if row is None else self.state_at_row(row)
+
+    def next_transition_row(self, row):
+        """The first transition after row (None if there is none)."""
+        k = int(np.searchsorted(self.transition_rows, row, side="right"))
+        return int(self.transition_rows[k]) if k < len(self.transition_rows) else None
+
+    def previous_transition_row(self, row):
+        """The last transition before row (None if there is none)."""
+        k = int(np.searchsorted(self.transition_rows, row, side="left")) - 1
+        return int(self.transition_rows[k]) if k >= 0 else None
+
+    def next_occurrence_row(self, source, target, row):
+        """The first time after row the FSM went from source to target (None if it did not)."""
+        rows = self.occurrences.get((source, target))
+        if rows is None:
+            return None
+        k = int(np.searchsorted(rows, row, side="right"))
+        return int(rows[k]) if k < len(rows) else None
+
+    def previous_occurrence_row(self, source, target, row):
+        """The last time before row the FSM went from source to target (None if it did not)."""
+        rows = self.occurrences.get((source, target))
+        if rows is None:
+            return None
+        k = int(np.searchsorted(rows, row, side="left")) - 1
+        return int(rows[k]) if k >= 0 else None
+
+    def last_transitions(self, row, k):
+        """The last k transitions up to and including row, oldest first.
+
+        Returns:
+            list: (source, target) tuples.
+        """
+        run = self.run_at_row(row)
+        first = max(run - k + 1, 1)
+        return [(self.state_names[self.run_states[r - 1]], self.state_names[self.run_states[r]])
+                for r in range(first, run + 1)]
@@ -0,0 +1,201 @@
+"""Columnar loader of FSM condition logs (li_conditions*.csv).
+
+The log has one row per FSM execution: fsm_execution_ts_sec, current_state, path_ts_sec,
+map_obj_ts_sec, then the signals ('sig-<signal>') and their data ('data-<signal>-<name>'),
+where '-' means the signal was not evaluated. Each signal column is kept as one typed array
+(float64, bool or, as a last resort, object) plus a null mask of its '-' entries, instead of
+Python lists, and the state changes and transitions are found with array operations over the
+whole log rather than row by row.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+NULL_VALUE = "-"
+STATE_COLUMN = "current_state"
+TIME_COLUMN = "fsm_execution_ts_sec"
+META_COLUMNS = (TIME_COLUMN, STATE_COLUMN, "path_ts_sec", "map_obj_ts_sec")
+# Names of the meta columns in FSM.dataframe
+RENAMED_COLUMNS = {STATE_COLUMN: "Current State", TIME_COLUMN: "time_stamp"}
+SIGNAL_PREFIX = "sig-"
+DATA_PREFIX = "data-"
+
+
+class SignalColumn(NamedTuple):
+    """One signal (or signal data) column of the log.
+
+    Attributes:
+        values: float64 (NaN where null), bool (False where null) or object (None where null) array.
+        null_mask: True where the log has '-'.
+    """
+    values: np.ndarray
+    null_mask: np.ndarray
+
+    def __len__(self):
+        return len(self.values)
+
+    def value_at(self, index):
+        """The value at a row as a Python scalar ('-' where null, whole numbers as int)."""
+        if self.null_mask[index]:
+            return NULL_VALUE
+        value = self.values[index]
+        if isinstance(value, np.bool_):
+            return bool(value)
+        if isinstance(value, np.floating):
+            return int(value) if value.is_integer() else float(value)
+        return value
+
+
+def parse_column(raw):
+    """Parse the raw strings of a signal column into a SignalColumn.
+
+    The column is factorized first, so every distinct string is parsed once (a log column
+    holds few distinct values, mostly '-', '0' and '1').
+
+    Args:
+        raw (array-like): The column as strings.
+
+    Returns:
+        SignalColumn: Numeric columns as float64, 'true'/'false' columns as bool, anything
+        else as object; a column of only '-' is numeric.
+    """
+    codes, uniques = pd.factorize(np.asarray(raw, dtype=object))
+    uniques = np.asarray(uniques, dtype=object)
+    unique_nulls = (uniques == NULL_VALUE) | (uniques == "")
+    present = uniques[~unique_nulls]
+
+    numbers = pd.to_numeric(present, errors="coerce").astype(np.float64)
+    lowered = np.char.lower(present.astype(str))
+    if not np.isnan(numbers).any():
+        unique_values = np.full(len(uniques), np.nan)
+        unique_values[~unique_nulls] = numbers
+    elif np.isin(lowered, ("true", "false")).all():
+        unique_values = np.zeros(len(uniques), dtype=bool)
+        unique_values[~unique_nulls] = lowered == "true"
+    else:
+        unique_values = uniques.copy()
+        unique_values[unique_nulls] = None
+    return SignalColumn(unique_values[codes], unique_nulls[codes])
+
+
+class FsmLog:
+    """An FSM condition log held column by column.
+
+    Attributes:
+        dataframe (pd.DataFrame): The meta columns (time_stamp, Current State, path_ts_sec,
+            map_obj_ts_sec); the signals are not duplicated into it.
+        state_names (np.ndarray): The states, in order of first appearance.
+        state_codes (np.ndarray): Index into state_names of the state of each row.
+        signal_columns (dict): Signal name -> SignalColumn of its 'sig-' column.
+        data_columns (dict): Signal name -> {data name -> SignalColumn}, for every signal with
+            a 'sig-' or 'data-' column, in order of first appearance.
+    """
+
+    def __init__(self, raw):
+        """Build the log from the raw DataFrame (all columns as strings).
+
+        Args:
+            raw (pd.DataFrame): The log as read by read_raw_log.
+        """
+        meta = {RENAMED_COLUMNS.get(column, column): raw[column] for column in META_COLUMNS if column in raw}
+        self.dataframe = pd.DataFrame(meta)
+        for column in self.dataframe.columns:
+            if column != "Current State":
+                self.dataframe[column] = pd.to_numeric(self.dataframe[column], errors="coerce")
+
+        states = raw[STATE_COLUMN].to_numpy(dtype=object)
+        self.state_codes, self.state_names = pd.factorize(states)
+        self.state_names = np.asarray(self.state_names, dtype=object)
+
+        self.signal_columns = {}
+        self.data_columns = {}
+        for column in raw.columns:
+            if column.startswith(SIGNAL_PREFIX):
+                signal = column[len(SIGNAL_PREFIX):]
+                self.data_columns.setdefault(signal, {})
+                self.signal_columns[signal] = parse_column(raw[column].to_numpy())
+            elif column.startswith(DATA_PREFIX):
+                signal = column[len(DATA_PREFIX):].split('-')[0]
+                data_name = column[len(DATA_PREFIX + signal + '-'):]
+                self.data_columns.setdefault(signal, {})[data_name] = parse_column(raw[column].to_numpy())
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """Load a log file."""
+        return cls(read_raw_log(file_path))
+
+    def __len__(self):
+        return len(self.state_codes)
+
+    @property
+    def states(self):
+        """The state of each row."""
+        return self.state_names[self.state_codes]
+
+    @property
+    def change_mask(self):
+        """True at the rows whose state differs from the state of the previous row."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[1:] = self.state_codes[1:] != self.state_codes[:-1]
+        return mask
+
+    @property
+    def state_change_indices(self):
+        """The rows where the state changes (the first row of every new state)."""
+        return np.flatnonzero(self.change_mask)
+
+    def active_signals_at(self, index):
+        """The signals evaluated at a row (not '-') and their values."""
+        return {signal: column.value_at(index) for signal, column in self.signal_columns.items()
+                if not column.null_mask[index]}
+
+    def last_transitions(self):
+        """The transitions between consecutive rows and the active signals of their last occurrence.
+
+        Every pair of consecutive rows is a transition (a state that lasts several rows is a
+        self-loop); a transition taken several times keeps the active signals of the last time.
+
+        Returns:
+            dict: (state, next state) -> {signal: value}, ordered by first occurrence.
+        """
+        if len(self) < 2:
+            return {}
+        num_states = len(self.state_names)
+        pairs = self.state_codes[:-1].astype(np.int64) * num_states + self.state_codes[1:]
+        unique_pairs, first_rows = np.unique(pairs, return_index=True)
+        _, last_rows_reversed = np.unique(pairs[::-1], return_index=True)
+        last_rows = len(pairs) - 1 - last_rows_reversed
+
+        transitions = {}
+        for k in np.argsort(first_rows, kind="stable"):
+            source, target = divmod(int(unique_pairs[k]), num_states)
+            transition = (self.state_names[source], self.state_names[target])
+            transitions[transition] = self.active_signals_at(last_rows[k])
+        return transitions
+
+    def transition_summary(self):
+        """Aggregate the state changes (self-loops excluded) per transition.
+
+        Returns:
+            pd.DataFrame: One row per (source, target) in order of first occurrence, with the
+            number of times it was taken and the first and last row (and time stamp) it was
+            taken at, i.e. the row of the new state.
+        """
+        rows = self.state_change_indices
+        changes = pd.DataFrame({
+            "source": self.state_names[self.state_codes[rows - 1]],
+            "target": self.state_names[self.state_codes[rows]],
+            "row": rows,
+        })
+        if "time_stamp" in self.dataframe:
+            changes["time_stamp"] = self.dataframe["time_stamp"].to_numpy()[rows]
+        aggregations = {"count": ("row", "size"), "first_row": ("row", "min"), "last_row": ("row", "max")}
+        if "time_stamp" in changes:
+            aggregations.update(first_time_stamp=("time_stamp", "min"), last_time_stamp=("time_stamp", "max"))
+        return changes.groupby(["source", "target"], sort=False).agg(**aggregations).reset_index()
+
+
+def read_raw_log(file_path):
+    """Read a log file with every column as strings ('-' kept as is)."""
+    return pd.read_csv(file_path, dtype=str, keep_default_na=False)
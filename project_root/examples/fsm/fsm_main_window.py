@@ -79,6 +79,12 @@ class MainWindow(QMainWindow):
             # Create combo boxes
             self.layout_combo = self.create_layout_combo()
             self.k_combo = self.create_k_combo()
+            self.transition_combo = self.create_transition_combo()
+
+            # Create buttons to jump between transitions
+            self.previous_transition_button = QPushButton("< Previous Transition")
+            self.next_transition_button = QPushButton("Next Transition >")
+            self.next_occurrence_button = QPushButton("Next Occurrence >")
             
             # Create button to open video player
             self.video_button = QPushButton("Open Video Player")
@@ -145,6 +151,14 @@ class MainWindow(QMainWindow):
         k_combo.setCurrentIndex(2)  # Default k is 3
         return k_combo
       
+    def create_transition_combo(self):
+        """Create and return the combo box of the transitions, for jumping to their next occurrence."""
+        transition_combo = QComboBox()
+        if self.fsm.event_index is not None:
+            for source, target in self.fsm.event_index.occurrences:
+                transition_combo.addItem(f"{source} -> {target}", (source, target))
+        return transition_combo
+
     def setup_main_layout(self):
         """Set up the main layout with all components and sub-layouts."""
               # Set up the central widget and main layout
@@ -178,6 +192,15 @@ class MainWindow(QMainWindow):
         slider_layout.addWidget(QLabel("FSM State Slider:"))
         slider_layout.addWidget(self.slider)
         bottom_layout.addLayout(slider_layout)
+
+        # Transition navigation layout
+        transition_layout = QHBoxLayout()
+        transition_layout.addWidget(self.previous_transition_button)
+        transition_layout.addWidget(self.next_transition_button)
+        transition_layout.addWidget(QLabel("Transition:"))
+        transition_layout.addWidget(self.transition_combo)
+        transition_layout.addWidget(self.next_occurrence_button)
+        bottom_layout.addLayout(transition_layout)
         
         # Timer layout (place it directly below the slider)
         timer_layout = QHBoxLayout()
@@ -216,6 +239,11 @@ class MainWindow(QMainWindow):
         # Connect the layout and k combo boxes to their respective slots
         self.layout_combo.currentTextChanged.connect(self.view.apply_layout)
         self.k_combo.currentTextChanged.connect(lambda k: self.view.set_k(int(k)))  
+
+        # Connect the transition buttons; they move the slider, which updates the FSM state and the video
+        self.previous_transition_button.clicked.connect(self.jump_to_previous_transition)
+        self.next_transition_button.clicked.connect(self.jump_to_next_transition)
+        self.next_occurrence_button.clicked.connect(self.jump_to_next_occurrence)
             
     def initialize_fsm_data(self):
         """Initialize FSM-specific data and set the initial state."""
@@ -252,6 +280,28 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error in open_video_player: {e}")
             
+    def jump_to_index(self, fsm_index):
+        """Move the FSM slider to an index, if there is one."""
+        if fsm_index is not None:
+            self.slider.setValue(fsm_index)
+
+    def jump_to_previous_transition(self):
+        """Move the FSM slider to the previous state change."""
+        if self.fsm.event_index is not None:
+            self.jump_to_index(self.fsm.event_index.previous_transition_row(self.slider.value()))
+
+    def jump_to_next_transition(self):
+        """Move the FSM slider to the next state change."""
+        if self.fsm.event_index is not None:
+            self.jump_to_index(self.fsm.event_index.next_transition_row(self.slider.value()))
+
+    def jump_to_next_occurrence(self):
+        """Move the FSM slider to the next occurrence of the transition selected in the combo box."""
+        transition = self.transition_combo.currentData()
+        if self.fsm.event_index is not None and transition is not None:
+            source, target = transition
+            self.jump_to_index(self.fsm.event_index.next_occurrence_row(source, target, self.slider.value()))
+
     def video_slider_moved(self, video_position_ms):
         """Update main window slider and FSM state when video slider moves."""
     
@@ -338,9 +388,6 @@ class MainWindow(QMainWindow):
             self.view.highlight_node(current_state)
             return  
 
-        self.state_sequence = self.fsm.dataframe["Current State"].iloc[:index + 1].tolist()
-        self.traversed_edges = list(zip(self.state_sequence[:-1], self.state_sequence[1:]))
-
         row = self.fsm.dataframe.iloc[index]
         current_state = row["Current State"]
            
@@ -359,12 +406,9 @@ class MainWindow(QMainWindow):
         
         self.view.highlight_node(current_state)
 
-        # Highlight traversed edges
-        d = len(self.traversed_edges)
-        num_edges_to_highlight = min(self.view.k, d)
-        self.traversed_edges = [edge for edge in self.traversed_edges if edge[0] != edge[1]]
-        edges_to_highlight = self.traversed_edges[-num_edges_to_highlight:]
-        self.view.highlight_last_k_edges(edges_to_highlight)
+        # Highlight the last k traversed edges (state changes, self-loops excluded)
+        self.traversed_edges = self.fsm.event_index.last_transitions(index, self.view.k)
+        self.view.highlight_last_k_edges(self.traversed_edges)
 
         # Update the timestamp marker in the PlotWidget
         self.update_timestamp_marker(index)
@@ -375,14 +419,8 @@ class MainWindow(QMainWindow):
         self.update_table_signals(signals_values)
     
     def find_fsm_index_for_time(self, fsm_time):
-        """Find the closest FSM index for a given absolute time."""
-        # Calculate the absolute difference between each timestamp and the target time
-        time_diffs = (self.fsm.dataframe["time_stamp"] - fsm_time).abs()
-        
-        # Find the index of the minimum difference
-        closest_index = time_diffs.idxmin()
-        
-        return int(closest_index)
+        """Find the closest FSM index for a given absolute time (binary search in the event index)."""
+        return self.fsm.event_index.nearest_row(fsm_time)
 
     def on_video_player_closed(self):
         """Handle the video player window being closed."""
@@ -396,6 +434,9 @@ class MainWindow(QMainWindow):
         if self.video_player:
             self.video_player.close()
 
+        # Let the layouts being computed in the background finish (and be cached)
+        self.view.wait_for_layouts()
+
         # Call the base class implementation (optional but recommended)
         super().closeEvent(event)
 
@@ -9,13 +9,13 @@ from matplotlib.ticker import MaxNLocator, FuncFormatter
 from matplotlib.lines import Line2D
 
 
-import networkx as nx
 from examples.fsm.fsm_core import Node, Edge, FSM
+from fsm.fsm_layout_cache import BACKGROUND_LAYOUTS, LAYOUT_FUNCTIONS, FsmLayoutCache, LayoutWorker, graph_key
 
 class GraphView(QGraphicsView):
     """A QGraphicsView to display the FSM graph"""
 
-    def __init__(self, fsm: FSM, parent=None):
+    def __init__(self, fsm: FSM, parent=None, layout_cache: FsmLayoutCache = None):
         super().__init__(parent)
         self.fsm = fsm
         self.scene = QGraphicsScene(self)
@@ -29,15 +29,14 @@ class GraphView(QGraphicsView):
         self.graph_scale = 250
         self.k = 3  # Default number of edges to highlight
 
-        self.nx_layout_functions = {
-            "Circular": nx.circular_layout,
-            "Planar": nx.planar_layout,
-            "Random": nx.random_layout,
-            "Shell": nx.shell_layout,
-            "Kamada-Kawai": nx.kamada_kawai_layout,
-            "Spring": nx.spring_layout,
-            "Spiral": nx.spiral_layout,
-        }
+        self.nx_layout_functions = LAYOUT_FUNCTIONS
+
+        # Layouts are cached on disk per graph, with the positions of dragged nodes
+        self.layout_cache = layout_cache if layout_cache is not None else FsmLayoutCache()
+        self.graph_key = graph_key(self.fsm.get_states(), self.fsm.get_transitions())
+        self.layout_name = None
+        self.layout_workers = {}  # Layout name -> running LayoutWorker
+        self.applied_positions = {}  # State -> scene position set by the current layout
 
         self.load_graph()
         self.apply_layout("Circular")
@@ -66,19 +65,78 @@ class GraphView(QGraphicsView):
         return list(self.nx_layout_functions.keys())
 
     def apply_layout(self, layout_name: str):
-        """Apply a NetworkX layout to the graph"""
-        if layout_name in self.nx_layout_functions:
-            nx_graph = nx.DiGraph()
-            nx_graph.add_edges_from(self.fsm.get_transitions())
-            positions = self.nx_layout_functions[layout_name](nx_graph)
-
-            # Set initial positions
-            for state, pos in positions.items():
-                x, y = pos
-                x *= self.graph_scale
-                y *= self.graph_scale
-                node = self.nodes[state]
-                node.setPos(QPointF(x, y))
+        """Apply a NetworkX layout to the graph.
+
+        Cached layouts are applied at once. Otherwise the cheap layouts are computed here and
+        the expensive ones (BACKGROUND_LAYOUTS) in a LayoutWorker thread; the graph keeps its
+        current positions until they are ready.
+        """
+        if layout_name not in self.nx_layout_functions:
+            return
+        self.layout_name = layout_name
+        positions = self.layout_cache.get_layout(self.graph_key, layout_name)
+        if positions is not None:
+            self.set_layout_positions(layout_name, positions)
+        elif layout_name in BACKGROUND_LAYOUTS:
+            self.start_layout_worker(layout_name)
+        else:
+            positions = self.layout_cache.cached_layout(self.graph_key, layout_name, self.fsm.get_states(),
+                                                        self.fsm.get_transitions())
+            self.set_layout_positions(layout_name, positions)
+
+    def start_layout_worker(self, layout_name: str):
+        """Compute a layout in the background, unless it is being computed already."""
+        if layout_name in self.layout_workers:
+            return
+        worker = LayoutWorker(layout_name, self.fsm.get_states(), self.fsm.get_transitions())
+        worker.layout_ready.connect(self.on_layout_ready)
+        worker.layout_failed.connect(self.on_layout_failed)
+        self.layout_workers[layout_name] = worker
+        worker.start()
+
+    def on_layout_ready(self, layout_name: str, positions: dict):
+        """Store a layout computed in the background and show it if it is still selected."""
+        self.release_layout_worker(layout_name)
+        self.layout_cache.put_layout(self.graph_key, layout_name, positions)
+        if layout_name == self.layout_name:
+            self.set_layout_positions(layout_name, positions)
+
+    def on_layout_failed(self, layout_name: str, message: str):
+        self.release_layout_worker(layout_name)
+        print(f"Layout '{layout_name}' failed: {message}")
+
+    def release_layout_worker(self, layout_name: str):
+        """Drop the worker of a layout once it has handed back its result."""
+        worker = self.layout_workers.pop(layout_name, None)
+        if worker is not None:
+            worker.wait()  # run() returns right after emitting; the thread must end before it is deleted
+
+    def wait_for_layouts(self):
+        """Wait for the layouts being computed in the background (e.g. before closing)."""
+        for worker in list(self.layout_workers.values()):
+            worker.wait()
+
+    def set_layout_positions(self, layout_name: str, positions: dict):
+        """Place the nodes at layout positions, scaled to the scene, and at their dragged positions."""
+        self.applied_positions = {state: QPointF(x * self.graph_scale, y * self.graph_scale)
+                                  for state, (x, y) in positions.items()}
+        for state, (x, y) in self.layout_cache.get_dragged(self.graph_key, layout_name).items():
+            self.applied_positions[state] = QPointF(x, y)
+        for state, pos in self.applied_positions.items():
+            if state in self.nodes:
+                self.nodes[state].setPos(pos)
+
+    def mouseReleaseEvent(self, event):
+        """Remember the nodes the user dragged away from their layout positions."""
+        super().mouseReleaseEvent(event)
+        if self.layout_name is None:
+            return
+        dragged = {}
+        for state, node in self.nodes.items():
+            if state in self.applied_positions and node.pos() != self.applied_positions[state]:
+                dragged[state] = (node.pos().x(), node.pos().y())
+                self.applied_positions[state] = node.pos()
+        self.layout_cache.put_dragged(self.graph_key, self.layout_name, dragged)
 
     def highlight_node(self, state: str):
         """Highlight a node"""
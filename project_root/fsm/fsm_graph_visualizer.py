@@ -4,9 +4,8 @@ from PySide6.QtCore import QPointF
 
 from fsm.fsm_data_objects import FSM
 
-import networkx as nx
-
 from fsm.fsm_data_objects import Node, Edge
+from fsm.fsm_layout_cache import LAYOUT_FUNCTIONS, FsmLayoutCache, graph_key
 
 class GraphVisualizer(QGraphicsView):
     """Handles visualization of FSM states and transitions using Nodes and Edges."""
@@ -25,15 +24,8 @@ class GraphVisualizer(QGraphicsView):
         self.graph_scale = 200
         self.k = 3  # Default number of edges to highlight
 
-        self.nx_layout_functions = {
-            "Circular": nx.circular_layout,
-            "Planar": nx.planar_layout,
-            "Random": nx.random_layout,
-            "Shell": nx.shell_layout,
-            "Kamada-Kawai": nx.kamada_kawai_layout,
-            "Spring": nx.spring_layout,
-            "Spiral": nx.spiral_layout,
-        }
+        self.nx_layout_functions = LAYOUT_FUNCTIONS
+        self.layout_cache = FsmLayoutCache()  # Layouts computed once per graph, kept on disk
 
         self.load_graph()
         self.apply_layout("Circular")
@@ -103,12 +95,11 @@ class GraphVisualizer(QGraphicsView):
 
     def apply_layout(self, layout_name: str):
         if layout_name in self.nx_layout_functions:
-            nx_graph = nx.DiGraph()
             state_pairs = [(source_state, dest_state) for (source_state, dest_state), _ in self.fsm.get_transitions()]
-            nx_graph.add_edges_from(state_pairs)
 
-            # Compute positions using the selected layout
-            positions = self.nx_layout_functions[layout_name](nx_graph)
+            # Compute positions using the selected layout (or reuse them from the cache)
+            key = graph_key(self.fsm.get_states(), state_pairs)
+            positions = self.layout_cache.cached_layout(key, layout_name, self.fsm.get_states(), state_pairs)
 
             # Apply positions with moderate scaling
             for state, pos in positions.items():
@@ -0,0 +1,161 @@
+"""Persistent cache of FSM graph layouts.
+
+Computing a networkx layout (Kamada-Kawai, Spring, ...) of a large state graph is slow, so
+the node positions are computed once per graph and layout and kept on disk, together with the
+positions of the nodes the user dragged. A graph is identified by its states and transitions
+(graph_key), so a log with the same state machine reuses the layouts of another.
+
+One JSON file per graph in the cache folder:
+    {"layouts": {layout name: {state: [x, y]}},   # networkx positions (before scaling)
+     "dragged": {layout name: {state: [x, y]}}}   # scene positions the user dragged nodes to
+
+The expensive layouts are computed in a LayoutWorker thread while the graph is already shown
+(with a cheap layout), see GraphView.apply_layout in examples/fsm/fsm_plot_manager.py.
+Both FSM viewers (fsm.fsm_graph_visualizer and examples/fsm) use this module.
+"""
+import hashlib
+import json
+import os
+
+import networkx as nx
+from PySide6.QtCore import QThread, Signal
+
+LAYOUT_FUNCTIONS = {
+    "Circular": nx.circular_layout,
+    "Planar": nx.planar_layout,
+    "Random": nx.random_layout,
+    "Shell": nx.shell_layout,
+    "Kamada-Kawai": nx.kamada_kawai_layout,
+    "Spring": nx.spring_layout,
+    "Spiral": nx.spiral_layout,
+}
+# Layouts too slow for large graphs to compute in the GUI thread
+BACKGROUND_LAYOUTS = {"Planar", "Kamada-Kawai", "Spring"}
+
+
+def default_cache_dir():
+    """The layout cache folder, under the user cache folder of the Debug Player."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "debug_player", "fsm_layouts")
+
+
+def graph_key(states, transitions):
+    """A key of a state graph that does not depend on the order of its states and transitions.
+
+    Args:
+        states (iterable): The states.
+        transitions (iterable): (source, target) tuples.
+
+    Returns:
+        str: Hex digest of the sorted states and transitions.
+    """
+    description = json.dumps([sorted(map(str, states)), sorted([str(s), str(t)] for s, t in transitions)])
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()
+
+
+def compute_layout(layout_name, states, transitions):
+    """Compute a networkx layout of a state graph.
+
+    Args:
+        layout_name (str): A key of LAYOUT_FUNCTIONS.
+        states (iterable): The states (states without transitions are laid out too).
+        transitions (iterable): (source, target) tuples.
+
+    Returns:
+        dict: State -> (x, y).
+
+    Raises:
+        networkx.NetworkXException: If the layout does not apply to the graph (e.g. Planar).
+    """
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(states)
+    nx_graph.add_edges_from(transitions)
+    positions = LAYOUT_FUNCTIONS[layout_name](nx_graph)
+    return {state: (float(x), float(y)) for state, (x, y) in positions.items()}
+
+
+class FsmLayoutCache:
+    """Node positions of state graphs, per layout, stored as JSON files.
+
+    The files are read on first use of a graph and rewritten on every change; use the cache
+    from the GUI thread only (workers hand their results back through signals).
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._entries = {}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _entry(self, key):
+        if key not in self._entries:
+            entry = {"layouts": {}, "dragged": {}}
+            try:
+                with open(self._path(key)) as file:
+                    entry.update(json.load(file))
+            except (OSError, ValueError):
+                pass  # Not cached yet, or a damaged file that is rewritten on the next change
+            self._entries[key] = entry
+        return self._entries[key]
+
+    def _save(self, key):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary_path = self._path(key) + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self._entries[key], file)
+        os.replace(temporary_path, self._path(key))
+
+    def get_layout(self, key, layout_name):
+        """The cached positions of a layout (state -> (x, y)), or None."""
+        positions = self._entry(key)["layouts"].get(layout_name)
+        return None if positions is None else {state: tuple(pos) for state, pos in positions.items()}
+
+    def put_layout(self, key, layout_name, positions):
+        """Store the positions (state -> (x, y)) of a layout."""
+        self._entry(key)["layouts"][layout_name] = {state: list(pos) for state, pos in positions.items()}
+        self._save(key)
+
+    def get_dragged(self, key, layout_name):
+        """The positions (state -> (x, y)) the user dragged nodes to in a layout."""
+        return {state: tuple(pos) for state, pos in self._entry(key)["dragged"].get(layout_name, {}).items()}
+
+    def put_dragged(self, key, layout_name, positions):
+        """Store positions (state -> (x, y)) the user dragged nodes to, on top of the earlier ones."""
+        if not positions:
+            return
+        dragged = self._entry(key)["dragged"].setdefault(layout_name, {})
+        dragged.update({state: list(pos) for state, pos in positions.items()})
+        self._save(key)
+
+    def clear_dragged(self, key, layout_name):
+        """Forget the dragged positions of a layout."""
+        if self._entry(key)["dragged"].pop(layout_name, None) is not None:
+            self._save(key)
+
+    def cached_layout(self, key, layout_name, states, transitions):
+        """The positions of a layout, computed (in this thread) and stored if not cached yet."""
+        positions = self.get_layout(key, layout_name)
+        if positions is None:
+            positions = compute_layout(layout_name, states, transitions)
+            self.put_layout(key, layout_name, positions)
+        return positions
+
+
+class LayoutWorker(QThread):
+    """Computes a layout in the background and hands the positions back to the GUI thread."""
+    layout_ready = Signal(str, dict)
+    layout_failed = Signal(str, str)
+
+    def __init__(self, layout_name, states, transitions, parent=None):
+        super().__init__(parent)
+        self.layout_name = layout_name
+        self.states = list(states)
+        self.transitions = list(transitions)
+
+    def run(self):
+        try:
+            positions = compute_layout(self.layout_name, self.states, self.transitions)
+        except nx.NetworkXException as error:
+            self.layout_failed.emit(self.layout_name, str(error))
+            return
+        self.layout_ready.emit(self.layout_name, positions)
@@ -2,7 +2,7 @@ import numpy as np
 import math
 import pyqtgraph as pg
 from PySide6.QtWidgets import QWidget, QMenu, QCheckBox, QHBoxLayout, QVBoxLayout  # Import QCheckBox from PySide6
-from PySide6.QtCore import Qt, QObject, QEvent, QPointF
+from PySide6.QtCore import Qt, QObject, QEvent, QPointF, Signal
 from PySide6.QtGui import QAction, QPolygonF, QBrush, QColor
 from PySide6.QtWidgets import QGraphicsPolygonItem, QGraphicsItem
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QAreaSeries
@@ -18,6 +18,9 @@ from matplotlib.figure import Figure
 from PySide6.QtCore import Qt, QObject, QEvent, QPointF
 from sortedcontainers import SortedList
 from sortedcontainers import SortedDict
+from core.signal_validation import POSE_DTYPE, to_scalar
+from core.trip_comparison import base_signal_name, is_comparison_signal
+from core import tracing
 
 
 class TemporalPlotWidget_pg(QWidget):
@@ -67,6 +70,9 @@ class TemporalPlotWidget_pg(QWidget):
         # Initialize a color cycle
         self.color_cycle = self.get_color_cycle()
 
+        # Precomputed block statistics per signal (see core.signal_statistics), used for y-autoscale
+        self.signal_statistics = {}
+
     def get_color_cycle(self):
         """Returns a generator that cycles through a list of colors."""
         colors = [
@@ -97,9 +103,15 @@ class TemporalPlotWidget_pg(QWidget):
             if signal not in self.signals:
                 self.signals.append(signal)
             
+            # Signals of a compared trip are dashed, in the color of their trip A signal if it is plotted
+            comparison = is_comparison_signal(signal)
+            base_line = self.plot_lines.get(base_signal_name(signal), {}).get(plot_name)
+            if color is None and comparison and base_line is not None:
+                color = base_line.opts["pen"].color()
+
             # Assign a color if not specified
             color = color or next(self.color_cycle)
-            pen = pg.mkPen(color=color, width=2)
+            pen = pg.mkPen(color=color, width=2, style=Qt.DashLine if comparison else Qt.SolidLine)
                   
             # Initialize plot lines for this signal if not already present
             if signal not in self.plot_lines:
@@ -117,47 +129,107 @@ class TemporalPlotWidget_pg(QWidget):
             print(f"Error(register_signal): Plot '{plot_name}' not found in data_store.")
 
 
+    def unregister_signal(self, signal):
+        """
+        Remove a signal from all plots (its lines, legend entries, data and statistics).
+        """
+        for plot_name, line in self.plot_lines.pop(signal, {}).items():
+            getattr(self, plot_name).removeItem(line)
+        for plot_data in self.data_store.values():
+            plot_data.pop(signal, None)
+        self.signal_statistics.pop(signal, None)
+        if signal in self.signals:
+            self.signals.remove(signal)
+
     def update_data(self, signal, data, current_timestamp):
         """
         Update data for a specific signal and timestamp.
         """
-        # Ensure data is in a compatible format
-        data_value = data.to_numpy().item() if hasattr(data, 'to_numpy') else data
+        # Contract scalars are used as-is; legacy frames/arrays take the slow conversion path
+        data_value = data if isinstance(data, (float, int, np.number)) else to_scalar(data)
+
+        if data_value is None:
+            # Expected at the edges of a signal's time range, so recorded as a trace event only
+            tracing.instant("no data", "widget", signal=signal, timestamp=current_timestamp)
+            return
 
-        if data_value is not None:
         # Update data in each plot where the signal is registered
-            for plot_name in self.plot_lines.get(signal, {}):                
-                # Insert or update the (timestamp, data_value) pair
-                self.data_store[plot_name][signal][current_timestamp] = data_value
+        for plot_name in self.plot_lines.get(signal, {}):
+            # Insert or update the (timestamp, data_value) pair
+            self.data_store[plot_name][signal][current_timestamp] = data_value
 
-                # Retrieve timestamps and values in sorted order for plotting
-                timestamps = list(self.data_store[plot_name][signal].keys())
-                values = list(self.data_store[plot_name][signal].values())
+            # Retrieve timestamps and values in sorted order for plotting
+            timestamps = list(self.data_store[plot_name][signal].keys())
+            values = list(self.data_store[plot_name][signal].values())
 
-                # Update the line data for the signal
-                line = self.plot_lines[signal][plot_name]
-                line.setData(timestamps, values)
-                
-                
-                # Update or create the timestamp line
-                if self.timestamp_line[plot_name] is None:
-                    self.timestamp_line[plot_name] = pg.InfiniteLine(pos=current_timestamp, angle=90, pen=pg.mkPen('r', style=Qt.DashLine))
-                    getattr(self, plot_name).addItem(self.timestamp_line[plot_name])
-                else:
-                    self.timestamp_line[plot_name].setValue(current_timestamp)
-
-                # Auto-update zoom if desired
-                self.auto_update_zoom()
-                
+            # Update the line data for the signal
+            line = self.plot_lines[signal][plot_name]
+            line.setData(timestamps, values)
+            
+            
+            # Update or create the timestamp line
+            if self.timestamp_line[plot_name] is None:
+                self.timestamp_line[plot_name] = pg.InfiniteLine(pos=current_timestamp, angle=90, pen=pg.mkPen('r', style=Qt.DashLine))
+                getattr(self, plot_name).addItem(self.timestamp_line[plot_name])
             else:
-                print(f"\033[93mWarning: Received empty or None data for signal {signal} at time stamp {current_timestamp}\033[0m")
+                self.timestamp_line[plot_name].setValue(current_timestamp)
+
+            # Auto-update zoom if desired
+            self.auto_update_zoom()
+
+    def set_signal_statistics(self, signal, statistics):
+        """
+        Attach precomputed statistics to a signal, so its y-range is taken from the
+        block table instead of scanning the plotted samples.
+        """
+        if statistics is None:
+            self.signal_statistics.pop(signal, None)
+        else:
+            self.signal_statistics[signal] = statistics
 
     def auto_update_zoom(self):
-        """Auto-update zoom to fit the data."""
-        for plot in [self.plot1, self.plot2, self.plot3]:
-            plot.enableAutoRange()
+        """
+        Auto-update zoom to fit the data.
+
+        The x-axis follows the plotted data. If every signal of a plot has precomputed
+        statistics, the y-range is taken from the blocks overlapping the plotted time range
+        (O(visible blocks)); otherwise pyqtgraph scans the plotted data.
+        """
+        for plot_name in self.data_store:
+            plot = getattr(self, plot_name)
+            y_range = self._block_y_range(plot_name)
+            if y_range is None:
+                plot.enableAutoRange()
+            else:
+                plot.enableAutoRange(axis='x')
+                plot.setYRange(*y_range, padding=0.05)
+
+    def _block_y_range(self, plot_name):
+        """Get the (min, max) over the plotted time range of all signals of a plot from their block statistics."""
+        y_min, y_max = None, None
+        for signal, samples in self.data_store[plot_name].items():
+            statistics = self.signal_statistics.get(signal)
+            if statistics is None:
+                return None
+            if not samples:
+                continue
+            stats = statistics.range_stats(samples.peekitem(0)[0], samples.peekitem(-1)[0])
+            if stats is None:
+                return None
+            y_min = stats.min if y_min is None else min(y_min, stats.min)
+            y_max = stats.max if y_max is None else max(y_max, stats.max)
+        if y_min is None:
+            return None
+        if y_min == y_max:
+            # pyqtgraph keeps the previous scale for a zero-height range; use a fixed one so
+            # the view depends only on the plotted data
+            y_min, y_max = y_min - 0.5, y_max + 0.5
+        return y_min, y_max
             
 class SpatialPlotWidget(QWidget):
+    # Left click on the plot: world x, y [m] and whether Shift was held
+    position_clicked = Signal(float, float, bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -176,6 +248,21 @@ class SpatialPlotWidget(QWidget):
         self.vehicle = VehicleObject(config=niro_ev2)
         self.plot_widget.addItem(self.vehicle)  # Add vehicle to plot                                      
 
+        # Vehicle of the compared trip, created when its pose signal is registered
+        self.comparison_vehicle = None
+
+        self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_clicked)
+
+    def on_mouse_clicked(self, event):
+        """Emit position_clicked with the world coordinates of a left click inside the plot area."""
+        if event.button() != Qt.LeftButton or event.double():
+            return
+        view_box = self.plot_widget.getPlotItem().getViewBox()
+        if not view_box.sceneBoundingRect().contains(event.scenePos()):
+            return
+        point = view_box.mapSceneToView(event.scenePos())
+        shift = bool(event.modifiers() & Qt.ShiftModifier)
+        self.position_clicked.emit(point.x(), point.y(), shift)
 
     def register_signal(self, signal):               
         """
@@ -192,19 +279,37 @@ class SpatialPlotWidget(QWidget):
         # Initialize an empty dictionary for this signal's data
         self.data_store[signal] = {"x": [], "y": [], "theta": None}  # Adjust as needed
         
-        # Create plot elements based on signal type
-        if signal == "route":
-            self.plot_elements[signal] = self.plot_widget.plot(pen=pg.mkPen('r', width=2))
-        elif signal == "car_pose(t)":
+        # Create plot elements based on signal type; signals of a compared trip get their own colors
+        base_signal = base_signal_name(signal)
+        comparison = is_comparison_signal(signal)
+        if base_signal == "route":
+            pen = pg.mkPen('c', width=2, style=Qt.DashLine) if comparison else pg.mkPen('r', width=2)
+            self.plot_elements[signal] = self.plot_widget.plot(pen=pen)
+        elif base_signal == "car_pose(t)":
             self.plot_elements[signal] = pg.ScatterPlotItem()
             self.plot_widget.addItem(self.plot_elements[signal])
-        elif signal == "path_in_world_coordinates(t)":
-            self.plot_elements[signal] = pg.PlotDataItem(pen=None, symbol='o', symbolBrush='g', symbolSize=5)
+            if comparison and self.comparison_vehicle is None:
+                self.comparison_vehicle = VehicleObject(config=niro_ev2)
+                self.comparison_vehicle.setBrush(QBrush(QColor(0, 200, 255, 120)))
+                self.plot_widget.addItem(self.comparison_vehicle)
+        elif base_signal == "path_in_world_coordinates(t)":
+            self.plot_elements[signal] = pg.PlotDataItem(pen=None, symbol='o', symbolBrush='m' if comparison else 'g', symbolSize=5)
             self.plot_widget.addItem(self.plot_elements[signal])
             
         print(f"\033[94mRegistered spatial signal\033[0m: {signal}")
 
-        
+
+    def unregister_signal(self, signal):
+        """
+        Remove a spatial signal and its plot element.
+        """
+        element = self.plot_elements.pop(signal, None)
+        if element is not None:
+            self.plot_widget.removeItem(element)
+        self.data_store.pop(signal, None)
+        if signal in self.signals:
+            self.signals.remove(signal)
+
     def update_data(self, signal, data):
         """Update data for spatial signals."""
         if signal not in self.data_store:
@@ -212,8 +317,12 @@ class SpatialPlotWidget(QWidget):
             return
         
         # Update data store
-        # Handle data as either dictionary or ndarray
-        if isinstance(data, dict):
+        # Contract payloads: a POSE_DTYPE record, or an (N, 2) float64 array stored as column views
+        if isinstance(data, (np.void, np.ndarray)) and data.dtype == POSE_DTYPE:
+            self.data_store[signal]["x"] = data["x"]
+            self.data_store[signal]["y"] = data["y"]
+            self.data_store[signal]["theta"] = data["theta"]
+        elif isinstance(data, dict):
             self.data_store[signal]["x"] = data.get("x", [])
             self.data_store[signal]["y"] = data.get("y", [])
             self.data_store[signal]["theta"] = data.get("theta")  # Only for 'car_pose(t)', if applicable
@@ -228,11 +337,13 @@ class SpatialPlotWidget(QWidget):
 
         # Update plot elements
         if signal in self.plot_elements:
-            if signal == "route" or signal == "path_in_world_coordinates(t)":
+            base_signal = base_signal_name(signal)
+            if base_signal == "route" or base_signal == "path_in_world_coordinates(t)":
                 self.plot_elements[signal].setData(self.data_store[signal]["x"], self.data_store[signal]["y"])
-            elif signal == "car_pose(t)":
+            elif base_signal == "car_pose(t)":
                 # Update the vehicle position and orientation
-                self.vehicle.set_pose_at_front_axle(
+                vehicle = self.comparison_vehicle if is_comparison_signal(signal) else self.vehicle
+                vehicle.set_pose_at_front_axle(
                     self.data_store[signal]["x"], 
                     self.data_store[signal]["y"], 
                     math.radians(self.data_store[signal]["theta"])
@@ -352,8 +463,8 @@ class TemporalPlotWidget_plt(QWidget):
         # name and data so we can append the current timestamp and data for the signal.
         """
                    
-        # Ensure data is in a compatible format
-        data_value = data.to_numpy().item() if hasattr(data, 'to_numpy') else data
+        # Contract scalars are used as-is; legacy frames/arrays take the slow conversion path
+        data_value = data if isinstance(data, (float, int, np.number)) else to_scalar(data)
 
                 
         for ax_name, ax_data in self.data_store.items(): # Iterate over all subplots
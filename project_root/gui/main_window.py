@@ -1,10 +1,12 @@
-from PySide6.QtWidgets import QMainWindow, QDockWidget, QWidget, QVBoxLayout, QComboBox, QCheckBox, QHBoxLayout, QMenu, QMenuBar, QMessageBox, QSizePolicy
+from PySide6.QtWidgets import QMainWindow, QDockWidget, QWidget, QVBoxLayout, QComboBox, QCheckBox, QHBoxLayout, QMenu, QMenuBar, QMessageBox, QSizePolicy, QInputDialog
 from PySide6.QtCore import Qt, Signal
 from gui.custom_plot_widget import SpatialPlotWidget, TemporalPlotWidget_plt, TemporalPlotWidget_pg
 from gui.timestamp_slider import TimestampSlider
+from gui.performance_hud import PerformanceHud
 from core.plot_manager import PlotManager
+from core.trip_comparison import comparison_companions
 from core.config import spatial_signals, temporal_signals  # Import signal lists from config
-from PySide6.QtGui import QAction
+from PySide6.QtGui import QAction, QCursor
 
 # Define global list for spatial signals
 spatial_signals = ["car_pose(t)", "route", "path_in_world_coordinates(t)"]
@@ -23,6 +25,10 @@ temporal_signals = [
 ]
 
 
+# Radius around a Shift+clicked point within which the passes of the car are listed [m]
+PASS_SEARCH_RADIUS_M = 5.0
+
+
 def create_main_window(plot_manager: PlotManager) -> tuple[QMainWindow, PlotManager]:
     win = QMainWindow()
     win.resize(1200, 800)
@@ -37,8 +43,11 @@ def create_main_window(plot_manager: PlotManager) -> tuple[QMainWindow, PlotMana
     car_pose_plot, car_signals_plot = plots_and_docks['plots']
     car_pose_dock, car_signals_dock = plots_and_docks['docks']
 
+    # Performance HUD dock, hidden until toggled from the View menu
+    hud_dock = setup_performance_hud(win, plot_manager)
+
     # Set up the menu bar with enhanced user interaction options
-    setup_menu_bar(win, plot_manager, [car_pose_plot, car_signals_plot], current_timestamp)
+    setup_menu_bar(win, plot_manager, [car_pose_plot, car_signals_plot], current_timestamp, hud_dock)
 
     # Create Timestamp Slider with compact placement
     setup_timestamp_slider(win, plot_manager, current_timestamp)
@@ -77,20 +86,38 @@ def setup_plot_docks(win: QMainWindow, plot_manager: PlotManager) -> dict[str, l
     win.addDockWidget(Qt.RightDockWidgetArea, car_signals_dock)
 
     # Register the widgets with the plot manager, but without recreating them for each signal
+    # In comparison mode, the trip B and A-B difference signals are overlaid on the same plots
     for signal in spatial_signals:
         plot_manager.register_plot(signal)
         # plot_manager.assign_signal_to_plot(car_pose_plot, signal)
+        for companion in comparison_companions(signal):
+            if companion in plot_manager.signal_plugins:
+                plot_manager.register_plot(companion)
 
         
     for signal in temporal_signals:
         plot_manager.register_plot(signal)
         # plot_manager.assign_signal_to_plot(car_signals_plot, signal)
+        for companion in comparison_companions(signal):
+            if companion in plot_manager.signal_plugins:
+                plot_manager.register_plot(companion)
 
     
     return {'plots': [car_pose_plot, car_signals_plot], 'docks': [car_pose_dock, car_signals_dock]}
 
 
-def setup_menu_bar(win, plot_manager, plots, current_timestamp):
+def setup_performance_hud(win, plot_manager):
+    """Create the (initially hidden) performance HUD dock."""
+    hud_dock = QDockWidget("Performance", win)
+    hud_dock.setObjectName("PerformanceHudDock")
+    hud_dock.setWidget(PerformanceHud(plot_manager))
+    hud_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetClosable | QDockWidget.DockWidgetFloatable)
+    win.addDockWidget(Qt.LeftDockWidgetArea, hud_dock)
+    hud_dock.hide()
+    return hud_dock
+
+
+def setup_menu_bar(win, plot_manager, plots, current_timestamp, hud_dock=None):
     menubar = QMenuBar(win)
     win.setMenuBar(menubar)
 
@@ -100,6 +127,13 @@ def setup_menu_bar(win, plot_manager, plots, current_timestamp):
     load_signal_menu = QMenu("Load Signals", win)
     view_menu.addMenu(load_signal_menu)
 
+    # Show/hide the performance HUD
+    if hud_dock is not None:
+        hud_action = hud_dock.toggleViewAction()
+        hud_action.setText("Performance HUD")
+        hud_action.setShortcut("F12")
+        view_menu.addAction(hud_action)
+
     # Add checkboxes for each available signal
     for signal in plot_manager.signal_plugins.keys():
         signal_action = QAction(signal, win)
@@ -108,6 +142,43 @@ def setup_menu_bar(win, plot_manager, plots, current_timestamp):
         signal_action.triggered.connect(lambda checked, s=signal: toggle_signal_visibility(plot_manager, plots, s, checked, current_timestamp))
         load_signal_menu.addAction(signal_action)
 
+    # Signals Menu for user-defined expression signals
+    signals_menu = menubar.addMenu("Signals")
+    add_expression_action = QAction("Add Expression Signal...", win)
+    add_expression_action.triggered.connect(lambda: add_expression_signal(win, plot_manager))
+    signals_menu.addAction(add_expression_action)
+
+    # Plugins Menu for reloading edited plugins without restarting the player
+    plugins_menu = menubar.addMenu("Plugins")
+    for plugin_name in sorted(plot_manager.plugin_sources):
+        reload_action = QAction(f"Reload {plugin_name}", win)
+        reload_action.triggered.connect(lambda checked=False, name=plugin_name: plot_manager.reload_plugin(name))
+        plugins_menu.addAction(reload_action)
+
+
+def add_expression_signal(win, plot_manager):
+    """
+    Ask the user for a signal name and an expression, register it and plot it.
+    
+    Example expressions: "abs(current_steering - target_steering_angle) > 5",
+    "rolling_mean(current_speed, 1s)".
+    """
+    expression, ok = QInputDialog.getText(win, "Add Expression Signal", "Expression:")
+    if not ok or not expression.strip():
+        return
+    signal_name, ok = QInputDialog.getText(win, "Add Expression Signal", "Signal name:", text=expression.strip())
+    if not ok or not signal_name.strip():
+        return
+    signal_name = signal_name.strip()
+
+    if not plot_manager.register_expression_signal(signal_name, expression):
+        QMessageBox.warning(win, "Add Expression Signal", f"Could not register expression '{expression}'. See the log for details.")
+        return
+
+    plot_manager.register_plot(signal_name)
+    if plot_manager.current_timestamp is not None:
+        plot_manager.request_data(plot_manager.current_timestamp)
+
 
 def setup_timestamp_slider(win, plot_manager, current_timestamp):
     if "timestamps" in plot_manager.signal_plugins:
@@ -129,6 +200,12 @@ def setup_timestamp_slider(win, plot_manager, current_timestamp):
     slider.timestamp_changed.connect(update_timestamp)
     slider_dock.setWidget(slider)
 
+    # Clicking the spatial plot seeks to the moment the car was closest to the clicked point
+    car_pose_plugin = plot_manager.plugins.get("CarPosePlugin")
+    if car_pose_plugin is not None:
+        plot_manager.spatial_plot_widget.position_clicked.connect(
+            lambda x, y, shift: seek_to_position(win, slider, car_pose_plugin.car_pose, x, y, list_passes=shift))
+
     # Remove the title bar for a more compact layout
     slider_dock.setTitleBarWidget(QWidget())
 
@@ -143,6 +220,30 @@ def setup_timestamp_slider(win, plot_manager, current_timestamp):
     slider_dock.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
 
 
+def seek_to_position(win, slider, car_pose, x, y, list_passes=False):
+    """
+    Move the slider to the moment the car was closest to the point (x, y) of the spatial plot.
+
+    With list_passes (Shift+click), the car may have passed the point several times (e.g. on
+    a looped route): every pass within PASS_SEARCH_RADIUS_M is listed in a menu to pick from.
+    """
+    if not list_passes:
+        nearest = car_pose.get_nearest_timestamp(x, y)
+        if nearest is not None:
+            slider.set_timestamp(nearest[0])
+        return
+
+    passes = car_pose.get_passes_near(x, y, PASS_SEARCH_RADIUS_M)
+    if not passes:
+        win.statusBar().showMessage(f"No pass within {PASS_SEARCH_RADIUS_M:g} m of ({x:.1f}, {y:.1f})", 5000)
+        return
+    menu = QMenu(win)
+    for number, (timestamp, distance) in enumerate(passes, start=1):
+        action = menu.addAction(f"Pass {number}: {slider.time_ms_to_datetime(timestamp)} ({distance:.1f} m)")
+        action.triggered.connect(lambda checked=False, t=timestamp: slider.set_timestamp(t))
+    menu.exec(QCursor.pos())
+
+
 def toggle_signal_visibility(plot_manager, plots, signal, visible, current_timestamp):
     for plot in plots:
         if visible:
@@ -0,0 +1,117 @@
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget
+from PySide6.QtCore import Qt, QTimer
+from core import tracing
+from core.performance_metrics import PerformanceMetrics, plugin_memory
+
+# Refresh interval of the HUD [ms]
+REFRESH_INTERVAL_MS = 500
+
+# Plugin memory is walked less often than the timing metrics are aggregated
+MEMORY_REFRESH_TICKS = 10
+
+
+def _format_bytes(num_bytes):
+    if num_bytes is None:
+        return "n/a"
+    return f"{num_bytes / 2**20:.1f} MB"
+
+
+class PerformanceHud(QWidget):
+    """
+    Live performance panel: FPS, request_data latency percentiles, time breakdowns per
+    plugin, signal and widget, data cache hit rate and memory per plugin.
+
+    The HUD is fed from the tracing ring buffer (see core.tracing). Tracing is enabled while
+    the HUD is visible (unless it was already enabled, e.g. via DEBUG_PLAYER_TRACE) and the
+    new events are aggregated every REFRESH_INTERVAL_MS, so a hidden HUD costs nothing.
+    """
+
+    def __init__(self, plot_manager, parent=None):
+        super().__init__(parent)
+        self.plot_manager = plot_manager
+        self.metrics = PerformanceMetrics()
+        self._enabled_tracing = False
+        self._ticks = 0
+        self._plugin_memory = {}
+
+        self.summary_label = QLabel("Waiting for frames...")
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self.tables = {}
+        self.tabs = QTabWidget()
+        for name, columns in (
+            ("plugins", ["Plugin", "Calls", "Total [ms]", "Mean [ms]", "Memory"]),
+            ("signals", ["Signal", "Calls", "Total [ms]", "Mean [ms]"]),
+            ("widgets", ["Widget", "Calls", "Total [ms]", "Mean [ms]"]),
+        ):
+            table = QTableWidget(0, len(columns))
+            table.setHorizontalHeaderLabels(columns)
+            table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+            table.verticalHeader().setVisible(False)
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            self.tables[name] = table
+            self.tabs.addTab(table, name.capitalize())
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.tabs)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        """Start sampling when the HUD becomes visible."""
+        if not tracing.is_enabled():
+            tracing.enable_tracing()
+            self._enabled_tracing = True
+        self.timer.start(REFRESH_INTERVAL_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Stop sampling, and tracing if the HUD enabled it."""
+        self.timer.stop()
+        if self._enabled_tracing:
+            tracing.disable_tracing()
+            self._enabled_tracing = False
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Aggregate the new tracing events and update the display."""
+        self.metrics.update()
+        if self._ticks % MEMORY_REFRESH_TICKS == 0:
+            self._plugin_memory = plugin_memory(self.plot_manager.plugins)
+        self._ticks += 1
+
+        snapshot = self.metrics.snapshot()
+        fps = f"{snapshot['fps']:.1f}" if snapshot["fps"] is not None else "n/a"
+        latency = snapshot["latency"]
+        latency_text = f"p50 {latency['p50']:.2f} ms / p99 {latency['p99']:.2f} ms" if latency else "n/a"
+        hit_rate = snapshot["cache_hit_rate"]
+        hit_rate_text = f"{hit_rate:.0%}" if hit_rate is not None else "n/a"
+        self.summary_label.setText(
+            f"FPS: {fps}    request_data: {latency_text}\n"
+            f"Data cache hit rate: {hit_rate_text}    Resident memory: {_format_bytes(snapshot['rss_bytes'])}"
+        )
+
+        plugins = dict(snapshot["plugins"])
+        # List plugins that were not called yet too, for their memory
+        for name in self._plugin_memory:
+            plugins.setdefault(f"plugin:{name}", {"calls": 0, "total_ms": 0.0, "mean_ms": 0.0})
+        self._fill_table(self.tables["plugins"], plugins,
+                         lambda name: _format_bytes(self._plugin_memory.get(name.split(":", 1)[-1])))
+        self._fill_table(self.tables["signals"], snapshot["signals"])
+        self._fill_table(self.tables["widgets"], snapshot["widgets"])
+
+    def _fill_table(self, table, rows, extra_column=None):
+        table.setRowCount(len(rows))
+        for row, (name, stats) in enumerate(rows.items()):
+            values = [name, str(stats["calls"]), f"{stats['total_ms']:.2f}", f"{stats['mean_ms']:.3f}"]
+            if extra_column is not None:
+                values.append(extra_column(name))
+            for column, value in enumerate(values):
+                item = table.item(row, column)
+                if item is None:
+                    table.setItem(row, column, QTableWidgetItem(value))
+                else:
+                    item.setText(value)
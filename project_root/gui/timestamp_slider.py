@@ -1,7 +1,9 @@
 from datetime import datetime
+import numpy as np
 from PySide6.QtWidgets import QWidget, QSlider, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QIcon
+from core import tracing
 
 class TimestampSlider(QWidget):
     # Define the signal that emits the updated timestamp
@@ -106,10 +108,11 @@ class TimestampSlider(QWidget):
         
     def on_slider_changed(self, value):
         """Handle slider value changes, map to actual timestamps, and update."""
-        timestamp_ms = self.get_timestamp(value)  # Get actual timestamp from slider value
-        self.label.setText(f"Timestamp: {self.time_ms_to_datetime(timestamp_ms)} ({timestamp_ms}[ms])")  # Update the label
-        self.plot_manager.request_data(timestamp_ms)  # Request data for this timestamp
-        self.timestamp_changed.emit(timestamp_ms)
+        with tracing.span("slider", "ui", value=value):
+            timestamp_ms = self.get_timestamp(value)  # Get actual timestamp from slider value
+            self.label.setText(f"Timestamp: {self.time_ms_to_datetime(timestamp_ms)} ({timestamp_ms}[ms])")  # Update the label
+            self.plot_manager.request_data(timestamp_ms)  # Request data for this timestamp
+            self.timestamp_changed.emit(timestamp_ms)
         
         
     def on_slider_moved(self, value):
@@ -125,6 +128,16 @@ class TimestampSlider(QWidget):
         """Map the slider's integer value to the corresponding timestamp."""
         return self.timestamps[slider_value]  # Return the actual timestamp
     
+    def set_timestamp(self, timestamp_ms):
+        """Move the slider to the data timestamp closest to timestamp_ms (e.g. when seeking from a plot)."""
+        timestamps = np.asarray(self.timestamps, dtype=np.float64)
+        if len(timestamps) == 0:
+            return
+        index = int(np.searchsorted(timestamps, timestamp_ms))
+        if index == len(timestamps) or (index > 0 and timestamp_ms - timestamps[index - 1] <= timestamps[index] - timestamp_ms):
+            index -= 1
+        self.slider.setValue(index)
+
     def time_ms_to_datetime(self, time_ms):
         """Convert a time in milliseconds to a datetime object."""
         time_stamp_datatime =  datetime.fromtimestamp(time_ms / 1000)
@@ -0,0 +1,232 @@
+import datetime
+import os
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton, QLabel,
+                               QDoubleSpinBox, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                               QDialogButtonBox, QFileDialog, QApplication)
+from PySide6.QtCore import QThread, Signal, QTimer
+from core.trip_catalog import TripCatalog, default_catalog_path
+
+# Results shown in the table
+MAX_RESULTS = 1000
+
+# While indexing, the results are re-queried every this many indexed trips
+REQUERY_INTERVAL = 50
+
+# Delay between the last filter edit and the query [ms]
+FILTER_DEBOUNCE_MS = 150
+
+_COLUMNS = ["Trip", "Start", "Duration [min]", "Distance [km]", "Path"]
+
+
+class TripIndexer(QThread):
+    """
+    Refreshes the catalog of a trips root in the background.
+
+    The thread opens its own catalog connection (SQLite connections are per thread), so the
+    picker keeps querying the catalog while trips are indexed.
+    """
+    progress = Signal(int, int, str)
+    indexing_finished = Signal(dict)
+
+    def __init__(self, root, catalog_path, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.catalog_path = catalog_path
+
+    def run(self):
+        catalog = TripCatalog(self.catalog_path)
+        try:
+            counts = catalog.refresh(self.root, progress=self.progress.emit,
+                                     should_stop=self.isInterruptionRequested)
+        finally:
+            catalog.close()
+        self.indexing_finished.emit(counts)
+
+
+def _optional_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+class TripPickerDialog(QDialog):
+    """
+    Trip picker backed by the trip catalog (see core.trip_catalog).
+
+    Shows the indexed trips of a root immediately and filters them by duration, driving
+    mode, route bounding box (car pose x/y) and name while the background indexer picks
+    up new and changed trips.
+    """
+
+    def __init__(self, root=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Trip")
+        self.resize(900, 600)
+        self.catalog = None
+        self.indexer = None
+        self.selected_path = None
+
+        self.root_edit = QLineEdit(root or "")
+        self.root_edit.setReadOnly(True)
+        browse_button = QPushButton("Open Trips Folder...")
+        browse_button.clicked.connect(self.browse_root)
+        self.reindex_button = QPushButton("Reindex")
+        self.reindex_button.clicked.connect(self.start_indexing)
+        root_layout = QHBoxLayout()
+        root_layout.addWidget(self.root_edit)
+        root_layout.addWidget(browse_button)
+        root_layout.addWidget(self.reindex_button)
+
+        self.min_duration = QDoubleSpinBox()
+        self.min_duration.setRange(0.0, 24 * 60.0)
+        self.min_duration.setSuffix(" min")
+        self.driving_mode = QComboBox()
+        self.driving_mode.setEditable(True)
+        self.driving_mode.addItems(["Any", "0", "1", "2"])
+        self.bbox_edit = QLineEdit()
+        self.bbox_edit.setPlaceholderText("min_x, min_y, max_x, max_y [m]")
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("Part of the trip name")
+        filters = QFormLayout()
+        filters.addRow("Longer than", self.min_duration)
+        filters.addRow("Driving mode", self.driving_mode)
+        filters.addRow("Route near", self.bbox_edit)
+        filters.addRow("Name", self.name_edit)
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(len(_COLUMNS) - 1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.cellDoubleClicked.connect(lambda row, _: self.accept())
+
+        self.status_label = QLabel()
+        buttons = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(root_layout)
+        layout.addLayout(filters)
+        layout.addWidget(self.table)
+        layout.addWidget(self.status_label)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        # Queries are cheap, but typing should not re-query on every key press
+        self.query_timer = QTimer(self)
+        self.query_timer.setSingleShot(True)
+        self.query_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.query_timer.timeout.connect(self.update_results)
+        self.min_duration.valueChanged.connect(self.query_timer.start)
+        self.driving_mode.currentTextChanged.connect(self.query_timer.start)
+        self.bbox_edit.textChanged.connect(self.query_timer.start)
+        self.name_edit.textChanged.connect(self.query_timer.start)
+
+        if root:
+            self.set_root(root)
+
+    def browse_root(self):
+        root = QFileDialog.getExistingDirectory(self, "Open Trips Folder", self.root_edit.text())
+        if root:
+            self.set_root(root)
+
+    def set_root(self, root):
+        """Show the catalog of a trips root and refresh it in the background."""
+        self.stop_indexing()
+        if self.catalog is not None:
+            self.catalog.close()
+        self.root_edit.setText(root)
+        self.catalog = TripCatalog(default_catalog_path(root))
+        self.update_results()
+        self.start_indexing()
+
+    def start_indexing(self):
+        if self.catalog is None or (self.indexer is not None and self.indexer.isRunning()):
+            return
+        self.indexer = TripIndexer(self.root_edit.text(), self.catalog.db_path, self)
+        self.indexer.progress.connect(self.on_index_progress)
+        self.indexer.indexing_finished.connect(self.on_indexing_finished)
+        self.reindex_button.setEnabled(False)
+        self.indexer.start()
+
+    def stop_indexing(self):
+        if self.indexer is not None:
+            self.indexer.requestInterruption()
+            self.indexer.wait()
+            self.indexer = None
+
+    def on_index_progress(self, done, total, trip_path):
+        self.status_label.setText(f"Indexing {done}/{total}: {os.path.basename(os.path.normpath(trip_path))}")
+        if done % REQUERY_INTERVAL == 0:
+            self.update_results()
+
+    def on_indexing_finished(self, counts):
+        self.reindex_button.setEnabled(True)
+        self.update_results()
+        if counts["failed"]:
+            self.status_label.setText(self.status_label.text() + f" ({counts['failed']} trips could not be indexed)")
+
+    def current_filters(self):
+        """Get the catalog query arguments of the filter fields."""
+        filters = {"root": self.root_edit.text(), "limit": MAX_RESULTS}
+        if self.min_duration.value() > 0:
+            filters["min_duration_s"] = self.min_duration.value() * 60.0
+        mode = _optional_float(self.driving_mode.currentText())
+        if mode is not None:
+            filters["driving_mode"] = mode
+        bbox = [_optional_float(v) for v in self.bbox_edit.text().split(",")]
+        if len(bbox) == 4 and None not in bbox:
+            filters["bbox"] = tuple(bbox)
+        if self.name_edit.text().strip():
+            filters["name"] = self.name_edit.text().strip()
+        return filters
+
+    def update_results(self):
+        if self.catalog is None:
+            return
+        trips = self.catalog.query(**self.current_filters())
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(trips))
+        for row, trip in enumerate(trips):
+            start = (datetime.datetime.fromtimestamp(trip["start_ms"] / 1000.0).strftime("%Y-%m-%d %H:%M:%S")
+                     if trip["start_ms"] is not None else "")
+            cells = [
+                trip["name"],
+                start,
+                f"{trip['duration_s'] / 60.0:.1f}" if trip["duration_s"] is not None else "",
+                f"{trip['distance_m'] / 1000.0:.2f}" if trip["distance_m"] is not None else "",
+                trip["path"],
+            ]
+            for column, text in enumerate(cells):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.setSortingEnabled(True)
+        if not (self.indexer is not None and self.indexer.isRunning()):
+            self.status_label.setText(f"{len(trips)} trips")
+
+    def accept(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        self.selected_path = self.table.item(row, len(_COLUMNS) - 1).text()
+        super().accept()
+
+    def done(self, result):
+        self.stop_indexing()
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
+        super().done(result)
+
+
+def select_trip(root=None):
+    """Let the user pick a trip of a trips root; returns its path or None if cancelled."""
+    # Held on purpose: a QApplication created here must stay alive while the dialog runs
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    dialog = TripPickerDialog(root)
+    return dialog.selected_path if dialog.exec() == QDialog.Accepted else None
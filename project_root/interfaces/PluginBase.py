@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
 
 class PluginBase(ABC):
     """
@@ -69,6 +71,9 @@ class PluginBase(ABC):
         # Each signal definition must include at minimum:
         # - func: A callable that returns data for this signal
         # - type: The signal type (e.g., "temporal", "spatial")
+        # Optionally, a signal may provide:
+        # - series: A callable returning the full signal as (timestamps_ms, values) arrays,
+        #   which allows it to be used as an input of derived signals
         # 
         # Example:
         # self.signals = {
@@ -101,7 +106,7 @@ class PluginBase(ABC):
         pass
 
     @abstractmethod
-    def get_data_for_timestamp(self, signal: str, timestamp: float) -> Optional[Dict[str, Any]]:
+    def get_data_for_timestamp(self, signal: str, timestamp: float) -> Optional[Any]:
         """
         Fetch data for a specific signal and timestamp.
 
@@ -122,10 +127,64 @@ class PluginBase(ABC):
         Returns:
         --------
         Optional[Dict[str, Any]]
-            A dictionary containing the data for the signal at the specified timestamp.
-            The format of this dictionary depends on the signal type:
-            - For temporal signals: {"value": value} or {"values": [v1, v2, ...]}
-            - For spatial signals: {"x": x_values, "y": y_values, (optional) "theta": orientation}
+            The data for the signal at the specified timestamp, following the signal
+            data contract of core.signal_validation:
+            - For temporal signals: a scalar float
+            - For spatial signals: an (N, 2) float64 array or a POSE_DTYPE pose record
+            - For categorical signals: a scalar category code
             - Return None if the signal is not found or data is not available
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_data_for_timestamps(self, signal: str, timestamps: Iterable[float]) -> np.ndarray:
+        """
+        Fetch the values of a temporal signal at many timestamps at once.
+
+        This is the batch counterpart of get_data_for_timestamp, used by headless tools that
+        sample signals on a time grid (e.g. tools/query.py). The default implementation calls
+        get_data_for_timestamp for each timestamp; plugins holding the full series in memory
+        should override it with a vectorized lookup that returns the same values.
+
+        Parameters:
+        -----------
+        signal : str
+            The name of the signal to fetch data for.
+
+        timestamps : Iterable[float]
+            The timestamps to fetch data for, in milliseconds.
+
+        Returns:
+        --------
+        np.ndarray
+            float64 array with one value per timestamp; NaN where no data is available.
+        """
+        from core.signal_validation import to_scalar
+
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.full(len(timestamps), np.nan)
+        for i, timestamp in enumerate(timestamps):
+            value = to_scalar(self.get_data_for_timestamp(signal, float(timestamp)))
+            if value is not None:
+                values[i] = value
+        return values
+
+    @classmethod
+    def discover_signals(cls, file_path: str) -> Optional[Iterable[str]]:
+        """
+        List the signals the plugin would provide for a trip, without loading its data.
+
+        Headless tools use this to instantiate only the plugins providing the signals they
+        need. Plugins whose signals depend on the data may scan it cheaply (e.g. read the
+        file headers) or return None.
+
+        Parameters:
+        -----------
+        file_path : str
+            The path passed to the plugin constructor.
+
+        Returns:
+        --------
+        Optional[Iterable[str]]
+            The signal names, or None if they are only known after instantiation.
+        """
+        return None
@@ -2,22 +2,43 @@ from PySide6.QtWidgets import QApplication
 from gui.main_window import create_main_window
 from core.data_loader import parse_arguments
 from core.plot_manager import PlotManager
+from core.config import expression_signals
+from core import tracing
 import os
 
 def main():
     # Initialize QApplication
     app = QApplication([])
+    
+    # Optionally trace the frame pipeline and write a Chrome/Perfetto trace on exit: DEBUG_PLAYER_TRACE=trace.json
+    trace_path = os.environ.get(tracing.TRACE_ENV_VAR)
+    if trace_path:
+        tracing.enable_tracing()
    
     # Initialize the PlotManager
     plot_manager = PlotManager()
     
+    # Optionally flag plugins that return slow (non-contract) data types: DEBUG_PLAYER_VALIDATE_DATA=warn|strict
+    validation_mode = os.environ.get("DEBUG_PLAYER_VALIDATE_DATA")
+    if validation_mode:
+        plot_manager.enable_data_validation(validation_mode)
+    
     # Load plugins dynamically from the 'plugins/' directory
     plugin_dir = os.path.join(os.path.dirname(__file__), 'plugins')
 
     # Pass file path arguments as needed to the plugins
     trip_path = parse_arguments()
-    plugin_args = {"file_path": trip_path}
-    plot_manager.load_plugins_from_directory(plugin_dir, plugin_args=plugin_args)
+    if isinstance(trip_path, tuple):
+        # A/B comparison: both trips load concurrently, trip B signals are suffixed with " [B]"
+        trip_a, trip_b, trip_b_offset = trip_path
+        plot_manager.load_comparison_plugins_from_directory(plugin_dir, trip_a, trip_b, time_offset_s=trip_b_offset)
+        plot_manager.register_comparison_diff_signals()
+        plot_manager.register_path_divergence_signals(max_workers=os.cpu_count() or 1)
+    else:
+        plugin_args = {"file_path": trip_path}
+        plot_manager.load_plugins_from_directory(plugin_dir, plugin_args=plugin_args)
+    plot_manager.register_default_derived_signals()
+    plot_manager.register_expression_signals(expression_signals)
     
     # Create the main window
     win, plot_manager = create_main_window(plot_manager=plot_manager)
@@ -31,6 +52,9 @@ def main():
         
     # Start the event loop
     app.exec()
+    
+    if trace_path:
+        tracing.export_chrome_trace(trace_path)
 
 if __name__ == '__main__':
     main()
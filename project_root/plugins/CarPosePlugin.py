@@ -1,5 +1,6 @@
 import numpy as np
 from data_classes.car_pose_class import CarPose
+from core.signal_validation import POSE_DTYPE, make_pose_record
 from functools import partial
 from interfaces.PluginBase import PluginBase
 
@@ -8,7 +9,7 @@ class CarPosePlugin(PluginBase):
     def __init__(self, file_path):
         super().__init__(file_path)
         self.car_pose = CarPose(file_path)
-        self.car_poses = {"x": self.car_pose.route['cp_x'], "y": self.car_pose.route['cp_y'], "theta": self.car_pose.df_car_pose['cp_yaw_deg']}
+        self.car_poses = self._build_car_poses()
         self.timestamps = self.car_pose.get_timestamps_milliseconds() # Example timestamps                
         # self.car_pose_at_timestamp = lambda t: self.handle_car_pose_at_timestamp(t)
         # route = self.car_pose.get_route() 
@@ -19,13 +20,23 @@ class CarPosePlugin(PluginBase):
             "car_poses": {"func": lambda: self.car_poses, "type": "spatial"}
         }
                 
+    def _build_car_poses(self):
+        """Pack all car poses into a structured POSE_DTYPE record array."""
+        x = np.asarray(self.car_pose.route['cp_x'], dtype=np.float64)
+        poses = np.empty(len(x), dtype=POSE_DTYPE)
+        poses["x"] = x
+        poses["y"] = np.asarray(self.car_pose.route['cp_y'], dtype=np.float64)
+        poses["theta"] = np.asarray(self.car_pose.df_car_pose['cp_yaw_deg'], dtype=np.float64)
+        return poses
+    
     def route_handler(self):
-        route_ = self.car_pose.get_route()
-        return {"x": route_[:, 0], "y": route_[:, 1]}
+        """Return the route as a contiguous (N, 2) float64 array."""
+        return np.ascontiguousarray(self.car_pose.get_route(), dtype=np.float64)
     
     def handle_car_pose_at_timestamp(self, timestamp):
+        """Return the interpolated car pose as a POSE_DTYPE record (theta in degrees)."""
         result = self.car_pose.get_car_pose_at_timestamp(timestamp)
-        return {"x": result[0], "y": result[1], "theta": result[2]} 
+        return make_pose_record(result[0], result[1], result[2])
     
     def has_signal(self, signal):
         """Check if this plugin provides the requested signal."""
@@ -2,18 +2,29 @@ import numpy as np
 from data_classes.car_state_class import CarStateInfo
 from functools import partial
 from interfaces.PluginBase import PluginBase
+from core.derived_signals import align_series
 import polars as pl
 class CarStatePlugin(PluginBase): 
+    
+    # Names of the signals defined in __init__, available without loading a trip
+    SIGNAL_NAMES = ("current_steering", "current_speed", "driving_mode", "target_speed", "target_steering_angle",
+                    "all_steering_data", "all_current_speed_data", "all_driving_mode_data",
+                    "all_target_speed_data", "all_target_steering_angle_data")
                
     def __init__(self, file_path):
         super().__init__(file_path)
         self.CarStateInfo = CarStateInfo(file_path)        
         self.signals = {
-            "current_steering": {"func": partial(self.CarStateInfo.get_current_steering_angle), "type": "temporal", "mode": "dynamic"},
-            "current_speed": {"func": partial(self.CarStateInfo.get_current_speed_at_timestamp), "type": "temporal","mode": "dynamic"},
-            "driving_mode": {"func": partial(self.CarStateInfo.get_driving_mode_at_timestamp), "type": "temporal","mode": "dynamic"},
-            "target_speed": {"func": partial(self.CarStateInfo.get_target_speed_at_timestamp), "type": "temporal","mode": "dynamic"},
-            "target_steering_angle": {"func": partial(self.CarStateInfo.get_target_steering_angle_at_timestamp), "type": "temporal","mode": "dynamic"},
+            "current_steering": {"func": partial(self.CarStateInfo.get_current_steering_angle), "type": "temporal", "mode": "dynamic",
+                                 "series": partial(self.CarStateInfo.get_time_series, "df_steering", "time_stamp", "data_value")},
+            "current_speed": {"func": partial(self.CarStateInfo.get_current_speed_at_timestamp), "type": "temporal","mode": "dynamic",
+                              "series": partial(self.CarStateInfo.get_time_series, "df_speed", "time_stamp", "data_value")},
+            "driving_mode": {"func": partial(self.CarStateInfo.get_driving_mode_at_timestamp), "type": "temporal","mode": "dynamic",
+                             "series": partial(self.CarStateInfo.get_time_series, "df_driving_mode", "time_stamp", "data_value")},
+            "target_speed": {"func": partial(self.CarStateInfo.get_target_speed_at_timestamp), "type": "temporal","mode": "dynamic",
+                             "series": partial(self.CarStateInfo.get_time_series, "df_cruise_control", "timestamp", "target_speed")},
+            "target_steering_angle": {"func": partial(self.CarStateInfo.get_target_steering_angle_at_timestamp), "type": "temporal","mode": "dynamic",
+                                      "series": partial(self.CarStateInfo.get_time_series, "df_cruise_control", "timestamp", "steer_command")},
             "all_steering_data": {"func": self.handler_get_all_current_steering_angle_data, "type": "temporal", "mode": "static"},
             "all_current_speed_data": {"func": self.handler_get_all_current_speed_data, "type": "temporal", "mode": "static"},
             "all_driving_mode_data": {"func": self.handler_get_all_driving_mode_data, "type": "temporal", "mode": "static"},
@@ -53,15 +64,32 @@ class CarStatePlugin(PluginBase):
             if callable(signal_func):
                 # Call the partial function with the timestamp (converted to seconds)
                 timestamp_in_sec = timestamp / 1000
-                result = signal_func(timestamp_in_sec)
-                res = np.array(result).flatten()
-                print(f"Fetched data for '{signal}' at {timestamp_in_sec}s: {res[0]}")
-                return result
+                return signal_func(timestamp_in_sec)
             else:
                 print(f"Error: Signal function for '{signal}' is not callable.")
         else:
             print(f"Error: Signal '{signal}' not found in CarStatePlugin.")
         return None
+
+    def get_data_for_timestamps(self, signal, timestamps):
+        """Fetch the values of a dynamic signal at many timestamps (in milliseconds), nearest sample first."""
+        series = self.signals.get(signal, {}).get("series")
+        if series is None:
+            return super().get_data_for_timestamps(signal, timestamps)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        signal_timestamps, values = series()
+        if len(signal_timestamps) == 0:
+            return np.full(len(timestamps), np.nan)
+        if np.any(np.diff(signal_timestamps) < 0):
+            order = np.argsort(signal_timestamps, kind="stable")
+            signal_timestamps, values = signal_timestamps[order], values[order]
+        # Same lookup as the per-timestamp handlers of CarStateInfo: the closest sample
+        return align_series(timestamps, signal_timestamps, values, align="nearest")
+
+    @classmethod
+    def discover_signals(cls, file_path):
+        """The signals do not depend on the trip content."""
+        return cls.SIGNAL_NAMES
      
 
 #Explicitly define which class is the plugin
@@ -0,0 +1,100 @@
+import os
+from functools import partial
+
+import numpy as np
+
+from interfaces.PluginBase import PluginBase
+from core.derived_signals import align_series
+from utils.data_loaders.csv_schema_scanner import scan_trip_folder, iter_signal_columns, load_csv_columns
+
+
+class GenericCsvPlugin(PluginBase):
+    """
+    Exposes every numeric column of every CSV file in the trip folder as a temporal signal.
+
+    The trip folder is scanned once for headers and a small sample of each file (cached per
+    file fingerprint, see utils.data_loaders.csv_schema_scanner), so startup does not read the
+    data itself. A column is loaded from disk only the first time one of its signals is
+    requested, and kept in memory afterwards.
+
+    Signals are named "<file stem>.<column>", e.g. "cruise_control.target_speed", and use the
+    file stem as their category.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.schemas = scan_trip_folder(file_path)
+
+        # Loaded series: signal name -> (timestamps in ms, float64 values)
+        self._series_cache = {}
+
+        self.signals = {}
+        for signal, file_name, column in iter_signal_columns(self.schemas):
+            self.signals[signal] = {
+                "func": partial(self.get_value_at_timestamp, signal),
+                "series": partial(self.get_series, signal),
+                "type": "temporal",
+                "mode": "dynamic",
+                "category": os.path.splitext(file_name)[0],
+                "file": file_name,
+                "column": column["name"],
+                "sample_rate_hz": self.schemas[file_name]["sample_rate_hz"],
+                "description": f"Column '{column['name']}' of {file_name}",
+            }
+
+    def get_series(self, signal):
+        """
+        Get the full series of a signal, loading its column on first use.
+
+        Returns:
+            tuple: (timestamps in milliseconds, values) as float64 arrays sorted by timestamp.
+        """
+        if signal not in self._series_cache:
+            info = self.signals[signal]
+            schema = self.schemas[info["file"]]
+            time_column = schema["time_column"]
+
+            df = load_csv_columns(os.path.join(self.file_path, info["file"]), schema,
+                                  [time_column, info["column"]])
+            df = df.drop_nulls(time_column).sort(time_column)
+
+            timestamps = df[time_column].to_numpy()
+            if schema["time_unit"] == "s":
+                timestamps = timestamps * 1000.0
+            values = df[info["column"]].fill_null(np.nan).to_numpy()
+            self._series_cache[signal] = (timestamps, values)
+        return self._series_cache[signal]
+
+    def get_value_at_timestamp(self, signal, timestamp):
+        """Get the last value of a signal at or before a timestamp in milliseconds."""
+        timestamps, values = self.get_series(signal)
+        idx = np.searchsorted(timestamps, timestamp, side="right") - 1
+        if idx < 0 or np.isnan(values[idx]):
+            return None
+        return float(values[idx])
+
+    def get_data_for_timestamps(self, signal, timestamps):
+        """Get the last value of a signal at or before each timestamp in milliseconds (NaN before the first sample)."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        signal_timestamps, values = self.get_series(signal)
+        return align_series(timestamps, signal_timestamps, values.astype(np.float64), align="previous")
+
+    @classmethod
+    def discover_signals(cls, file_path):
+        """List the column signals from the (cached) header scan of the trip folder."""
+        return [signal for signal, _, _ in iter_signal_columns(scan_trip_folder(file_path))]
+
+    def has_signal(self, signal):
+        """Check if this plugin provides the requested signal."""
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal, timestamp):
+        """Fetch data for a specific signal and timestamp (in milliseconds)."""
+        if signal not in self.signals:
+            print(f"Error: Signal '{signal}' not found in GenericCsvPlugin.")
+            return None
+        return self.get_value_at_timestamp(signal, timestamp)
+
+
+#Explicitly define which class is the plugin
+plugin_class = GenericCsvPlugin
@@ -0,0 +1,112 @@
+import logging
+import os
+from functools import partial
+
+import numpy as np
+
+from interfaces.PluginBase import PluginBase
+from core.derived_signals import align_series
+from utils.data_loaders.nav_data_loader import GPS_FILE, read_gps_fixes
+from utils.localization_and_navigation.geodetic import LocalTangentFrame
+
+logger = logging.getLogger(__name__)
+
+
+class GpsPlugin(PluginBase):
+    """
+    Exposes the GPS fixes of a trip (gps.csv) in an ENU frame tangent at the first fix.
+
+    All fixes are converted at once by the batched geodetic transforms of
+    utils.localization_and_navigation.geodetic. Temporal signals return the sample closest
+    to the requested timestamp; "gps_route" is the whole track as an (N, 2) east/north array.
+    The ENU frame is not aligned with the world frame of car_pose, so the track is not drawn
+    on the spatial plot. Trips without gps.csv get no signals.
+    """
+
+    # Temporal signals: name -> column of the (N, 3) ENU array, or None for the ground speed
+    TEMPORAL_SIGNALS = {"gps_east": 0, "gps_north": 1, "gps_up": 2, "gps_ground_speed": None}
+    UNITS = {"gps_east": "m", "gps_north": "m", "gps_up": "m", "gps_ground_speed": "m/s"}
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.timestamps_ms = np.empty(0)
+        self.enu = np.empty((0, 3))
+        self.ground_speed = np.empty(0)
+        self.frame = None
+        if not os.path.isfile(os.path.join(file_path, GPS_FILE)):
+            logger.info(f"No {GPS_FILE} in {file_path}, GPS signals disabled")
+            return
+
+        timestamps, lla = read_gps_fixes(file_path)
+        order = np.argsort(timestamps, kind="stable")
+        self.timestamps_ms = timestamps[order] * 1000.0
+        if len(lla):
+            self.frame = LocalTangentFrame(*lla[order[0]], frame="ENU")
+            # lla[order] is a fresh array: convert it in place
+            self.enu = lla[order]
+            self.frame.from_geodetic(self.enu, out=self.enu)
+        self.ground_speed = self._ground_speed()
+
+        self.signals = {
+            name: {"func": partial(self.get_value_at_timestamp, name), "series": partial(self.get_series, name),
+                   "type": "temporal", "mode": "dynamic", "units": self.UNITS[name], "category": "gps"}
+            for name in self.TEMPORAL_SIGNALS
+        }
+        self.signals["gps_route"] = {"func": self.get_route, "type": "spatial", "category": "gps"}
+
+    def _ground_speed(self):
+        """Horizontal speed between consecutive fixes [m/s], NaN where the fix time does not advance."""
+        speed = np.full(len(self.timestamps_ms), np.nan)
+        if len(speed) > 1:
+            dt = np.diff(self.timestamps_ms) / 1000.0
+            distance = np.hypot(np.diff(self.enu[:, 0]), np.diff(self.enu[:, 1]))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                speed[1:] = np.where(dt > 0, distance / dt, np.nan)
+            speed[0] = speed[1]
+        return speed
+
+    def get_series(self, signal):
+        """Get the full series of a temporal signal as (timestamps in milliseconds, values)."""
+        column = self.TEMPORAL_SIGNALS[signal]
+        values = self.ground_speed if column is None else self.enu[:, column]
+        return self.timestamps_ms, values
+
+    def get_value_at_timestamp(self, signal, timestamp):
+        """Get the value of a temporal signal at the fix closest to a timestamp in milliseconds."""
+        value = self.get_data_for_timestamps(signal, [timestamp])[0]
+        return None if np.isnan(value) else float(value)
+
+    def get_route(self, _=None):
+        """The GPS track as a contiguous (N, 2) float64 array of east/north [m]."""
+        return np.ascontiguousarray(self.enu[:, :2])
+
+    def has_signal(self, signal):
+        """Check if this plugin provides the requested signal."""
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal, timestamp):
+        """Fetch data for a specific signal and timestamp (in milliseconds)."""
+        if signal not in self.signals:
+            return None
+        return self.signals[signal]["func"](timestamp)
+
+    def get_data_for_timestamps(self, signal, timestamps):
+        """Fetch the values of a temporal signal at many timestamps (in milliseconds), nearest fix first."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if signal not in self.TEMPORAL_SIGNALS or signal not in self.signals:
+            return super().get_data_for_timestamps(signal, timestamps)
+        signal_timestamps, values = self.get_series(signal)
+        if len(signal_timestamps) == 0:
+            return np.full(len(timestamps), np.nan)
+        return align_series(timestamps, signal_timestamps, values, align="nearest")
+
+    @classmethod
+    def discover_signals(cls, file_path):
+        """The signals exist when the trip has a gps.csv file."""
+        if not os.path.isfile(os.path.join(file_path, GPS_FILE)):
+            return ()
+        return tuple(cls.TEMPORAL_SIGNALS) + ("gps_route",)
+
+
+# Explicitly define which class is the plugin
+plugin_class = GpsPlugin
@@ -2,6 +2,7 @@ import numpy as np
 from data_classes.PathTrajectory_pandas import PathTrajectoryPandas
 from data_classes.PathTrajectory_polars import PathTrajectoryPolars
 from interfaces.PluginBase import PluginBase
+from core.signal_validation import make_pose_record
 
 class PathViewPlugin(PluginBase):
     def __init__(self, file_path, path_type = 'path_trajectory.csv', path_loader_type='polars'):
@@ -46,12 +47,16 @@ class PathViewPlugin(PluginBase):
         }
 
     def get_path_world_at_timestamp(self, timestamp):
+        """Return the path in world coordinates as a contiguous (N, 2) float64 array."""
         results = self.get_path_in_world_coordinates_at_timestamp(timestamp)
-        return results["path_world"]
+        return np.ascontiguousarray(results["path_world"], dtype=np.float64)
 
     def get_car_pose_at_timestamp(self, timestamp):
+        """Return the car pose of the path sample as a POSE_DTYPE record (theta in degrees)."""
         results = self.get_path_in_world_coordinates_at_timestamp(timestamp)
-        return results["car_pose"]
+        car_pose = results["car_pose"]
+        return make_pose_record(car_pose[0, 2], car_pose[1, 2],
+                                np.degrees(np.arctan2(car_pose[1, 0], car_pose[0, 0])))
     
     def has_signal(self, signal):
         """
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the batch analysis runner (tools/batch_runner.py).
+"""
+
+import json
+import os
+import shutil
+import sys
+import polars as pl
+import pytest
+
+# Add project root and tools to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+sys.path.insert(0, os.path.join(base_path, "tools"))
+
+from batch_runner import (CHECKPOINT_METADATA_KEY, RESULT_SCHEMA, checkpoint_is_current, checkpoint_metadata,
+                          checkpoint_path, find_trips, merge_checkpoints, parse_memory, path_regression, run_batch,
+                          TripSignals)
+
+SAMPLE_TRIP = os.path.join(base_path, "2024-09-11T15_55_30")
+
+
+@pytest.fixture
+def trips_root(tmp_path):
+    """A trips root with the sample trip at two levels."""
+    if not os.path.isdir(SAMPLE_TRIP):
+        pytest.skip("Sample trip not available")
+    root = tmp_path / "trips"
+    shutil.copytree(SAMPLE_TRIP, root / "vehicle1" / "trip_a", ignore=shutil.ignore_patterns("*.pkl", ".*"))
+    shutil.copytree(SAMPLE_TRIP, root / "trip_b", ignore=shutil.ignore_patterns("*.pkl", ".*"))
+    return str(root)
+
+
+class TestBatchRunner:
+    """Test suite for the batch runner."""
+
+    def test_find_trips(self, tmp_path):
+        """Folders with CSV files are trips; their subfolders are not searched."""
+        (tmp_path / "fleet" / "t1" / "camera").mkdir(parents=True)
+        (tmp_path / "fleet" / "t1" / "gps.csv").write_text("timestamp\n")
+        (tmp_path / "fleet" / "t1" / "camera" / "frames.csv").write_text("timestamp\n")
+        (tmp_path / "t2").mkdir()
+        (tmp_path / "t2" / "imu.csv").write_text("timestamp\n")
+        (tmp_path / "empty").mkdir()
+
+        trips = find_trips(str(tmp_path))
+        assert [key for key, _ in trips] == ["fleet__t1", "t2"]
+        assert trips[0][1].endswith(os.sep)
+
+    def test_parse_memory(self):
+        """Memory sizes accept binary unit suffixes."""
+        assert parse_memory("16GB") == 16 * 2**30
+        assert parse_memory("512mb") == 512 * 2**20
+        assert parse_memory("1000") == 1000
+        with pytest.raises(ValueError):
+            parse_memory("lots")
+
+    def test_run_and_merge(self, trips_root, tmp_path):
+        """Every trip gets a checkpoint; the merged table holds the rows of all trips."""
+        checkpoints = str(tmp_path / "checkpoints")
+        failures = run_batch(trips_root, checkpoints, workers=1)
+        assert failures == {}
+
+        output = str(tmp_path / "results.parquet")
+        df = merge_checkpoints(checkpoints, output)
+        assert df.schema == pl.Schema(RESULT_SCHEMA)
+        assert sorted(df["trip"].unique().to_list()) == ["trip_b", "vehicle1__trip_a"]
+        assert set(df["analysis"].unique()) == {"signal_statistics", "tracking_kpis", "path_regression"}
+        assert pl.read_parquet(output).equals(df)
+
+        # Identical trips give identical results
+        a = df.filter(pl.col("trip") == "trip_b").drop("trip")
+        b = df.filter(pl.col("trip") == "vehicle1__trip_a").drop("trip")
+        assert a.equals(b)
+
+    def test_resume_skips_checkpointed_trips(self, trips_root, tmp_path):
+        """Trips with a current checkpoint are not analysed again unless resuming is disabled."""
+        checkpoints = str(tmp_path / "checkpoints")
+        os.makedirs(checkpoints)
+        trip_b = os.path.join(trips_root, "trip_b")
+        marker = pl.DataFrame([("trip_b", "marker", "", "", 1.0)], schema=RESULT_SCHEMA, orient="row")
+        metadata = json.dumps(checkpoint_metadata(trip_b, ["tracking_kpis"]))
+        marker.write_parquet(checkpoint_path(checkpoints, "trip_b"), metadata={CHECKPOINT_METADATA_KEY: metadata})
+
+        run_batch(trips_root, checkpoints, analyses=["tracking_kpis"], workers=1)
+        assert pl.read_parquet(checkpoint_path(checkpoints, "trip_b")).equals(marker)
+        assert os.path.exists(checkpoint_path(checkpoints, "vehicle1__trip_a"))
+
+        run_batch(trips_root, checkpoints, analyses=["tracking_kpis"], workers=1, resume=False)
+        assert set(pl.read_parquet(checkpoint_path(checkpoints, "trip_b"))["analysis"]) == {"tracking_kpis"}
+
+    def test_resume_reruns_stale_checkpoints(self, trips_root, tmp_path):
+        """Checkpoints of other analyses, of a changed trip or without metadata are not resumed."""
+        checkpoints = str(tmp_path / "checkpoints")
+        trip_b = os.path.join(trips_root, "trip_b")
+        run_batch(trips_root, checkpoints, analyses=["tracking_kpis"], workers=1)
+        assert checkpoint_is_current(checkpoints, "trip_b", trip_b, ["tracking_kpis"])
+        assert not checkpoint_is_current(checkpoints, "trip_b", trip_b, ["tracking_kpis", "signal_statistics"])
+
+        run_batch(trips_root, checkpoints, analyses=["signal_statistics", "tracking_kpis"], workers=1)
+        assert set(pl.read_parquet(checkpoint_path(checkpoints, "trip_b"))["analysis"]) == {"signal_statistics",
+                                                                                          "tracking_kpis"}
+
+        csv_file = next(os.path.join(trip_b, f) for f in sorted(os.listdir(trip_b)) if f.endswith(".csv"))
+        with open(csv_file, "a") as f:
+            f.write("\n")
+        assert not checkpoint_is_current(checkpoints, "trip_b", trip_b, ["signal_statistics", "tracking_kpis"])
+        assert checkpoint_is_current(checkpoints, "vehicle1__trip_a", os.path.join(trips_root, "vehicle1", "trip_a"),
+                                     ["tracking_kpis", "signal_statistics"])
+
+        pl.DataFrame(schema=RESULT_SCHEMA).write_parquet(checkpoint_path(checkpoints, "trip_b"))
+        assert not checkpoint_is_current(checkpoints, "trip_b", trip_b, ["signal_statistics", "tracking_kpis"])
+
+    def test_path_regression(self, trips_root):
+        """The path regression analysis gives the PathRegressor KPIs and look-ahead errors of a trip."""
+        from data_classes.PathRegressor import PathRegressor
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+
+        trip_path = os.path.join(trips_root, "trip_b") + os.sep
+        rows = path_regression(TripSignals(trip_path, []))
+        table = {(signal, metric): value for signal, metric, value in rows}
+
+        regressor = PathRegressor(PathTrajectoryPolars(trip_path + "path_trajectory.csv"), CACHE_DIR=None)
+        kpis = regressor.evaluate_kpi()
+        assert table[("planned_path", "num_paths")] == kpis["num_paths"] > 0
+        assert table[("planned_path", "p95_max_abs_curvature")] == pytest.approx(kpis["p95_max_abs_curvature"])
+        _, df_kpis = regressor.sweep({"delta_t_sec": [1.0]})
+        assert table[("path_lookahead_1s", "lookahead_error_mean_m")] == pytest.approx(
+            df_kpis["lookahead_error_mean_m"][0])
+        assert {signal for signal, _ in table} == {"planned_path", "path_lookahead_0.5s", "path_lookahead_1s",
+                                                   "path_lookahead_2s"}
+
+        os.remove(trip_path + "path_trajectory.csv")
+        assert path_regression(TripSignals(trip_path, [])) == []
+
+    def test_process_pool_with_memory_budget(self, trips_root, tmp_path):
+        """A budget below a single trip still runs every trip, one at a time."""
+        checkpoints = str(tmp_path / "checkpoints")
+        failures = run_batch(trips_root, checkpoints, analyses=["tracking_kpis"], workers=2, memory_budget=1)
+        assert failures == {}
+        assert merge_checkpoints(checkpoints, str(tmp_path / "results.csv"))["trip"].n_unique() == 2
+
+    def test_unknown_analysis(self, tmp_path):
+        """Unknown analysis names are rejected before any trip runs."""
+        with pytest.raises(ValueError):
+            run_batch(str(tmp_path), str(tmp_path / "checkpoints"), analyses=["no_such_analysis"])
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the process-wide data cache used to keep decoded trip data across plugin reloads.
+"""
+
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.cache_handler import DataCache, file_fingerprint
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """A small data file."""
+    path = tmp_path / "data.csv"
+    path.write_text("t,v\n0,1\n")
+    return str(path)
+
+
+class TestDataCache:
+    """Test suite for the DataCache."""
+
+    def test_hit_and_miss(self, data_file):
+        """Test that a loader runs once per file and arguments, and hits are counted."""
+        cache = DataCache()
+        loader = MagicMock(return_value="decoded")
+
+        assert cache.get_or_load(data_file, loader, data_file) == "decoded"
+        assert cache.get_or_load(data_file, loader, data_file) == "decoded"
+        assert loader.call_count == 1
+
+        cache.get_or_load(data_file, loader, data_file, columns=["v"])
+        assert loader.call_count == 2
+        assert cache.stats() == {"entries": 2, "hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+    def test_changed_file_is_reloaded(self, data_file):
+        """Test that a changed fingerprint invalidates the cached result."""
+        cache = DataCache()
+        loader = MagicMock(side_effect=lambda path: open(path).read())
+        fingerprint = file_fingerprint(data_file)
+
+        cache.get_or_load(data_file, loader, data_file)
+        with open(data_file, "a") as f:
+            f.write("1,2\n")
+        assert file_fingerprint(data_file) != fingerprint
+
+        assert cache.get_or_load(data_file, loader, data_file).endswith("1,2\n")
+        assert loader.call_count == 2
+
+    def test_missing_file_and_eviction(self, tmp_path, data_file):
+        """Test that missing files are not cached and the least recently used entry is evicted."""
+        cache = DataCache(max_entries=1)
+        loader = MagicMock(return_value=None)
+
+        cache.get_or_load(str(tmp_path / "missing.csv"), loader)
+        cache.get_or_load(str(tmp_path / "missing.csv"), loader)
+        assert loader.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+        cache.get_or_load(data_file, loader, 1)
+        cache.get_or_load(data_file, loader, 2)
+        assert cache.stats()["entries"] == 1
+        cache.get_or_load(data_file, loader, 1)
+        assert loader.call_count == 5
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
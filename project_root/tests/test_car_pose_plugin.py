@@ -8,6 +8,7 @@ and provides the expected signals and data.
 """
 
 import os
+import shutil
 import sys
 import pytest
 from unittest.mock import MagicMock, patch
@@ -20,6 +21,7 @@ sys.path.insert(0, base_path)
 from plugins.CarPosePlugin import CarPosePlugin
 from interfaces.PluginBase import PluginBase
 from core.plot_manager import PlotManager
+from core.signal_validation import POSE_DTYPE, classify_signal_data
 
 
 @pytest.fixture
@@ -108,13 +110,15 @@ class TestCarPosePlugin:
         """
         # Test car_pose(t) signal
         car_pose_data = car_pose_plugin.get_data_for_timestamp("car_pose(t)", 200)
-        assert car_pose_data == {"x": 2.0, "y": 5.0, "theta": 20.0}
+        assert car_pose_data.dtype == POSE_DTYPE
+        assert (car_pose_data["x"], car_pose_data["y"], car_pose_data["theta"]) == (2.0, 5.0, 20.0)
         mock_car_pose.get_car_pose_at_timestamp.assert_called_with(200)
         
         # Test route signal
         route_data = car_pose_plugin.get_data_for_timestamp("route", 0)  # Timestamp doesn't matter for route
-        assert "x" in route_data
-        assert "y" in route_data
+        assert route_data.shape == (3, 2)
+        assert route_data.dtype == np.float64
+        assert np.array_equal(route_data[:, 0], [1.0, 2.0, 3.0])
         mock_car_pose.get_route.assert_called_once()
         
         # Test timestamps signal
@@ -124,6 +128,17 @@ class TestCarPosePlugin:
         # Test nonexistent signal
         assert car_pose_plugin.get_data_for_timestamp("nonexistent_signal", 200) is None
     
+    def test_signal_data_contract(self, car_pose_plugin):
+        """
+        Test that spatial signals return payloads from the signal data contract.
+        """
+        assert classify_signal_data(car_pose_plugin.get_data_for_timestamp("car_pose(t)", 200)) == "pose"
+        assert classify_signal_data(car_pose_plugin.get_data_for_timestamp("route", 0)) == "xy_array"
+        
+        car_poses = car_pose_plugin.get_data_for_timestamp("car_poses", 0)
+        assert classify_signal_data(car_poses) == "pose"
+        assert np.array_equal(car_poses["theta"], [10.0, 20.0, 30.0])
+    
     def test_integration_with_plot_manager(self, car_pose_plugin):
         """
         Test that the plugin can be registered with PlotManager.
@@ -145,5 +160,90 @@ class TestCarPosePlugin:
                 assert plot_manager.signal_plugins[signal]["plugin"] == "CarPosePlugin"
 
 
+def make_car_pose(x, y, timestamps_s):
+    """Create a CarPose from arrays, without reading a trip folder."""
+    import pandas as pd
+    from data_classes.car_pose_class import CarPose
+
+    car_pose = CarPose.__new__(CarPose)
+    index = pd.to_datetime(np.asarray(timestamps_s), unit="s")
+    car_pose.df_car_pose = pd.DataFrame({"cp_x": x, "cp_y": y, "cp_yaw_deg": np.zeros(len(x))}, index=index)
+    car_pose.timestamps = car_pose.df_car_pose.index
+    car_pose.route = car_pose.df_car_pose[["cp_x", "cp_y"]]
+    car_pose.build_spatial_index()
+    return car_pose
+
+
+class TestCarPoseSpatialIndex:
+    """
+    Test suite for the position queries of CarPose (click-to-seek on the spatial plot).
+    """
+
+    @pytest.fixture
+    def looped_car_pose(self):
+        """Two laps of a circle of radius 50 m at 10 Hz, 60 s per lap."""
+        t = np.arange(0.0, 120.0, 0.1)
+        angle = 2.0 * np.pi * t / 60.0
+        return make_car_pose(50.0 * np.cos(angle), 50.0 * np.sin(angle), 1726037730.0 + t)
+
+    def test_nearest_timestamp(self, looped_car_pose):
+        """The nearest query returns the timestamp of the closest pose and its distance."""
+        timestamp, distance = looped_car_pose.get_nearest_timestamp(0.0, 52.0)
+        assert distance == pytest.approx(2.0, abs=1e-6)
+        # A quarter lap, in the first or the second lap
+        assert (timestamp - 1726037730000) % 60000 == 15000
+
+    def test_passes_near(self, looped_car_pose):
+        """Every lap through the radius is one pass, reported at its closest pose."""
+        passes = looped_car_pose.get_passes_near(0.0, 52.0, radius=5.0)
+        assert [timestamp - 1726037730000 for timestamp, _ in passes] == [15000, 75000]
+        assert [distance for _, distance in passes] == pytest.approx([2.0, 2.0], abs=1e-6)
+        assert looped_car_pose.get_passes_near(0.0, 0.0, radius=5.0) == []
+
+    def test_passes_near_sample_trip(self, tmp_path):
+        """On the sample trip, the pose at a timestamp is found again by the position queries."""
+        from data_classes.car_pose_class import CarPose
+
+        # Work on a copy, so the loader's pickle cache is not written into the repository
+        trip = tmp_path / "trip"
+        shutil.copytree(os.path.join(base_path, "2024-09-11T15_55_30"), trip,
+                        ignore=shutil.ignore_patterns("*.pkl", ".*"))
+        car_pose = CarPose(str(trip))
+        x, y = car_pose.positions[500]
+        timestamp, distance = car_pose.get_nearest_timestamp(x, y)
+        assert distance == 0.0
+        assert car_pose.positions[np.searchsorted(car_pose.timestamps_ms, timestamp)] == pytest.approx([x, y])
+        assert any(t == timestamp for t, _ in car_pose.get_passes_near(x, y, radius=1.0))
+
+
+class TestClickToSeek:
+    """
+    Test suite for seeking the timestamp slider from a click on the spatial plot.
+    """
+
+    @pytest.fixture
+    def slider(self):
+        """A timestamp slider over three timestamps."""
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        from gui.timestamp_slider import TimestampSlider
+        return TimestampSlider(MagicMock(), np.array([100, 200, 300]))
+
+    def test_set_timestamp(self, slider):
+        """The slider moves to the closest data timestamp."""
+        for timestamp, value in ((260, 2), (249, 1), (150, 0), (1000, 2), (-5, 0)):
+            slider.set_timestamp(timestamp)
+            assert slider.slider.value() == value
+
+    def test_seek_to_position(self, slider):
+        """A click seeks to the closest car pose."""
+        from gui.main_window import seek_to_position
+
+        car_pose = make_car_pose(np.array([0.0, 10.0, 20.0]), np.zeros(3), np.array([0.1, 0.2, 0.3]))
+        slider.timestamps = car_pose.timestamps_ms
+        seek_to_position(None, slider, car_pose, 11.0, 1.0)
+        assert slider.slider.value() == 1
+
+
 if __name__ == "__main__":
     pytest.main(['-xvs', __file__])
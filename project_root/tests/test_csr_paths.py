@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the CSR path operations (utils/path_analysis/csr_paths.py) and the vectorized
+virtual path extraction of the PathRegressor.
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.path_analysis.csr_paths import (arc_length, gather_windows, nearest_arc_length_index, paths_to_csr,
+                                           transform_paths)
+
+SAMPLE_TRIP = os.path.join(base_path, "2024-09-11T15_55_30")
+
+
+@pytest.fixture
+def padded_paths():
+    """Random paths of different lengths (one empty, one with repeated points), NaN-padded."""
+    rng = np.random.default_rng(0)
+    lengths = [5, 0, 1, 12, 8]
+    path_x = np.full((len(lengths), 12), np.nan)
+    path_y = np.full((len(lengths), 12), np.nan)
+    for i, n in enumerate(lengths):
+        path_x[i, :n] = np.cumsum(rng.uniform(0.0, 2.0, n))
+        path_y[i, :n] = rng.normal(0.0, 0.5, n)
+    path_x[3, 4:6] = path_x[3, 3]
+    path_y[3, 4:6] = path_y[3, 3]
+    return path_x, path_y, lengths
+
+
+class TestCsrPaths:
+    """Test suite for the segmented path operations against per-path loops."""
+
+    def test_paths_to_csr(self, padded_paths):
+        """Rows become consecutive segments without the padding."""
+        path_x, path_y, lengths = padded_paths
+        paths = paths_to_csr(path_x, path_y)
+        assert list(paths.counts) == lengths
+        assert np.array_equal(paths.path(3)[:, 0], path_x[3, :12])
+
+    def test_transform_paths(self, padded_paths):
+        """Each path is moved with its own pose."""
+        path_x, path_y, lengths = padded_paths
+        paths = paths_to_csr(path_x, path_y)
+        pose_x, pose_y, pose_yaw = np.arange(5.0), -np.arange(5.0), np.linspace(-3.0, 3.0, 5)
+        world = transform_paths(paths, pose_x, pose_y, pose_yaw)
+        for i in range(5):
+            c, s = np.cos(pose_yaw[i]), np.sin(pose_yaw[i])
+            expected = paths.path(i) @ np.array([[c, s], [-s, c]]) + [pose_x[i], pose_y[i]]
+            assert np.allclose(world.path(i), expected)
+
+    def test_arc_length(self, padded_paths):
+        """The segmented cumsum restarts at every path."""
+        paths = paths_to_csr(*padded_paths[:2])
+        s = arc_length(paths)
+        for i in range(paths.num_paths):
+            points = paths.path(i)
+            expected = np.insert(np.cumsum(np.hypot(*np.diff(points, axis=0).T)), 0, 0.0)[:len(points)]
+            assert np.allclose(s[paths.offsets[i]:paths.offsets[i + 1]], expected)
+
+    def test_nearest_arc_length_index_matches_argmin(self, padded_paths):
+        """The segmented searchsorted returns the per-path argmin, ties and repeats included."""
+        paths = paths_to_csr(*padded_paths[:2])
+        s = arc_length(paths)
+        for targets in (np.array([1.0, 2.0, 0.5, 3.7, 100.0]), np.array([-1.0, 0.0, np.nan, 0.0, 4.2]),
+                        s[np.minimum(paths.offsets[:-1] + 4, len(s) - 1)]):
+            index = nearest_arc_length_index(paths, s, targets)
+            for i in range(paths.num_paths):
+                segment = s[paths.offsets[i]:paths.offsets[i + 1]]
+                expected = np.argmin(np.abs(segment - targets[i])) if len(segment) else -1
+                assert index[i] == expected
+
+    def test_gather_windows(self, padded_paths):
+        """Windows are clipped to their path and empty paths are skipped."""
+        paths = paths_to_csr(*padded_paths[:2])
+        centers = np.array([0, -1, 0, 5, 7])
+        indices, path_idx = gather_windows(paths, centers, pts_before=2, pts_after=3)
+        for i, center in enumerate(centers):
+            expected = [] if center < 0 else list(range(max(center - 2, 0), min(center + 4, paths.counts[i])))
+            assert list(indices[path_idx == i] - paths.offsets[i]) == expected
+
+
+@pytest.mark.skipif(not os.path.isdir(SAMPLE_TRIP), reason="Sample trip not available")
+class TestPathRegressorVectorized:
+    """Test suite for the vectorized virtual path extraction on the sample trip."""
+
+    def test_matches_per_timestamp_reference(self):
+        """The vectorized extraction returns the points of the per-timestamp reference."""
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+        from data_classes.PathRegressor import PathRegressor
+
+        path_trajectory = PathTrajectoryPolars(os.path.join(SAMPLE_TRIP, "path_trajectory.csv"))
+        regressor = PathRegressor(path_trajectory, CACHE_DIR=None, delta_t_sec=1.0, pts_before=3, pts_after=5)
+        df_virt_path, v_p = regressor.extract_virtual_path()
+        df_reference, v_p_reference = regressor.extract_virtual_path_per_timestamp()
+
+        assert v_p.shape == v_p_reference.shape
+        # The reference leaves the kinematic columns empty (see tests/test_kinematics.py)
+        assert np.allclose(v_p[:, :6], v_p_reference[:, :6], equal_nan=True)
+        assert np.array_equal(df_virt_path["timestamp_idx"], df_reference["timestamp_idx"])
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
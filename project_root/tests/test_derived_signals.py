@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Tests for derived signals: the DerivedSignalEngine and its integration in the SignalRegistry.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.signal_registry import SignalRegistry
+from core.signal_validation import SignalValidationError
+from core.derived_signals import align_series, DERIVED_PLUGIN_NAME
+from core.plot_manager import PlotManager
+
+
+def make_series_signal(timestamps, values):
+    """Create a temporal signal definition that provides a full series."""
+    return {
+        "func": lambda t: None,
+        "type": "temporal",
+        "series": lambda: (np.asarray(timestamps, dtype=float), np.asarray(values, dtype=float)),
+    }
+
+
+@pytest.fixture
+def registry():
+    """A registry with two input signals sampled at different rates."""
+    registry = SignalRegistry()
+    registry.register_signal("target_speed", make_series_signal([0, 100, 200, 300], [10, 10, 12, 12]), "CarState")
+    registry.register_signal("current_speed", make_series_signal([0, 200], [8, 12]), "CarState")
+    return registry
+
+
+class TestDerivedSignals:
+    """Test suite for derived signals."""
+
+    def test_align_series(self):
+        """Test interpolation and sample-and-hold alignment."""
+        time_base = np.array([-10.0, 0.0, 50.0, 100.0])
+        timestamps = np.array([0.0, 100.0])
+        values = np.array([0.0, 10.0])
+
+        interp = align_series(time_base, timestamps, values, "interp")
+        assert np.isnan(interp[0])
+        assert np.allclose(interp[1:], [0.0, 5.0, 10.0])
+
+        previous = align_series(time_base, timestamps, values, "previous")
+        assert np.isnan(previous[0])
+        assert np.allclose(previous[1:], [0.0, 0.0, 10.0])
+
+        nearest = align_series(time_base, timestamps, values, "nearest")
+        assert np.allclose(nearest, [0.0, 0.0, 0.0, 10.0])  # Ties take the earlier sample
+
+    def test_register_and_evaluate(self, registry):
+        """Test that a derived signal is evaluated over the union time base and served like a plugin."""
+        registry.register_derived_signal(
+            "speed_error", ["target_speed", "current_speed"], lambda t, target, current: target - current
+        )
+
+        assert registry.signal_providers["speed_error"] == DERIVED_PLUGIN_NAME
+        assert registry.signals["speed_error"]["inputs"] == ["target_speed", "current_speed"]
+
+        timestamps, values = registry.derived_engine.get_series("speed_error")
+        assert np.array_equal(timestamps, [0, 100, 200, 300])
+        assert np.allclose(values[:3], [2.0, 0.0, 0.0])
+        assert np.isnan(values[3])  # current_speed is not interpolated past its last sample
+
+        engine = registry.derived_engine
+        assert engine.has_signal("speed_error")
+        assert engine.get_data_for_timestamp("speed_error", 150) == 0.0
+        assert isinstance(engine.get_data_for_timestamp("speed_error", 0), float)
+        assert engine.get_data_for_timestamp("speed_error", 350) is None
+        assert engine.get_data_for_timestamp("speed_error", -1) is None
+
+    def test_cached_until_inputs_change(self, registry):
+        """Test that the function runs once and again only after an input is invalidated."""
+        func = MagicMock(side_effect=lambda t, speed: speed * 2)
+        registry.register_derived_signal("double_speed", ["current_speed"], func)
+        engine = registry.derived_engine
+
+        for timestamp in (0, 100, 200):
+            engine.get_data_for_timestamp("double_speed", timestamp)
+        assert func.call_count == 1
+
+        # Unrelated signals do not trigger a recompute
+        registry.invalidate_signal("target_speed")
+        engine.get_data_for_timestamp("double_speed", 0)
+        assert func.call_count == 1
+
+        assert registry.invalidate_signal("current_speed") == {"double_speed"}
+        engine.get_data_for_timestamp("double_speed", 0)
+        assert func.call_count == 2
+
+    def test_chained_derived_signals(self, registry):
+        """Test derived signals built from other derived signals and transitive invalidation."""
+        registry.register_derived_signal("speed_error", ["target_speed", "current_speed"], lambda t, a, b: a - b)
+        registry.register_derived_signal("abs_speed_error", ["speed_error"], lambda t, e: np.abs(e))
+
+        assert registry.get_dependents("current_speed") == {"speed_error", "abs_speed_error"}
+        assert registry.derived_engine.get_data_for_timestamp("abs_speed_error", 0) == 2.0
+
+    def test_invalid_definitions(self, registry):
+        """Test that unknown inputs, inputs without series and cycles are rejected."""
+        with pytest.raises(SignalValidationError):
+            registry.register_derived_signal("bad", ["unknown_signal"], lambda t, x: x)
+
+        registry.register_signal("no_series", {"func": lambda t: 0.0, "type": "temporal"}, "Other")
+        with pytest.raises(SignalValidationError):
+            registry.register_derived_signal("bad", ["no_series"], lambda t, x: x)
+
+        registry.register_derived_signal("a", ["current_speed"], lambda t, x: x)
+        registry.register_derived_signal("b", ["a"], lambda t, x: x)
+        with pytest.raises(SignalValidationError):
+            registry.register_derived_signal("a", ["b"], lambda t, x: x)
+
+    def test_plot_manager_integration(self):
+        """Test that PlotManager routes derived signals through the engine like a plugin."""
+        with patch('core.plot_manager.TemporalPlotWidget_pg'), \
+             patch('core.plot_manager.SpatialPlotWidget'):
+            plot_manager = PlotManager()
+
+        plugin = MagicMock()
+        plugin.signals = {
+            "target_speed": make_series_signal([0, 100], [10, 12]),
+            "current_speed": make_series_signal([0, 100], [9, 12]),
+        }
+        plot_manager.register_plugin("CarStatePlugin", plugin)
+
+        assert plot_manager.register_derived_signal(
+            "speed_error", ["target_speed", "current_speed"], lambda t, a, b: a - b
+        ) is True
+        assert plot_manager.register_derived_signal("bad", ["unknown"], lambda t, x: x) is False
+        assert plot_manager.signal_plugins["speed_error"]["plugin"] == DERIVED_PLUGIN_NAME
+
+        plot_manager.signals["speed_error"] = [plot_manager.temporal_plot_widget]
+        plot_manager.request_data(0)
+        plot_manager.temporal_plot_widget.update_data.assert_called_with("speed_error", 1.0, 0)
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
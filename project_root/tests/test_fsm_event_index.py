@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the FSM event index (examples/fsm/fsm_event_index.py) and the FSM viewer navigation on it.
+"""
+
+import os
+import shutil
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from examples.fsm.fsm_event_index import FsmEventIndex
+
+SAMPLE_LOG = os.path.join(base_path, "examples", "fsm", "data", "fsm_3.csv")
+
+
+@pytest.fixture
+def event_index():
+    """An index over the states A A B B B A C C A B at times 10, 11, ..., 19."""
+    states = ["A", "A", "B", "B", "B", "A", "C", "C", "A", "B"]
+    state_names = np.array(["A", "B", "C"], dtype=object)
+    codes = [list(state_names).index(state) for state in states]
+    return FsmEventIndex(np.arange(10.0, 20.0), codes, state_names)
+
+
+class TestFsmEventIndex:
+    """Test suite for the event index."""
+
+    def test_run_length_table(self, event_index):
+        """States are stored as runs and transitions as the first rows of the runs."""
+        assert event_index.run_starts.tolist() == [0, 2, 5, 6, 8, 9]
+        assert event_index.transition_rows.tolist() == [2, 5, 6, 8, 9]
+        assert event_index.occurrences[("A", "B")].tolist() == [2, 9]
+        assert event_index.occurrences[("C", "A")].tolist() == [8]
+        assert [event_index.state_at_row(row) for row in range(10)] == list("AABBBACCAB")
+
+    def test_time_lookups(self, event_index):
+        """Times map to the nearest row and to the state in effect."""
+        assert event_index.nearest_row(14.4) == 4
+        assert event_index.nearest_row(14.6) == 5
+        assert event_index.nearest_row(-1.0) == 0 and event_index.nearest_row(99.0) == 9
+        assert event_index.state_at_time(16.9) == "C"
+        assert event_index.state_at_time(17.0) == "C"
+        assert event_index.state_at_time(18.0) == "A"
+        assert event_index.state_at_time(9.0) is None
+
+    def test_unsorted_time_stamps(self):
+        """Rows out of time order are still found by time."""
+        index = FsmEventIndex([3.0, 1.0, 2.0], [0, 1, 1], ["A", "B"])
+        assert index.nearest_row(1.1) == 1
+        assert index.state_at_time(3.5) == "A"
+
+    def test_transition_jumps(self, event_index):
+        """Jumps go to the previous/next transition and to the next occurrence of a transition."""
+        assert event_index.next_transition_row(0) == 2
+        assert event_index.next_transition_row(2) == 5
+        assert event_index.next_transition_row(9) is None
+        assert event_index.previous_transition_row(4) == 2
+        assert event_index.previous_transition_row(5) == 2
+        assert event_index.previous_transition_row(2) is None
+        assert event_index.next_occurrence_row("A", "B", 2) == 9
+        assert event_index.previous_occurrence_row("A", "B", 9) == 2
+        assert event_index.next_occurrence_row("C", "B", 0) is None
+        assert event_index.last_transitions(7, 2) == [("B", "A"), ("A", "C")]
+        assert event_index.last_transitions(1, 3) == []
+
+    def test_matches_log_scans(self):
+        """On the sample log the index agrees with scanning the whole log."""
+        from examples.fsm.fsm_log import FsmLog
+
+        log = FsmLog.from_csv(SAMPLE_LOG)
+        index = FsmEventIndex.from_log(log)
+        times = log.dataframe["time_stamp"]
+        states = log.states
+        rng = np.random.default_rng(3)
+        for time_stamp in rng.uniform(times.min() - 1.0, times.max() + 1.0, 50):
+            assert times[index.nearest_row(time_stamp)] == times[(times - time_stamp).abs().idxmin()]
+        for row in rng.integers(1, len(log), 50):
+            sequence = list(zip(states[:row], states[1:row + 1]))
+            expected = [edge for edge in sequence if edge[0] != edge[1]][-3:]
+            assert index.last_transitions(row, 3) == expected
+
+
+class TestFsmViewerNavigation:
+    """Test suite for the transition navigation of the FSM viewer."""
+
+    @pytest.fixture
+    def window(self, tmp_path):
+        """An FSM viewer on the sample log, without video."""
+        from PySide6.QtWidgets import QApplication
+        # The viewer imports the video player (QtMultimedia, pytz)
+        MainWindow = pytest.importorskip("examples.fsm.fsm_main_window", exc_type=ImportError).MainWindow
+
+        app = QApplication.instance() or QApplication([])
+        shutil.copy(SAMPLE_LOG, tmp_path / "li_conditions.csv")
+        window = MainWindow(str(tmp_path) + "/", "")
+        yield window
+        window.deleteLater()
+
+    def test_transition_buttons(self, window):
+        """The buttons move the slider to the transitions of the event index."""
+        event_index = window.fsm.event_index
+        window.next_transition_button.click()
+        assert window.slider.value() == event_index.transition_rows[0]
+        window.next_transition_button.click()
+        assert window.slider.value() == event_index.transition_rows[1]
+        window.previous_transition_button.click()
+        assert window.slider.value() == event_index.transition_rows[0]
+
+        source, target = window.transition_combo.itemData(0)
+        window.next_occurrence_button.click()
+        assert window.slider.value() == event_index.next_occurrence_row(source, target, event_index.transition_rows[0])
+        assert window.find_fsm_index_for_time(window.fsm.time_stamps.iloc[7] + 1e-4) == 7
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the persistent FSM layout cache (fsm/fsm_layout_cache.py) and the graph view using it.
+"""
+
+import os
+import shutil
+import sys
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from fsm.fsm_layout_cache import FsmLayoutCache, compute_layout, graph_key
+
+SAMPLE_LOG = os.path.join(base_path, "examples", "fsm", "data", "fsm_3.csv")
+STATES = ["A", "B", "C", "D"]
+TRANSITIONS = [("A", "B"), ("B", "C"), ("C", "A")]
+
+
+class TestFsmLayoutCache:
+    """Test suite for the layout cache."""
+
+    def test_graph_key(self):
+        """The key depends on the states and transitions, not on their order."""
+        key = graph_key(STATES, TRANSITIONS)
+        assert key == graph_key(STATES[::-1], TRANSITIONS[::-1])
+        assert key != graph_key(STATES, TRANSITIONS[:2])
+
+    def test_layouts_persist(self, tmp_path):
+        """Layouts are computed once and read back by another cache on the same folder."""
+        key = graph_key(STATES, TRANSITIONS)
+        cache = FsmLayoutCache(str(tmp_path))
+        assert cache.get_layout(key, "Spring") is None
+        positions = cache.cached_layout(key, "Spring", STATES, TRANSITIONS)
+        assert set(positions) == set(STATES)  # D has no transitions and is laid out too
+        assert cache.cached_layout(key, "Spring", STATES, TRANSITIONS) == positions
+
+        reopened = FsmLayoutCache(str(tmp_path))
+        assert reopened.get_layout(key, "Spring") == pytest.approx(positions)
+        assert reopened.get_layout(key, "Circular") is None
+
+    def test_dragged_positions(self, tmp_path):
+        """Dragged positions are kept per layout until cleared."""
+        key = graph_key(STATES, TRANSITIONS)
+        cache = FsmLayoutCache(str(tmp_path))
+        cache.put_dragged(key, "Circular", {"A": (10.0, 20.0)})
+        cache.put_dragged(key, "Circular", {"B": (-5.0, 0.0)})
+        assert FsmLayoutCache(str(tmp_path)).get_dragged(key, "Circular") == {"A": (10.0, 20.0), "B": (-5.0, 0.0)}
+        assert cache.get_dragged(key, "Spring") == {}
+        cache.clear_dragged(key, "Circular")
+        assert FsmLayoutCache(str(tmp_path)).get_dragged(key, "Circular") == {}
+
+    def test_damaged_file(self, tmp_path):
+        """A damaged cache file is treated as empty."""
+        key = graph_key(STATES, TRANSITIONS)
+        (tmp_path / (key + ".json")).write_text("{not json")
+        assert FsmLayoutCache(str(tmp_path)).get_layout(key, "Circular") is None
+
+    def test_compute_layout(self):
+        """Layouts give a position to every state."""
+        positions = compute_layout("Circular", STATES, TRANSITIONS)
+        assert set(positions) == set(STATES) and all(len(pos) == 2 for pos in positions.values())
+
+
+class TestGraphViewLayouts:
+    """Test suite for the graph view on the layout cache."""
+
+    @pytest.fixture
+    def fsm(self, tmp_path):
+        """The FSM of the sample log."""
+        from PySide6.QtWidgets import QApplication
+        from examples.fsm.fsm_core import FSM
+
+        QApplication.instance() or QApplication([])
+        shutil.copy(SAMPLE_LOG, tmp_path / "li_conditions.csv")
+        return FSM(str(tmp_path) + "/")
+
+    def test_background_layout_is_cached(self, fsm, tmp_path):
+        """An expensive layout is computed in the background once and applied at once afterwards."""
+        from PySide6.QtWidgets import QApplication
+        from examples.fsm.fsm_plot_manager import GraphView
+
+        cache_dir = str(tmp_path / "layouts")
+        view = GraphView(fsm, layout_cache=FsmLayoutCache(cache_dir))
+        view.apply_layout("Kamada-Kawai")
+        assert "Kamada-Kawai" in view.layout_workers
+        view.wait_for_layouts()
+        QApplication.processEvents()
+        assert view.layout_workers == {}
+        positions = FsmLayoutCache(cache_dir).get_layout(view.graph_key, "Kamada-Kawai")
+        state, (x, y) = next(iter(positions.items()))
+        assert view.nodes[state].pos().x() == pytest.approx(x * view.graph_scale)
+
+        reopened = GraphView(fsm, layout_cache=FsmLayoutCache(cache_dir))
+        reopened.apply_layout("Kamada-Kawai")
+        assert reopened.layout_workers == {}
+        assert reopened.nodes[state].pos().y() == pytest.approx(y * view.graph_scale)
+
+    def test_dragged_nodes_are_restored(self, fsm, tmp_path):
+        """Nodes moved by the user keep their position when the view is reopened."""
+        from PySide6.QtCore import QPointF
+        from examples.fsm.fsm_plot_manager import GraphView
+
+        cache_dir = str(tmp_path / "layouts")
+        view = GraphView(fsm, layout_cache=FsmLayoutCache(cache_dir))
+        state = next(iter(view.nodes))
+        view.nodes[state].setPos(QPointF(123.0, -45.0))
+        view.mouseReleaseEvent(_MouseRelease())
+
+        reopened = GraphView(fsm, layout_cache=FsmLayoutCache(cache_dir))
+        assert (reopened.nodes[state].pos().x(), reopened.nodes[state].pos().y()) == (123.0, -45.0)
+
+
+def _MouseRelease():
+    """A left button release event at the origin of the view."""
+    from PySide6.QtCore import QPointF, Qt
+    from PySide6.QtGui import QMouseEvent
+
+    return QMouseEvent(QMouseEvent.Type.MouseButtonRelease, QPointF(0, 0), QPointF(0, 0), Qt.MouseButton.LeftButton,
+                       Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the columnar FSM log loader (examples/fsm/fsm_log.py) and the FSM class built on it.
+"""
+
+import os
+import shutil
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from examples.fsm.fsm_log import NULL_VALUE, FsmLog, parse_column
+
+SAMPLE_LOG = os.path.join(base_path, "examples", "fsm", "data", "fsm_3.csv")
+
+
+def reference_transitions(df):
+    """The transitions the way FSM.load_data_from_file used to build them, one row at a time."""
+    signals = [column for column in df.columns if column.startswith("sig-")]
+    transitions = {}
+    for ind in range(len(df) - 1):
+        transition = (df.loc[ind, "current_state"], df.loc[ind + 1, "current_state"])
+        transitions[transition] = {column[4:]: df.loc[ind, column] for column in signals
+                                   if df.loc[ind, column] != NULL_VALUE}
+    return transitions
+
+
+@pytest.fixture
+def raw_log():
+    """A small log with repeated transitions and numeric, boolean and text signals."""
+    return pd.DataFrame({
+        "fsm_execution_ts_sec": ["1.0", "1.1", "1.2", "1.3", "1.4", "1.5"],
+        "current_state": ["A", "A", "B", "A", "B", "C"],
+        "path_ts_sec": ["0.9", "1.0", "1.1", "1.2", "1.3", "1.4"],
+        "map_obj_ts_sec": ["0.9", "1.0", "1.1", "1.2", "1.3", "1.4"],
+        "sig-X": ["-", "1", "0", "1", "-", "1"],
+        "data-X-hit": ["true", "-", "false", "-", "TRUE", "-"],
+        "data-X-name": ["a", "-", "b", "-", "c", "-"],
+        "sig-Y": ["0.5", "-", "-", "2", "-", "-"],
+    })
+
+
+class TestFsmLog:
+    """Test suite for the columnar FSM log."""
+
+    def test_parse_column(self):
+        """Columns are parsed to float, bool or object arrays with a null mask for '-'."""
+        numeric = parse_column(["-", "1", "2.5", "-"])
+        assert numeric.values.dtype == np.float64 and numeric.null_mask.tolist() == [True, False, False, True]
+        assert [numeric.value_at(i) for i in range(4)] == [NULL_VALUE, 1, 2.5, NULL_VALUE]
+        boolean = parse_column(["true", "-", "False"])
+        assert boolean.values.dtype == bool and boolean.values.tolist() == [True, False, False]
+        text = parse_column(["a", "-"])
+        assert text.values.tolist() == ["a", None] and text.value_at(1) == NULL_VALUE
+        assert parse_column(["-", "-"]).values.dtype == np.float64
+
+    def test_state_changes(self, raw_log):
+        """State changes and transitions are found over the whole log."""
+        log = FsmLog(raw_log)
+        assert log.state_names.tolist() == ["A", "B", "C"]
+        assert log.state_change_indices.tolist() == [2, 3, 4, 5]
+        assert list(log.dataframe.columns) == ["time_stamp", "Current State", "path_ts_sec", "map_obj_ts_sec"]
+        assert log.dataframe["time_stamp"].dtype == np.float64
+
+        transitions = log.last_transitions()
+        assert list(transitions) == [("A", "A"), ("A", "B"), ("B", "A"), ("B", "C")]
+        # A -> B was taken at rows 1 and 3; the last time wins
+        assert transitions[("A", "B")] == {"X": 1, "Y": 2}
+        assert transitions[("B", "C")] == {}
+
+        summary = log.transition_summary().set_index(["source", "target"])
+        assert summary.loc[("A", "B"), "count"] == 2 and summary.loc[("A", "B"), "last_row"] == 4
+        assert ("A", "A") not in summary.index
+        assert summary.loc[("B", "C"), "first_time_stamp"] == pytest.approx(1.5)
+
+    def test_matches_row_by_row_transitions(self):
+        """The sample log gives the transitions and active signals of the former row-by-row loader."""
+        df = pd.read_csv(SAMPLE_LOG, dtype=str, keep_default_na=False)
+        expected = reference_transitions(df)
+        transitions = FsmLog(df).last_transitions()
+        assert list(transitions) == list(expected)
+        for transition, signals in expected.items():
+            assert transitions[transition] == {signal: float(value) for signal, value in signals.items()}
+
+
+class TestFsm:
+    """Test suite for the FSM class on the columnar log."""
+
+    def test_load_data_from_file(self, tmp_path):
+        """The FSM exposes typed signal arrays and '-' in the per-index values."""
+        from examples.fsm.fsm_core import FSM
+
+        shutil.copy(SAMPLE_LOG, tmp_path / "li_conditions.csv")
+        fsm = FSM(str(tmp_path) + "/")
+        df = pd.read_csv(SAMPLE_LOG, dtype=str, keep_default_na=False)
+        assert fsm.get_transitions() == list(reference_transitions(df))
+        assert set(fsm.get_states()) == set(df["current_state"])
+        assert len(fsm.dataframe) == len(df)
+
+        signal = "Phi_0"
+        values = fsm.signals_dict[signal]
+        assert isinstance(values, np.ndarray) and values.dtype == np.float64
+        raw = df["sig-" + signal]
+        assert np.array_equal(np.isnan(values), (raw == NULL_VALUE).to_numpy())
+        index = int(np.flatnonzero(raw == NULL_VALUE)[0])
+        assert fsm.get_signals_value_at_index(index)[signal] == NULL_VALUE
+        assert len(fsm.get_signals_data_at_index(index)) == len(fsm.signals_data_dict)
+        assert "crosswalk_under_the_ego.1" in fsm.signals_and_data_dict["FULL_EXLI_1"]["data"]
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
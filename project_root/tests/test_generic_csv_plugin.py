@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""
+Tests for automatic trip signal discovery: the CSV schema scanner, its per-fingerprint
+cache, the GenericCsvPlugin and core.data_loader.get_available_signals.
+"""
+
+import os
+import sys
+import pytest
+from unittest.mock import patch
+import numpy as np
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.data_loaders import csv_schema_scanner
+from utils.data_loaders.csv_schema_scanner import (
+    scan_trip_folder, scan_csv_schema, load_csv_columns, SCHEMA_CACHE_FILE
+)
+from plugins.generic_csv_plugin import GenericCsvPlugin
+from core.data_loader import get_available_signals
+
+
+@pytest.fixture
+def trip_folder(tmp_path):
+    """A trip folder with a headered file (seconds), a headerless NUL-padded file and a text file."""
+    rows = "\n".join(f"{1726037730.0 + 0.1 * i},{i * 2.0},mode_{i % 2}" for i in range(50))
+    (tmp_path / "cruise_control.csv").write_text("timestamp,target_speed,mode\n" + rows + "\n")
+
+    imu_rows = "\n".join(f"{1726037730.0 + 0.01 * i},{-9.8 + i},{i}" for i in range(20))
+    (tmp_path / "imu.csv").write_bytes(b"\x00" * 64 + imu_rows.encode() + b"\n")
+
+    (tmp_path / "notes.txt").write_text("not a csv")
+    return str(tmp_path) + "/"
+
+
+class TestCsvSchemaScanner:
+    """Test suite for the header and sample based schema scan."""
+
+    def test_scan_headered_file(self, trip_folder):
+        """Test dtype, time column and sample rate inference."""
+        schema = scan_csv_schema(os.path.join(trip_folder, "cruise_control.csv"))
+
+        assert schema["has_header"] is True
+        assert [c["name"] for c in schema["columns"]] == ["timestamp", "target_speed", "mode"]
+        assert [c["numeric"] for c in schema["columns"]] == [True, True, False]
+        assert schema["time_column"] == "timestamp"
+        assert schema["time_unit"] == "s"
+        assert schema["sample_rate_hz"] == pytest.approx(10.0, rel=1e-3)
+
+    def test_scan_headerless_nul_padded_file(self, trip_folder):
+        """Test that leading NUL bytes are skipped and columns get positional names."""
+        schema = scan_csv_schema(os.path.join(trip_folder, "imu.csv"))
+
+        assert schema["has_header"] is False
+        assert schema["nul_prefix"] == 64
+        assert schema["time_column"] == "column_0"
+        assert schema["sample_rate_hz"] == pytest.approx(100.0, rel=1e-3)
+
+        df = load_csv_columns(os.path.join(trip_folder, "imu.csv"), schema, ["column_0", "column_1"])
+        assert df.columns == ["column_0", "column_1"]
+        assert df.height == 20
+        assert df["column_1"][1] == pytest.approx(-8.8)
+
+    def test_cache_hit_skips_rescan(self, trip_folder):
+        """Test that unchanged files are served from the cache and changed files are rescanned."""
+        scan_trip_folder(trip_folder)
+        assert os.path.exists(os.path.join(trip_folder, SCHEMA_CACHE_FILE))
+
+        with patch.object(csv_schema_scanner, "scan_csv_schema", wraps=scan_csv_schema) as scan:
+            schemas = scan_trip_folder(trip_folder)
+            assert scan.call_count == 0
+            assert set(schemas) == {"cruise_control.csv", "imu.csv"}
+
+            with open(os.path.join(trip_folder, "imu.csv"), "ab") as f:
+                f.write(b"1726037731.0,1.0,1\n")
+            scan_trip_folder(trip_folder)
+            assert [call.args[0] for call in scan.call_args_list] == [os.path.join(trip_folder, "imu.csv")]
+
+
+class TestGenericCsvPlugin:
+    """Test suite for the GenericCsvPlugin."""
+
+    def test_registers_numeric_columns(self, trip_folder):
+        """Test that every numeric non-time column becomes a temporal signal."""
+        plugin = GenericCsvPlugin(trip_folder)
+
+        assert set(plugin.signals) == {"cruise_control.target_speed", "imu.column_1", "imu.column_2"}
+        info = plugin.signals["cruise_control.target_speed"]
+        assert info["type"] == "temporal"
+        assert info["category"] == "cruise_control"
+
+    def test_columns_load_lazily(self, trip_folder):
+        """Test that data is read only when a signal is requested, one column at a time."""
+        plugin = GenericCsvPlugin(trip_folder)
+        assert plugin._series_cache == {}
+
+        with patch("plugins.generic_csv_plugin.load_csv_columns", wraps=load_csv_columns) as load:
+            assert plugin.get_data_for_timestamp("cruise_control.target_speed", 1726037730150.0) == 2.0
+            assert plugin.get_data_for_timestamp("cruise_control.target_speed", 1726037730250.0) == 4.0
+            assert load.call_count == 1
+            assert load.call_args.args[2] == ["timestamp", "target_speed"]
+
+        assert plugin.get_data_for_timestamp("cruise_control.target_speed", 0) is None
+        assert list(plugin._series_cache) == ["cruise_control.target_speed"]
+
+        timestamps, values = plugin.signals["cruise_control.target_speed"]["series"]()
+        assert timestamps[0] == pytest.approx(1726037730000.0)
+        assert values.dtype == np.float64
+
+    def test_get_available_signals(self, trip_folder):
+        """Test that get_available_signals reports the discovered signals."""
+        signals = get_available_signals(trip_folder)
+
+        assert set(signals) == {"cruise_control.target_speed", "imu.column_1", "imu.column_2"}
+        assert signals["imu.column_1"]["file"] == "imu.csv"
+        assert signals["imu.column_1"]["sample_rate_hz"] == pytest.approx(100.0, rel=1e-3)
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the batched geodetic transforms (utils/localization_and_navigation/geodetic.py),
+the GPS loader built on them and the GPS plugin.
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.localization_and_navigation.geodetic import (LocalTangentFrame, ecef_to_geodetic, geodetic_to_ecef,
+                                                        rotation_matrix)
+
+SAMPLE_TRIP = os.path.join(base_path, "2024-09-11T15_55_30")
+
+
+@pytest.fixture
+def fixes():
+    """Geodetic coordinates all over the globe, including the poles and the antimeridian."""
+    rng = np.random.default_rng(5)
+    lla = np.column_stack([rng.uniform(-90.0, 90.0, 5000), rng.uniform(-180.0, 180.0, 5000),
+                           rng.uniform(-400.0, 30000.0, 5000)])
+    lla[:4] = [[90.0, 0.0, 10.0], [-90.0, 45.0, 0.0], [0.0, 180.0, 0.0], [0.0, 0.0, -100.0]]
+    return lla
+
+
+class TestGeodeticTransforms:
+    """Test suite for the WGS84, ECEF and local tangent frame transforms."""
+
+    def test_haifa_ecef(self):
+        """WGS84 to ECEF matches the reference values of the online converter."""
+        ecef = geodetic_to_ecef([[32.825020, 34.982573, 0.0]])
+        assert ecef[0] == pytest.approx([4395702.106, 3075911.671, 3437667.463], abs=1e-3)
+
+    def test_round_trip(self, fixes):
+        """ECEF to WGS84 (closed form) inverts WGS84 to ECEF."""
+        back = ecef_to_geodetic(geodetic_to_ecef(fixes))
+        assert np.abs(back[:, 0] - fixes[:, 0]).max() < 1e-9
+        longitude_error = (back[4:, 1] - fixes[4:, 1] + 180.0) % 360.0 - 180.0
+        assert np.abs(longitude_error).max() < 1e-9
+        assert np.abs(back[:, 2] - fixes[:, 2]).max() < 1e-6
+
+    def test_in_place_and_preallocated(self, fixes):
+        """Writing into a preallocated output or into the input gives the same result."""
+        expected = geodetic_to_ecef(fixes)
+        out = np.empty_like(fixes)
+        assert geodetic_to_ecef(fixes, out=out) is out
+        assert np.array_equal(out, expected)
+        ecef = fixes.copy()
+        geodetic_to_ecef(ecef, out=ecef)
+        assert np.array_equal(ecef, expected)
+        ecef_to_geodetic(ecef, out=ecef)
+        assert np.array_equal(ecef, ecef_to_geodetic(expected))
+        with pytest.raises(ValueError):
+            geodetic_to_ecef(fixes, out=np.empty((len(fixes), 2)))
+
+    def test_local_frames(self):
+        """ENU and NED axes point the right way and hold the same points."""
+        enu = LocalTangentFrame(32.82909, 34.97446, 0.0, frame="ENU")
+        ned = LocalTangentFrame(32.82909, 34.97446, 0.0, frame="NED")
+        points = np.array([[32.82909, 34.97446, 0.0], [32.83909, 34.97446, 0.0], [32.82909, 34.98446, 0.0],
+                           [32.82909, 34.97446, 100.0]])
+        local = enu.from_geodetic(points)
+        assert local[0] == pytest.approx([0.0, 0.0, 0.0], abs=1e-6)
+        assert local[1, 1] > 1100.0 and abs(local[1, 0]) < 1e-6
+        assert local[2, 0] > 900.0 and abs(local[2, 1]) < 1.0
+        assert local[3] == pytest.approx([0.0, 0.0, 100.0], abs=1e-6)
+        assert np.allclose(ned.from_geodetic(points), local[:, [1, 0, 2]] * [1.0, 1.0, -1.0])
+        assert np.allclose(enu.to_geodetic(local), points, atol=1e-8)
+        assert np.allclose(enu.from_ecef(enu.to_ecef(local)), local)
+        with pytest.raises(ValueError):
+            LocalTangentFrame(0.0, 0.0, frame="XYZ")
+
+    def test_rotation_cached(self):
+        """Frames at the same reference point share one read-only rotation."""
+        a = LocalTangentFrame(35.0, 139.0)
+        b = LocalTangentFrame(35.0, 139.0, 50.0)
+        assert a.rotation is b.rotation is rotation_matrix(35.0, 139.0, "ENU")
+        assert not a.rotation.flags.writeable
+
+    def test_dataframe_wrappers(self):
+        """The DataFrame functions of coordinate_transformation agree with the array transforms."""
+        from utils.localization_and_navigation import coordinate_transformation as geo
+
+        df_wgs84 = pd.DataFrame({"latitude": [32.82909, 32.82815], "longitude": [34.97446, 34.97670],
+                                 "height": [0.0, 10.0]})
+        df_ecef = geo.wgs842ecef(df_wgs84)
+        frame = LocalTangentFrame(32.82909, 34.97446, 0.0)
+        expected = frame.from_geodetic(df_wgs84.to_numpy())
+        df_enu = geo.ecef2enu(df_ecef, df_ecef.iloc[0, :], 32.82909, 34.97446)
+        assert np.allclose(df_enu[["x", "y", "z"]].to_numpy(), expected)
+        df_ned = geo.ecef2ned(df_ecef, df_ecef.iloc[0, :], 32.82909, 34.97446)
+        assert np.allclose(df_ned[["x", "y", "z"]].to_numpy(), expected[:, [1, 0, 2]] * [1.0, 1.0, -1.0])
+
+
+class TestGpsLoading:
+    """Test suite for the GPS loader and the GPS plugin on the sample trip."""
+
+    def test_load_trip_gps_data(self):
+        """The loader returns WGS84 rows and tangent frame coordinates starting at the first fix."""
+        from utils.data_loaders.nav_data_loader import load_trip_gps_data
+
+        wgs84, df_rect = load_trip_gps_data(SAMPLE_TRIP, "both", sample_spacing=10)
+        assert wgs84.shape == (4, len(df_rect))
+        assert wgs84[1, 0] == pytest.approx(35.4517588)
+        assert list(df_rect.columns) == ["x", "y", "z", "time_stamp"]
+        assert df_rect.iloc[0][["x", "y", "z"]].tolist() == pytest.approx([0.0, 0.0, 0.0], abs=1e-6)
+        df_ned = load_trip_gps_data(SAMPLE_TRIP, "rect", sample_spacing=10, tangent_frame="NED")
+        assert np.allclose(df_ned["x"], df_rect["y"]) and np.allclose(df_ned["z"], -df_rect["z"])
+
+    def test_gps_plugin(self):
+        """The plugin serves the ENU track and nearest-fix temporal signals."""
+        from plugins.gps_plugin import GpsPlugin
+
+        plugin = GpsPlugin(SAMPLE_TRIP + "/")
+        assert set(GpsPlugin.discover_signals(SAMPLE_TRIP)) == set(plugin.signals)
+        route = plugin.get_data_for_timestamp("gps_route", 0)
+        assert route.shape == (len(plugin.timestamps_ms), 2) and route.flags["C_CONTIGUOUS"]
+        timestamps, east = plugin.get_series("gps_east")
+        assert east[0] == pytest.approx(0.0, abs=1e-6)
+        assert plugin.get_data_for_timestamp("gps_east", timestamps[100] + 1.0) == pytest.approx(east[100])
+        values = plugin.get_data_for_timestamps("gps_ground_speed", timestamps[:50])
+        assert np.all(np.isfinite(values) | np.isnan(plugin.ground_speed[:50]))
+
+    def test_gps_plugin_without_gps_file(self, tmp_path):
+        """A trip without gps.csv gets no GPS signals instead of failing to load."""
+        from plugins.gps_plugin import GpsPlugin
+
+        assert GpsPlugin(str(tmp_path) + "/").signals == {}
+        assert tuple(GpsPlugin.discover_signals(str(tmp_path))) == ()
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the segmented kinematic KPI engine (utils/path_analysis/kinematics.py).
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.path_analysis.csr_paths import CsrPaths, arc_length, paths_to_csr
+from utils.path_analysis.kinematics import (KINEMATIC_COLUMNS, path_kinematics, path_kpis, segmented_gradient,
+                                            speed_profile, trip_kpis)
+
+SAMPLE_TRIP = os.path.join(base_path, "2024-09-11T15_55_30")
+
+
+def circle_paths(radii, num_points=40, step=0.5):
+    """Arcs of the given radii (left turns for positive radii), starting at the origin along x."""
+    path_x = np.full((len(radii), num_points), np.nan)
+    path_y = np.full((len(radii), num_points), np.nan)
+    for i, radius in enumerate(radii):
+        angle = step * np.arange(num_points) / abs(radius)
+        path_x[i] = abs(radius) * np.sin(angle)
+        path_y[i] = radius * (1.0 - np.cos(angle))
+    return paths_to_csr(path_x, path_y)
+
+
+class TestKinematics:
+    """Test suite for the per-point kinematics of CSR paths."""
+
+    def test_segmented_gradient_matches_np_gradient(self):
+        """Within every segment, the result is np.gradient of that segment; single points are NaN."""
+        rng = np.random.default_rng(1)
+        offsets = np.array([0, 5, 6, 6, 14])
+        values = rng.normal(size=14)
+        spacing = np.cumsum(rng.uniform(0.1, 1.0, 14))
+        gradient = segmented_gradient(values, offsets, spacing)
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            if end - start > 1:
+                assert np.allclose(gradient[start:end], np.gradient(values[start:end], spacing[start:end]))
+        assert np.isnan(gradient[5])
+
+    def test_circle(self):
+        """Arcs have curvature 1 / R and lateral acceleration v^2 / R at constant speed."""
+        paths = circle_paths([10.0, -25.0])
+        s = arc_length(paths)
+        kinematics = path_kinematics(paths, s, speed_profile(paths, s, np.array([5.0, 10.0])))
+        curvature = kinematics[:, KINEMATIC_COLUMNS.index("curvature")]
+        lateral_acceleration = kinematics[:, KINEMATIC_COLUMNS.index("lateral_acceleration")]
+        # End points use one-sided differences; compare the interior
+        assert np.allclose(curvature[2:38], 0.1, rtol=1e-3)
+        assert np.allclose(curvature[42:78], -0.04, rtol=1e-3)
+        assert np.allclose(lateral_acceleration[42:78], -4.0, rtol=1e-3)
+        assert np.allclose(kinematics[:, KINEMATIC_COLUMNS.index("longitudinal_acceleration")], 0.0)
+
+    def test_constant_acceleration(self):
+        """The speed profile accelerates uniformly from the start to the end speed of each path."""
+        paths = paths_to_csr(np.arange(0.0, 50.0, 1.0)[None, :], np.zeros((1, 50)))
+        s = arc_length(paths)
+        speeds = speed_profile(paths, s, np.array([2.0]), np.array([8.0]))
+        assert speeds[0] == pytest.approx(2.0) and speeds[-1] == pytest.approx(8.0)
+
+        kinematics = path_kinematics(paths, s, speeds)
+        # v^2 = v0^2 + 2 a s
+        expected = (8.0 ** 2 - 2.0 ** 2) / (2.0 * 49.0)
+        assert np.allclose(kinematics[1:-1, KINEMATIC_COLUMNS.index("longitudinal_acceleration")], expected)
+        assert np.allclose(kinematics[2:-2, KINEMATIC_COLUMNS.index("longitudinal_jerk")], 0.0, atol=1e-9)
+        assert np.allclose(kinematics[:, KINEMATIC_COLUMNS.index("longitudinal_velocity")], speeds)
+
+    def test_path_and_trip_kpis(self):
+        """Per-path maxima skip NaN; empty paths have none."""
+        paths = circle_paths([10.0, 20.0])
+        paths = CsrPaths(paths.x, paths.y, np.array([0, 40, 40, 80]))
+        s = arc_length(paths)
+        kinematics = path_kinematics(paths, s, speed_profile(paths, s, np.array([5.0, 1.0, 5.0])))
+        df = path_kpis(paths, s, kinematics, timestamps=np.array([0.0, 100.0, 200.0]))
+        assert list(df["num_points"]) == [40, 0, 40]
+        assert df.loc[0, "max_abs_lateral_acceleration"] == pytest.approx(2.5, rel=1e-2)
+        assert np.isnan(df.loc[1, "max_abs_curvature"])
+
+        summary = trip_kpis(df)
+        assert summary["num_paths"] == 3
+        assert summary["max_max_abs_curvature"] == pytest.approx(0.1, rel=1e-2)
+
+
+@pytest.mark.skipif(not os.path.isdir(SAMPLE_TRIP), reason="Sample trip not available")
+class TestPathRegressorKpi:
+    """Test suite for the kinematic KPIs of the PathRegressor on the sample trip."""
+
+    def test_evaluate_kpi(self):
+        """The KPIs cover every path and the virtual path carries the kinematic columns."""
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+        from data_classes.PathRegressor import PathRegressor, V_P_COLUMNS
+
+        regressor = PathRegressor(PathTrajectoryPolars(os.path.join(SAMPLE_TRIP, "path_trajectory.csv")),
+                                  CACHE_DIR=None, delta_t_sec=1.0, pts_after=2)
+        kpi = regressor.evaluate_kpi()
+        assert kpi is regressor.kpi
+        assert kpi["num_paths"] == len(regressor.time_data) == len(regressor.df_path_kpis)
+        assert 0.0 < kpi["p95_max_abs_lateral_acceleration"] <= kpi["max_max_abs_lateral_acceleration"]
+
+        _, v_p = regressor.extract_virtual_path()
+        pre = regressor.precompute()
+        # The longitudinal/lateral positions are the ego-frame point, placed by the image pose
+        idx = v_p[:, V_P_COLUMNS.index("timestamp_idx")].astype(int)
+        lon = v_p[:, V_P_COLUMNS.index("longitudinal_position")]
+        lat = v_p[:, V_P_COLUMNS.index("lateral_position")]
+        yaw = v_p[:, V_P_COLUMNS.index("yaw_angle_rad")]
+        assert np.allclose(np.cos(yaw) * lon - np.sin(yaw) * lat + pre.pose_x[idx], v_p[:, 0])
+        assert np.allclose(np.sin(yaw) * lon + np.cos(yaw) * lat + pre.pose_y[idx], v_p[:, 1])
+        assert np.isfinite(v_p[:, V_P_COLUMNS.index("curvature")]).mean() > 0.9
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
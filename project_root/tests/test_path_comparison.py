@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the path-to-path comparison of two trips (utils/path_analysis/path_comparison.py)
+and the path divergence signals of comparison mode.
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.path_analysis import path_comparison
+from utils.path_analysis.path_comparison import (METRIC_COLUMNS, align_cycles, batch_path_metrics, chunk_pairs,
+                                                 compare_path_pairs, compare_trips, discrete_frechet_distance,
+                                                 hausdorff_distance, lateral_deviations, path_pair_metrics,
+                                                 worst_cycles)
+
+FIXED_COLUMNS = ("data_timestamp_sec, current_speed_mps, target_speed_mps, turn_signal_state, w_car_pose_now_x_, "
+                 "w_car_pose_now_y, w_car_pose_now_yaw_rad, car_pose_now_timestamp, w_car_pose_image_x, "
+                 "w_car_pose_image_y, w_car_pose_image_yaw_rad, car_pose_image_timestamp_sec")
+
+PLUGIN_SOURCE = '''
+from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+
+
+class PathPlugin:
+    """Loads the planned paths of a trip."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.path_trajectory = PathTrajectoryPolars(file_path + "path_trajectory.csv")
+        self.signals = {"timestamps": {"func": self.path_trajectory.get_timestamps_ms, "type": "temporal"}}
+
+    def has_signal(self, signal):
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal, timestamp):
+        return None
+
+
+plugin_class = PathPlugin
+'''
+
+
+def write_path_trajectory(file_path, start_s, lateral_offsets, num_points=20):
+    """Write straight paths along x, shifted sideways by lateral_offsets[k] in cycle k (10 Hz)."""
+    header = FIXED_COLUMNS + "".join(f", path_x_{i}, path_y_{i}" for i in range(num_points))
+    lines = [header]
+    for k, lateral in enumerate(lateral_offsets):
+        t = start_s + 0.1 * k
+        fixed = [t, 3.0, 3.0, "Idle", k, 0.0, 0.0, t, k, 0.0, 0.0, t]
+        points = [v for i in range(num_points) for v in (0.5 * i, lateral)]
+        lines.append(", ".join(str(v) for v in fixed + points))
+    with open(file_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def random_pairs():
+    """Pairs of random paths of different lengths, with empty, single-point and repeated-point paths."""
+    rng = np.random.default_rng(3)
+    pairs = []
+    for _ in range(60):
+        a = np.cumsum(rng.normal(size=(rng.integers(0, 12), 2)), axis=0)
+        b = np.cumsum(rng.normal(size=(rng.integers(0, 12), 2)), axis=0)
+        if len(a) > 2:
+            a[1] = a[0]
+        pairs.append((a, b))
+    return pairs
+
+
+class TestPathMetrics:
+    """Test suite for the path distance metrics."""
+
+    def test_single_pair_metrics(self):
+        """Metrics of simple polylines match their definitions."""
+        a = np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]])
+        b = np.array([[0.0, 1.0], [2.0, 1.0], [4.0, 1.0]])
+        assert hausdorff_distance(a, b) == pytest.approx(np.hypot(2.0, 1.0))
+        assert discrete_frechet_distance(a, b) == pytest.approx(np.hypot(2.0, 1.0))
+        assert list(lateral_deviations(a, b)) == pytest.approx([1.0, 1.0, np.hypot(2.0, 1.0)])
+        # Frechet respects the order of the points, Hausdorff does not
+        assert discrete_frechet_distance(a, a[::-1]) == pytest.approx(2.0)
+        assert hausdorff_distance(a, a[::-1]) == 0.0
+
+    def test_frechet_matches_recurrence(self, random_pairs):
+        """The anti-diagonal evaluation equals the cell-by-cell coupling recurrence."""
+        for a, b in random_pairs:
+            if len(a) == 0 or len(b) == 0:
+                continue
+            d = np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+            ca = np.zeros_like(d)
+            for i in range(len(a)):
+                for j in range(len(b)):
+                    previous = [ca[i - 1, j]] if i else []
+                    previous += [ca[i, j - 1]] if j else []
+                    previous += [ca[i - 1, j - 1]] if i and j else []
+                    ca[i, j] = max(d[i, j], min(previous)) if previous else d[i, j]
+            assert discrete_frechet_distance(a, b) == pytest.approx(ca[-1, -1])
+
+    def test_batch_matches_single_pairs(self, random_pairs):
+        """The batched metrics equal the metrics of each pair; pairs with an empty path are NaN."""
+        expected = np.array([path_pair_metrics(a, b) for a, b in random_pairs])
+        assert np.allclose(batch_path_metrics(random_pairs), expected, equal_nan=True)
+        assert batch_path_metrics([]).shape == (0, len(METRIC_COLUMNS))
+
+    def test_segment_blocks_and_chunks(self, random_pairs, monkeypatch):
+        """Small segment blocks and memory-bounded chunks give the metrics of each pair, in pair order."""
+        class Paths:
+            def __init__(self, paths):
+                self.paths = paths
+
+            def path(self, index):
+                return self.paths[index]
+
+        monkeypatch.setattr(path_comparison, "LATERAL_SEGMENT_BLOCK", 3)
+        monkeypatch.setattr(path_comparison, "COMPARISON_MAX_ELEMENTS", 400)
+        expected = np.array([path_pair_metrics(a, b) for a, b in random_pairs])
+        assert np.allclose(batch_path_metrics(random_pairs), expected, equal_nan=True)
+        index = np.arange(len(random_pairs))
+        metrics = compare_path_pairs(Paths([a for a, _ in random_pairs]), Paths([b for _, b in random_pairs]),
+                                     index, index)
+        assert np.allclose(metrics, expected, equal_nan=True)
+
+    def test_chunk_pairs(self):
+        """Chunks stay within the element bound and cover every pair once; oversized pairs stand alone."""
+        rng = np.random.default_rng(5)
+        lengths_a, lengths_b = rng.integers(0, 40, 200), rng.integers(0, 40, 200)
+        lengths_a[7] = 500
+        chunks = chunk_pairs(lengths_a, lengths_b, max_elements=5000)
+        assert sorted(np.concatenate(chunks)) == list(range(200))
+        for chunk in chunks:
+            size = len(chunk) * max(lengths_a[chunk].max(), 1) * max(lengths_b[chunk].max(), 1)
+            assert size <= 5000 or len(chunk) == 1
+        assert [7] in [list(chunk) for chunk in chunks]
+
+    def test_align_cycles(self):
+        """Cycles pair with the closest cycle of trip B within the tolerance."""
+        timestamps_a = np.array([0.0, 100.0, 200.0, 300.0])
+        timestamps_b = np.array([1120.0, 1010.0, 1210.0])
+        index_a, index_b = align_cycles(timestamps_a, timestamps_b, offset_ms=1000.0)
+        assert list(index_a) == [0, 1, 2]
+        assert list(index_b) == [1, 0, 2]
+
+
+class TestCompareTrips:
+    """Test suite for the comparison of the planned paths of two trips."""
+
+    def test_compare_trips(self, tmp_path):
+        """A sideways shift of the paths of trip B shows up in the cycles where it happens."""
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+
+        lateral_b = np.zeros(30)
+        lateral_b[10:15] = [0.2, 0.4, 1.5, 0.4, 0.2]
+        write_path_trajectory(str(tmp_path / "a.csv"), 1726037730.0, np.zeros(30))
+        write_path_trajectory(str(tmp_path / "b.csv"), 1726037830.0, lateral_b)
+
+        df = compare_trips(PathTrajectoryPolars(str(tmp_path / "a.csv")), PathTrajectoryPolars(str(tmp_path / "b.csv")),
+                           offset_ms=100000.0)
+        assert len(df) == 30
+        assert list(df["path_idx_b"]) == list(range(30))
+        for column in METRIC_COLUMNS:
+            assert np.allclose(df[column], lateral_b, atol=1e-9)
+        assert list(worst_cycles(df, "mean_lateral_deviation_m", n=3)["path_idx_a"]) == [12, 11, 13]
+
+
+class TestPathDivergenceSignals:
+    """Test suite for the path divergence signals of comparison mode."""
+
+    def test_register_path_divergence_signals(self, tmp_path):
+        """Comparison mode serves the per-cycle divergence on the time base of trip A."""
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        from core.plot_manager import PlotManager
+
+        plugin_dir = tmp_path / "plugins"
+        plugin_dir.mkdir()
+        (plugin_dir / "path_plugin.py").write_text(PLUGIN_SOURCE)
+        lateral_b = np.zeros(20)
+        lateral_b[5] = 2.0
+        trips = {}
+        for name, start, lateral in (("a", 1726037730.0, np.zeros(20)), ("b", 1726040000.0, lateral_b)):
+            (tmp_path / name).mkdir()
+            write_path_trajectory(str(tmp_path / name / "path_trajectory.csv"), start, lateral)
+            trips[name] = str(tmp_path / name) + "/"
+
+        plot_manager = PlotManager()
+        plot_manager.load_comparison_plugins_from_directory(str(plugin_dir), trips["a"], trips["b"])
+        signals = plot_manager.register_path_divergence_signals()
+        assert "path_divergence_lateral" in signals
+        assert plot_manager.signal_plugins["path_divergence_lateral"]["type"] == "temporal"
+
+        plugin = plot_manager.plugins["path_divergence"]
+        plugin._comparison_thread.join(timeout=30)
+        app.processEvents()  # The refresh is queued to the GUI thread
+        assert plot_manager.signal_registry.get_signal_statistics("path_divergence_lateral").count == 20
+        timestamps, values = plugin.get_series("path_divergence_lateral")
+        assert timestamps[0] == pytest.approx(1726037730000.0)
+        assert np.allclose(values, lateral_b)
+        assert plugin.get_data_for_timestamp("path_divergence_frechet", timestamps[5] + 20.0) == pytest.approx(2.0)
+
+    def test_background_comparison(self, tmp_path):
+        """The comparison runs in a background thread; per-frame requests do not wait for it."""
+        from core.trip_comparison import PathDivergencePlugin
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+
+        lateral_b = np.zeros(20)
+        lateral_b[5] = 2.0
+        write_path_trajectory(str(tmp_path / "a.csv"), 1726037730.0, np.zeros(20))
+        write_path_trajectory(str(tmp_path / "b.csv"), 1726037730.0, lateral_b)
+        ready = []
+        plugin = PathDivergencePlugin(PathTrajectoryPolars(str(tmp_path / "a.csv")),
+                                      PathTrajectoryPolars(str(tmp_path / "b.csv")), on_ready=lambda: ready.append(True))
+        timestamp = 1726037730000.0 + 500.0
+
+        plugin._lock.acquire()  # Hold the comparison back
+        plugin.start_comparison()
+        assert plugin.is_comparing()
+        assert plugin.get_data_for_timestamp("path_divergence_lateral", timestamp) is None
+        timestamps, values = plugin.get_series("path_divergence_lateral")
+        assert len(timestamps) == 0 and len(values) == 0
+        plugin._lock.release()
+
+        plugin._comparison_thread.join(timeout=30)
+        assert ready == [True]
+        assert not plugin.is_comparing()
+        assert plugin.get_data_for_timestamp("path_divergence_lateral", timestamp) == pytest.approx(2.0)
+
+    def test_failed_comparison_is_not_repeated(self, monkeypatch):
+        """A comparison that fails leaves empty signals and is not run again on every request."""
+        from core.trip_comparison import PathDivergencePlugin
+
+        calls = []
+
+        def failing_compare_trips(*args, **kwargs):
+            calls.append(args)
+            raise ValueError("no paths")
+
+        monkeypatch.setattr(path_comparison, "compare_trips", failing_compare_trips)
+        ready = []
+        plugin = PathDivergencePlugin(object(), object(), on_ready=lambda: ready.append(True))
+        plugin.start_comparison()
+        plugin._comparison_thread.join(timeout=30)
+        assert ready == [True]
+        assert plugin.error == "ValueError: no paths"
+        for _ in range(3):
+            assert plugin.get_data_for_timestamp("path_divergence_frechet", 1000.0) is None
+        assert len(plugin.get_series("path_divergence_frechet")[0]) == 0
+        assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
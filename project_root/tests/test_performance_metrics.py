@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the live performance metrics and the performance HUD.
+"""
+
+import os
+import sys
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import numpy as np
+import polars as pl
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance()
+if not app:
+    app = QApplication([])
+
+from core import tracing
+from core.performance_metrics import PerformanceMetrics, estimate_memory, plugin_memory, resident_memory
+from gui.performance_hud import PerformanceHud
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    """Start each test with tracing enabled and leave it disabled afterwards."""
+    tracing.enable_tracing()
+    yield
+    tracing.disable_tracing()
+    tracing.clear()
+
+
+def record_frame(signals=("speed", "steering")):
+    """Record the spans of one request_data frame."""
+    with tracing.span("request_data", "frame"):
+        for signal in signals:
+            with tracing.span("plugin:CarState", "plugin", signal=signal):
+                pass
+            with tracing.span("widget:temporal", "widget", signal=signal):
+                pass
+
+
+class TestPerformanceMetrics:
+    """Test suite for PerformanceMetrics and the memory estimates."""
+
+    def test_aggregates_new_events_only(self):
+        """Test latency, breakdowns and that each event is aggregated once."""
+        metrics = PerformanceMetrics()
+        for _ in range(3):
+            record_frame()
+        assert metrics.update() == 15
+        assert metrics.update() == 0
+
+        snapshot = metrics.snapshot()
+        assert len(metrics.latencies_ms) == 3
+        assert snapshot["latency"]["p50"] <= snapshot["latency"]["p99"]
+        assert snapshot["fps"] is not None
+        assert snapshot["plugins"]["plugin:CarState"]["calls"] == 6
+        assert snapshot["signals"]["speed"]["calls"] == 3
+        assert snapshot["widgets"]["widget:temporal"]["calls"] == 6
+
+    def test_empty_metrics(self):
+        """Test the metrics before any frame was traced."""
+        snapshot = PerformanceMetrics().snapshot()
+        assert snapshot["fps"] is None
+        assert snapshot["latency"] is None
+        assert snapshot["plugins"] == {}
+
+    def test_memory_estimates(self):
+        """Test that plugin memory counts arrays and frames once, including shared data."""
+        shared = np.zeros(1000)
+        plugin_a = SimpleNamespace(data={"values": shared, "frame": pl.DataFrame({"x": np.zeros(100)})})
+        plugin_b = SimpleNamespace(values=shared, name="b")
+
+        assert estimate_memory(plugin_a) == 8000 + 800
+        assert plugin_memory({"a": plugin_a, "b": plugin_b}) == {"a": 8800, "b": 0}
+        assert resident_memory() is None or resident_memory() > 0
+
+
+class TestPerformanceHud:
+    """Test suite for the PerformanceHud widget."""
+
+    def test_refresh(self):
+        """Test that the HUD shows the traced frames and plugin memory."""
+        plot_manager = MagicMock()
+        plot_manager.plugins = {"CarState": SimpleNamespace(values=np.zeros(10))}
+        hud = PerformanceHud(plot_manager)
+
+        record_frame()
+        hud.refresh()
+
+        assert "request_data: p50" in hud.summary_label.text()
+        plugins_table = hud.tables["plugins"]
+        assert plugins_table.item(0, 0).text() == "plugin:CarState"
+        assert plugins_table.item(0, 1).text() == "2"
+        assert plugins_table.item(0, 4).text() == "0.0 MB"
+        assert hud.tables["signals"].rowCount() == 2
+
+    def test_tracing_follows_visibility(self):
+        """Test that the HUD enables tracing while shown and restores it when hidden."""
+        tracing.disable_tracing()
+        hud = PerformanceHud(MagicMock(plugins={}))
+
+        hud.show()
+        assert tracing.is_enabled()
+        hud.hide()
+        assert not tracing.is_enabled()
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -164,6 +164,23 @@ class TestPlotManager:
         # Verify that get_data_for_timestamp was called correctly for our signal
         mock_plugin.get_data_for_timestamp.assert_called_with("test_signal", 12345)
     
+    def test_request_data_with_data_validation(self, plot_manager):
+        """
+        Test that enabling data validation flags plugins returning slow data types.
+        """
+        validator = plot_manager.enable_data_validation("warn")
+        
+        mock_plugin = MagicMock()
+        mock_plugin.has_signal.return_value = True
+        mock_plugin.get_data_for_timestamp.return_value = {"value": 42}
+        plot_manager.plugins["TestPlugin"] = mock_plugin
+        plot_manager.signal_plugins["test_signal"] = {"plugin": "TestPlugin", "type": "temporal"}
+        plot_manager.signals["test_signal"] = [MagicMock()]
+        
+        plot_manager.request_data(12345)
+        
+        assert validator.report()["test_signal"]["plugin"] == "TestPlugin"
+    
     def test_request_data(self, plot_manager_with_plugin):
         """
         Test requesting data for a specific timestamp using the fixture.
@@ -250,6 +267,83 @@ class TestPlotManager:
             # Verify plugin was registered
             assert "test_plugin" in plot_manager.plugins
 
+    def test_reload_plugin(self, plot_manager, tmp_path):
+        """
+        Test that reloading a plugin re-executes its module and re-registers its signals in place.
+        """
+        plugin_file = tmp_path / "reload_plugin.py"
+        source = (
+            "class ReloadPlugin:\n"
+            "    def __init__(self, file_path):\n"
+            "        self.signals = {{{signals}}}\n"
+            "    def has_signal(self, signal):\n"
+            "        return signal in self.signals\n"
+            "    def get_data_for_timestamp(self, signal, timestamp):\n"
+            "        return {value}\n"
+            "plugin_class = ReloadPlugin\n"
+        )
+        plugin_file.write_text(source.format(
+            signals='"speed": {"func": abs, "type": "temporal"}, "old": {"func": abs, "type": "temporal"}', value=1.0
+        ))
+        plot_manager.load_plugin_from_file("reload_plugin", str(plugin_file), {"file_path": "/trip/"})
+        plot_manager.signals["speed"] = [plot_manager.temporal_plot_widget]
+        plot_manager.signals["old"] = [plot_manager.temporal_plot_widget]
+        plot_manager.request_data(100)
+        version = plot_manager.signal_registry.get_signal_version("speed")
+        
+        plugin_file.write_text(source.format(signals='"speed": {"func": abs, "type": "temporal"}', value=2.0))
+        assert plot_manager.reload_plugin("reload_plugin") is True
+        
+        # Signals are re-registered in place, removed signals are dropped and the frame is re-requested
+        assert plot_manager.signal_registry.get_signal_version("speed") > version
+        assert "old" not in plot_manager.signal_plugins
+        assert "old" not in plot_manager.signals
+        plot_manager.temporal_plot_widget.unregister_signal.assert_called_once_with("old")
+        plot_manager.temporal_plot_widget.update_data.assert_called_with("speed", 2.0, 100)
+        
+        # A broken edit keeps the running instance
+        plugin_file.write_text("raise RuntimeError('syntax slip')\n")
+        assert plot_manager.reload_plugin("reload_plugin") is False
+        assert plot_manager.plugins["reload_plugin"].get_data_for_timestamp("speed", 0) == 2.0
+        
+        assert plot_manager.reload_plugin("unknown_plugin") is False
+
+
+class TestPlotWidgetUnregister:
+    """
+    Test suite for removing signals from the real plot widgets.
+    """
+
+    def test_temporal_unregister_signal(self):
+        """
+        Test that an unregistered temporal signal loses its lines, data and statistics.
+        """
+        from gui.custom_plot_widget import TemporalPlotWidget_pg
+
+        widget = TemporalPlotWidget_pg()
+        widget.register_signal("speed", "plot1")
+        widget.register_signal("speed", "plot2")
+        widget.update_data("speed", 1.0, 100)
+        line = widget.plot_lines["speed"]["plot1"]
+        widget.unregister_signal("speed")
+        assert "speed" not in widget.signals and "speed" not in widget.plot_lines
+        assert all("speed" not in plot_data for plot_data in widget.data_store.values())
+        assert line not in widget.plot1.listDataItems()
+        widget.update_data("speed", 2.0, 200)  # Ignored instead of redrawing the removed line
+
+    def test_spatial_unregister_signal(self):
+        """
+        Test that an unregistered spatial signal loses its plot element.
+        """
+        from gui.custom_plot_widget import SpatialPlotWidget
+
+        widget = SpatialPlotWidget()
+        widget.register_signal("route")
+        element = widget.plot_elements["route"]
+        widget.unregister_signal("route")
+        assert "route" not in widget.signals and "route" not in widget.data_store
+        assert element not in widget.plot_widget.listDataItems()
+
 
 if __name__ == "__main__":
     pytest.main(['-xvs', __file__])
@@ -9,6 +9,7 @@ These tests verify that plugins correctly implement the required interface.
 import sys
 import os
 import pytest
+import numpy as np
 from unittest.mock import MagicMock
 
 # Add the project root to the Python path
@@ -79,6 +80,28 @@ class TestPluginBase:
         data = plugin.get_data_for_timestamp("test_signal", 0)
         assert data == {"value": 42}
 
+    def test_default_batch_lookup(self):
+        """
+        Test that the default get_data_for_timestamps calls get_data_for_timestamp per
+        timestamp and maps missing data to NaN.
+        """
+        class ScalarPlugin(PluginBase):
+            def __init__(self, file_path):
+                super().__init__(file_path)
+                self.signals = {"value": {"func": abs, "type": "temporal"}}
+
+            def has_signal(self, signal):
+                return signal in self.signals
+
+            def get_data_for_timestamp(self, signal, timestamp):
+                return timestamp / 10 if timestamp >= 0 else None
+
+        plugin = ScalarPlugin("/path/to/test")
+        values = plugin.get_data_for_timestamps("value", [-10, 0, 10])
+        assert np.isnan(values[0])
+        assert list(values[1:]) == [0.0, 1.0]
+        assert ScalarPlugin.discover_signals("/path/to/test") is None
+
 
 if __name__ == "__main__":
     pytest.main(['-xvs', __file__])
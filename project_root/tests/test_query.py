@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the headless signal query (tools/query.py) and the batch timestamp API.
+"""
+
+import os
+import sys
+import numpy as np
+import polars as pl
+import pytest
+
+# Add project root and tools to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+sys.path.insert(0, os.path.join(base_path, "tools"))
+
+from query import parse_rate, load_plugins_for_signals, time_grid, query_trip, write_table
+from plugins.generic_csv_plugin import GenericCsvPlugin
+
+
+@pytest.fixture
+def trip_folder(tmp_path):
+    """A trip folder with one 10 Hz CSV file (timestamps in seconds)."""
+    rows = "\n".join(f"{1726037730.0 + 0.1 * i},{i * 2.0},{-i}" for i in range(50))
+    (tmp_path / "cruise_control.csv").write_text("timestamp,target_speed,steer_command\n" + rows + "\n")
+    return str(tmp_path) + "/"
+
+
+class TestQuery:
+    """Test suite for the query CLI building blocks."""
+
+    def test_parse_rate(self):
+        """Rates are accepted in Hz or as a period."""
+        assert parse_rate("10Hz") == 10.0
+        assert parse_rate("5") == 5.0
+        assert parse_rate("100ms") == pytest.approx(10.0)
+        with pytest.raises(ValueError):
+            parse_rate("fast")
+
+    def test_time_grid(self):
+        """The grid starts relative to the earliest signal and includes its end."""
+        grid = time_grid([(1000.0, 5000.0), (2000.0, 9000.0)], start_s=1.0, end_s=3.0, rate_hz=2.0)
+        assert grid[0] == 2000.0
+        assert grid[-1] == 4000.0
+        assert len(grid) == 5
+
+    def test_loads_only_providing_plugins(self, trip_folder):
+        """Plugins declaring other signals are not instantiated."""
+        providers = load_plugins_for_signals(trip_folder, ["cruise_control.target_speed"])
+        # Plugin modules are executed from their files, so compare by class name
+        assert type(providers["cruise_control.target_speed"]).__name__ == "GenericCsvPlugin"
+
+    def test_unknown_signal(self, trip_folder):
+        """A signal nobody provides is reported."""
+        with pytest.raises(KeyError):
+            load_plugins_for_signals(trip_folder, ["no_such_signal"])
+
+    def test_batch_matches_single_lookups(self, trip_folder):
+        """The vectorized lookup returns the same values as per-timestamp requests."""
+        plugin = GenericCsvPlugin(trip_folder)
+        timestamps = np.linspace(1726037729000.0, 1726037736000.0, 97)
+        batch = plugin.get_data_for_timestamps("cruise_control.target_speed", timestamps)
+        single = [plugin.get_data_for_timestamp("cruise_control.target_speed", t) for t in timestamps]
+        assert np.allclose(batch, np.array(single, dtype=np.float64), equal_nan=True)
+
+    def test_query_trip_writes_parquet(self, trip_folder, tmp_path):
+        """Signals are sampled on one grid and written as columns."""
+        df = query_trip(trip_folder, ["cruise_control.target_speed", "cruise_control.steer_command"],
+                        start_s=0.0, end_s=1.0, rate_hz=10.0)
+        assert df.columns == ["trip", "timestamp_ms", "cruise_control.target_speed", "cruise_control.steer_command"]
+        assert df.height == 11
+        assert df["cruise_control.target_speed"].to_list()[:3] == [0.0, 2.0, 4.0]
+
+        output = str(tmp_path / "out.parquet")
+        write_table(df, output)
+        assert pl.read_parquet(output).equals(df)
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the headless batch frame renderer (tools/render_frames.py).
+"""
+
+import os
+import shutil
+import sys
+import numpy as np
+import pytest
+
+# Add project root and tools to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+sys.path.insert(0, os.path.join(base_path, "tools"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import render_frames
+from render_frames import frame_timestamps, partition_frames, stitch_frames, render_partition, FRAME_PATTERN
+
+SAMPLE_TRIP = os.path.join(base_path, "2024-09-11T15_55_30") + os.sep
+
+
+class TestFramePlanning:
+    """Test suite for frame selection and partitioning."""
+
+    def test_raw_timestamps_in_range(self):
+        """Without a frame rate, every trip timestamp of the range is a frame."""
+        trip = np.arange(1000.0, 11000.0, 100.0)
+        frames = frame_timestamps(trip, start_s=2.0, duration_s=1.0)
+        assert frames[0] == 3000.0
+        assert frames[-1] == 4000.0
+        assert len(frames) == 11
+
+    def test_resampled_timestamps_keep_end_frame(self):
+        """Resampling on epoch milliseconds includes the end of the range."""
+        trip = np.array([1.726e12, 1.726e12 + 60000.0])
+        frames = frame_timestamps(trip, start_s=10.0, duration_s=2.0, fps=5)
+        assert len(frames) == 11
+        assert frames[-1] - frames[0] == pytest.approx(2000.0)
+
+    def test_duration_clipped_to_trip(self):
+        """A range past the end of the trip stops at the last timestamp."""
+        trip = np.arange(0.0, 1000.0, 100.0)
+        frames = frame_timestamps(trip, duration_s=100.0, fps=10)
+        assert frames[-1] <= trip[-1]
+
+    def test_partitions_cover_all_frames(self):
+        """Partitions are contiguous, disjoint and cover every frame."""
+        partitions = partition_frames(11, 3)
+        assert partitions[0][0] == 0
+        assert partitions[-1][1] == 11
+        for (_, end), (start, _) in zip(partitions[:-1], partitions[1:]):
+            assert end == start
+
+    def test_more_workers_than_frames(self):
+        """Empty partitions are dropped."""
+        assert partition_frames(2, 8) == [(0, 1), (1, 2)]
+
+
+class TestStitcher:
+    """Test suite for the stitcher."""
+
+    def test_missing_frames_raise(self, tmp_path):
+        """The stitcher refuses incomplete sequences."""
+        (tmp_path / FRAME_PATTERN.format(0)).write_bytes(b"")
+        with pytest.raises(RuntimeError, match="missing"):
+            stitch_frames(str(tmp_path), 2, str(tmp_path), 10)
+
+    def test_image_sequence_output(self, tmp_path):
+        """A directory output is the frame directory itself."""
+        for i in range(2):
+            (tmp_path / FRAME_PATTERN.format(i)).write_bytes(b"")
+        assert stitch_frames(str(tmp_path), 2, str(tmp_path), 10) == str(tmp_path)
+
+    def test_mp4_without_ffmpeg_keeps_frames(self, tmp_path, monkeypatch):
+        """Without ffmpeg the image sequence is kept."""
+        (tmp_path / FRAME_PATTERN.format(0)).write_bytes(b"")
+        monkeypatch.setattr(render_frames.shutil, "which", lambda name: None)
+        assert stitch_frames(str(tmp_path), 1, str(tmp_path / "out.mp4"), 10) == str(tmp_path)
+
+
+@pytest.mark.skipif(not os.path.isdir(SAMPLE_TRIP), reason="Sample trip not available")
+class TestRenderPartition:
+    """Test suite for rendering on the sample trip."""
+
+    @pytest.fixture
+    def sample_trip(self, tmp_path):
+        """A copy of the sample trip, so the loader caches are not written into the repository."""
+        trip = tmp_path / "trip"
+        shutil.copytree(SAMPLE_TRIP, trip, ignore=shutil.ignore_patterns("*.pkl", ".*"))
+        return str(trip) + os.sep
+
+    def test_partitioned_render_matches_sequential(self, sample_trip, tmp_path):
+        """Frames rendered by a later partition are identical to a sequential render."""
+        from data_classes.car_pose_class import CarPose
+
+        trip_timestamps = CarPose(sample_trip).get_timestamps_milliseconds().to_numpy()
+        timestamps = frame_timestamps(trip_timestamps, start_s=10.0, duration_s=0.4, fps=5)
+        sequential, partitioned = tmp_path / "sequential", tmp_path / "partitioned"
+        sequential.mkdir()
+        partitioned.mkdir()
+
+        assert render_partition(sample_trip, timestamps, 0, 3, str(sequential), 400, 300) == 3
+        render_partition(sample_trip, timestamps, 2, 3, str(partitioned), 400, 300)
+
+        frame = FRAME_PATTERN.format(2)
+        assert (sequential / frame).read_bytes() == (partitioned / frame).read_bytes()
+        assert not (partitioned / FRAME_PATTERN.format(1)).exists()
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
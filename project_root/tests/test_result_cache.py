@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the content-addressed result cache (utils/path_analysis/result_cache.py) and its
+use by the PathRegressor.
+"""
+
+import json
+import os
+import sys
+import numpy as np
+import polars as pl
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.path_analysis.result_cache import ResultCache, cache_key, file_content_hash
+
+FIXED_COLUMNS = ("data_timestamp_sec, current_speed_mps, target_speed_mps, turn_signal_state, w_car_pose_now_x_, "
+                 "w_car_pose_now_y, w_car_pose_now_yaw_rad, car_pose_now_timestamp, w_car_pose_image_x, "
+                 "w_car_pose_image_y, w_car_pose_image_yaw_rad, car_pose_image_timestamp_sec")
+
+
+def write_path_trajectory(file_path, num_paths=6, num_points=20, speed=3.0):
+    """Write a path_trajectory.csv with straight paths planned from poses along x."""
+    header = FIXED_COLUMNS + "".join(f", path_x_{i}, path_y_{i}" for i in range(num_points))
+    lines = [header]
+    for k in range(num_paths):
+        t = 1726037730.0 + 0.1 * k
+        fixed = [t, speed, 10.0, "Idle", k, 0.0, 0.1, t, k, 0.0, 0.1, t]
+        points = [v for i in range(num_points) for v in (0.5 * i, 0.01 * i * i)]
+        lines.append(", ".join(str(v) for v in fixed + points))
+    with open(file_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def path_file(tmp_path):
+    """A small path_trajectory.csv with six paths."""
+    file_path = str(tmp_path / "path_trajectory.csv")
+    write_path_trajectory(file_path)
+    return file_path
+
+
+class TestResultCache:
+    """Test suite for cache keys and entries."""
+
+    def test_keys(self, path_file, tmp_path):
+        """Keys change with the file content and the parameters, not with the file location."""
+        data_key = file_content_hash(path_file)
+        copy = tmp_path / "copy.csv"
+        copy.write_bytes(open(path_file, "rb").read())
+        assert file_content_hash(str(copy)) == data_key
+
+        assert cache_key("virtual_path", data_key, {"a": 1, "b": 2}) == cache_key("virtual_path", data_key, {"b": 2, "a": 1})
+        assert cache_key("virtual_path", data_key, {"a": 1}) != cache_key("virtual_path", data_key, {"a": 2})
+
+        with open(copy, "a") as f:
+            f.write("\n")
+        assert file_content_hash(str(copy)) != data_key
+
+    def test_table_and_array_entries(self, tmp_path):
+        """Tables and arrays round-trip with a JSON metadata sidecar."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        assert cache.load_table("k1") is None
+
+        df = pl.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+        cache.save_table("k1", df, {"params": {"a": 1}})
+        assert cache.load_table("k1").equals(df)
+        assert cache.metadata("k1")["params"] == {"a": 1}
+        assert cache.metadata("k1")["rows"] == 2
+
+        cache.save_arrays("k2", {"offsets": np.array([0, 2, 5]), "s": np.linspace(0.0, 1.0, 5)})
+        arrays = cache.load_arrays("k2")
+        assert list(arrays["offsets"]) == [0, 2, 5]
+        assert not [f for f in os.listdir(tmp_path / "cache") if f.endswith(".tmp")]
+
+
+class TestPathRegressorCache:
+    """Test suite for the PathRegressor result cache."""
+
+    def make_regressor(self, path_file, cache_dir, **params):
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+        from data_classes.PathRegressor import PathRegressor
+        return PathRegressor(PathTrajectoryPolars(path_file), trip_name="trip", CACHE_DIR=cache_dir, **params)
+
+    def test_results_are_reused(self, path_file, tmp_path):
+        """A second regressor with the same data and parameters loads the stored virtual path."""
+        cache_dir = str(tmp_path / "cache")
+        regressor = self.make_regressor(path_file, cache_dir, delta_t_sec=1.0, pts_before=1, pts_after=2)
+        regressor.eval()
+
+        other = self.make_regressor(path_file, cache_dir, delta_t_sec=1.0, pts_before=1, pts_after=2)
+        other.extract_virtual_path = lambda: pytest.fail("The virtual path should come from the cache")
+        other.eval()
+        assert np.array_equal(other.v_p, regressor.v_p, equal_nan=True)
+        assert list(other.df_virt_path["timestamp_idx"]) == list(regressor.df_virt_path["timestamp_idx"])
+
+        metadata = [json.load(open(os.path.join(cache_dir, f))) for f in os.listdir(cache_dir) if f.endswith(".json")]
+        assert {m["kind"] for m in metadata} == {"virtual_path", "path_precomputation"}
+
+    def test_parameter_change_reuses_precomputation(self, path_file, tmp_path):
+        """Other parameters give a separate entry, computed from the stored per-path products."""
+        cache_dir = str(tmp_path / "cache")
+        self.make_regressor(path_file, cache_dir, delta_t_sec=1.0, pts_before=1, pts_after=2).eval()
+
+        regressor = self.make_regressor(path_file, cache_dir, delta_t_sec=2.0, pts_before=0, pts_after=4)
+        regressor.pathobj.get_paths_csr = lambda: pytest.fail("The per-path products should come from the cache")
+        regressor.eval()
+        assert len(regressor.v_p) == 6 * 5
+        assert len([f for f in os.listdir(cache_dir) if f.endswith(".parquet")]) == 2
+
+    def test_changed_input_invalidates(self, path_file, tmp_path):
+        """A modified source file is a different cache entry."""
+        cache_dir = str(tmp_path / "cache")
+        regressor = self.make_regressor(path_file, cache_dir, delta_t_sec=1.0)
+        regressor.eval()
+
+        write_path_trajectory(path_file, speed=6.0)
+        changed = self.make_regressor(path_file, cache_dir, delta_t_sec=1.0)
+        changed.eval()
+        assert np.all(changed.v_p[:, 4] == 6.0)
+        assert len([f for f in os.listdir(cache_dir) if f.endswith(".parquet")]) == 2
+
+
+    def test_loaders_have_separate_entries(self, path_file, tmp_path):
+        """The pandas and polars loaders of the same file do not share entries: their timestamps differ."""
+        from data_classes.PathTrajectory_pandas import PathTrajectoryPandas
+        from data_classes.PathRegressor import PathRegressor
+
+        cache_dir = str(tmp_path / "cache")
+        self.make_regressor(path_file, cache_dir, delta_t_sec=1.0).eval()
+
+        regressor = PathRegressor(PathTrajectoryPandas(path_file), trip_name="trip", CACHE_DIR=cache_dir, delta_t_sec=1.0)
+        assert regressor.data_key() != self.make_regressor(path_file, cache_dir).data_key()
+        regressor.eval()
+        assert np.array_equal(regressor.precompute().timestamps, np.asarray(regressor.time_data))
+        assert np.array_equal(np.unique(regressor.v_p[:, 3]), np.unique(regressor.df_virt_path["timestamp"]))
+        assert len([f for f in os.listdir(cache_dir) if f.endswith(".npz")]) == 2
+
+
+class TestPathRegressorSweep:
+    """Test suite for the parameter sweep of the PathRegressor."""
+
+    def make_regressor(self, path_file):
+        from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+        from data_classes.PathRegressor import PathRegressor
+        return PathRegressor(PathTrajectoryPolars(path_file), trip_name="trip", CACHE_DIR=None)
+
+    def test_sweep_matches_single_extraction(self, path_file):
+        """Every parameter set of the grid gives the points of a single extraction with these parameters."""
+        regressor = self.make_regressor(path_file)
+        grid = {"delta_t_sec": [0.5, 1.0, 2.0], "pts_before": [0, 2], "pts_after": [1, 3]}
+        df_points, df_kpis = regressor.sweep(grid)
+        assert len(df_kpis) == 12
+        assert list(df_kpis["param_set"]) == list(range(12))
+
+        for _, row in df_kpis.iterrows():
+            regressor.update_params({name: row[name] for name in ("delta_t_sec", "pts_before", "pts_after")})
+            _, v_p = regressor.extract_virtual_path()
+            points = df_points[df_points["param_set"] == row["param_set"]]
+            assert row["num_points"] == len(v_p) == len(points)
+            assert np.allclose(points[["x", "y", "timestamp_idx", "speed"]].to_numpy(), v_p[:, [0, 1, 2, 4]])
+
+    def test_lookahead_error(self, path_file):
+        """The look-ahead error compares the delta_t_sec * speed point with the later image pose."""
+        regressor = self.make_regressor(path_file)
+        _, df_kpis = regressor.sweep([{"delta_t_sec": 0.1}])
+        # Poses advance 1 m per 0.1 s; the path point closest to 0.3 m ahead is (0.5, 0.01) in the
+        # pose frame (yaw 0.1), compared with the next pose
+        c, s = np.cos(0.1), np.sin(0.1)
+        expected = np.hypot(c * 0.5 - s * 0.01 - 1.0, s * 0.5 + c * 0.01)
+        assert df_kpis.loc[0, "lookahead_error_mean_m"] == pytest.approx(expected, abs=1e-6)
+
+    def test_unknown_parameter(self, path_file):
+        """Grids with parameters the regressor does not have are rejected."""
+        with pytest.raises(ValueError):
+            self.make_regressor(path_file).sweep({"delta_t": [1.0]})
+
+    def test_process_pool(self, path_file, monkeypatch):
+        """The process pool returns the same tables as the in-process sweep."""
+        import data_classes.PathRegressor as path_regressor
+        regressor = self.make_regressor(path_file)
+        grid = {"delta_t_sec": [0.5, 1.0], "pts_after": [0, 2]}
+        expected = regressor.sweep(grid)
+
+        monkeypatch.setattr(path_regressor, "SWEEP_POOL_MIN_DELTA_T", 2)
+        df_points, df_kpis = regressor.sweep(grid, max_workers=2)
+        assert df_points.equals(expected[0])
+        assert df_kpis.equals(expected[1])
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
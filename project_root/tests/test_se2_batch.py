@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the batched SE(2) operations (utils/spatial_poses/se2_batch.py) and the
+se2_function helpers built on them.
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from utils.spatial_poses import se2_batch, se2_function
+
+
+def reference_matrix(x, y, theta):
+    """A single SE(2) matrix, built the way se2_function used to, one at a time."""
+    return np.array([[np.cos(theta), -np.sin(theta), x], [np.sin(theta), np.cos(theta), y], [0.0, 0.0, 1.0]])
+
+
+@pytest.fixture
+def poses():
+    """Random [x, y, yaw] poses."""
+    rng = np.random.default_rng(7)
+    return np.column_stack([rng.normal(0.0, 50.0, 40), rng.normal(0.0, 50.0, 40), rng.uniform(-np.pi, np.pi, 40)])
+
+
+class TestSe2Batch:
+    """Test suite for the batched SE(2) kernels."""
+
+    def test_matrices_round_trip(self, poses):
+        """Pose vectors and matrices convert into each other."""
+        matrices = se2_batch.vectors_to_matrices(poses)
+        assert np.allclose(matrices, [reference_matrix(*pose) for pose in poses])
+        assert np.allclose(se2_batch.matrices_to_vectors(matrices), poses)
+
+    def test_compose_and_inverse(self, poses):
+        """Composition and inversion agree between matrices and pose vectors."""
+        a, b = poses[:20], poses[20:]
+        matrices_a, matrices_b = se2_batch.vectors_to_matrices(a), se2_batch.vectors_to_matrices(b)
+        assert np.allclose(se2_batch.compose(matrices_a, matrices_b), [ma @ mb for ma, mb in zip(matrices_a, matrices_b)])
+        assert np.allclose(se2_batch.vectors_to_matrices(se2_batch.compose_poses(a, b)),
+                           se2_batch.compose(matrices_a, matrices_b))
+        assert np.allclose(se2_batch.compose(matrices_a, se2_batch.inverse(matrices_a)), np.eye(3))
+        assert np.allclose(se2_batch.vectors_to_matrices(se2_batch.inverse_poses(a)), se2_batch.inverse(matrices_a))
+        # A single transform broadcasts over the batch
+        assert np.allclose(se2_batch.compose(matrices_a[0], matrices_b), [matrices_a[0] @ mb for mb in matrices_b])
+
+    def test_transform_points(self, poses):
+        """Points are transformed by a single matrix, one matrix each, or one matrix per point set."""
+        rng = np.random.default_rng(8)
+        points = rng.normal(size=(len(poses), 2))
+        matrices = se2_batch.vectors_to_matrices(poses)
+        homogeneous = np.column_stack((points, np.ones(len(points))))
+        assert np.allclose(se2_batch.transform_points(matrices[0], points), (matrices[0] @ homogeneous.T).T[:, :2])
+        assert np.allclose(se2_batch.transform_points(matrices, points),
+                           [(m @ p)[:2] for m, p in zip(matrices, homogeneous)])
+
+        offsets = np.array([0, 3, 3, 10, len(points)])
+        expected = np.concatenate([(matrices[k] @ homogeneous[offsets[k]:offsets[k + 1]].T).T[:, :2]
+                                   for k in range(len(offsets) - 1)])
+        in_place = points.copy()
+        se2_batch.transform_points_ragged(matrices[:4], in_place, offsets, out=in_place)
+        assert np.allclose(in_place, expected)
+
+    def test_interpolate_poses(self):
+        """Poses interpolate linearly, extrapolate beyond the ends and turn the short way across +-pi."""
+        timestamps = np.array([0.0, 1.0, 2.0])
+        x, y = np.array([0.0, 1.0, 2.0]), np.array([0.0, 0.0, 2.0])
+        yaw = np.array([3.0, -3.0, -2.0])
+        result = se2_batch.interpolate_poses([0.5, 1.5, 3.0], timestamps, x, y, yaw)
+        assert np.allclose(result[:, :2], [[0.5, 0.0], [1.5, 1.0], [3.0, 4.0]])
+        assert result[0, 2] == pytest.approx(se2_batch.wrap_angle(3.0 + (2.0 * np.pi - 6.0) / 2.0))
+        raw = se2_batch.interpolate_poses([0.5], timestamps, x, y, yaw, unwrap_yaw=False)
+        assert raw[0, 2] == pytest.approx(0.0)
+
+
+class TestSe2Function:
+    """Test suite for the se2_function helpers on top of the batched kernels."""
+
+    def test_interpolated_pose_se2(self):
+        """The batched matrices equal the per-timestamp matrices of the interpolation handler."""
+        rng = np.random.default_rng(9)
+        timestamps = np.sort(rng.uniform(0.0, 10.0, 50))
+        x, y, yaw_deg = rng.normal(size=50), rng.normal(size=50), rng.uniform(-180.0, 180.0, 50)
+        query = rng.uniform(-1.0, 11.0, 30)
+        matrices, handler = se2_function.get_interpolated_pose_SE2(query, yaw_deg, timestamps, x, y, timestamps)
+        assert matrices.shape == (30, 3, 3)
+        assert np.allclose(matrices, [handler(t) for t in query])
+
+    def test_apply_se2_transform(self):
+        """Points given as lists or 2 x N arrays are transformed like homogeneous coordinates."""
+        matrix = reference_matrix(1.0, 2.0, 0.5)
+        points = [[0.0, 0.0], [1.0, 0.0], [0.0, 3.0]]
+        expected = (matrix @ np.column_stack((points, np.ones(3))).T).T[:, :2]
+        assert np.allclose(se2_function.apply_se2_transform(matrix, points), expected)
+        assert np.allclose(se2_function.apply_se2_transform(matrix, np.array(points).T), expected)
+        assert np.allclose(se2_function.inverse_se2_matrix(matrix) @ matrix, np.eye(3))
+        series = se2_function.apply_se2_transform_to_series(matrix, [matrix, np.eye(3)])
+        assert np.allclose(series, [matrix @ matrix, matrix])
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
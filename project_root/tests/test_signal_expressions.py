@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the signal expression compiler.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.signal_expressions import compile_expression, evaluate_expression, SignalExpressionError
+from core.signal_registry import SignalRegistry
+
+
+def make_series_signal(timestamps, values):
+    """Create a temporal signal definition that provides a full series."""
+    return {
+        "func": lambda t: None,
+        "type": "temporal",
+        "series": lambda: (np.asarray(timestamps, dtype=float), np.asarray(values, dtype=float)),
+    }
+
+
+class TestSignalExpressions:
+    """Test suite for signal expressions."""
+
+    def test_compile_inputs_and_type(self):
+        """Test that inputs and the result type are inferred from the expression."""
+        compiled = compile_expression("abs(current_steering - target_steering_angle) > 5")
+        assert compiled.inputs == ("current_steering", "target_steering_angle")
+        assert compiled.signal_type == "boolean"
+
+        compiled = compile_expression("rolling_mean(current_speed, 1s) * 3.6")
+        assert compiled.inputs == ("current_speed",)
+        assert compiled.signal_type == "temporal"
+
+    def test_compiled_plans_are_cached(self):
+        """Test that compiling the same expression string twice returns the cached plan."""
+        assert compile_expression("a + b") is compile_expression("a + b")
+
+    @pytest.mark.parametrize("expression", [
+        "a +",                      # syntax error
+        "unknown_func(a)",          # unknown function
+        "abs(a).attribute",         # attributes only of signal names
+        "a[0]",                     # subscripts are not allowed
+        "`a + b",                   # unterminated quoted signal name
+        "rolling_mean(a, 5)",       # window must be a duration
+        "a + 1s",                   # durations only as windows
+        "1 + 2",                    # no signal referenced
+        "__import__('os')",         # arbitrary calls are rejected
+    ])
+    def test_invalid_expressions(self, expression):
+        """Test that invalid expressions raise SignalExpressionError."""
+        with pytest.raises(SignalExpressionError):
+            compile_expression(expression)
+
+    def test_dotted_and_quoted_signal_names(self):
+        """Dotted names and backtick-quoted names reference signals whose names are not identifiers."""
+        compiled = compile_expression("cruise_control.target_speed - vehicle.state.speed > 1")
+        assert compiled.inputs == ("cruise_control.target_speed", "vehicle.state.speed")
+        assert compiled.signal_type == "boolean"
+
+        compiled = compile_expression("abs(`current_speed [A-B]`) / `current_speed [B]` + `speed (1s)`")
+        assert compiled.inputs == ("current_speed [A-B]", "current_speed [B]", "speed (1s)")
+
+        # Durations inside a quoted name are part of the name
+        compiled = compile_expression("rolling_mean(`mean 5s`, 5s)")
+        assert compiled.inputs == ("mean 5s",)
+
+        result = evaluate_expression(compile_expression("`speed [B]` - cruise_control.target_speed"),
+                                     np.array([0.0, 100.0]), np.array([3.0, 5.0]), np.array([1.0, 1.0]))
+        assert np.array_equal(result, [2.0, 4.0])
+
+    def test_evaluate(self):
+        """Test evaluation over aligned arrays, including NaN (no data) samples."""
+        time_base = np.array([0.0, 500.0, 1000.0, 1500.0])
+        a = np.array([1.0, 10.0, np.nan, 4.0])
+        b = np.array([0.0, 0.0, 0.0, 10.0])
+
+        result = evaluate_expression(compile_expression("abs(a - b) > 5"), time_base, a, b)
+        assert np.array_equal(result[[0, 1, 3]], [0.0, 1.0, 1.0])
+        assert np.isnan(result[2])
+
+        result = evaluate_expression(compile_expression("rolling_max(b, 1s)"), time_base, b)
+        assert np.array_equal(result, [0.0, 0.0, 0.0, 10.0])
+
+        result = evaluate_expression(compile_expression("a > 0 and b < 5"), time_base, a, b)
+        assert np.array_equal(result[[0, 1, 3]], [1.0, 1.0, 0.0])
+
+    def test_register_expression_signal(self):
+        """Test that expression signals register as derived signals with the inferred type."""
+        registry = SignalRegistry()
+        registry.register_signal("target_speed", make_series_signal([0, 1000, 2000], [10, 20, 30]), "CarState")
+        registry.register_signal("current_speed", make_series_signal([0, 1500], [12, 24]), "CarState")
+
+        result = registry.register_expression_signal("too_slow", "target_speed - current_speed > 1")
+        assert result["type"] == "boolean"
+        assert result["expression"] == "target_speed - current_speed > 1"
+
+        engine = registry.derived_engine
+        assert engine.get_data_for_timestamp("too_slow", 0) == 0.0
+        assert engine.get_data_for_timestamp("too_slow", 1000) == 1.0  # 20 - 12 (held)
+        assert engine.get_data_for_timestamp("too_slow", 1600) == 0.0  # 20 - 24
+
+        registry.register_signal("current_speed [B]", make_series_signal([0, 2000], [10, 30]), "ComparisonPlugin")
+        result = registry.register_expression_signal("faster_than_b", "current_speed > `current_speed [B]`")
+        assert result["inputs"] == ["current_speed", "current_speed [B]"]
+        assert engine.get_data_for_timestamp("faster_than_b", 0) == 1.0
+
+        result = registry.register_expression_signal("speed_mean", "rolling_mean(target_speed, 1.5s)")
+        assert result["type"] == "temporal"
+        assert engine.get_data_for_timestamp("speed_mean", 2000) == 25.0  # window (500, 2000]
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
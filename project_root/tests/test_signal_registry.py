@@ -5,6 +5,7 @@ Tests for the SignalRegistry class.
 """
 
 import pytest
+import numpy as np
 from unittest.mock import MagicMock, patch
 import sys
 import os
@@ -202,6 +203,55 @@ class TestSignalRegistry:
         assert set(plugin2_signals) == {"signal3"}
         assert unknown_plugin_signals == []
         
+    def test_get_signals_by_category_and_prefix(self):
+        """Test the category and name prefix indexes."""
+        registry = SignalRegistry()
+        registry.register_signal("imu.acc_x", {"func": lambda x: x, "type": "temporal", "category": "imu"}, "csv")
+        registry.register_signal("imu.acc_y", {"func": lambda x: x, "type": "temporal", "category": "imu"}, "csv")
+        registry.register_signal("gps.lat", {"func": lambda x: x, "type": "temporal", "category": "gps"}, "csv")
+        registry.register_signal("imu_raw", {"func": lambda x: x, "type": "temporal"}, "csv")
+        
+        assert registry.get_signals_by_category("imu") == ["imu.acc_x", "imu.acc_y"]
+        assert registry.get_signals_by_prefix("imu.") == ["imu.acc_x", "imu.acc_y"]
+        assert registry.get_signals_by_prefix("imu") == ["imu.acc_x", "imu.acc_y", "imu_raw"]
+        assert registry.get_signals_by_prefix("speed") == []
+        
+    def test_reregister_and_unregister_update_indexes(self):
+        """Test that re-registering or removing a signal keeps all indexes consistent."""
+        registry = SignalRegistry()
+        registry.register_signal("signal1", {"func": lambda x: x, "type": "temporal"}, "plugin1")
+        registry.register_signal("signal1", {"func": lambda x: x, "type": "spatial"}, "plugin2")
+        
+        assert registry.get_signals_by_type("temporal") == []
+        assert registry.get_signals_by_type("spatial") == ["signal1"]
+        assert registry.get_signals_by_plugin("plugin1") == []
+        assert registry.get_signals_by_plugin("plugin2") == ["signal1"]
+        assert registry.signal_hierarchy["plugin1"]["temporal"] == []
+        assert registry.get_signals_by_prefix("signal") == ["signal1"]
+        
+        assert registry.unregister_signal("signal1") is True
+        assert registry.unregister_signal("signal1") is False
+        assert not registry.has_signal("signal1")
+        assert registry.get_signals_by_type("spatial") == []
+        assert registry.get_signals_by_prefix("signal") == []
+        
+    def test_subscribers_are_weak_references(self):
+        """Test that deleted subscribers are dropped automatically."""
+        registry = SignalRegistry()
+        registry.register_signal("signal1", {"func": lambda x: x, "type": "temporal"}, "plugin1")
+        
+        subscriber = MagicMock()
+        registry.subscribe_to_signal("signal1", subscriber)
+        assert registry.get_signal_subscribers("signal1") == [subscriber]
+        
+        del subscriber
+        import gc
+        gc.collect()
+        assert registry.get_signal_subscribers("signal1") == []
+        
+        # Objects without weak reference support cannot subscribe
+        assert registry.subscribe_to_signal("signal1", "not_weakrefable") is False
+        
     def test_get_signal_metadata(self):
         """Test getting signal metadata."""
         registry = SignalRegistry()
@@ -214,7 +264,8 @@ class TestSignalRegistry:
             "type": "temporal",
             "description": "A test signal",
             "units": "meters",
-            "valid_range": [0, 100]
+            "valid_range": [0, 100],
+            "series": lambda: (np.array([0.0]), np.array([1.0]))
         }
         plugin_name = "test_plugin"
         registry.register_signal(signal_name, signal_def, plugin_name)
@@ -229,8 +280,9 @@ class TestSignalRegistry:
         assert metadata["units"] == "meters"
         assert metadata["valid_range"] == [0, 100]
         
-        # Func should not be exposed in metadata
+        # Func and series should not be exposed in metadata
         assert "func" not in metadata
+        assert "series" not in metadata
         
         # Getting metadata for nonexistent signal should return empty dict
         metadata = registry.get_signal_metadata("nonexistent_signal")
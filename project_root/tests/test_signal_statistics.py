@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+Tests for precomputed signal statistics and their exposure through the SignalRegistry.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.signal_statistics import compute_signal_statistics, BLOCK_DTYPE
+from core.signal_registry import SignalRegistry
+
+
+class TestSignalStatistics:
+    """Test suite for compute_signal_statistics and SignalStatistics."""
+
+    def test_summary_and_blocks(self):
+        """Test count, extent, sample interval and the per-block table."""
+        timestamps = np.arange(0, 3000, 100, dtype=float)  # 10 Hz over 3 s
+        values = np.arange(30, dtype=float)
+        values[5] = np.nan
+
+        stats = compute_signal_statistics(timestamps, values)
+
+        assert stats.count == 29
+        assert (stats.t_min, stats.t_max) == (0.0, 2900.0)
+        assert stats.median_dt == 100.0
+        assert stats.sample_rate_hz == pytest.approx(10.0)
+        assert not stats.is_sparse
+
+        assert stats.blocks.dtype == BLOCK_DTYPE
+        assert list(stats.blocks["start"]) == [0.0, 1000.0, 2000.0]
+        assert list(stats.blocks["count"]) == [9, 10, 10]
+        assert list(stats.blocks["min"]) == [0.0, 10.0, 20.0]
+        assert list(stats.blocks["max"]) == [9.0, 19.0, 29.0]
+
+    def test_range_stats_uses_overlapping_blocks(self):
+        """Test that range queries cover exactly the blocks overlapping the range."""
+        stats = compute_signal_statistics(np.arange(0, 3000, 100, dtype=float), np.arange(30, dtype=float))
+
+        middle = stats.range_stats(1200, 1800)
+        assert (middle.min, middle.max, middle.count) == (10.0, 19.0, 10)
+        assert middle.mean == pytest.approx(14.5)
+
+        assert stats.range_stats(900, 2100).count == 30
+        assert stats.range_stats(5000, 6000) is None
+
+    def test_sparse_and_non_numeric(self):
+        """Test sparse detection and that non-numeric series have no statistics."""
+        sparse = compute_signal_statistics([0.0, 5000.0, 10000.0], [1.0, 2.0, 3.0])
+        assert sparse.is_sparse
+
+        assert compute_signal_statistics([0.0, 1.0], np.array(["a", "b"])) is None
+
+
+class TestRegistryStatistics:
+    """Test suite for statistics in the SignalRegistry."""
+
+    def test_metadata_and_caching(self):
+        """Test that statistics are computed once and recomputed after invalidation."""
+        registry = SignalRegistry()
+        series = MagicMock(return_value=(np.array([0.0, 100.0, 200.0]), np.array([1.0, 3.0, 2.0])))
+        registry.register_signal("speed", {"func": lambda t: 0.0, "type": "temporal", "series": series}, "CarState")
+
+        metadata = registry.get_signal_metadata("speed")
+        assert metadata["statistics"]["count"] == 3
+        assert metadata["statistics"]["t_max"] == 200.0
+
+        registry.get_signal_statistics("speed")
+        assert series.call_count == 1
+
+        registry.invalidate_signal("speed")
+        registry.get_signal_statistics("speed")
+        assert series.call_count == 2
+
+    def test_derived_signal_statistics_follow_inputs(self):
+        """Test that statistics of a derived signal are recomputed when an input changes."""
+        registry = SignalRegistry()
+        data = {"values": np.array([1.0, 2.0])}
+        registry.register_signal("speed", {
+            "func": lambda t: 0.0, "type": "temporal",
+            "series": lambda: (np.array([0.0, 100.0]), data["values"]),
+        }, "CarState")
+        registry.register_derived_signal("double_speed", ["speed"], lambda t, x: 2 * x)
+
+        assert registry.get_signal_statistics("double_speed").range_stats(0, 100).max == 4.0
+
+        data["values"] = np.array([5.0, 6.0])
+        registry.invalidate_signal("speed")
+        assert registry.get_signal_statistics("double_speed").range_stats(0, 100).max == 12.0
+
+    def test_signals_without_series(self):
+        """Test that signals without a series have no statistics."""
+        registry = SignalRegistry()
+        registry.register_signal("pose", {"func": lambda t: 0.0, "type": "spatial"}, "CarPose")
+
+        assert registry.get_signal_statistics("pose") is None
+        assert "statistics" not in registry.get_signal_metadata("pose")
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -10,6 +10,8 @@ import os
 import sys
 import pytest
 from unittest.mock import MagicMock
+import numpy as np
+import polars as pl
 
 # Add project root to Python path
 base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -20,7 +22,13 @@ from core.signal_validation import (
     check_required_signal_fields, 
     get_signal_metadata,
     SignalValidationError,
-    SIGNAL_TYPES
+    SIGNAL_TYPES,
+    POSE_DTYPE,
+    SignalDataValidator,
+    classify_signal_data,
+    validate_signal_data,
+    make_pose_record,
+    make_xy_array,
 )
 
 
@@ -139,5 +147,71 @@ class TestSignalValidation:
         assert result == {}
 
 
+
+class TestSignalDataContract:
+    """
+    Test suite for the signal data contract and the runtime data validator.
+    """
+    
+    def test_classify_contract_payloads(self):
+        """
+        Test that each contract payload is recognized.
+        """
+        assert classify_signal_data(1.5) == "scalar"
+        assert classify_signal_data(np.float32(1.5)) == "scalar"
+        assert classify_signal_data(make_xy_array([0.0, 1.0], [2.0, 3.0])) == "xy_array"
+        assert classify_signal_data(make_pose_record(1.0, 2.0, 90.0)) == "pose"
+        assert classify_signal_data(np.zeros(4, dtype=POSE_DTYPE)) == "pose"
+    
+    def test_classify_slow_types(self):
+        """
+        Test that frames, dicts and non-contiguous or non-float64 arrays are not contract payloads.
+        """
+        assert classify_signal_data(pl.DataFrame({"data_value": [1.0]})) is None
+        assert classify_signal_data({"x": [1.0], "y": [2.0]}) is None
+        assert classify_signal_data(np.zeros((3, 2), dtype=np.float32)) is None
+        assert classify_signal_data(np.zeros((3, 3))[:, :2]) is None
+    
+    def test_validate_signal_data(self):
+        """
+        Test that data is checked against the payloads allowed for the signal type.
+        """
+        assert validate_signal_data("speed", 3.0, "temporal", "test_plugin") == "scalar"
+        assert validate_signal_data("speed", None, "temporal", "test_plugin") == "none"
+        
+        with pytest.raises(SignalValidationError):
+            validate_signal_data("pose", 3.0, "spatial", "test_plugin")
+        with pytest.raises(SignalValidationError):
+            validate_signal_data("speed", pl.DataFrame({"data_value": [1.0]}), "temporal", "test_plugin")
+    
+    def test_validator_warn_mode_records_violations_once(self):
+        """
+        Test that warn mode records a slow signal once and counts repeated occurrences.
+        """
+        validator = SignalDataValidator(mode="warn")
+        slow_value = pl.DataFrame({"data_value": [1.0]})
+        
+        assert validator.check("speed", slow_value, "temporal", "test_plugin") is False
+        assert validator.check("speed", slow_value, "temporal", "test_plugin") is False
+        assert validator.check("steering", 0.5, "temporal", "test_plugin") is True
+        
+        report = validator.report()
+        assert list(report) == ["speed"]
+        assert report["speed"]["count"] == 2
+        assert report["speed"]["data_type"] == "polars.dataframe.frame.DataFrame"
+    
+    def test_validator_modes(self):
+        """
+        Test strict and off modes and rejection of unknown modes.
+        """
+        with pytest.raises(SignalValidationError):
+            SignalDataValidator(mode="strict").check("speed", [1.0], "temporal", "test_plugin")
+        
+        assert SignalDataValidator(mode="off").check("speed", [1.0], "temporal", "test_plugin") is True
+        
+        with pytest.raises(ValueError):
+            SignalDataValidator(mode="loud")
+
+
 if __name__ == "__main__":
     pytest.main(['-xvs', __file__])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the hot-path tracing subsystem and its Chrome trace export.
+"""
+
+import json
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core import tracing
+from core.plot_manager import PlotManager
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    """Leave tracing disabled and empty after each test."""
+    yield
+    tracing.disable_tracing()
+    tracing.clear()
+
+
+class TestTracing:
+    """Test suite for spans, the ring buffer and the export."""
+
+    def test_disabled_records_nothing(self):
+        """Test that disabled spans are the shared no-op span and record nothing."""
+        assert tracing.span("a") is tracing.span("b")
+        with tracing.span("request_data", "frame"):
+            tracing.instant("no data")
+        assert tracing.get_events() == []
+
+    def test_spans_and_instants(self):
+        """Test that spans record their duration, category, args and errors."""
+        tracing.enable_tracing()
+        with tracing.span("request_data", "frame", timestamp=5):
+            tracing.instant("no data", "widget", signal="speed")
+        with pytest.raises(ValueError):
+            with tracing.span("plugin:broken", "plugin"):
+                raise ValueError("boom")
+
+        instant, span, failed = tracing.get_events()
+        assert (instant["name"], instant["ph"], instant["args"]) == ("no data", "i", {"signal": "speed"})
+        assert (span["name"], span["cat"], span["ph"], span["args"]) == ("request_data", "frame", "X", {"timestamp": 5})
+        assert span["dur"] >= 0 and span["ts"] <= instant["ts"]
+        assert failed["args"] == {"error": "ValueError"}
+
+    def test_ring_buffer_and_decorator(self):
+        """Test that the ring buffer keeps the newest events and traced() wraps calls."""
+        tracing.enable_tracing(capacity=3)
+
+        @tracing.traced(category="loader")
+        def load(i):
+            return i * 2
+
+        assert [load(i) for i in range(5)] == [0, 2, 4, 6, 8]
+        events = tracing.get_events()
+        assert len(events) == 3
+        assert events[0]["name"].endswith("load")
+
+    def test_export_chrome_trace(self, tmp_path):
+        """Test that the export is valid Chrome trace JSON."""
+        tracing.enable_tracing()
+        with tracing.span("slider", "ui", value=object()):
+            pass
+
+        path = tmp_path / "trace.json"
+        assert tracing.export_chrome_trace(str(path)) == 1
+        trace = json.loads(path.read_text())
+        assert trace["traceEvents"][0]["name"] == "slider"
+        assert isinstance(trace["traceEvents"][0]["args"]["value"], str)
+
+    def test_request_data_spans(self):
+        """Test that PlotManager.request_data traces the frame, plugin calls and widget updates."""
+        with patch('core.plot_manager.TemporalPlotWidget_pg'), \
+             patch('core.plot_manager.SpatialPlotWidget'):
+            plot_manager = PlotManager()
+
+        plugin = MagicMock()
+        plugin.signals = {"speed": {"func": lambda t: 1.0, "type": "temporal"}}
+        plugin.get_data_for_timestamp.return_value = 1.0
+        plot_manager.register_plugin("CarStatePlugin", plugin)
+        plot_manager.signals["speed"] = [plot_manager.temporal_plot_widget]
+
+        tracing.enable_tracing()
+        plot_manager.request_data(100)
+
+        names = [event["name"] for event in tracing.get_events()]
+        assert names == ["plugin:CarStatePlugin", "widget:temporal", "request_data"]
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the SQLite trip catalog (core/trip_catalog.py) and the trip picker.
+"""
+
+import os
+import shutil
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from core.trip_catalog import TripCatalog, find_trip_folders, index_trip
+
+START_S = 1726037730.0
+
+
+def write_trip(trip_dir, duration_s, mode, x_offset, rate_hz=10.0):
+    """Write a trip with a driving mode log and a car pose route along x."""
+    trip_dir.mkdir(parents=True)
+    t = START_S + np.arange(0.0, duration_s, 1.0 / rate_hz)
+    (trip_dir / "driving_mode.csv").write_text(
+        "time_stamp,data_value\n" + "".join(f"{ti:.3f},{mode:.1f}\n" for ti in t))
+    (trip_dir / "car_pose.csv").write_text(
+        "timestamp_seconds,car_pose_front_axle_x_meters,car_pose_front_axle_y_meters,car_pose_yaw_degrees\n"
+        + "".join(f"{ti:.3f},{x_offset + (ti - START_S):.3f},0.0,0.0\n" for ti in t))
+    return str(trip_dir) + os.sep
+
+
+@pytest.fixture
+def trips_root(tmp_path):
+    """A root with a long autonomous trip, a short manual one and a nested long manual one."""
+    root = tmp_path / "trips"
+    write_trip(root / "long_auto", 700.0, 1, x_offset=0.0)
+    write_trip(root / "short_manual", 60.0, 0, x_offset=5000.0)
+    write_trip(root / "fleet" / "long_manual", 650.0, 0, x_offset=0.0)
+    return str(root)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """An empty catalog."""
+    catalog = TripCatalog(str(tmp_path / "catalog.sqlite"))
+    yield catalog
+    catalog.close()
+
+
+class TestTripCatalog:
+    """Test suite for trip indexing and catalog queries."""
+
+    def test_find_trip_folders(self, trips_root):
+        """Nested trip folders are found."""
+        names = [os.path.basename(os.path.normpath(p)) for p in find_trip_folders(trips_root)]
+        assert names == ["long_manual", "long_auto", "short_manual"]
+
+    def test_index_trip(self, trips_root):
+        """The record holds the extent, row counts, signals, driving modes and route."""
+        record = index_trip(os.path.join(trips_root, "long_auto") + os.sep)
+        assert record["start_ms"] == pytest.approx(START_S * 1000.0)
+        assert record["duration_s"] == pytest.approx(699.9, abs=1e-3)
+        rows = {file_name: num_rows for file_name, _, _, num_rows in record["files"]}
+        assert rows == {"car_pose.csv": 7000, "driving_mode.csv": 7000}
+        assert "driving_mode.data_value" in record["signals"]
+        assert record["driving_modes"] == {1.0: pytest.approx(699.9, abs=1e-3)}
+        assert record["distance_m"] == pytest.approx(699.9, abs=1e-2)
+        assert (record["min_x"], record["max_x"]) == (0.0, pytest.approx(699.9))
+
+    def test_queries(self, trips_root, catalog):
+        """Filters on duration, driving mode, route bounding box and signals combine."""
+        counts = catalog.refresh(trips_root, max_workers=2)
+        assert counts == {"indexed": 3, "unchanged": 0, "removed": 0, "failed": 0}
+
+        def names(**filters):
+            return sorted(trip["name"] for trip in catalog.query(**filters))
+
+        assert names(min_duration_s=600) == ["long_auto", "long_manual"]
+        assert names(min_duration_s=600, driving_mode=1) == ["long_auto"]
+        assert names(bbox=(4000.0, -10.0, 6000.0, 10.0)) == ["short_manual"]
+        assert names(signals=["car_pose.car_pose_yaw_degrees"], name="long") == ["long_auto", "long_manual"]
+        assert names(root=os.path.join(trips_root, "fleet")) == ["long_manual"]
+
+    def test_incremental_refresh(self, trips_root, catalog):
+        """Only changed trips are re-indexed; deleted trips are removed."""
+        catalog.refresh(trips_root)
+        assert catalog.refresh(trips_root)["unchanged"] == 3
+
+        shutil.rmtree(os.path.join(trips_root, "short_manual"))
+        mode_file = os.path.join(trips_root, "long_auto", "driving_mode.csv")
+        with open(mode_file, "a") as f:
+            f.write(f"{START_S + 800.0:.3f},2.0\n")
+
+        counts = catalog.refresh(trips_root)
+        assert counts == {"indexed": 1, "unchanged": 1, "removed": 1, "failed": 0}
+        trip = catalog.get_trip(os.path.join(trips_root, "long_auto") + os.sep)
+        assert trip["driving_modes"][1.0] == pytest.approx(800.0, abs=1e-3)
+        assert catalog.get_trip(os.path.join(trips_root, "short_manual") + os.sep) is None
+
+    def test_catalog_version_rebuild(self, trips_root, tmp_path):
+        """A catalog of another version is rebuilt instead of being read."""
+        path = str(tmp_path / "old.sqlite")
+        catalog = TripCatalog(path)
+        catalog.refresh(trips_root)
+        catalog.connection.execute("PRAGMA user_version = 0")
+        catalog.close()
+
+        catalog = TripCatalog(path)
+        assert catalog.query() == []
+        catalog.close()
+
+
+class TestTripPicker:
+    """Test suite for the catalog-backed trip picker dialog."""
+
+    def test_picker_filters_indexed_trips(self, trips_root):
+        """The background indexer fills the catalog; filters narrow the shown trips."""
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        from gui.trip_picker import TripPickerDialog
+
+        dialog = TripPickerDialog(trips_root)
+        dialog.indexer.wait()
+        app.processEvents()
+        assert dialog.table.rowCount() == 3
+
+        dialog.min_duration.setValue(10.0)
+        dialog.driving_mode.setCurrentText("1")
+        dialog.update_results()
+        assert dialog.table.rowCount() == 1
+        dialog.table.selectRow(0)
+        dialog.accept()
+        assert dialog.selected_path == os.path.join(trips_root, "long_auto") + os.sep
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
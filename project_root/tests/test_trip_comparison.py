@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""
+Tests for A/B trip comparison: trip B plugin wrapping, time alignment, concurrent loading
+and the vectorized difference signals.
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+
+app = QApplication.instance()
+if not app:
+    app = QApplication([])
+
+from core.plot_manager import PlotManager
+from core.trip_comparison import (ComparisonPlugin, base_signal_name, comparison_name, diff_name,
+                                  is_comparison_signal, trip_start_ms)
+
+PLUGIN_SOURCE = '''
+import os
+import numpy as np
+
+
+class TripPlugin:
+    """Speed ramp starting at the time stored in the trip folder: speed = gain * seconds since start."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(os.path.join(file_path, "trip.txt")) as f:
+            start, gain = (float(v) for v in f.read().split())
+        self.t = start + np.arange(0, 10000.0, 100.0)
+        self.v = gain * (self.t - start) / 1000.0
+        self.signals = {
+            "timestamps": {"func": lambda: self.t, "type": "temporal"},
+            "speed": {"func": abs, "type": "temporal", "series": lambda: (self.t, self.v)},
+        }
+
+    def has_signal(self, signal):
+        return signal in self.signals
+
+    def get_data_for_timestamp(self, signal, timestamp):
+        idx = np.searchsorted(self.t, timestamp, side="right") - 1
+        return None if idx < 0 else float(self.v[idx])
+
+
+plugin_class = TripPlugin
+'''
+
+
+@pytest.fixture
+def comparison_setup(tmp_path):
+    """A plugin directory and two trips starting at different times with different speed ramps."""
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    (plugin_dir / "trip_plugin.py").write_text(PLUGIN_SOURCE)
+
+    trips = {}
+    for name, start, gain in (("a", 1_000_000.0, 1.0), ("b", 5_000_000.0, 3.0)):
+        trip = tmp_path / name
+        trip.mkdir()
+        (trip / "trip.txt").write_text(f"{start} {gain}")
+        trips[name] = str(trip) + "/"
+    return str(plugin_dir), trips
+
+
+class TestTripComparison:
+    """Test suite for comparison mode."""
+
+    def test_signal_names(self):
+        """Suffixes identify trip B and difference signals."""
+        assert comparison_name("speed") == "speed [B]"
+        assert is_comparison_signal("speed [B]")
+        assert not is_comparison_signal(diff_name("speed"))
+        assert base_signal_name("speed [B]") == base_signal_name("speed [A-B]") == "speed"
+
+    def test_comparison_plugin_shifts_time(self):
+        """Requests and series of trip B are moved onto the trip A time base."""
+        from types import SimpleNamespace
+        t = np.array([0.0, 100.0, 200.0])
+        inner = SimpleNamespace(
+            file_path="/trip_b/",
+            signals={"speed": {"func": abs, "type": "temporal", "series": lambda: (t + 1000.0, t)}},
+            get_data_for_timestamp=lambda signal, timestamp: timestamp,
+            get_data_for_timestamps=lambda signal, timestamps: timestamps,
+        )
+        plugin = ComparisonPlugin(inner, offset_ms=1000.0)
+
+        assert plugin.has_signal("speed [B]")
+        assert plugin.signals["speed [B]"]["trip"] == "B"
+        assert plugin.get_data_for_timestamp("speed [B]", 50.0) == 1050.0
+        assert list(plugin.get_data_for_timestamps("speed [B]", [0.0, 10.0])) == [1000.0, 1010.0]
+        timestamps, values = plugin.signals["speed [B]"]["series"]()
+        assert list(timestamps) == list(t)
+
+    def test_load_and_align_trips(self, comparison_setup):
+        """Both trips load into separate instances, aligned at their start plus the offset."""
+        plugin_dir, trips = comparison_setup
+        plot_manager = PlotManager()
+        offset_ms = plot_manager.load_comparison_plugins_from_directory(plugin_dir, trips["a"], trips["b"],
+                                                                        time_offset_s=2.0)
+
+        assert offset_ms == 5_000_000.0 - 1_000_000.0 + 2000.0
+        assert set(plot_manager.plugins) == {"trip_plugin", "trip_plugin [B]"}
+        assert "speed [B]" in plot_manager.signal_plugins
+        assert trip_start_ms({"a": plot_manager.plugins["trip_plugin"]}) == 1_000_000.0
+
+        # 3 s into trip A is 5 s into trip B (start alignment + 2 s)
+        assert plot_manager.plugins["trip_plugin"].get_data_for_timestamp("speed", 1_003_000.0) == 3.0
+        assert plot_manager.plugins["trip_plugin [B]"].get_data_for_timestamp("speed [B]", 1_003_000.0) == 15.0
+
+    def test_diff_signals(self, comparison_setup):
+        """A - B is evaluated over the aligned timeline of trip A."""
+        plugin_dir, trips = comparison_setup
+        plot_manager = PlotManager()
+        plot_manager.load_comparison_plugins_from_directory(plugin_dir, trips["a"], trips["b"])
+
+        assert plot_manager.register_comparison_diff_signals() == ["speed [A-B]"]
+        engine = plot_manager.plugins["DerivedSignals"]
+        timestamps, values = engine.signals["speed [A-B]"]["series"]()
+        assert timestamps[0] == 1_000_000.0
+        assert np.allclose(values, -2.0 * (timestamps - 1_000_000.0) / 1000.0)
+
+    def test_overlay_on_trip_a_plots(self, comparison_setup):
+        """Trip B lines share the plots and color of their trip A signal, dashed."""
+        plugin_dir, trips = comparison_setup
+        plot_manager = PlotManager()
+        plot_manager.load_comparison_plugins_from_directory(plugin_dir, trips["a"], trips["b"])
+        plot_manager.register_plot("speed")
+        plot_manager.register_plot("speed [B]")
+
+        widget = plot_manager.temporal_plot_widget
+        assert list(widget.plot_lines["speed [B]"]) == list(widget.plot_lines["speed"])
+        line_a = widget.plot_lines["speed"]["plot1"]
+        line_b = widget.plot_lines["speed [B]"]["plot1"]
+        assert line_b.opts["pen"].color() == line_a.opts["pen"].color()
+        assert line_b.opts["pen"].style() == Qt.DashLine
+
+
+if __name__ == "__main__":
+    pytest.main(['-xvs', __file__])
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+
+"""
+Batch analysis runner.
+
+Walks a trips root, runs per-trip analyses (signal statistics, tracking KPIs over the
+derived error signals, ...) on a process pool and writes all results into one columnar
+table with the columns trip, analysis, signal, metric and value.
+
+- Memory budget: each trip gets an estimated peak memory from the size of its CSV files.
+  A trip is only started when its estimate fits into the budget next to the trips in
+  flight (one trip always runs, even if it exceeds the budget alone).
+- Checkpoints: the results of each trip are written to <checkpoint dir>/<trip key>.parquet
+  as soon as the trip is done, with the analyses and the trip signature (the names, sizes
+  and modification times of its CSV files) in the parquet metadata. An interrupted run
+  started again skips the trips whose checkpoint matches both; trips that changed, trips
+  checkpointed for other analyses and failed trips (they have none) are analysed again.
+- Workers are recycled after WORKER_MAX_TASKS trips so memory fragmentation from many
+  loaded trips does not accumulate.
+
+Analyses run headless on the plugins and the derived signals of core (no Qt), or on the
+trip's data classes (path_regression runs the PathRegressor on the planned paths). New
+analyses are functions taking a TripSignals and returning rows; register them in ANALYSES.
+
+Usage:
+    python tools/batch_runner.py --root /data/trips --out results.parquet \\
+        [--analyses signal_statistics,tracking_kpis,path_regression] [--workers 8] [--memory-budget 16GB] [--no-resume]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import polars as pl
+
+# Add project root and tools to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.trip_catalog import find_trip_folders, trip_signature
+from query import load_plugins_for_signals, write_table
+
+logger = logging.getLogger(__name__)
+
+# Columns of the result table
+RESULT_SCHEMA = {"trip": pl.Utf8, "analysis": pl.Utf8, "signal": pl.Utf8, "metric": pl.Utf8, "value": pl.Float64}
+
+# Estimated peak memory of a trip: a fixed worker overhead (interpreter, numpy/polars/pandas)
+# plus a multiple of the CSV bytes on disk (decoded frames, series copies, derived signals)
+WORKER_BASE_MEMORY = 400 * 2**20
+MEMORY_PER_CSV_BYTE = 6
+
+# Trips processed by a worker process before it is replaced
+WORKER_MAX_TASKS = 25
+
+# Planned paths of a trip and the look-ahead times of the path_regression analysis [s]
+PATH_TRAJECTORY_FILE = "path_trajectory.csv"
+PATH_REGRESSION_DELTA_T_SEC = (0.5, 1.0, 2.0)
+
+# Parquet metadata key of the checkpoint description (analyses and trip signature)
+CHECKPOINT_METADATA_KEY = "batch_runner"
+
+
+class TripSignals:
+    """
+    Headless signal access for one trip: the plugins providing the analysed signals,
+    registered in a SignalRegistry together with the default derived signals.
+
+    Attributes:
+        trip_path (str): Trip folder
+        registry (SignalRegistry): Registry of the loaded and derived signals
+    """
+
+    def __init__(self, trip_path, signals):
+        from core.signal_registry import SignalRegistry
+        from core.signal_validation import SignalValidationError
+        from core.derived_signals import DEFAULT_DERIVED_SIGNALS
+
+        self.trip_path = trip_path
+        self.registry = SignalRegistry()
+
+        providers = load_plugins_for_signals(trip_path, signals, strict=False)
+        for plugin in {id(p): p for p in providers.values()}.values():
+            for signal, signal_info in plugin.signals.items():
+                try:
+                    self.registry.register_signal(signal, signal_info, type(plugin).__name__)
+                except SignalValidationError as e:
+                    logger.warning(f"{trip_path}: {e}")
+
+        for signal, definition in DEFAULT_DERIVED_SIGNALS.items():
+            options = dict(definition)
+            inputs, func = options.pop("inputs"), options.pop("func")
+            if all(callable(self.registry.signals.get(name, {}).get("series")) for name in inputs):
+                self.registry.register_derived_signal(signal, inputs, func, **options)
+
+    def has_series(self, signal):
+        """Check whether a signal is available with its full series."""
+        return callable(self.registry.signals.get(signal, {}).get("series"))
+
+    def series(self, signal):
+        """Get the full series of a signal as float64 arrays (timestamps in ms, values)."""
+        timestamps, values = self.registry.signals[signal]["series"]()
+        return np.asarray(timestamps, dtype=np.float64), np.asarray(values, dtype=np.float64)
+
+
+def signal_statistics(trip):
+    """Sample count, rate, duration and value statistics of the analysed signals."""
+    from core.config import temporal_signals
+
+    rows = []
+    for signal in temporal_signals:
+        if not trip.has_series(signal):
+            continue
+        timestamps, values = trip.series(signal)
+        finite = values[np.isfinite(values)]
+        statistics = trip.registry.get_signal_statistics(signal)
+        metrics = {
+            "count": float(len(values)),
+            "sample_rate_hz": statistics.sample_rate_hz if statistics is not None else None,
+            "duration_s": (timestamps[-1] - timestamps[0]) / 1000.0 if len(timestamps) else None,
+            "mean": float(finite.mean()) if len(finite) else None,
+            "std": float(finite.std()) if len(finite) else None,
+            "min": float(finite.min()) if len(finite) else None,
+            "max": float(finite.max()) if len(finite) else None,
+        }
+        rows.extend((signal, metric, value) for metric, value in metrics.items())
+    return rows
+
+
+def tracking_kpis(trip):
+    """Tracking error KPIs of the speed and steering controllers (derived error signals)."""
+    rows = []
+    for signal in ("speed_error", "steering_error"):
+        if not trip.has_series(signal):
+            continue
+        _, values = trip.series(signal)
+        error = np.abs(values[np.isfinite(values)])
+        if len(error) == 0:
+            continue
+        rows.extend([
+            (signal, "rms", float(np.sqrt(np.mean(error ** 2)))),
+            (signal, "mean_abs", float(error.mean())),
+            (signal, "p95_abs", float(np.percentile(error, 95))),
+            (signal, "max_abs", float(error.max())),
+        ])
+    return rows
+
+
+def path_regression(trip):
+    """
+    Kinematic KPIs of the planned paths and the look-ahead errors of the PathRegressor.
+
+    The kinematic KPIs (PathRegressor.evaluate_kpi) are rows of the signal "planned_path"; the
+    look-ahead errors of every delta_t_sec of PATH_REGRESSION_DELTA_T_SEC (see
+    PathRegressor.sweep) are rows of the signal "path_lookahead_<delta_t_sec>s".
+    """
+    from data_classes.PathRegressor import PathRegressor
+    from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+
+    path_file = os.path.join(trip.trip_path, PATH_TRAJECTORY_FILE)
+    if not os.path.exists(path_file):
+        return []
+    # No result cache: the batch checkpoints already keep the results per trip
+    trip_name = os.path.basename(os.path.normpath(trip.trip_path))
+    regressor = PathRegressor(PathTrajectoryPolars(path_file), trip_name=trip_name, CACHE_DIR=None)
+    rows = [("planned_path", metric, float(value)) for metric, value in regressor.evaluate_kpi().items()]
+
+    _, df_kpis = regressor.sweep({"delta_t_sec": list(PATH_REGRESSION_DELTA_T_SEC)})
+    for _, kpis in df_kpis.iterrows():
+        signal = f"path_lookahead_{kpis['delta_t_sec']:g}s"
+        rows.extend((signal, metric, float(kpis[metric]))
+                    for metric in ("num_paths", "lookahead_error_mean_m", "lookahead_error_p95_m", "lookahead_error_max_m"))
+    return rows
+
+
+# Registered analyses: name -> function(TripSignals) -> [(signal, metric, value), ...]
+ANALYSES = {
+    "signal_statistics": signal_statistics,
+    "tracking_kpis": tracking_kpis,
+    "path_regression": path_regression,
+}
+
+
+def analysis_signals():
+    """Signals loaded for every trip: the configured temporal signals."""
+    from core.config import temporal_signals
+    return list(temporal_signals)
+
+
+def find_trips(root):
+    """
+    Find the trip folders below a root (see core.trip_catalog.find_trip_folders) and key them.
+
+    Returns:
+        list: (trip key, trip path) sorted by key; the key is the path relative to the root
+    """
+    root = os.path.abspath(os.path.expanduser(root))
+    trips = []
+    for trip_path in find_trip_folders(root):
+        relative = os.path.relpath(trip_path, root)
+        key = os.path.basename(root) if relative == "." else relative.replace(os.sep, "__")
+        trips.append((key, trip_path))
+    return sorted(trips)
+
+
+def estimate_trip_memory(trip_path):
+    """Estimate the peak memory of analysing a trip, in bytes."""
+    csv_bytes = sum(entry.stat().st_size for entry in os.scandir(trip_path)
+                    if entry.is_file() and entry.name.endswith(".csv"))
+    return WORKER_BASE_MEMORY + MEMORY_PER_CSV_BYTE * csv_bytes
+
+
+def parse_memory(text):
+    """Parse a memory size such as "16GB", "512MB" or a number of bytes."""
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([kmgt]?)i?b?\s*", text.lower())
+    if not match:
+        raise ValueError(f"Invalid memory size '{text}'. Expected e.g. '16GB' or '512MB'.")
+    return int(float(match.group(1)) * 1024 ** " kmgt".index(match.group(2) or " "))
+
+
+def checkpoint_path(checkpoint_dir, trip_key):
+    return os.path.join(checkpoint_dir, f"{trip_key}.parquet")
+
+
+def checkpoint_metadata(trip_path, analyses):
+    """Description of a checkpoint: the analyses that produced it and the signature of the trip."""
+    return {"analyses": sorted(analyses), "trip_signature": trip_signature(trip_path)}
+
+
+def checkpoint_is_current(checkpoint_dir, trip_key, trip_path, analyses):
+    """Check whether a trip has a checkpoint of the same analyses over the unchanged trip."""
+    path = checkpoint_path(checkpoint_dir, trip_key)
+    if not os.path.exists(path):
+        return False
+    try:
+        stored = pl.read_parquet_metadata(path).get(CHECKPOINT_METADATA_KEY)
+        return stored is not None and json.loads(stored) == checkpoint_metadata(trip_path, analyses)
+    except (OSError, ValueError, pl.exceptions.PolarsError):
+        return False  # Damaged checkpoint, analysed again
+
+
+def analyze_trip(trip_key, trip_path, analyses, checkpoint_dir):
+    """
+    Run the analyses of one trip and write its checkpoint.
+
+    Returns:
+        tuple: (trip key, number of result rows, seconds, error message or None)
+    """
+    start = time.perf_counter()
+    try:
+        # Taken before loading, so a trip modified during the analysis is analysed again next time
+        metadata = checkpoint_metadata(trip_path, analyses)
+        trip = TripSignals(trip_path, analysis_signals())
+        rows = []
+        for name in analyses:
+            rows.extend((trip_key, name, signal, metric, value) for signal, metric, value in ANALYSES[name](trip))
+        df = pl.DataFrame(rows, schema=RESULT_SCHEMA, orient="row")
+    except Exception as e:
+        return trip_key, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+    # Write-then-rename, so an interrupted write never leaves a checkpoint behind
+    path = checkpoint_path(checkpoint_dir, trip_key)
+    df.write_parquet(path + ".tmp", metadata={CHECKPOINT_METADATA_KEY: json.dumps(metadata)})
+    os.replace(path + ".tmp", path)
+    return trip_key, df.height, time.perf_counter() - start, None
+
+
+def _init_worker():
+    # Plugins print loading messages; keep the runner's progress output readable. Runs once
+    # per worker process, whose streams are closed when it exits
+    sys.stdout = open(os.devnull, "w")
+
+
+def _analyze_trip_worker(args):
+    return analyze_trip(*args)
+
+
+def run_batch(root, checkpoint_dir, analyses=None, workers=None, memory_budget=None, resume=True):
+    """
+    Analyse all trips below a root, writing one checkpoint per trip.
+
+    Args:
+        root (str): Trips root
+        checkpoint_dir (str): Directory for the per-trip checkpoints
+        analyses (list): Names of the analyses to run (default: all of ANALYSES)
+        workers (int): Worker processes (default: all cores); 1 runs in this process
+        memory_budget (int): Memory budget in bytes for the trips in flight (default: unbounded)
+        resume (bool): Skip trips with a checkpoint of the same analyses over the unchanged trip
+
+    Returns:
+        dict: {trip key: error message} of the failed trips
+    """
+    analyses = list(analyses or ANALYSES)
+    unknown = [name for name in analyses if name not in ANALYSES]
+    if unknown:
+        raise ValueError(f"Unknown analyses {unknown}. Available: {list(ANALYSES)}")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    trips = find_trips(root)
+    pending = [(key, path) for key, path in trips
+               if not (resume and checkpoint_is_current(checkpoint_dir, key, path, analyses))]
+    print(f"{len(trips)} trips, {len(trips) - len(pending)} already done, {len(pending)} to analyse", file=sys.stderr)
+
+    failures = {}
+
+    def report(result, done):
+        key, rows, seconds, error = result
+        if error is None:
+            print(f"[{done}/{len(pending)}] {key}: {rows} rows in {seconds:.1f}s", file=sys.stderr)
+        else:
+            failures[key] = error
+            print(f"\033[91m[{done}/{len(pending)}] {key} failed: {error}\033[0m", file=sys.stderr)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pending) <= 1:
+        for done, (key, path) in enumerate(pending, 1):
+            report(analyze_trip(key, path, analyses, checkpoint_dir), done)
+        return failures
+
+    queue = deque((key, path, estimate_trip_memory(path)) for key, path in pending)
+    budget = memory_budget or float("inf")
+    in_flight = {}  # future -> estimated memory
+    used = 0
+    done = 0
+    # Spawned workers start clean; replacing them bounds the memory they accumulate
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             max_tasks_per_child=WORKER_MAX_TASKS, initializer=_init_worker) as pool:
+        while queue or in_flight:
+            while queue and len(in_flight) < workers and (not in_flight or used + queue[0][2] <= budget):
+                key, path, estimate = queue.popleft()
+                future = pool.submit(_analyze_trip_worker, (key, path, analyses, checkpoint_dir))
+                in_flight[future] = estimate
+                used += estimate
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                used -= in_flight.pop(future)
+                done += 1
+                report(future.result(), done)
+    return failures
+
+
+def merge_checkpoints(checkpoint_dir, output_path, trip_keys=None):
+    """
+    Merge per-trip checkpoints into one table.
+
+    Args:
+        checkpoint_dir (str): Directory with the checkpoints
+        output_path (str): Output .parquet or .csv file
+        trip_keys (list): Trips to include (default: every checkpoint)
+
+    Returns:
+        pl.DataFrame: The merged table
+    """
+    if trip_keys is None:
+        files = sorted(f for f in os.listdir(checkpoint_dir) if f.endswith(".parquet"))
+    else:
+        files = [f"{key}.parquet" for key in sorted(trip_keys)
+                 if os.path.exists(checkpoint_path(checkpoint_dir, key))]
+    tables = [pl.read_parquet(os.path.join(checkpoint_dir, f)) for f in files]
+    df = pl.concat(tables) if tables else pl.DataFrame(schema=RESULT_SCHEMA)
+    write_table(df, output_path)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run per-trip analyses over a trips root into one table.")
+    parser.add_argument("--root", required=True, help="Trips root directory")
+    parser.add_argument("--out", required=True, help="Output table (.parquet or .csv)")
+    parser.add_argument("--analyses", default=None, help=f"Comma-separated analyses (default: all of {list(ANALYSES)})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--memory-budget", type=parse_memory, default=None, help="Memory budget, e.g. 16GB")
+    parser.add_argument("--checkpoint-dir", default=None, help="Checkpoint directory (default: <out>.checkpoints)")
+    parser.add_argument("--no-resume", action="store_true", help="Re-analyse trips that have a checkpoint")
+    args = parser.parse_args()
+
+    checkpoints = args.checkpoint_dir or os.path.splitext(args.out)[0] + ".checkpoints"
+    selected = args.analyses.split(",") if args.analyses else None
+    start = time.perf_counter()
+    failed = run_batch(args.root, checkpoints, selected, args.workers, args.memory_budget, resume=not args.no_resume)
+    merged = merge_checkpoints(checkpoints, args.out, [key for key, _ in find_trips(args.root)])
+    print(f"Wrote {merged.height} rows for {merged['trip'].n_unique()} trips to {args.out} "
+          f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    if failed:
+        with open(os.path.join(checkpoints, "failures.json"), "w") as f:
+            json.dump(failed, f, indent=2)
+        print(f"\033[93m{len(failed)} trips failed, see {os.path.join(checkpoints, 'failures.json')}\033[0m", file=sys.stderr)
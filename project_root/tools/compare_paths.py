@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Headless path comparison of two trips.
+
+Compares the planned paths of trip B with those of the reference trip A cycle by cycle
+(Hausdorff, discrete Frechet and mean lateral deviation, see
+utils/path_analysis/path_comparison.py), prints the worst moments and optionally writes
+the per-cycle divergence table (Parquet or CSV). Trips are aligned at their first planning
+cycle, like the comparison mode of the player, plus an optional offset.
+
+Usage:
+    python tools/compare_paths.py --trip-a 2024-09-11T15_55_30/ --trip-b other_trip/ \\
+        [--offset 0.0] [--metric frechet_m] [--top 10] [--workers 4] [--out divergence.parquet]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+from data_classes.PathTrajectory_polars import PathTrajectoryPolars
+from utils.path_analysis.path_comparison import METRIC_COLUMNS, compare_trips, worst_cycles
+
+logger = logging.getLogger(__name__)
+
+PATH_FILE = "path_trajectory.csv"
+
+
+def load_path_trajectory(trip):
+    """Load the path data of a trip folder (or of a path_trajectory.csv file)."""
+    file_path = trip if trip.endswith(".csv") else os.path.join(trip, PATH_FILE)
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"No {PATH_FILE} found for trip {trip}")
+    return PathTrajectoryPolars(file_path)
+
+
+def compare(trip_a, trip_b, offset_s=0.0, tolerance_ms=None, workers=1):
+    """
+    Compare the planned paths of two trips.
+
+    Parameters:
+    trip_a (str): Reference trip folder.
+    trip_b (str): Compared trip folder.
+    offset_s (float): Additional shift of trip B [s]: trip A time t is compared with trip B
+        at its start + t + offset_s.
+    tolerance_ms (float): Largest time difference of compared cycles (default: half a cycle).
+    workers (int): Worker processes.
+
+    Returns:
+    pd.DataFrame: The per-cycle divergence table of compare_trips.
+    """
+    path_a, path_b = load_path_trajectory(trip_a), load_path_trajectory(trip_b)
+    start_a = float(np.min(np.asarray(path_a.get_timestamps_ms(), dtype=np.float64)))
+    start_b = float(np.min(np.asarray(path_b.get_timestamps_ms(), dtype=np.float64)))
+    offset_ms = start_b - start_a + offset_s * 1000.0
+    return compare_trips(path_a, path_b, offset_ms=offset_ms, tolerance_ms=tolerance_ms, max_workers=workers)
+
+
+def print_worst(df_divergence, metric, top):
+    """Print the cycles with the largest divergence."""
+    if df_divergence.empty:
+        print("No corresponding planning cycles found.")
+        return
+    start_ms = df_divergence["timestamp"].min()
+    print(f"Worst {top} of {len(df_divergence)} cycles by {metric}:")
+    print(f"{'time [s]':>10} {'timestamp':>26} " + " ".join(f"{column:>25}" for column in METRIC_COLUMNS))
+    for _, row in worst_cycles(df_divergence, metric, top).iterrows():
+        timestamp = datetime.datetime.fromtimestamp(row["timestamp"] / 1000.0).isoformat(timespec="milliseconds")
+        print(f"{(row['timestamp'] - start_ms) / 1000.0:10.2f} {timestamp:>26} "
+              + " ".join(f"{row[column]:25.3f}" for column in METRIC_COLUMNS))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the planned paths of two trips cycle by cycle")
+    parser.add_argument("--trip-a", required=True, help="Reference trip folder")
+    parser.add_argument("--trip-b", required=True, help="Compared trip folder")
+    parser.add_argument("--offset", type=float, default=0.0, help="Additional shift of trip B [s]")
+    parser.add_argument("--tolerance-ms", type=float, default=None,
+                        help="Largest time difference of compared cycles [ms] (default: half a cycle)")
+    parser.add_argument("--metric", choices=METRIC_COLUMNS, default="frechet_m", help="Metric to rank cycles by")
+    parser.add_argument("--top", type=int, default=10, help="Number of worst cycles to print")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--out", default=None, help="Output file for the divergence table (.parquet or .csv)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    start = time.perf_counter()
+    df_divergence = compare(args.trip_a, args.trip_b, args.offset, args.tolerance_ms, args.workers)
+    logger.info(f"Compared {len(df_divergence)} cycles in {time.perf_counter() - start:.2f} s")
+    print_worst(df_divergence, args.metric, args.top)
+
+    if args.out:
+        table = pl.from_pandas(df_divergence)
+        if args.out.endswith(".csv"):
+            table.write_csv(args.out)
+        else:
+            table.write_parquet(args.out)
+        logger.info(f"Wrote {args.out}")
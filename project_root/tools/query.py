@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+"""
+Headless signal query.
+
+Samples signals of one or more trips on a common time grid and writes them as a columnar
+table (Parquet or CSV), for CI checks and scripted triage. It does not import Qt and loads
+only the plugins providing the requested signals: plugins that can list their signals
+without loading a trip (PluginBase.discover_signals) are matched first, and plugins with
+data-dependent signals are instantiated only if requested signals are still missing.
+
+Signals are sampled with the batch API (PluginBase.get_data_for_timestamps), i.e. with the
+same lookup as the player, vectorized where the plugin supports it. Values are float64,
+NaN where a signal has no data.
+
+Usage:
+    python tools/query.py --trip 2024-09-11T15_55_30/ [more trips...] \\
+        --signals current_speed,target_speed --start 0 --end 60 --rate 10Hz --out out.parquet
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_DIR = os.path.join(base_path, "plugins")
+
+
+def parse_rate(text):
+    """
+    Parse a sampling rate: "10Hz", "10" (Hz) or "100ms" (period).
+
+    Returns:
+        float: The rate in Hz
+
+    Raises:
+        ValueError: If the text is not a positive rate
+    """
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*(hz|ms|s)?\s*", text.lower())
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid rate '{text}'. Expected e.g. '10Hz', '10' or '100ms'.")
+    value, unit = float(match.group(1)), match.group(2) or "hz"
+    return {"hz": value, "ms": 1000.0 / value, "s": 1.0 / value}[unit]
+
+
+def find_plugin_modules(plugin_dir=PLUGIN_DIR):
+    """List the (module name, path) of the plugin files of a directory, sorted by name."""
+    return [
+        (filename[:-3], os.path.join(plugin_dir, filename))
+        for filename in sorted(os.listdir(plugin_dir))
+        if filename.endswith(".py") and filename != "__init__.py"
+    ]
+
+
+def load_plugin_class(module_name, file_path):
+    """Execute a plugin module and get its `plugin_class`, or None if it does not define one."""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, "plugin_class", None)
+
+
+def load_plugins_for_signals(trip_path, signals, plugin_dir=PLUGIN_DIR, strict=True):
+    """
+    Instantiate the plugins providing the requested signals.
+
+    Args:
+        trip_path (str): Trip folder passed to the plugins as file_path
+        signals (list): Requested signal names
+        plugin_dir (str): Directory with the plugin files
+        strict (bool): Raise if a signal is not provided; otherwise it is left out
+
+    Returns:
+        dict: {signal: plugin instance} for every provided signal
+
+    Raises:
+        KeyError: If strict and no plugin provides some of the signals
+    """
+    remaining = list(dict.fromkeys(signals))
+    providers = {}
+    undeclared = []
+
+    def instantiate(module_name, plugin_class):
+        try:
+            plugin = plugin_class(file_path=trip_path)
+        except Exception as e:
+            logger.warning(f"Could not load plugin '{module_name}' for {trip_path}: {e}")
+            return
+        for signal in [s for s in remaining if plugin.has_signal(s)]:
+            providers[signal] = plugin
+            remaining.remove(signal)
+
+    for module_name, file_path in find_plugin_modules(plugin_dir):
+        plugin_class = load_plugin_class(module_name, file_path)
+        if plugin_class is None:
+            continue
+        declared = plugin_class.discover_signals(trip_path) if hasattr(plugin_class, "discover_signals") else None
+        if declared is None:
+            undeclared.append((module_name, plugin_class))
+        elif any(signal in remaining for signal in declared):
+            instantiate(module_name, plugin_class)
+        if not remaining:
+            return providers
+
+    # Plugins that only know their signals once loaded
+    for module_name, plugin_class in undeclared:
+        instantiate(module_name, plugin_class)
+        if not remaining:
+            return providers
+
+    if strict:
+        raise KeyError(f"No plugin provides the signals {remaining} for trip {trip_path}")
+    return providers
+
+
+def signal_extent(plugin, signal):
+    """Get the (first, last) timestamp in milliseconds of a signal with a full series, or None."""
+    series = plugin.signals.get(signal, {}).get("series")
+    if series is None:
+        return None
+    timestamps, _ = series()
+    if len(timestamps) == 0:
+        return None
+    return float(np.min(timestamps)), float(np.max(timestamps))
+
+
+def time_grid(extents, start_s=None, end_s=None, rate_hz=10.0):
+    """
+    Build the sampling grid of a trip.
+
+    Args:
+        extents (list): (first, last) timestamps in milliseconds of the sampled signals
+        start_s (float): Grid start in seconds from the trip start (the earliest first timestamp)
+        end_s (float): Grid end in seconds from the trip start; None ends at the latest last timestamp
+        rate_hz (float): Sampling rate
+
+    Returns:
+        np.ndarray: Grid timestamps in milliseconds
+
+    Raises:
+        ValueError: If no signal provides its extent
+    """
+    if not extents:
+        raise ValueError("None of the requested signals provides a full series to derive the time range from.")
+    trip_start = min(first for first, _ in extents)
+    trip_end = max(last for _, last in extents)
+    t_start = trip_start + (start_s or 0.0) * 1000.0
+    t_end = trip_end if end_s is None else min(trip_start + end_s * 1000.0, trip_end)
+    if t_end < t_start:
+        return np.empty(0)
+    # Count the samples first: arange on epoch milliseconds is subject to rounding at the end
+    num_samples = int(np.floor((t_end - t_start) * rate_hz / 1000.0 + 1e-9)) + 1
+    return t_start + np.arange(num_samples) * (1000.0 / rate_hz)
+
+
+def query_trip(trip_path, signals, start_s=None, end_s=None, rate_hz=10.0, plugin_dir=PLUGIN_DIR):
+    """
+    Sample signals of a trip on a common time grid.
+
+    Args:
+        trip_path (str): Trip folder
+        signals (list): Signal names
+        start_s (float): Grid start in seconds from the trip start
+        end_s (float): Grid end in seconds from the trip start
+        rate_hz (float): Sampling rate
+        plugin_dir (str): Directory with the plugin files
+
+    Returns:
+        pl.DataFrame: Columns trip, timestamp_ms and one float64 column per signal
+    """
+    providers = load_plugins_for_signals(trip_path, signals, plugin_dir)
+    extents = [extent for extent in (signal_extent(providers[s], s) for s in signals) if extent is not None]
+    grid = time_grid(extents, start_s, end_s, rate_hz)
+
+    columns = {
+        "trip": pl.Series("trip", [os.path.basename(os.path.normpath(trip_path))] * len(grid), dtype=pl.Utf8),
+        "timestamp_ms": grid,
+    }
+    for signal in signals:
+        columns[signal] = np.asarray(providers[signal].get_data_for_timestamps(signal, grid), dtype=np.float64)
+    return pl.DataFrame(columns)
+
+
+def write_table(df, output_path):
+    """Write a table as Parquet (.parquet) or CSV (any other extension)."""
+    if output_path.lower().endswith(".parquet"):
+        df.write_parquet(output_path)
+    else:
+        df.write_csv(output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sample signals of trips on a common time grid, headless.")
+    parser.add_argument("--trip", required=True, nargs="+", help="Trip folder(s)")
+    parser.add_argument("--signals", required=True, help="Comma-separated signal names")
+    parser.add_argument("--start", type=float, default=None, help="Start in seconds from the trip start")
+    parser.add_argument("--end", type=float, default=None, help="End in seconds from the trip start")
+    parser.add_argument("--rate", type=parse_rate, default=10.0, help="Sampling rate, e.g. 10Hz or 100ms")
+    parser.add_argument("--out", required=True, help="Output file (.parquet or .csv)")
+    args = parser.parse_args()
+
+    signal_names = [s.strip() for s in args.signals.split(",") if s.strip()]
+    tables = []
+    for trip in args.trip:
+        trip = trip if trip.endswith(os.sep) else trip + os.sep
+        start = time.perf_counter()
+        try:
+            tables.append(query_trip(trip, signal_names, args.start, args.end, args.rate))
+        except (KeyError, ValueError) as e:
+            print(f"\033[91mSkipping {trip}: {e}\033[0m", file=sys.stderr)
+            continue
+        print(f"{trip}: {tables[-1].height} samples in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    if not tables:
+        sys.exit("No trip could be queried.")
+    write_table(pl.concat(tables), args.out)
+    print(f"Wrote {sum(t.height for t in tables)} rows to {args.out}", file=sys.stderr)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+"""
+Headless batch frame renderer.
+
+Renders a time range of a trip to a PNG image sequence or an MP4 video without an
+interactive session. Each worker process runs its own PlotManager with the spatial and
+temporal widgets on the offscreen Qt platform, steps through its share of the frames and
+grabs them. The frame range is split into one contiguous partition per worker.
+
+Every frame is rendered exactly as in a sequential run: before its first frame, a worker
+replays the plot history of all earlier frames of the range into the temporal widget
+(values only, without drawing). Frames are written as frame_<index>.png with their global
+index, and the stitcher assembles them in index order, so the output does not depend on
+the number of workers.
+
+MP4 output requires ffmpeg on the PATH; without it the image sequence is kept.
+
+Usage:
+    python tools/render_frames.py --trip 2024-09-11T15_55_30/ --start 0 --duration 600 \\
+        --fps 10 --out clip.mp4 [--workers 8] [--size 1600x900]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Add project root to Python path
+base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, base_path)
+
+FRAME_PATTERN = "frame_{:06d}.png"
+
+# Fixed width of the y-axes [px]
+AXIS_WIDTH = 50
+
+
+def frame_timestamps(trip_timestamps_ms, start_s=0.0, duration_s=None, fps=None):
+    """
+    Select the frame timestamps of a time range.
+
+    Args:
+        trip_timestamps_ms (array-like): Timeline of the trip in milliseconds (the slider timestamps)
+        start_s (float): Range start, in seconds from the first trip timestamp
+        duration_s (float): Range length in seconds; None renders to the end of the trip
+        fps (float): Output frame rate; None renders every trip timestamp in the range
+
+    Returns:
+        np.ndarray: Frame timestamps in milliseconds
+    """
+    trip_timestamps_ms = np.asarray(trip_timestamps_ms, dtype=np.float64)
+    t_start = trip_timestamps_ms[0] + start_s * 1000.0
+    t_end = trip_timestamps_ms[-1] if duration_s is None else min(t_start + duration_s * 1000.0, trip_timestamps_ms[-1])
+    if fps is None:
+        return trip_timestamps_ms[(trip_timestamps_ms >= t_start) & (trip_timestamps_ms <= t_end)]
+    # Count the frames first: arange on epoch milliseconds would drop the end frame to rounding
+    num_frames = int(np.floor((t_end - t_start) * fps / 1000.0 + 1e-9)) + 1
+    return t_start + np.arange(num_frames) * (1000.0 / fps)
+
+
+def partition_frames(num_frames, num_workers):
+    """
+    Split frame indices into contiguous partitions, one per worker.
+
+    Returns:
+        list: (first index, end index) pairs; empty partitions are dropped
+    """
+    bounds = np.linspace(0, num_frames, min(num_workers, max(num_frames, 1)) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def create_render_session(trip_path, width, height):
+    """
+    Create a PlotManager with all plugins loaded and the default signals plotted, and a
+    widget showing the spatial and temporal plots side by side.
+
+    Returns:
+        tuple: (QApplication, PlotManager, render widget)
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication, QSplitter
+    from PySide6.QtCore import Qt
+    from core.plot_manager import PlotManager
+    from core.config import spatial_signals, temporal_signals, expression_signals
+
+    app = QApplication.instance() or QApplication([])
+    plot_manager = PlotManager()
+    plot_manager.load_plugins_from_directory(os.path.join(base_path, "plugins"), {"file_path": trip_path})
+    plot_manager.register_default_derived_signals()
+    plot_manager.register_expression_signals(expression_signals)
+    for signal in spatial_signals + temporal_signals:
+        if signal in plot_manager.signal_plugins:
+            plot_manager.register_plot(signal)
+
+    # pyqtgraph widens axes to the longest tick label seen so far; fixed widths keep the
+    # layout independent of the frames a worker rendered before
+    plots = [getattr(plot_manager.temporal_plot_widget, name) for name in plot_manager.temporal_plot_widget.data_store]
+    plots.append(plot_manager.spatial_plot_widget.plot_widget)
+    for plot in plots:
+        plot.getAxis("left").setWidth(AXIS_WIDTH)
+
+    widget = QSplitter(Qt.Horizontal)
+    widget.addWidget(plot_manager.spatial_plot_widget)
+    widget.addWidget(plot_manager.temporal_plot_widget)
+    widget.resize(width, height)
+    widget.show()
+    app.processEvents()
+    return app, plot_manager, widget
+
+
+def replay_history(plot_manager, timestamps_ms):
+    """
+    Fill the temporal plot history with the values at the given timestamps without drawing,
+    as if the frames had been requested one by one.
+    """
+    from core.signal_validation import to_scalar
+
+    widget = plot_manager.temporal_plot_widget
+    for signal in plot_manager.signals:
+        signal_info = plot_manager.signal_plugins.get(signal)
+        if not signal_info or signal_info["type"] not in ("temporal", "boolean"):
+            continue
+        plugin = plot_manager.plugins.get(signal_info["plugin"])
+        if plugin is None:
+            continue
+        for timestamp in timestamps_ms:
+            value = to_scalar(plugin.get_data_for_timestamp(signal, timestamp))
+            if value is None:
+                continue
+            for plot_name in widget.plot_lines.get(signal, {}):
+                widget.data_store[plot_name][signal][timestamp] = value
+
+
+def render_partition(trip_path, timestamps_ms, first_index, end_index, out_dir, width, height):
+    """
+    Render the frames first_index..end_index-1 of a range into out_dir.
+
+    Args:
+        trip_path (str): Trip folder
+        timestamps_ms (np.ndarray): All frame timestamps of the range
+        first_index (int): Index of the first frame to render
+        end_index (int): Index after the last frame to render
+        out_dir (str): Output directory for the PNG files
+        width (int), height (int): Frame size in pixels
+
+    Returns:
+        int: Number of rendered frames
+    """
+    app, plot_manager, widget = create_render_session(trip_path, width, height)
+    if first_index > 0:
+        # Replay the history, then draw the preceding frame without saving it, so the view
+        # ranges carry over as in a sequential run
+        replay_history(plot_manager, timestamps_ms[:first_index - 1])
+        plot_manager.request_data(float(timestamps_ms[first_index - 1]))
+        app.processEvents()
+
+    for index in range(first_index, end_index):
+        plot_manager.request_data(float(timestamps_ms[index]))
+        app.processEvents()
+        widget.grab().save(os.path.join(out_dir, FRAME_PATTERN.format(index)))
+    return end_index - first_index
+
+
+def _render_partition_worker(args):
+    # Worker processes print plugin registration messages; keep the console readable
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        return render_partition(*args)
+
+
+def stitch_frames(frame_dir, num_frames, output_path, fps):
+    """
+    Assemble the rendered frames into the output.
+
+    Args:
+        frame_dir (str): Directory holding frame_<index>.png for indices 0..num_frames-1
+        num_frames (int): Expected number of frames
+        output_path (str): .mp4 file, or a directory for the image sequence
+        fps (float): Frame rate of the video
+
+    Returns:
+        str: Path of the written output (the frame directory if no video was encoded)
+
+    Raises:
+        RuntimeError: If frames are missing or ffmpeg fails
+    """
+    missing = [i for i in range(num_frames) if not os.path.exists(os.path.join(frame_dir, FRAME_PATTERN.format(i)))]
+    if missing:
+        raise RuntimeError(f"{len(missing)} frames are missing, first missing frame: {missing[0]}")
+
+    if not output_path.lower().endswith(".mp4"):
+        return frame_dir
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print(f"\033[93mWarning: ffmpeg not found, keeping the image sequence in {frame_dir}\033[0m")
+        return frame_dir
+
+    command = [
+        ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+        "-i", os.path.join(frame_dir, "frame_%06d.png"),
+        # Even frame sizes are required by yuv420p
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", output_path,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+    return output_path
+
+
+def render(trip_path, output_path, start_s=0.0, duration_s=None, fps=None, workers=None, width=1600, height=900):
+    """
+    Render a time range of a trip to an image sequence or MP4.
+
+    Args:
+        trip_path (str): Trip folder
+        output_path (str): .mp4 file or output directory for PNG frames
+        start_s (float): Range start in seconds from the trip start
+        duration_s (float): Range length in seconds (None: to the end)
+        fps (float): Output frame rate (None: every car pose timestamp)
+        workers (int): Number of worker processes (default: all cores)
+        width (int), height (int): Frame size in pixels
+
+    Returns:
+        str: Path of the written output
+    """
+    from data_classes.car_pose_class import CarPose
+
+    trip_timestamps = CarPose(trip_path).get_timestamps_milliseconds().to_numpy()
+    timestamps_ms = frame_timestamps(trip_timestamps, start_s, duration_s, fps)
+    if len(timestamps_ms) == 0:
+        raise ValueError("The selected time range does not contain any frame.")
+
+    if output_path.lower().endswith(".mp4"):
+        frame_dir = os.path.splitext(output_path)[0] + "_frames"
+    else:
+        frame_dir = output_path
+    os.makedirs(frame_dir, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    partitions = partition_frames(len(timestamps_ms), workers)
+    tasks = [(trip_path, timestamps_ms, a, b, frame_dir, width, height) for a, b in partitions]
+    print(f"Rendering {len(timestamps_ms)} frames with {len(tasks)} worker(s) into {frame_dir}")
+
+    start = time.perf_counter()
+    if len(tasks) == 1:
+        render_partition(*tasks[0])
+    else:
+        # Qt is not fork-safe: start clean interpreters
+        with multiprocessing.get_context("spawn").Pool(len(tasks)) as pool:
+            pool.map(_render_partition_worker, tasks)
+    print(f"Rendered {len(timestamps_ms)} frames in {time.perf_counter() - start:.1f}s")
+
+    frame_rate = fps
+    if frame_rate is None:
+        # Play the raw timeline back in real time
+        frame_rate = 1000.0 / float(np.median(np.diff(timestamps_ms))) if len(timestamps_ms) > 1 else 10.0
+    return stitch_frames(frame_dir, len(timestamps_ms), output_path, frame_rate)
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a time range of a trip to PNG frames or an MP4 video, headless.")
+    parser.add_argument("--trip", required=True, help="Trip folder")
+    parser.add_argument("--out", required=True, help="Output .mp4 file or directory for PNG frames")
+    parser.add_argument("--start", type=float, default=0.0, help="Range start in seconds from the trip start")
+    parser.add_argument("--duration", type=float, default=None, help="Range length in seconds (default: to the end)")
+    parser.add_argument("--fps", type=float, default=None, help="Output frame rate (default: every car pose timestamp)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--size", type=parse_size, default=(1600, 900), help="Frame size WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    trip = args.trip if args.trip.endswith(os.sep) else args.trip + os.sep
+    output = render(trip, args.out, args.start, args.duration, args.fps, args.workers, *args.size)
+    print(f"Output written to {output}")
@@ -4,6 +4,7 @@ import os
 import pandas as pd
 from scipy.interpolate import interp1d
 from utils.data_loaders.data_converters import save_car_pose_as_pickle, load_car_pose_from_pickle
+from core.cache_handler import cached_loader
 
 def prepare_car_pose_data(trip, interpolation=False, car_pose_file_name = 'car_pose.csv', options = None):
     """Prepare car pose data for the cross_analysis."""
@@ -15,6 +16,15 @@ def prepare_car_pose_data(trip, interpolation=False, car_pose_file_name = 'car_p
         if not os.path.exists(file_path):
             return None            
     
+    return _load_car_pose_frame(file_path)
+
+
+@cached_loader
+def _load_car_pose_frame(file_path):
+    """
+    Load and prepare the car pose data frame of a car pose file. Results are kept in the
+    process-wide data cache until the file changes, and must not be modified in place.
+    """
     # Check if the data exists as a pickle file
     pickle_path = file_path[:-4] + '.pkl'
     if os.path.exists(pickle_path):
@@ -0,0 +1,260 @@
+# Description: Scan the CSV files of a trip folder for their schema (columns, dtypes, time
+# column and sample rate) by reading only the header and a small sample of each file.
+# Results are cached per file fingerprint in a JSON file inside the trip folder, so reopening
+# a folder only re-scans files that changed.
+import io
+import json
+import logging
+import os
+
+import numpy as np
+import polars as pl
+
+from core.cache_handler import cached_loader, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Name of the schema cache file written into each scanned trip folder
+SCHEMA_CACHE_FILE = ".debug_player_schema.json"
+
+# Bump when the schema format changes to invalidate existing caches
+SCHEMA_VERSION = 1
+
+# Number of bytes read from the start of each file for the header and sample rows
+SAMPLE_BYTES = 64 * 1024
+
+# Timestamps below this value are treated as seconds, above as milliseconds
+_SECONDS_MS_THRESHOLD = 1e11
+
+# Files skipped by default: path_trajectory.csv holds hundreds of path point columns per row
+# and has a dedicated loader (see path_handler_loader)
+DEFAULT_EXCLUDED_FILES = frozenset({"path_trajectory.csv"})
+
+# Strings read as missing values (e.g. gps.csv logs 'nan' for unavailable speed)
+NULL_VALUES = ["", "nan", "NaN"]
+
+
+def _read_sample(file_path):
+    """
+    Read the first SAMPLE_BYTES of a file, skipping leading NUL padding.
+
+    Returns:
+    tuple: (sample bytes cut at the last complete line, number of leading NUL bytes, file size).
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        raw = f.read(SAMPLE_BYTES)
+
+    sample = raw.lstrip(b"\x00")
+    nul_prefix = len(raw) - len(sample)
+
+    # Drop the trailing partial line unless the whole file fit in the sample
+    if len(raw) < file_size and b"\n" in sample:
+        sample = sample[:sample.rindex(b"\n") + 1]
+    return sample, nul_prefix, file_size
+
+
+def _is_number(field):
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+def _find_time_column(columns, df_sample):
+    """
+    Find the timestamp column: the first column whose name contains 'time', or for files
+    without header the first column holding epoch-like values.
+
+    Returns:
+    tuple: (column name or None, unit 's' or 'ms' or None).
+    """
+    candidates = [c for c in columns if "time" in c.lower()] or columns[:1]
+    for column in candidates:
+        values = df_sample[column]
+        if not values.dtype.is_numeric() or values.null_count() == len(values):
+            continue
+        median = float(values.drop_nulls().median())
+        if 1e9 <= median < 1e10:
+            return column, "s"
+        if 1e12 <= median < 1e13:
+            return column, "ms"
+        if "time" in column.lower():
+            return column, "s" if median < _SECONDS_MS_THRESHOLD else "ms"
+    return None, None
+
+
+def scan_csv_schema(file_path, sample_rows=200):
+    """
+    Infer the schema of a CSV file from its header and a small sample.
+
+    Parameters:
+    file_path (str): Path to the CSV file.
+    sample_rows (int): Maximum number of rows used for dtype and sample rate inference.
+
+    Returns:
+    dict: Schema with keys: file, fingerprint, has_header, nul_prefix, columns
+          (list of {"name", "dtype", "numeric"}), time_column, time_unit,
+          sample_rate_hz and estimated_rows. None if the file holds no parsable data.
+    """
+    sample, nul_prefix, file_size = _read_sample(file_path)
+    lines = [line for line in sample.decode("utf-8", errors="replace").splitlines() if line.strip()]
+    if not lines:
+        return None
+
+    first_fields = [field.strip() for field in lines[0].split(",")]
+    has_header = not all(_is_number(field) for field in first_fields if field)
+
+    try:
+        df_sample = pl.read_csv(
+            io.BytesIO(sample), has_header=has_header, n_rows=sample_rows,
+            infer_schema_length=sample_rows, truncate_ragged_lines=True,
+            null_values=NULL_VALUES, ignore_errors=True,
+        )
+    except Exception as e:
+        logger.warning(f"Could not sample {file_path}: {e}")
+        return None
+
+    if has_header:
+        df_sample.columns = [column.strip() for column in df_sample.columns]
+    else:
+        df_sample.columns = [f"column_{i}" for i in range(df_sample.width)]
+
+    columns = [
+        {"name": name, "dtype": str(dtype), "numeric": dtype.is_numeric()}
+        for name, dtype in zip(df_sample.columns, df_sample.dtypes)
+    ]
+
+    time_column, time_unit = _find_time_column(df_sample.columns, df_sample)
+    sample_rate_hz = None
+    if time_column is not None and df_sample.height > 1:
+        timestamps = df_sample[time_column].drop_nulls().to_numpy().astype(np.float64)
+        dt = np.diff(timestamps) * (1.0 if time_unit == "ms" else 1000.0)
+        dt = dt[dt > 0]
+        if len(dt):
+            sample_rate_hz = 1000.0 / float(np.median(dt))
+
+    data_lines = len(lines) - (1 if has_header else 0)
+    data_bytes = len(sample) - (len(lines[0]) + 1 if has_header else 0)
+    estimated_rows = int(round(file_size / max(data_bytes / max(data_lines, 1), 1)))
+
+    return {
+        "version": SCHEMA_VERSION,
+        "file": os.path.basename(file_path),
+        "fingerprint": file_fingerprint(file_path),
+        "has_header": has_header,
+        "nul_prefix": nul_prefix,
+        "columns": columns,
+        "time_column": time_column,
+        "time_unit": time_unit,
+        "sample_rate_hz": sample_rate_hz,
+        "estimated_rows": estimated_rows,
+    }
+
+
+def _load_schema_cache(cache_path):
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_schema_cache(cache_path, cache):
+    try:
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=1)
+    except OSError as e:
+        logger.warning(f"Could not write schema cache {cache_path}: {e}")
+
+
+def scan_trip_folder(trip_path, exclude=DEFAULT_EXCLUDED_FILES, use_cache=True):
+    """
+    Scan all CSV files of a trip folder, reusing cached schemas of unchanged files.
+
+    Parameters:
+    trip_path (str): Path to the trip folder.
+    exclude (iterable): File names to skip.
+    use_cache (bool): Read and update the schema cache file in the trip folder.
+
+    Returns:
+    dict: {file name: schema} for every CSV file with parsable data, sorted by file name.
+    """
+    if not os.path.isdir(trip_path):
+        return {}
+
+    cache_path = os.path.join(trip_path, SCHEMA_CACHE_FILE)
+    cache = _load_schema_cache(cache_path) if use_cache else {}
+    schemas = {}
+    changed = False
+
+    for file_name in sorted(os.listdir(trip_path)):
+        if not file_name.endswith(".csv") or file_name in exclude:
+            continue
+        file_path = os.path.join(trip_path, file_name)
+
+        cached = cache.get(file_name)
+        if (cached is not None and cached.get("version") == SCHEMA_VERSION
+                and cached.get("fingerprint") == file_fingerprint(file_path)):
+            schemas[file_name] = cached
+            continue
+
+        schema = scan_csv_schema(file_path)
+        changed = True
+        if schema is not None:
+            schemas[file_name] = schema
+
+    if use_cache and (changed or set(cache) != set(schemas)):
+        _save_schema_cache(cache_path, schemas)
+    return schemas
+
+
+def iter_signal_columns(schemas):
+    """
+    Iterate over the columns of scanned files that can be exposed as temporal signals:
+    numeric columns other than the time column of files with a detected time column.
+
+    Parameters:
+    schemas (dict): {file name: schema} as returned by scan_trip_folder.
+
+    Returns:
+    iterator: (signal name "<file stem>.<column>", file name, column dict) tuples.
+    """
+    for file_name, schema in schemas.items():
+        time_column = schema["time_column"]
+        if time_column is None:
+            continue
+        stem = os.path.splitext(file_name)[0]
+        for column in schema["columns"]:
+            if column["numeric"] and column["name"] != time_column:
+                yield f"{stem}.{column['name']}", file_name, column
+
+
+@cached_loader
+def load_csv_columns(file_path, schema, columns):
+    """
+    Load only the given columns of a scanned CSV file. Results are kept in the
+    process-wide data cache until the file changes.
+
+    Parameters:
+    file_path (str): Path to the CSV file.
+    schema (dict): Schema returned by scan_csv_schema.
+    columns (list): Column names to load (as named in the schema).
+
+    Returns:
+    polars.DataFrame: The requested columns, cast to Float64.
+    """
+    names = [column["name"] for column in schema["columns"]]
+    source = file_path
+    if schema["nul_prefix"]:
+        with open(file_path, "rb") as f:
+            source = io.BytesIO(f.read().lstrip(b"\x00"))
+
+    indices = [names.index(column) for column in columns]
+    df = pl.read_csv(
+        source, has_header=schema["has_header"], columns=indices,
+        truncate_ragged_lines=True, null_values=NULL_VALUES, ignore_errors=True,
+    )
+    df.columns = list(columns)
+    return df.with_columns(pl.all().cast(pl.Float64, strict=False))
@@ -1,57 +1,70 @@
+# Description: Loader of the GPS fixes of a trip (gps.csv), as WGS84 coordinates and/or as
+# coordinates in a local tangent frame (ENU or NED) at the first fix, see
+# utils/localization_and_navigation/geodetic.py.
+import os
 
-def load_trip_gps_data(trip_path, coordinates_type, sample_spacing = 1, tangent_frame = "ENU"):
-    # read position from gps data 
-    filepathGPS =  trip_path +'/'+ 'gps.csv'
-    # gps_header = ['time_stamp','latitude','longtitude','height','speed','sensor_time_counter']
-    
-    # Set the data types of your columns
-    dtypes = {
-        'latitude': 'float64',
-        'longitude': 'float64',
-        'height': 'float64',
-        'time_stamp': 'float64'
-        # Add more columns as needed
-    }
-    
-    df_gps = pd.read_csv(filepathGPS, header=0, dtype=dtypes)
-    df_wgs84 = df_gps[['latitude','longitude','height']].iloc[::sample_spacing,:]
-    Xwgs84_long_lat = np.asarray(df_wgs84[['longitude','latitude','height']]).T
-    time_vec_ = np.squeeze(np.asarray(df_gps[['time_stamp']].iloc[::sample_spacing,:]).T)
-    # Xwgs84_h = np.append(Xwgs84,np.ones((1,Xwgs84.shape[1])),axis = 0)
-    
-    # adding the time_stamp column to the result
-    Xwgs84_long_lat_ = np.hstack((Xwgs84_long_lat.T, time_vec_.reshape(-1, 1)))
-    Xwgs84_long_lat = Xwgs84_long_lat_.T
-  
-    if coordinates_type=="wgs_84":
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from utils.localization_and_navigation.geodetic import LocalTangentFrame
+
+GPS_FILE = "gps.csv"
+# gps_header = ['time_stamp','latitude','longitude','height','speed','sensor_time_counter']
+GPS_COLUMNS = ["time_stamp", "latitude", "longitude", "height"]
+
+
+def read_gps_fixes(trip_path, sample_spacing=1):
+    """
+    Read the GPS fixes of a trip.
+
+    Parameters:
+    trip_path (str): Trip folder containing gps.csv.
+    sample_spacing (int): Keep every sample_spacing-th fix.
+
+    Returns:
+    tuple: (timestamps [s], lla) where lla is a C-contiguous (N, 3) float64 array of
+        latitude [deg], longitude [deg], height [m]; fixes with a missing coordinate are dropped.
+    """
+    file_path = os.path.join(trip_path, GPS_FILE)
+    df_gps = pl.read_csv(file_path, columns=GPS_COLUMNS, null_values=["nan", "NaN", ""],
+                         schema_overrides={column: pl.Float64 for column in GPS_COLUMNS})
+    data = df_gps.drop_nulls().to_numpy()[::sample_spacing]
+    data = data[np.all(np.isfinite(data), axis=1)]
+    return np.ascontiguousarray(data[:, 0]), np.ascontiguousarray(data[:, 1:])
+
+
+def load_trip_gps_data(trip_path, coordinates_type, sample_spacing=1, tangent_frame="ENU"):
+    """
+    Load the GPS fixes of a trip.
+
+    Parameters:
+    trip_path (str): Trip folder containing gps.csv.
+    coordinates_type (str): "wgs_84", "rect" or "both".
+    sample_spacing (int): Keep every sample_spacing-th fix.
+    tangent_frame (str): "ENU" or "NED", the local frame of the "rect" coordinates (origin at the first fix).
+
+    Returns:
+    np.ndarray for "wgs_84": 4 x N array of longitude, latitude, height and time_stamp rows.
+    pd.DataFrame for "rect": columns x, y, z (in the tangent frame) and time_stamp.
+    tuple for "both": (the "wgs_84" array, the "rect" DataFrame).
+    """
+    if coordinates_type not in ("wgs_84", "rect", "both"):
+        raise ValueError(f"Unknown coordinates_type '{coordinates_type}'")
+    time_vec, lla = read_gps_fixes(trip_path, sample_spacing)
+    Xwgs84_long_lat = np.vstack((lla[:, 1], lla[:, 0], lla[:, 2], time_vec))
+    if coordinates_type == "wgs_84":
         return Xwgs84_long_lat
-    
-    # Then: coordinates_type=="both" or coordinates_type=="rect":
-    # convert gps path from wgs84 to rectangular coordinates
-    # a,e,f,RN_at_lat = geo.get_wgs84_geodetic_model()
-
-    # print( abs(RN_at_lat(np.radians(34))  - RN_at_lat(np.radians(32)))/RN_at_lat(np.radians(32)))
-    # geoModelParams = {'a':a,'e':e,'f':f,'RN_h':RN_at_lat}
-    
-    df_ecef = geo.wgs842ecef(df_wgs84[['longitude','latitude','height']])
-    
-    # set first coordinate as ENU reference point
-    XYZ_ref = df_ecef.iloc[0,:]
-    if tangent_frame=="ENU":
-        df_tangent = geo.ecef2enu(df_ecef,XYZ_ref, df_wgs84['latitude'].iloc[0], df_wgs84['longitude'].iloc[0])
-    elif tangent_frame=="NED":
-        df_tangent = geo.ecef2ned(df_ecef,XYZ_ref, df_wgs84['latitude'].iloc[0], df_wgs84['longitude'].iloc[0])
+
+    # Set the first fix as the reference point of the tangent frame
+    if len(lla) == 0:
+        local = np.empty((0, 3))
     else:
-        SystemError("Bad tangent_frame name \n")
-        
-    # xyz_enu = np.asarray(df_enu).T
-    # # change into homogeneous coordinates     
-    # X_rect_h = np.append(X_rect,np.ones((1,X_rect.shape[1])),axis = 0)
-    
-    # Adding time_stamp column
-    df_tangent['time_stamp'] = time_vec_
-
-    if coordinates_type=="rect":
+        frame = LocalTangentFrame(*lla[0], frame=tangent_frame.upper())
+        local = frame.from_geodetic(lla)
+    df_tangent = pd.DataFrame(local, columns=["x", "y", "z"])
+    df_tangent["time_stamp"] = time_vec
+
+    if coordinates_type == "rect":
         return df_tangent
-    else: # coordinates_type == 'both'
-        return Xwgs84_long_lat, df_tangent
\ No newline at end of file
+    return Xwgs84_long_lat, df_tangent
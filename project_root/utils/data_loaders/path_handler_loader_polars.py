@@ -5,7 +5,9 @@ from datetime import datetime
 
 
 import polars as pl
+from core.cache_handler import cached_loader
 
+@cached_loader
 def read_path_handler_data(filepath):
     """
     Reads a CSV file with dynamic path_x and path_y columns, handling inconsistent row lengths.
@@ -15,6 +17,7 @@ def read_path_handler_data(filepath):
 
     Returns:
     tuple: A tuple containing the extracted data as two polars DataFrames.
+           Results are kept in the process-wide data cache until the file changes.
     """
    
     # Read the entire CSV file as a Polars DataFrame
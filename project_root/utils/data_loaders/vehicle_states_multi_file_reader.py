@@ -4,6 +4,25 @@ from datetime import datetime
 
 
 import polars as pl
+from core.cache_handler import cached_loader
+
+
+@cached_loader
+def _read_log_file(file):
+    """
+    Read one log file. Results are kept in the process-wide data cache until the file changes.
+
+    Parameters:
+    file (str): The path to the CSV file.
+
+    Returns:
+    polars.DataFrame: The log data with stripped column names.
+    """
+    df = pl.read_csv(file, null_values=[""], truncate_ragged_lines=True)
+    # Strip leading and trailing spaces from column names
+    df.columns = [col.strip() for col in df.columns]
+    return df
+
 
 #  cruise_control.csv, driving_mode.csv, speed.csv, steering
 def read_vehicle_state_logs(filepath, log_files_names = None):
@@ -28,9 +47,7 @@ def read_vehicle_state_logs(filepath, log_files_names = None):
         for file in files_to_read:
             # Read the entire CSV file as a Polars DataFrame
             try:
-                df = pl.read_csv(file, null_values=[""], truncate_ragged_lines=True)
-                # Strip leading and trailing spaces from column names
-                df.columns = [col.strip() for col in df.columns]
+                df = _read_log_file(file)
             except:
                 print(f"Error: Could not read the log file {file}")
                 df = None
@@ -5,6 +5,8 @@ import math
 import unittest
 from math import isclose
 
+from utils.localization_and_navigation import geodetic
+
 
 def wgs842ecef(df_wgs: pd.DataFrame):
     """transform between the geodetic (i.e., (φ, λ, h)e) and rectangular (i.e., (x, y, z)e) ECEF coordinates. 
@@ -14,96 +16,29 @@ def wgs842ecef(df_wgs: pd.DataFrame):
     """
     # df is the wgs84 data with size mx3 array and tupples [latitude,longitude,height] with m is the number of data points and each row consist of: [lat, long, height[m]] 
     # lat/long are degrees in decimal(integer) form with signs (+) for N/E and (-) for S/W
-    
-    a,ecc,f,R_N_funcHandle_lat = get_wgs84_geodetic_model()    
-    
-    lat = df_wgs[["latitude"]].to_numpy()
-    lng = df_wgs[["longitude"]].to_numpy()
-    h = df_wgs[["height"]].to_numpy()
-    
-    cos_lng = np.cos(np.radians(lng))  #cos(longtitude)
-    cos_lat = np.cos(np.radians(lat))  #cos(latitude)
-    sin_lng = np.sin(np.radians(lng))  #sin(longtitude)
-    sin_lat = np.sin(np.radians(lat))  #sin(latitude)
-    
-    # caculate RN
-    ecc2 = ecc**2
-    sin_lat_2 = sin_lat**2
-    RN_den = np.sqrt(1-ecc2*sin_lat_2)
-    RN = a/RN_den
-        
-    RN_h_times_cos_lat = (RN + h)*cos_lat
-    x = RN_h_times_cos_lat*cos_lng
-    y = RN_h_times_cos_lat*sin_lng
-    z = (RN*(1-ecc2)+h)*sin_lat
-    xyz = {'X': np.squeeze(x), 'Y': np.squeeze(y),'Z': np.squeeze(z)}
-    
-    df_rect = pd.DataFrame(xyz, columns=['X','Y','Z'])
-        
-    return df_rect
+    # DataFrame front end of geodetic.geodetic_to_ecef, which works on (N, 3) arrays
+    lla = df_wgs[["latitude", "longitude", "height"]].to_numpy(dtype=np.float64)
+    return pd.DataFrame(geodetic.geodetic_to_ecef(lla), columns=['X','Y','Z'])
+
+
+def _ecef2tangent(df_ecef, XYZ_ref, lat_deg_dec_ref, long_deg_dec_ref, frame):
+    """Rotate ECEF points, translated by the ref point, into the tangent frame at the ref lat/long."""
+    points = df_ecef[["X", "Y", "Z"]].to_numpy(dtype=np.float64, copy=True)
+    np.subtract(points, np.asarray(XYZ_ref, dtype=np.float64), out=points)
+    # Rows of the (cached) rotation are the tangent frame axes in ECEF
+    W = geodetic.rotation_matrix(float(lat_deg_dec_ref), float(long_deg_dec_ref), frame)
+    np.matmul(points, W.T, out=points)
+    return pd.DataFrame(points, columns=['x','y','z'])
 
 
 def ecef2enu(df_ecef, XYZ_ref, lat_rad_deg_dec, long_deg_dec_ref):
     # https://en.wikipedia.org/wiki/Geographic_coordinate_conversion#Geodetic_to/from_ENU_coordinates
-    
-    X = df_ecef[["X"]].to_numpy().squeeze()
-    Y = df_ecef[["Y"]].to_numpy().squeeze()
-    Z = df_ecef[["Z"]].to_numpy().squeeze()
-    
-    XYZ_p = np.squeeze(np.stack((X,Y,Z),axis=0))
-    
-    # right hand side : translated by ref point coordinates
-    b =  XYZ_p - np.expand_dims(XYZ_ref,axis=1)
-    
-    # Build the tranformation matrix based on the ref poiunts ecef position and lat/long
-    s_lng = math.sin(np.radians(long_deg_dec_ref))
-    c_lng = math.cos(np.radians(long_deg_dec_ref))
-    s_lat = math.sin(np.radians(lat_rad_deg_dec))
-    c_lat = math.cos(np.radians(lat_rad_deg_dec))
-    
-    
-    w1 = np.array([ -s_lng       ,  c_lng       , 0     ])
-    w2 = np.array([ -s_lat*c_lng , -s_lat*s_lng , c_lat ])
-    w3 = np.array([  c_lat*c_lng ,  c_lat*s_lng , s_lng ])
-   
-    W = np.stack((w1,w2,w3),axis=0)
-    
-    
-    xyz_enu = W @ b
-    
-    df_enu =  pd.DataFrame(xyz_enu.T, columns=['x','y','z'])
-    return df_enu
+    return _ecef2tangent(df_ecef, XYZ_ref, lat_rad_deg_dec, long_deg_dec_ref, "ENU")
 
     
 def ecef2ned(df_ecef, XYZ_ref, lat_rad_deg_dec, long_deg_dec_ref):
     # https://en.wikipedia.org/wiki/Local_tangent_plane_coordinates
-    X = df_ecef[["X"]].to_numpy().squeeze()
-    Y = df_ecef[["Y"]].to_numpy().squeeze()
-    Z = df_ecef[["Z"]].to_numpy().squeeze()
-    
-    XYZ_p = np.squeeze(np.stack((X,Y,Z),axis=0))
-    
-    # right hand side : translated by ref point coordinates
-    b =  XYZ_p - np.expand_dims(XYZ_ref,axis=1)
-    
-    # Build the tranformation matrix based on the ref poiunts ecef position and lat/long
-    s_lng = math.sin(np.radians(long_deg_dec_ref))
-    c_lng = math.cos(np.radians(long_deg_dec_ref))
-    s_lat = math.sin(np.radians(lat_rad_deg_dec))
-    c_lat = math.cos(np.radians(lat_rad_deg_dec))
-    
-    
-    w1 = np.array([-s_lat*c_lng , -s_lat*s_lng  ,  c_lat ])
-    w2 = np.array([-s_lng       ,  c_lng        ,  0     ])
-    w3 = np.array([-c_lat*c_lng , -c_lat*s_lng  , -s_lat ])
-   
-    W = np.stack((w1,w2,w3),axis=0)
-    
-    
-    xyz_ned = W @ b
-    
-    df_ned =  pd.DataFrame(xyz_ned.T, columns=['x','y','z'])
-    return df_ned    
+    return _ecef2tangent(df_ecef, XYZ_ref, lat_rad_deg_dec, long_deg_dec_ref, "NED")
 
 class TestGPSToCartesian(unittest.TestCase):
     def test_haifa_dist(self):
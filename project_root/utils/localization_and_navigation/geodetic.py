@@ -0,0 +1,207 @@
+# Description: NumPy-native geodetic transforms between WGS84 geodetic coordinates
+# (latitude [deg], longitude [deg], height [m]), ECEF and local tangent frames (ENU / NED),
+# in both directions. All functions take (N, 3) float64 arrays and write into a preallocated
+# output (which may be the input itself, for in-place conversion). Rows are processed in
+# blocks, so the temporaries stay small and cache-resident whatever the number of fixes.
+# The rotation of a local tangent frame is computed once per reference point and cached.
+from functools import lru_cache
+
+import numpy as np
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0                      # Equatorial radius [m]
+WGS84_F = 1.0 / 298.257223563            # Flattening
+WGS84_B = WGS84_A * (1.0 - WGS84_F)      # Polar radius [m]
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)     # First eccentricity squared
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)  # Second eccentricity squared
+
+# Rows per block of the blockwise transforms
+BLOCK_ROWS = 1 << 15
+
+LOCAL_FRAMES = ("ENU", "NED")
+
+
+def _points(array, name="points"):
+    """Get an (N, 3) float64 array (without copying if it already is one)."""
+    array = np.asarray(array, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 3:
+        raise ValueError(f"{name} must be an (N, 3) array, got shape {array.shape}")
+    return array
+
+
+def _output(points, out):
+    """Validate a preallocated output, or allocate one like points."""
+    if out is None:
+        return np.empty_like(points)
+    if not isinstance(out, np.ndarray) or out.dtype != np.float64 or out.shape != points.shape:
+        raise ValueError(f"out must be a float64 array of shape {points.shape}")
+    return out
+
+
+def _blockwise(func, points, out):
+    """Apply func(points_block, out_block) to consecutive row blocks."""
+    for start in range(0, len(points), BLOCK_ROWS):
+        func(points[start:start + BLOCK_ROWS], out[start:start + BLOCK_ROWS])
+    return out
+
+
+def _geodetic_to_ecef_block(lla, out):
+    lat = np.radians(lla[:, 0])
+    lon = np.radians(lla[:, 1])
+    height = lla[:, 2].copy()
+    sin_lat = np.sin(lat)
+    cos_lat = np.cos(lat, out=lat)
+    # Prime vertical radius of curvature
+    radius = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    horizontal = (radius + height) * cos_lat
+    np.multiply(horizontal, np.cos(lon), out=out[:, 0])
+    np.multiply(horizontal, np.sin(lon), out=out[:, 1])
+    np.multiply(radius * (1.0 - WGS84_E2) + height, sin_lat, out=out[:, 2])
+
+
+def _ecef_to_geodetic_block(ecef, out):
+    x, y, z = ecef[:, 0], ecef[:, 1], ecef[:, 2]
+    lon = np.arctan2(y, x)
+    p2 = x * x + y * y
+    p = np.sqrt(p2)
+    z2 = z * z
+    # Heikkinen's closed-form solution (exact, no iterations)
+    f = 54.0 * WGS84_B ** 2 * z2
+    g = p2 + (1.0 - WGS84_E2) * z2 - WGS84_E2 * (WGS84_A ** 2 - WGS84_B ** 2)
+    c = WGS84_E2 ** 2 * f * p2 / (g * g * g)
+    s = np.cbrt(1.0 + c + np.sqrt(c * c + 2.0 * c))
+    k = s + 1.0 + 1.0 / s
+    pk = f / (3.0 * k * k * g * g)
+    q = np.sqrt(1.0 + 2.0 * WGS84_E2 ** 2 * pk)
+    r0 = (-(pk * WGS84_E2 * p) / (1.0 + q)
+          + np.sqrt(np.maximum(0.5 * WGS84_A ** 2 * (1.0 + 1.0 / q)
+                               - pk * (1.0 - WGS84_E2) * z2 / (q * (1.0 + q)) - 0.5 * pk * p2, 0.0)))
+    t = (p - WGS84_E2 * r0) ** 2
+    u = np.sqrt(t + z2)
+    v = np.sqrt(t + (1.0 - WGS84_E2) * z2)
+    z0 = WGS84_B ** 2 * z / (WGS84_A * v)
+    height = u * (1.0 - WGS84_B ** 2 / (WGS84_A * v))
+    lat = np.arctan2(z + WGS84_EP2 * z0, p)
+    # ecef may be out: every input is consumed before the first write
+    np.degrees(lat, out=out[:, 0])
+    np.degrees(lon, out=out[:, 1])
+    out[:, 2] = height
+
+
+def geodetic_to_ecef(lla, out=None):
+    """
+    Convert WGS84 geodetic coordinates to ECEF.
+
+    Parameters:
+    lla (np.ndarray): (N, 3) latitude [deg], longitude [deg], height above the ellipsoid [m].
+    out (np.ndarray): Optional (N, 3) float64 output; may be lla for an in-place conversion.
+
+    Returns:
+    np.ndarray: (N, 3) ECEF x, y, z [m].
+    """
+    lla = _points(lla, "lla")
+    return _blockwise(_geodetic_to_ecef_block, lla, _output(lla, out))
+
+
+def ecef_to_geodetic(ecef, out=None):
+    """
+    Convert ECEF coordinates to WGS84 geodetic coordinates (closed form, see Heikkinen 1982).
+
+    Parameters:
+    ecef (np.ndarray): (N, 3) ECEF x, y, z [m].
+    out (np.ndarray): Optional (N, 3) float64 output; may be ecef for an in-place conversion.
+
+    Returns:
+    np.ndarray: (N, 3) latitude [deg], longitude [deg], height above the ellipsoid [m].
+    """
+    ecef = _points(ecef, "ecef")
+    return _blockwise(_ecef_to_geodetic_block, ecef, _output(ecef, out))
+
+
+@lru_cache(maxsize=64)
+def rotation_matrix(lat_deg, lon_deg, frame="ENU"):
+    """
+    Rotation from ECEF to a local tangent frame (cached per reference point).
+
+    Parameters:
+    lat_deg, lon_deg (float): Reference point [deg].
+    frame (str): "ENU" (east, north, up) or "NED" (north, east, down).
+
+    Returns:
+    np.ndarray: Read-only 3x3 matrix whose rows are the local axes in ECEF.
+    """
+    if frame not in LOCAL_FRAMES:
+        raise ValueError(f"Unknown local frame '{frame}', expected one of {LOCAL_FRAMES}")
+    lat, lon = np.radians(lat_deg), np.radians(lon_deg)
+    sin_lat, cos_lat, sin_lon, cos_lon = np.sin(lat), np.cos(lat), np.sin(lon), np.cos(lon)
+    east = [-sin_lon, cos_lon, 0.0]
+    north = [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat]
+    up = [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat]
+    rows = [east, north, up] if frame == "ENU" else [north, east, [-v for v in up]]
+    rotation = np.array(rows, dtype=np.float64)
+    rotation.flags.writeable = False
+    return rotation
+
+
+class LocalTangentFrame:
+    """
+    ENU or NED frame tangent to the WGS84 ellipsoid at a reference point.
+
+    The reference point (in ECEF) and the rotation are computed once; the conversions are
+    blockwise matrix products into a preallocated (or in-place) output.
+
+    Attributes:
+        origin_lla (np.ndarray): Reference latitude [deg], longitude [deg], height [m]
+        origin_ecef (np.ndarray): Reference point in ECEF [m]
+        rotation (np.ndarray): ECEF to local rotation (rows are the local axes)
+        frame (str): "ENU" or "NED"
+    """
+
+    def __init__(self, lat_deg, lon_deg, height=0.0, frame="ENU"):
+        self.frame = frame.upper()
+        self.origin_lla = np.array([lat_deg, lon_deg, height], dtype=np.float64)
+        self.origin_ecef = geodetic_to_ecef(self.origin_lla[None, :])[0]
+        self.rotation = rotation_matrix(float(lat_deg), float(lon_deg), self.frame)
+
+    def from_ecef(self, ecef, out=None):
+        """Convert (N, 3) ECEF coordinates to the local frame [m]; out may be ecef."""
+        ecef = _points(ecef, "ecef")
+
+        def block(points, result):
+            np.matmul(points - self.origin_ecef, self.rotation.T, out=result)
+
+        return _blockwise(block, ecef, _output(ecef, out))
+
+    def to_ecef(self, local, out=None):
+        """Convert (N, 3) local coordinates to ECEF [m]; out may be local."""
+        local = _points(local, "local")
+
+        def block(points, result):
+            # The rotation is orthonormal: its inverse is its transpose
+            np.add(points @ self.rotation, self.origin_ecef, out=result)
+
+        return _blockwise(block, local, _output(local, out))
+
+    def from_geodetic(self, lla, out=None):
+        """Convert (N, 3) geodetic coordinates (lat [deg], lon [deg], h [m]) to the local frame; out may be lla."""
+        lla = _points(lla, "lla")
+
+        def block(points, result):
+            _geodetic_to_ecef_block(points, result)
+            np.matmul(result - self.origin_ecef, self.rotation.T, out=result)
+
+        return _blockwise(block, lla, _output(lla, out))
+
+    def to_geodetic(self, local, out=None):
+        """Convert (N, 3) local coordinates to geodetic coordinates (lat [deg], lon [deg], h [m]); out may be local."""
+        local = _points(local, "local")
+
+        def block(points, result):
+            np.add(points @ self.rotation, self.origin_ecef, out=result)
+            _ecef_to_geodetic_block(result, result)
+
+        return _blockwise(block, local, _output(local, out))
+
+    def __repr__(self):
+        lat, lon, height = self.origin_lla
+        return f"LocalTangentFrame(lat_deg={lat}, lon_deg={lon}, height={height}, frame='{self.frame}')"
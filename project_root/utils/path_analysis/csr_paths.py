@@ -0,0 +1,165 @@
+# Description: Array-native operations on all planned paths of a trip at once. The paths are
+# stored in CSR (compressed sparse row) layout: the points of every path concatenated into
+# flat x/y arrays, and offsets[i]:offsets[i + 1] the points of path i. Per-path loops become
+# segmented array operations (segmented cumsum, segmented searchsorted, bulk gathers), so a
+# full trip is processed in a few numpy calls instead of one Python task per path.
+from typing import NamedTuple
+
+import numpy as np
+
+from utils.spatial_poses.se2_batch import pose_matrices, transform_points_ragged
+
+
+class CsrPaths(NamedTuple):
+    """Paths in CSR layout: path i is (x, y)[offsets[i]:offsets[i + 1]]."""
+    x: np.ndarray
+    y: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def num_paths(self):
+        return len(self.offsets) - 1
+
+    @property
+    def counts(self):
+        """Number of points of each path."""
+        return np.diff(self.offsets)
+
+    def path(self, i):
+        """Get the points of path i as an [N x 2] array."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return np.column_stack((self.x[start:end], self.y[start:end]))
+
+    def path_index(self):
+        """Get the path index of every point."""
+        return np.repeat(np.arange(self.num_paths), self.counts)
+
+
+def paths_to_csr(path_x, path_y):
+    """
+    Build CSR paths from padded [num_paths x max_points] coordinate matrices.
+
+    Parameters:
+    path_x (np.ndarray): x coordinates, NaN after the last point of shorter paths.
+    path_y (np.ndarray): y coordinates, NaN after the last point of shorter paths.
+
+    Returns:
+    CsrPaths: The points with finite x and y of every row, in row order.
+    """
+    path_x = np.asarray(path_x, dtype=np.float64)
+    path_y = np.asarray(path_y, dtype=np.float64)
+    valid = np.isfinite(path_x) & np.isfinite(path_y)
+    offsets = np.zeros(len(path_x) + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=offsets[1:])
+    # Boolean indexing is row-major, i.e. keeps the point order of each path
+    return CsrPaths(path_x[valid], path_y[valid], offsets)
+
+
+def transform_paths(paths, pose_x, pose_y, pose_yaw):
+    """
+    Transform every path with its own SE(2) pose (e.g. from ego to world coordinates).
+
+    Parameters:
+    paths (CsrPaths): Paths in the source frame.
+    pose_x, pose_y, pose_yaw (np.ndarray): Pose of each path's frame [m, m, rad].
+
+    Returns:
+    CsrPaths: The transformed paths (same offsets).
+    """
+    points = transform_points_ragged(pose_matrices(pose_x, pose_y, pose_yaw), np.column_stack((paths.x, paths.y)),
+                                     paths.offsets)
+    x, y = np.ascontiguousarray(points.T)
+    return CsrPaths(x, y, paths.offsets)
+
+
+def segment_sum(values, offsets):
+    """Sum the values of every CSR segment (0 for empty segments)."""
+    sums = np.zeros(len(offsets) - 1, dtype=np.result_type(values, np.int64))
+    nonempty = offsets[1:] > offsets[:-1]
+    if len(values):
+        sums[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return sums
+
+
+def arc_length(paths):
+    """
+    Cumulative arc length along every path, starting at 0 at its first point.
+
+    Returns:
+    np.ndarray: Arc length of every point (flat, CSR order).
+    """
+    step = np.zeros(len(paths.x))
+    step[1:] = np.hypot(np.diff(paths.x), np.diff(paths.y))
+    starts = paths.offsets[:-1][paths.counts > 0]
+    # Segmented cumsum: the step into the first point of a path is not part of the path
+    step[starts] = 0.0
+    cumulative = np.cumsum(step)
+    return cumulative - np.repeat(cumulative[starts], paths.counts[paths.counts > 0])
+
+
+def nearest_arc_length_index(paths, arc_lengths, targets):
+    """
+    Find the point of every path whose arc length is closest to a target distance.
+
+    Equivalent to np.argmin(np.abs(arc_length_i - target_i)) per path (the first point on
+    ties), computed for all paths at once with a segmented searchsorted: arc lengths are
+    sorted within each path, so counting the points below a value gives its insertion index.
+
+    Parameters:
+    paths (CsrPaths): The paths.
+    arc_lengths (np.ndarray): Arc length of every point, from arc_length().
+    targets (np.ndarray): Target distance of each path.
+
+    Returns:
+    np.ndarray: Index of the closest point within each path (-1 for empty paths).
+    """
+    counts = paths.counts
+    row = paths.path_index()
+    targets = np.asarray(targets, dtype=np.float64)
+
+    # Insertion index of the target: the candidates are the points just below and above it
+    below = segment_sum((arc_lengths < targets[row]).astype(np.int64), paths.offsets)
+    lower = np.clip(below - 1, 0, np.maximum(counts - 1, 0))
+    upper = np.minimum(below, np.maximum(counts - 1, 0))
+    nonempty = counts > 0
+    lower_s = np.zeros(len(counts))
+    upper_s = np.zeros(len(counts))
+    lower_s[nonempty] = arc_lengths[paths.offsets[:-1][nonempty] + lower[nonempty]]
+    upper_s[nonempty] = arc_lengths[paths.offsets[:-1][nonempty] + upper[nonempty]]
+    # Ties go to the lower candidate, like argmin
+    best_s = np.where(np.abs(lower_s - targets) <= np.abs(upper_s - targets), lower_s, upper_s)
+    # NaN targets select the first point, like argmin over an all-NaN array
+    best_s[np.isnan(targets)] = 0.0
+
+    # First point with the best arc length (zero-length steps repeat values)
+    index = segment_sum((arc_lengths < best_s[row]).astype(np.int64), paths.offsets)
+    index[~nonempty] = -1
+    return index
+
+
+def gather_windows(paths, centers, pts_before, pts_after):
+    """
+    Gather the points [center - pts_before, center + pts_after] of every path, clipped to the path.
+
+    Parameters:
+    paths (CsrPaths): The paths.
+    centers (np.ndarray): Center index within each path (-1 skips the path).
+    pts_before, pts_after (int): Window size before and after the center.
+
+    Returns:
+    tuple: (flat point indices into paths.x/y, path index of every gathered point).
+    """
+    counts = paths.counts
+    centers = np.asarray(centers, dtype=np.int64)
+    start = np.maximum(centers - pts_before, 0)
+    end = np.minimum(centers + pts_after + 1, counts)
+    end[centers < 0] = start[centers < 0]
+    lengths = np.maximum(end - start, 0)
+
+    # Segmented arange: position within the window plus the global start of each window
+    window_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=window_offsets[1:])
+    path_of_point = np.repeat(np.arange(len(lengths)), lengths)
+    within = np.arange(window_offsets[-1]) - window_offsets[:-1][path_of_point]
+    indices = paths.offsets[:-1][path_of_point] + start[path_of_point] + within
+    return indices, path_of_point
@@ -0,0 +1,193 @@
+# Description: Kinematic quantities (curvature, velocities, accelerations, jerks) of all planned
+# paths of a trip, computed in one segmented pass over the CSR path arrays (see csr_paths).
+# Derivatives are discrete central differences within each path (one-sided at the path ends);
+# curvature uses derivatives with respect to the point index, the dynamics use derivatives
+# with respect to arc length and a speed profile along it (d/dt = v * d/ds).
+import numpy as np
+import pandas as pd
+
+# Columns of path_kinematics, in the order of the kinematic columns of the PathRegressor v_p array
+KINEMATIC_COLUMNS = [
+    "curvature", "acceleration", "jerk", "longitudinal_jerk", "lateral_jerk", "longitudinal_acceleration",
+    "lateral_acceleration", "longitudinal_velocity", "lateral_velocity", "longitudinal_position",
+    "lateral_position",
+]
+
+# Per-path KPIs of path_kpis: the maximum absolute value of these columns over the path
+KPI_COLUMNS = ["curvature", "lateral_acceleration", "longitudinal_acceleration", "acceleration", "lateral_jerk",
+               "longitudinal_jerk", "jerk"]
+
+
+def segmented_gradient(values, offsets, spacing=None):
+    """
+    Derivative of values within every CSR segment, like np.gradient applied per path.
+
+    Second-order central differences inside a segment (the non-uniform spacing formula of
+    np.gradient), first-order one-sided differences at its first and last point. Single-point
+    segments get NaN, as do points next to a zero spacing (e.g. repeated path points when
+    differentiating by arc length).
+
+    Parameters:
+    values (np.ndarray): Flat values in CSR order.
+    offsets (np.ndarray): CSR offsets of the segments.
+    spacing (np.ndarray): Flat parameter (e.g. arc length) to differentiate by; None for the point index.
+
+    Returns:
+    np.ndarray: The derivative of every value.
+    """
+    n = len(values)
+    index = np.arange(n)
+    counts = np.diff(offsets)
+    starts = np.repeat(offsets[:-1], counts)
+    ends = np.repeat(offsets[1:], counts) - 1
+    before = np.maximum(index - 1, starts)
+    after = np.minimum(index + 1, ends)
+
+    t = index.astype(np.float64) if spacing is None else np.asarray(spacing, dtype=np.float64)
+    h_before = t[index] - t[before]
+    h_after = t[after] - t[index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gradient = (h_before ** 2 * values[after] + (h_after ** 2 - h_before ** 2) * values
+                    - h_after ** 2 * values[before]) / (h_before * h_after * (h_before + h_after))
+        # One-sided at the segment ends (one of the steps is 0 there)
+        edge = (before == index) | (after == index)
+        gradient[edge] = ((values[after] - values[before]) / (t[after] - t[before]))[edge]
+    gradient[~np.isfinite(gradient)] = np.nan
+    return gradient
+
+
+def speed_profile(paths, arc_lengths, start_speeds, end_speeds=None):
+    """
+    Speed at every path point for a constant acceleration from start_speeds to end_speeds
+    over the length of each path (v^2 linear in arc length); constant without end_speeds.
+
+    Parameters:
+    paths (CsrPaths): The paths.
+    arc_lengths (np.ndarray): Arc length of every point, from arc_length().
+    start_speeds (np.ndarray): Speed at the first point of each path [m/s].
+    end_speeds (np.ndarray): Speed at the last point of each path [m/s].
+
+    Returns:
+    np.ndarray: Speed of every point [m/s].
+    """
+    row = paths.path_index()
+    start_speeds = np.asarray(start_speeds, dtype=np.float64)
+    if end_speeds is None:
+        return start_speeds[row]
+    end_speeds = np.asarray(end_speeds, dtype=np.float64)
+    lengths = np.zeros(paths.num_paths)
+    nonempty = paths.counts > 0
+    lengths[nonempty] = arc_lengths[paths.offsets[1:][nonempty] - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(lengths[row] > 0, arc_lengths / lengths[row], 0.0)
+    v0, v1 = start_speeds[row], end_speeds[row]
+    return np.sqrt(np.maximum(v0 ** 2 + (v1 ** 2 - v0 ** 2) * fraction, 0.0))
+
+
+def path_kinematics(paths, arc_lengths, speeds):
+    """
+    Compute the kinematic quantities of every point of every path.
+
+    Parameters:
+    paths (CsrPaths): The paths in the frame they were planned in (ego coordinates), so the
+        longitudinal/lateral components are relative to the car.
+    arc_lengths (np.ndarray): Arc length of every point, from arc_length().
+    speeds (np.ndarray): Speed of every point, e.g. from speed_profile() [m/s].
+
+    Returns:
+    np.ndarray: [num_points x len(KINEMATIC_COLUMNS)] array, in CSR order.
+
+    Algorithm Description:
+        Curvature kappa = (x' y'' - y' x'') / (x'^2 + y'^2)^(3/2) with derivatives by point index
+        (independent of the parametrization, no division by zero-length steps). With speed v(s):
+        lateral acceleration v^2 kappa, longitudinal acceleration v dv/ds = d(v^2 / 2)/ds, and the jerks are the
+        time derivatives v d(a)/ds. The velocity components follow the path heading in the ego frame.
+    """
+    offsets = paths.offsets
+    speeds = np.asarray(speeds, dtype=np.float64)
+    dx = segmented_gradient(paths.x, offsets)
+    dy = segmented_gradient(paths.y, offsets)
+    ddx = segmented_gradient(dx, offsets)
+    ddy = segmented_gradient(dy, offsets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curvature = (dx * ddy - dy * ddx) / np.power(dx ** 2 + dy ** 2, 1.5)
+    heading = np.arctan2(dy, dx)
+
+    # v dv/ds as d(v^2 / 2)/ds, exact for the piecewise constant accelerations of speed_profile
+    longitudinal_acceleration = 0.5 * segmented_gradient(speeds ** 2, offsets, arc_lengths)
+    lateral_acceleration = speeds ** 2 * curvature
+    longitudinal_jerk = speeds * segmented_gradient(longitudinal_acceleration, offsets, arc_lengths)
+    lateral_jerk = speeds * segmented_gradient(lateral_acceleration, offsets, arc_lengths)
+
+    kinematics = np.empty((len(paths.x), len(KINEMATIC_COLUMNS)))
+    kinematics[:, 0] = curvature
+    kinematics[:, 1] = np.hypot(longitudinal_acceleration, lateral_acceleration)
+    kinematics[:, 2] = np.hypot(longitudinal_jerk, lateral_jerk)
+    kinematics[:, 3] = longitudinal_jerk
+    kinematics[:, 4] = lateral_jerk
+    kinematics[:, 5] = longitudinal_acceleration
+    kinematics[:, 6] = lateral_acceleration
+    kinematics[:, 7] = speeds * np.cos(heading)
+    kinematics[:, 8] = speeds * np.sin(heading)
+    kinematics[:, 9] = paths.x
+    kinematics[:, 10] = paths.y
+    return kinematics
+
+
+def segment_max(values, offsets):
+    """Maximum of the finite values of every CSR segment (NaN for segments without any)."""
+    values = np.where(np.isfinite(values), values, -np.inf)
+    maxima = np.full(len(offsets) - 1, -np.inf)
+    nonempty = offsets[1:] > offsets[:-1]
+    if len(values):
+        maxima[nonempty] = np.maximum.reduceat(values, offsets[:-1][nonempty])
+    maxima[maxima == -np.inf] = np.nan
+    return maxima
+
+
+def path_kpis(paths, arc_lengths, kinematics, timestamps=None):
+    """
+    Summarize the kinematics of every path.
+
+    Parameters:
+    paths (CsrPaths): The paths.
+    arc_lengths (np.ndarray): Arc length of every point.
+    kinematics (np.ndarray): Output of path_kinematics().
+    timestamps (np.ndarray): Timestamp of each path, added as a column if given.
+
+    Returns:
+    pd.DataFrame: One row per path: path_idx, (timestamp), num_points, length_m and
+        max_abs_<column> for every column of KPI_COLUMNS.
+    """
+    offsets = paths.offsets
+    counts = paths.counts
+    lengths = np.full(paths.num_paths, np.nan)
+    lengths[counts > 0] = arc_lengths[offsets[1:][counts > 0] - 1]
+    kpis = {"path_idx": np.arange(paths.num_paths)}
+    if timestamps is not None:
+        kpis["timestamp"] = np.asarray(timestamps)
+    kpis["num_points"] = counts
+    kpis["length_m"] = lengths
+    for column in KPI_COLUMNS:
+        kpis[f"max_abs_{column}"] = segment_max(np.abs(kinematics[:, KINEMATIC_COLUMNS.index(column)]), offsets)
+    return pd.DataFrame(kpis)
+
+
+def trip_kpis(df_path_kpis):
+    """
+    Summarize per-path KPIs over a trip: the median, 95th percentile and maximum of every
+    max_abs_<column> over the paths.
+
+    Returns:
+    dict: {"<statistic>_<kpi>": value}, plus the number of paths.
+    """
+    summary = {"num_paths": int(len(df_path_kpis))}
+    for column in df_path_kpis.columns:
+        if not column.startswith("max_abs_"):
+            continue
+        values = df_path_kpis[column].to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        summary[f"median_{column}"] = float(np.median(values)) if len(values) else np.nan
+        summary[f"p95_{column}"] = float(np.percentile(values, 95)) if len(values) else np.nan
+        summary[f"max_{column}"] = float(values.max()) if len(values) else np.nan
+    return summary
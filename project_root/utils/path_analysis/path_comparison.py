@@ -0,0 +1,347 @@
+# Description: Path-to-path distance metrics between the planned paths of two trips (e.g. two
+# software versions driving or re-simulating the same route). The planning cycles of the
+# trips are aligned in time, and for every pair of corresponding paths the Hausdorff
+# distance, the discrete Frechet distance (anti-diagonal dynamic programming) and the mean
+# lateral deviation (nearest-segment query) are computed for chunks of cycles at once, sized
+# to bound the memory of the distance tensors, on a process pool for large trips. The single-pair functions (Hausdorff with KD-trees) serve
+# arbitrary point sets and are the reference of the batched metrics. The result is a
+# per-timestamp divergence table that can be served as temporal signals and sorted to find
+# the worst moments.
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from utils.path_analysis.csr_paths import transform_paths
+
+# Columns of the per-cycle metrics, in the order of compare_path_pairs
+METRIC_COLUMNS = ["hausdorff_m", "frechet_m", "mean_lateral_deviation_m"]
+
+# Trips with at least this many aligned cycles are compared on a process pool (if max_workers > 1)
+COMPARISON_POOL_MIN_CYCLES = 5000
+
+# Largest number of elements K * N * M of the [K x N x M] distance tensors of a chunk of K
+# cycles compared together (also one process pool task); 2**21 float64 elements are 16 MB
+COMPARISON_MAX_ELEMENTS = 2 ** 21
+
+# Segments of the reference paths projected onto at once in the lateral deviation of a chunk
+LATERAL_SEGMENT_BLOCK = 16
+
+
+def hausdorff_distance(a, b):
+    """
+    Symmetric Hausdorff distance between two point sets.
+
+    Parameters:
+    a, b (np.ndarray): [N x 2] and [M x 2] points.
+
+    Returns:
+    float: The largest distance from a point of one set to the closest point of the other.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.nan
+    distance_ab, _ = cKDTree(b).query(a)
+    distance_ba, _ = cKDTree(a).query(b)
+    return float(max(distance_ab.max(), distance_ba.max()))
+
+
+def discrete_frechet_distance(a, b):
+    """
+    Discrete Frechet distance between two polylines.
+
+    The coupling recurrence ca[i, j] = max(d[i, j], min(ca[i-1, j], ca[i-1, j-1], ca[i, j-1]))
+    only depends on the two previous anti-diagonals, so it is evaluated one anti-diagonal
+    at a time (N + M steps of array operations instead of N * M Python steps).
+
+    Parameters:
+    a, b (np.ndarray): [N x 2] and [M x 2] polyline vertices.
+
+    Returns:
+    float: The discrete Frechet distance.
+    """
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return np.nan
+    d = np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+    ca = np.full((n, m), np.inf)
+    ca[0, 0] = d[0, 0]
+    for k in range(1, n + m - 1):
+        i = np.arange(max(0, k - m + 1), min(k, n - 1) + 1)
+        j = k - i
+        previous = np.full(len(i), np.inf)
+        has_up, has_left = i > 0, j > 0
+        previous[has_up] = ca[i[has_up] - 1, j[has_up]]
+        previous[has_left] = np.minimum(previous[has_left], ca[i[has_left], j[has_left] - 1])
+        both = has_up & has_left
+        previous[both] = np.minimum(previous[both], ca[i[both] - 1, j[both] - 1])
+        ca[i, j] = np.maximum(d[i, j], previous)
+    return float(ca[-1, -1])
+
+
+def lateral_deviations(reference, points):
+    """
+    Distance from every point to the closest segment of a reference polyline.
+
+    Parameters:
+    reference (np.ndarray): [N x 2] reference polyline vertices.
+    points (np.ndarray): [M x 2] points.
+
+    Returns:
+    np.ndarray: The M distances (NaN if the reference is empty).
+    """
+    if len(reference) == 0:
+        return np.full(len(points), np.nan)
+    if len(reference) == 1:
+        return np.hypot(*(points - reference[0]).T)
+    start = reference[:-1]
+    direction = reference[1:] - reference[:-1]
+    length_sq = np.einsum('ij,ij->i', direction, direction)
+    offset = points[:, None, :] - start[None, :, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.clip(np.einsum('mij,ij->mi', offset, direction) / length_sq, 0.0, 1.0)
+    # Zero-length segments (repeated vertices) are their start point
+    fraction[:, length_sq == 0] = 0.0
+    closest = start[None, :, :] + fraction[..., None] * direction[None, :, :]
+    return np.hypot(*(points[:, None, :] - closest).transpose(2, 0, 1)).min(axis=1)
+
+
+def path_pair_metrics(a, b):
+    """
+    Compare two paths (reference implementation of batch_path_metrics for a single pair).
+
+    Returns:
+    tuple: (Hausdorff distance, discrete Frechet distance, mean lateral deviation of the points
+        of b from the polyline a) [m]; NaN if a path is empty.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.nan, np.nan, np.nan
+    return hausdorff_distance(a, b), discrete_frechet_distance(a, b), float(lateral_deviations(a, b).mean())
+
+
+def _pad(paths):
+    """Stack [N_k x 2] arrays into a NaN-padded [K x max(N_k) x 2] array."""
+    lengths = np.array([len(path) for path in paths], dtype=np.int64)
+    padded = np.full((len(paths), max(lengths.max(initial=0), 1), 2), np.nan)
+    for k, path in enumerate(paths):
+        padded[k, :len(path)] = path
+    return padded, lengths
+
+
+def batch_path_metrics(pairs):
+    """
+    Compare many pairs of paths at once; equivalent to path_pair_metrics for every pair.
+
+    The paths are padded into [K x N x 2] and [K x M x 2] arrays and all pairs share one
+    [K x N x M] distance tensor: the Hausdorff distance is a masked min/max over it, and the
+    Frechet recurrence runs over the anti-diagonals of all pairs together, so the number of
+    array steps is N + M for the whole batch. Padding never influences the result: the
+    recurrence only reads cells with smaller indices than the last cell of each pair. The
+    lateral deviation projects the points of b onto LATERAL_SEGMENT_BLOCK segments of a at a
+    time and keeps the running minimum, so its temporaries are [K x M x block].
+    Memory grows with K * N * M; compare_path_pairs sizes the chunks to bound it.
+
+    Parameters:
+    pairs (list): (a, b) pairs of [N_k x 2] and [M_k x 2] paths.
+
+    Returns:
+    np.ndarray: [K x len(METRIC_COLUMNS)] metrics (NaN for pairs with an empty path).
+    """
+    metrics = np.full((len(pairs), len(METRIC_COLUMNS)), np.nan)
+    if not pairs:
+        return metrics
+    a, len_a = _pad([pair[0] for pair in pairs])
+    b, len_b = _pad([pair[1] for pair in pairs])
+    k_all = np.arange(len(pairs))
+    valid = (len_a > 0) & (len_b > 0)
+
+    d = np.hypot(a[:, :, None, 0] - b[:, None, :, 0], a[:, :, None, 1] - b[:, None, :, 1])
+    d = np.where(np.isnan(d), np.inf, d)
+
+    # Hausdorff: the padded rows/columns are inf, so they never win a min and are masked from the max
+    row_valid = np.arange(a.shape[1])[None, :] < len_a[:, None]
+    col_valid = np.arange(b.shape[1])[None, :] < len_b[:, None]
+    a_to_b = np.where(row_valid, d.min(axis=2), -np.inf).max(axis=1)
+    b_to_a = np.where(col_valid, d.min(axis=1), -np.inf).max(axis=1)
+    metrics[:, 0] = np.maximum(a_to_b, b_to_a)
+
+    # Frechet, one anti-diagonal of all pairs per step
+    n, m = d.shape[1], d.shape[2]
+    ca = np.full_like(d, np.inf)
+    ca[:, 0, 0] = d[:, 0, 0]
+    for diagonal in range(1, n + m - 1):
+        i = np.arange(max(0, diagonal - m + 1), min(diagonal, n - 1) + 1)
+        j = diagonal - i
+        previous = np.full((len(pairs), len(i)), np.inf)
+        up, left = i > 0, j > 0
+        previous[:, up] = ca[:, i[up] - 1, j[up]]
+        previous[:, left] = np.minimum(previous[:, left], ca[:, i[left], j[left] - 1])
+        both = up & left
+        previous[:, both] = np.minimum(previous[:, both], ca[:, i[both] - 1, j[both] - 1])
+        ca[:, i, j] = np.maximum(d[:, i, j], previous)
+    metrics[:, 1] = ca[k_all, np.maximum(len_a - 1, 0), np.maximum(len_b - 1, 0)]
+
+    # Mean lateral deviation of b from the segments of a (single-point paths a: the point distance);
+    # fmin skips the NaN distances to padded segments
+    deviation = np.full(b.shape[:2], np.inf)
+    for first in range(0, n - 1, LATERAL_SEGMENT_BLOCK):
+        last = min(first + LATERAL_SEGMENT_BLOCK, n - 1)
+        start = a[:, None, first:last]
+        direction = a[:, None, first + 1:last + 1] - start
+        length_sq = direction[..., 0] ** 2 + direction[..., 1] ** 2
+        offset_x = b[:, :, None, 0] - start[..., 0]
+        offset_y = b[:, :, None, 1] - start[..., 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.clip((offset_x * direction[..., 0] + offset_y * direction[..., 1]) / length_sq, 0.0, 1.0)
+        fraction = np.where(length_sq == 0, 0.0, fraction)
+        segment_distance = np.hypot(offset_x - fraction * direction[..., 0], offset_y - fraction * direction[..., 1])
+        deviation = np.fmin(deviation, np.fmin.reduce(segment_distance, axis=2))
+    deviation = np.where((len_a == 1)[:, None], d[:, 0, :], deviation)
+    deviation = np.where(col_valid, deviation, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics[:, 2] = deviation.sum(axis=1) / len_b
+
+    metrics[~valid] = np.nan
+    return metrics
+
+
+def chunk_pairs(lengths_a, lengths_b, max_elements):
+    """
+    Group path pairs into chunks whose padded distance tensors have at most max_elements elements.
+
+    Pairs of similar size are grouped together, so little of a tensor is padding. A pair
+    larger than max_elements on its own forms a chunk by itself.
+
+    Parameters:
+    lengths_a, lengths_b (np.ndarray): Number of points of the paths of every pair.
+    max_elements (int): Largest K * max(N_k) * max(M_k) of a chunk.
+
+    Returns:
+    list: Arrays of the pair indices of every chunk.
+    """
+    lengths_a = np.maximum(np.asarray(lengths_a, dtype=np.int64), 1)
+    lengths_b = np.maximum(np.asarray(lengths_b, dtype=np.int64), 1)
+    chunks = []
+    chunk = []
+    n = m = 0
+    for k in np.lexsort((lengths_b, lengths_a)):
+        chunk_n, chunk_m = max(n, lengths_a[k]), max(m, lengths_b[k])
+        if chunk and (len(chunk) + 1) * chunk_n * chunk_m > max_elements:
+            chunks.append(np.array(chunk))
+            chunk = []
+            chunk_n, chunk_m = lengths_a[k], lengths_b[k]
+        chunk.append(k)
+        n, m = chunk_n, chunk_m
+    if chunk:
+        chunks.append(np.array(chunk))
+    return chunks
+
+
+def compare_path_pairs(paths_a, paths_b, index_a, index_b, max_workers=1):
+    """
+    Compare the paths paths_a.path(index_a[k]) and paths_b.path(index_b[k]) for every k.
+
+    The pairs are processed in chunks of at most COMPARISON_MAX_ELEMENTS distance tensor
+    elements (see chunk_pairs and batch_path_metrics), on a process pool from
+    COMPARISON_POOL_MIN_CYCLES pairs if max_workers > 1.
+
+    Parameters:
+    paths_a, paths_b (CsrPaths): The paths of both trips.
+    index_a, index_b (np.ndarray): Indices of the corresponding paths.
+    max_workers (int): Worker processes.
+
+    Returns:
+    np.ndarray: [K x len(METRIC_COLUMNS)] metrics of the pairs.
+    """
+    pairs = [(paths_a.path(i), paths_b.path(j)) for i, j in zip(index_a, index_b)]
+    chunks = chunk_pairs([len(a) for a, _ in pairs], [len(b) for _, b in pairs], COMPARISON_MAX_ELEMENTS)
+    chunk_pairs_list = [[pairs[k] for k in chunk] for chunk in chunks]
+    if max_workers > 1 and len(pairs) >= COMPARISON_POOL_MIN_CYCLES:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(batch_path_metrics, chunk_pairs_list))
+    else:
+        results = [batch_path_metrics(chunk) for chunk in chunk_pairs_list]
+
+    metrics = np.empty((len(pairs), len(METRIC_COLUMNS)))
+    for chunk, result in zip(chunks, results):
+        metrics[chunk] = result
+    return metrics
+
+
+def align_cycles(timestamps_a, timestamps_b, offset_ms=0.0, tolerance_ms=None):
+    """
+    Pair every planning cycle of trip A with the closest cycle of trip B.
+
+    Parameters:
+    timestamps_a, timestamps_b (np.ndarray): Cycle timestamps of both trips [ms].
+    offset_ms (float): Trip B time minus trip A time (see core.trip_comparison).
+    tolerance_ms (float): Largest accepted time difference; defaults to half the median
+        cycle period of trip B.
+
+    Returns:
+    tuple: (index_a, index_b) of the paired cycles.
+    """
+    timestamps_a = np.asarray(timestamps_a, dtype=np.float64)
+    timestamps_b = np.asarray(timestamps_b, dtype=np.float64)
+    if len(timestamps_a) == 0 or len(timestamps_b) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order_b = np.argsort(timestamps_b, kind='stable')
+    sorted_b = timestamps_b[order_b]
+    if tolerance_ms is None:
+        tolerance_ms = 0.5 * np.median(np.diff(sorted_b)) if len(sorted_b) > 1 else np.inf
+
+    target = timestamps_a + offset_ms
+    if len(sorted_b) == 1:
+        nearest = np.zeros(len(target), dtype=np.int64)
+    else:
+        upper = np.clip(np.searchsorted(sorted_b, target), 1, len(sorted_b) - 1)
+        nearest = np.where(np.abs(target - sorted_b[upper - 1]) <= np.abs(sorted_b[upper] - target), upper - 1, upper)
+    matched = np.abs(sorted_b[nearest] - target) <= tolerance_ms
+    return np.flatnonzero(matched), order_b[nearest[matched]]
+
+
+def world_paths(path_trajectory):
+    """Get all paths of a PathTrajectory in world coordinates (CSR layout)."""
+    return transform_paths(path_trajectory.get_paths_csr(), *path_trajectory.get_image_poses())
+
+
+def compare_trips(trajectory_a, trajectory_b, offset_ms=0.0, tolerance_ms=None, max_workers=1):
+    """
+    Compute the divergence between the planned paths of two trips, cycle by cycle.
+
+    Parameters:
+    trajectory_a, trajectory_b (PathTrajectoryBase): The path data of the reference trip A and of trip B.
+    offset_ms (float): Trip B time minus trip A time.
+    tolerance_ms (float): Largest time difference of paired cycles (see align_cycles).
+    max_workers (int): Worker processes for large trips.
+
+    Returns:
+    pd.DataFrame: One row per paired cycle, sorted by time: timestamp (trip A) [ms],
+        timestamp_b [ms], path_idx_a, path_idx_b and METRIC_COLUMNS.
+    """
+    timestamps_a = np.asarray(trajectory_a.get_timestamps_ms(), dtype=np.float64)
+    timestamps_b = np.asarray(trajectory_b.get_timestamps_ms(), dtype=np.float64)
+    index_a, index_b = align_cycles(timestamps_a, timestamps_b, offset_ms, tolerance_ms)
+    metrics = compare_path_pairs(world_paths(trajectory_a), world_paths(trajectory_b), index_a, index_b, max_workers)
+
+    df = pd.DataFrame({'timestamp': timestamps_a[index_a], 'timestamp_b': timestamps_b[index_b],
+                       'path_idx_a': index_a, 'path_idx_b': index_b})
+    for column, values in zip(METRIC_COLUMNS, metrics.T):
+        df[column] = values
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def worst_cycles(df_divergence, metric="frechet_m", n=10):
+    """
+    Get the cycles with the largest divergence.
+
+    Parameters:
+    df_divergence (pd.DataFrame): Output of compare_trips.
+    metric (str): Column of METRIC_COLUMNS to rank by.
+    n (int): Number of cycles.
+
+    Returns:
+    pd.DataFrame: The n rows with the largest metric, largest first (NaN last).
+    """
+    return df_divergence.sort_values(metric, ascending=False, na_position='last', kind='stable').head(n)
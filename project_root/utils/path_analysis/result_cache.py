@@ -0,0 +1,144 @@
+# Description: Content-addressed cache for path analysis results. Entries are keyed by a
+# sha256 hash of the input data (the content of the source file) and the parameters that
+# produced them, so a changed input file or parameter never returns a stale result and two
+# parameter sets never overwrite each other. Tables are stored as Parquet, arrays
+# (intermediate products shared by many parameter sets) as .npz; every entry has a JSON
+# sidecar with its metadata. Entries are written to a temporary file and renamed, so
+# concurrent writers and interrupted runs never leave a partial entry behind.
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import polars as pl
+
+from core.cache_handler import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cached entries changes to invalidate existing entries
+CACHE_VERSION = 4
+
+# Content hashes of files, keyed by (path, size, mtime_ns): hashing a file once per change is enough
+_content_hashes = {}
+_content_hashes_lock = threading.Lock()
+
+
+def file_content_hash(file_path):
+    """
+    Get the sha256 hex digest of a file's content (memoized until the file changes).
+
+    Parameters:
+    file_path (str): Path to the file.
+
+    Returns:
+    str: The hex digest.
+    """
+    memo_key = (os.path.abspath(file_path), *file_fingerprint(file_path))
+    with _content_hashes_lock:
+        digest = _content_hashes.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with _content_hashes_lock:
+            _content_hashes[memo_key] = digest
+    return digest
+
+
+def cache_key(kind, data_key, params=None):
+    """
+    Build the key of a cache entry.
+
+    Parameters:
+    kind (str): Kind of result (e.g. "virtual_path").
+    data_key (str): Hash of the input data (see file_content_hash).
+    params (dict): Parameters the result depends on.
+
+    Returns:
+    str: sha256 hex digest of kind, data key, parameters and cache version.
+    """
+    payload = json.dumps({"version": CACHE_VERSION, "kind": kind, "data": data_key, "params": params or {}},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of content-addressed cache entries: <key>.parquet or <key>.npz plus <key>.json.
+
+    Attributes:
+        cache_dir (str): Directory of the entries (created on the first write)
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}{extension}")
+
+    def _write(self, key, extension, write, metadata):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The data file is renamed last: an entry exists once its data file does
+        for ext, writer in ((".json", lambda path: _write_json(path, metadata)), (extension, write)):
+            final_path = self._path(key, ext)
+            tmp_path = f"{final_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            writer(tmp_path)
+            os.replace(tmp_path, final_path)
+
+    def metadata(self, key):
+        """Get the metadata of an entry, or None if it does not exist."""
+        try:
+            with open(self._path(key, ".json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_table(self, key, df, metadata=None):
+        """Store a polars DataFrame as Parquet."""
+        metadata = dict(metadata or {}, key=key, created=time.time(), rows=df.height, columns=df.columns)
+        self._write(key, ".parquet", df.write_parquet, metadata)
+
+    def load_table(self, key):
+        """Get a stored DataFrame, or None on a cache miss."""
+        path = self._path(key, ".parquet")
+        if not os.path.exists(path):
+            return None
+        try:
+            return pl.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def save_arrays(self, key, arrays, metadata=None):
+        """Store a dictionary of numpy arrays as .npz."""
+        metadata = dict(metadata or {}, key=key, created=time.time(),
+                        arrays={name: list(np.shape(a)) for name, a in arrays.items()})
+
+        def write(path):
+            with open(path, "wb") as f:
+                np.savez(f, **arrays)
+
+        self._write(key, ".npz", write, metadata)
+
+    def load_arrays(self, key):
+        """Get stored arrays as a dictionary, or None on a cache miss."""
+        path = self._path(key, ".npz")
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as npz:
+                return {name: npz[name] for name in npz.files}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+
+def _write_json(path, metadata):
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=1, default=str)
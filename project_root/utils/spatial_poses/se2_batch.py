@@ -0,0 +1,208 @@
+# Description: Batched SE(2) operations. Poses are either (N, 3) arrays of [x, y, yaw_rad]
+# vectors (the *_poses functions) or (N, 3, 3) arrays of homogeneous matrices (a single pose
+# may be given as (3,) or (3, 3) and broadcasts). Every function works on the whole batch in a
+# few numpy calls instead of a Python loop over 3x3 matrices; point sets of different sizes per
+# pose (e.g. the planned paths of a trip) are passed as one flat point array with CSR offsets.
+import numpy as np
+
+
+def wrap_angle(angle):
+    """Wrap angles [rad] to [-pi, pi)."""
+    return (np.asarray(angle, dtype=np.float64) + np.pi) % (2.0 * np.pi) - np.pi
+
+
+def pose_matrices(x, y, yaw, out=None):
+    """
+    Build SE(2) matrices from pose components.
+
+    Parameters:
+    x, y (array-like): Translations [m].
+    yaw (array-like): Rotations [rad].
+    out (np.ndarray): Optional (N, 3, 3) float64 output.
+
+    Returns:
+    np.ndarray: (N, 3, 3) homogeneous matrices.
+    """
+    x, y, yaw = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (x, y, yaw)))
+    if out is None:
+        out = np.empty((len(x), 3, 3))
+    cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+    out[:, 0, 0] = cos_yaw
+    out[:, 0, 1] = -sin_yaw
+    out[:, 0, 2] = x
+    out[:, 1, 0] = sin_yaw
+    out[:, 1, 1] = cos_yaw
+    out[:, 1, 2] = y
+    out[:, 2, :2] = 0.0
+    out[:, 2, 2] = 1.0
+    return out
+
+
+def vectors_to_matrices(poses, out=None):
+    """Convert (N, 3) [x, y, yaw] poses to (N, 3, 3) matrices."""
+    poses = np.asarray(poses, dtype=np.float64).reshape(-1, 3)
+    return pose_matrices(poses[:, 0], poses[:, 1], poses[:, 2], out=out)
+
+
+def matrices_to_vectors(matrices):
+    """Convert (N, 3, 3) matrices to (N, 3) [x, y, yaw] poses (yaw in [-pi, pi])."""
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    return np.column_stack((matrices[:, 0, 2], matrices[:, 1, 2], np.arctan2(matrices[:, 1, 0], matrices[:, 0, 0])))
+
+
+def compose(a, b):
+    """
+    Compose SE(2) matrices, a @ b, pairwise or broadcasting a single (3, 3) matrix.
+
+    Parameters:
+    a, b (np.ndarray): (N, 3, 3) or (3, 3) matrices.
+
+    Returns:
+    np.ndarray: The composed matrices.
+    """
+    return np.matmul(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+
+
+def compose_poses(a, b):
+    """
+    Compose poses given as [x, y, yaw] vectors: the pose b expressed in the frame of pose a.
+
+    Parameters:
+    a, b (np.ndarray): (N, 3) or (3,) poses; a single pose broadcasts.
+
+    Returns:
+    np.ndarray: The composed poses (yaw wrapped to [-pi, pi)).
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    cos_yaw, sin_yaw = np.cos(a[..., 2]), np.sin(a[..., 2])
+    return np.stack((a[..., 0] + cos_yaw * b[..., 0] - sin_yaw * b[..., 1],
+                     a[..., 1] + sin_yaw * b[..., 0] + cos_yaw * b[..., 1],
+                     wrap_angle(a[..., 2] + b[..., 2])), axis=-1)
+
+
+def inverse(matrices):
+    """
+    Invert SE(2) matrices in closed form (transposed rotation, rotated negative translation).
+
+    Parameters:
+    matrices (np.ndarray): (N, 3, 3) or (3, 3) matrices.
+
+    Returns:
+    np.ndarray: The inverse matrices.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    rotation_t = np.swapaxes(matrices[..., :2, :2], -1, -2)
+    result = np.zeros_like(matrices)
+    result[..., :2, :2] = rotation_t
+    result[..., :2, 2] = -np.einsum("...ij,...j->...i", rotation_t, matrices[..., :2, 2])
+    result[..., 2, 2] = 1.0
+    return result
+
+
+def inverse_poses(poses):
+    """Invert poses given as (N, 3) or (3,) [x, y, yaw] vectors (yaw wrapped to [-pi, pi))."""
+    poses = np.asarray(poses, dtype=np.float64)
+    cos_yaw, sin_yaw = np.cos(poses[..., 2]), np.sin(poses[..., 2])
+    x, y = poses[..., 0], poses[..., 1]
+    return np.stack((-cos_yaw * x - sin_yaw * y, sin_yaw * x - cos_yaw * y, wrap_angle(-poses[..., 2])), axis=-1)
+
+
+def transform_points(matrices, points, out=None):
+    """
+    Apply SE(2) matrices to 2D points: x' = R x + t.
+
+    Parameters:
+    matrices (np.ndarray): A single (3, 3) matrix applied to all points, or (N, 3, 3) with
+        one matrix per point.
+    points (np.ndarray): (N, 2) points.
+    out (np.ndarray): Optional (N, 2) float64 output; may be points.
+
+    Returns:
+    np.ndarray: (N, 2) transformed points.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    return _rotate_translate(matrices[..., 0, 0], matrices[..., 1, 0], matrices[..., 0, 2], matrices[..., 1, 2],
+                             points, out)
+
+
+def _rotate_translate(cos_yaw, sin_yaw, tx, ty, points, out):
+    """x' = R x + t from the rotation and translation components (per point or broadcast)."""
+    points = np.asarray(points, dtype=np.float64)
+    if out is None:
+        out = np.empty_like(points)
+    px, py = points[:, 0].copy(), points[:, 1]
+    np.add(cos_yaw * px - sin_yaw * py, tx, out=out[:, 0])
+    np.add(sin_yaw * px + cos_yaw * py, ty, out=out[:, 1])
+    return out
+
+
+def transform_points_ragged(matrices, points, offsets, out=None):
+    """
+    Apply one SE(2) matrix to each of a set of point sets of different sizes.
+
+    Parameters:
+    matrices (np.ndarray): (K, 3, 3) matrices.
+    points (np.ndarray): (N, 2) points of all sets, concatenated.
+    offsets (np.ndarray): CSR offsets (K + 1): set k is points[offsets[k]:offsets[k + 1]].
+    out (np.ndarray): Optional (N, 2) float64 output; may be points.
+
+    Returns:
+    np.ndarray: (N, 2) transformed points.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    # Gather the four components per point rather than whole matrices
+    row = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    return _rotate_translate(matrices[:, 0, 0][row], matrices[:, 1, 0][row], matrices[:, 0, 2][row],
+                             matrices[:, 1, 2][row], points, out)
+
+
+def _interp_extrapolate(t, tp, fp):
+    """Linear interpolation of fp(tp) at t, extrapolating linearly beyond the ends (like interp1d)."""
+    if len(tp) == 1:
+        return np.full(len(t), fp[0])
+    index = np.clip(np.searchsorted(tp, t), 1, len(tp) - 1)
+    t0, t1 = tp[index - 1], tp[index]
+    weight = (t - t0) / (t1 - t0)
+    return fp[index - 1] + weight * (fp[index] - fp[index - 1])
+
+
+def interpolate_poses(timestamps, pose_timestamps, x, y, yaw, yaw_timestamps=None, unwrap_yaw=True):
+    """
+    Interpolate poses at timestamps (linearly, extrapolating beyond the first and last pose).
+
+    Parameters:
+    timestamps (array-like): Timestamps to interpolate at.
+    pose_timestamps (array-like): Timestamps of x and y (and of yaw without yaw_timestamps).
+    x, y (array-like): Positions [m].
+    yaw (array-like): Headings [rad].
+    yaw_timestamps (array-like): Timestamps of yaw, if they differ from those of the positions.
+    unwrap_yaw (bool): Interpolate the heading along the shortest turn, so a wrap from pi to
+        -pi does not spin the car; the result is wrapped to [-pi, pi). False interpolates the
+        raw values.
+
+    Returns:
+    np.ndarray: (N, 3) [x, y, yaw] poses.
+    """
+    timestamps = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
+
+    def sorted_series(tp, *values):
+        tp = np.asarray(tp, dtype=np.float64)
+        values = [np.asarray(v, dtype=np.float64) for v in values]
+        if np.any(np.diff(tp) < 0):
+            order = np.argsort(tp, kind="stable")
+            tp, values = tp[order], [v[order] for v in values]
+        return tp, values
+
+    tp, (px, py) = sorted_series(pose_timestamps, x, y)
+    tp_yaw, (pyaw,) = sorted_series(pose_timestamps if yaw_timestamps is None else yaw_timestamps, yaw)
+    if unwrap_yaw:
+        pyaw = np.unwrap(pyaw)
+    result = np.empty((len(timestamps), 3))
+    result[:, 0] = _interp_extrapolate(timestamps, tp, px)
+    result[:, 1] = _interp_extrapolate(timestamps, tp, py)
+    result[:, 2] = _interp_extrapolate(timestamps, tp_yaw, pyaw)
+    if unwrap_yaw:
+        result[:, 2] = wrap_angle(result[:, 2])
+    return result
@@ -1,8 +1,7 @@
 # se2_function.py
 import numpy as np
 from scipy.interpolate import interp1d
-import numpy as np
-from spatialmath import SE2
+from utils.spatial_poses import se2_batch
 
 
 
@@ -59,42 +58,19 @@ def get_interpolated_pose_SE2(P_time_stamp, yaw, time_stamp_yaw, ego_x, ego_y, e
     ego_y_interpolator = interp1d(ego_time_stamp, ego_y, fill_value="extrapolate")
     yaw_interpolator = interp1d(time_stamp_yaw, yaw_rad, fill_value="extrapolate")
 
-    # Interpolate ego_x, ego_y, and ego_yaw for each P_time_stamp
-    interpolated_ego_x =   ego_x_interpolator(P_time_stamp)
-    interpolated_ego_y =   ego_y_interpolator(P_time_stamp)
-    interpolated_ego_yaw = yaw_interpolator(P_time_stamp)
-
-    # Create SE(2) matrices
-    SE2_matrices = []
-    for x, y, theta in zip(interpolated_ego_x, interpolated_ego_y, interpolated_ego_yaw):
-        SE2_matrix = np.array([
-            [np.cos(theta), -np.sin(theta), x],
-            [np.sin(theta), np.cos(theta), y],
-            [0, 0, 1]
-        ])
-        SE2_matrices.append(SE2_matrix)
+    # Create the SE(2) matrices of all P_time_stamp at once, as an (N, 3, 3) array
+    # (raw yaw interpolation, like the interpolators of the handler below)
+    poses = se2_batch.interpolate_poses(P_time_stamp, ego_time_stamp, ego_x, ego_y, yaw_rad,
+                                        yaw_timestamps=time_stamp_yaw, unwrap_yaw=False)
+    SE2_matrices = se2_batch.vectors_to_matrices(poses)
        
     lambda_handler_ego = lambda time_stamp: compute_se2_matrix(time_stamp, ego_x_interpolator, ego_y_interpolator, yaw_interpolator)
 
     return SE2_matrices, lambda_handler_ego
 
 def inverse_se2_matrix(se2_matrix):
-    # Extract the rotation and translation components
-    R = se2_matrix[:2, :2]
-    t = se2_matrix[:2, 2]
-    
-    # Compute the inverse rotation (transpose of the rotation matrix)
-    R_inv = R.T
-    
-    # Compute the inverse translation
-    t_inv = -np.dot(R_inv, t)
-    
-    # Construct the inverse SE(2) matrix
-    se2_matrix_inv = np.eye(3)
-    se2_matrix_inv[:2, :2] = R_inv
-    se2_matrix_inv[:2, 2] = t_inv
-    
-    return se2_matrix_inv
+    # Closed form: transposed rotation and rotated negative translation
+    return se2_batch.inverse(se2_matrix)
 
 # Function to compute SE(2) transformation
 def apply_se2_transform(se2_matrix, points):
@@ -111,26 +87,13 @@ def apply_se2_transform(se2_matrix, points):
     if points.shape[1] == 1:
         points = np.squeeze(points)
 
-    # check if se_matrix is given in class SE2 and obtain matrix if so
-    if isinstance(se2_matrix, SE2):
-        se2_matrix = se2_matrix.A   
-                        
-    # Convert points to homogeneous coordinates
-    points_homogeneous = np.hstack((points, np.ones((points.shape[0], 1))))
-    transformed_points_homogeneous = (se2_matrix @ points_homogeneous.T).T
-    transformed_points = transformed_points_homogeneous[:, :2]
-    
-    # check if points were given as list and return as list
-    if isinstance(points, list):
-        transformed_points = transformed_points.tolist()
-        
-    return transformed_points
+    # SE2 objects (e.g. of spatialmath) hold their matrix in .A
+    se2_matrix = getattr(se2_matrix, "A", se2_matrix)
+
+    # x' = R x + t, without building homogeneous coordinates
+    return se2_batch.transform_points(se2_matrix, points)
 
 # function to apply SE(2) to a series of SE(2) matrices
 def apply_se2_transform_to_series(T, se2_matrices):
-    # Apply the SE(2) transformation to each SE(2) matrix
-    transformed_se2_matrices = [T @ se2_matrix_i for se2_matrix_i in se2_matrices]
-        
-    return transformed_se2_matrices
-    
-
+    # Apply the SE(2) transformation to each SE(2) matrix, as one batched product
+    return se2_batch.compose(T, np.asarray(se2_matrices, dtype=np.float64))